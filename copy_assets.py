@@ -1,5 +1,6 @@
 import os
 import shutil
+import filecmp
 
 # Target Directory
 DEST_DIR = "dashboard/assets/curated_plots"
@@ -55,6 +56,7 @@ files_to_copy = [
 ]
 
 copied_count = 0
+unchanged_count = 0
 errors = []
 
 print(f"Starting copy of {len(files_to_copy)} files...")
@@ -66,6 +68,10 @@ for src in files_to_copy:
     
     try:
         if os.path.exists(src):
+            # Same bytes already in place: leave it (keeps mtimes and the image build cache stable)
+            if os.path.exists(dest) and filecmp.cmp(src, dest, shallow=False):
+                unchanged_count += 1
+                continue
             shutil.copy2(src, dest)
             copied_count += 1
             # print(f"Copied: {filename}")
@@ -74,7 +80,7 @@ for src in files_to_copy:
     except Exception as e:
         errors.append(f"ERROR copying {src}: {str(e)}")
 
-print(f"Finished. Successfully copied: {copied_count}/{len(files_to_copy)}")
+print(f"Finished. Successfully copied: {copied_count}/{len(files_to_copy)} ({unchanged_count} unchanged)")
 if errors:
     print("Errors encounterd:")
     for err in errors:
@@ -1,6 +1,8 @@
 /* ========================================
    UIDAI Analytics Dashboard - Data
    Real data from analysis outputs
+   Offline fallback: script.js replaces these values with the
+   dashboard/data bundle (scripts/build_dashboard_data.py) when served
    ======================================== */
 
 // KPI Data
@@ -78,7 +80,7 @@ const criticalDistricts = [
 const clusterData = {
     labels: ['Cluster 0\nEnrolment Frontiers', 'Cluster 1-2\nMature Systems', 'Cluster 3\nHigh Verification', 'Cluster 4\nDormant'],
     values: [80, 560, 200, 60],
-    colors: ['#1e88e5', '#43a047', '#fb8c00', '#e53935']
+    colors: ['#1e88e5', '#43a047', '#fb8c00', '#e53935', '#8e24aa']
 };
 
 // Metric Details
@@ -6,6 +6,9 @@
 // Chart instances storage
 let charts = {};
 
+// State charts show the largest states only (tables show all)
+const TOP_STATES = 20;
+
 document.addEventListener('DOMContentLoaded', function () {
     // Initialize all components
     initNavigation();
@@ -63,6 +66,9 @@ function initScrollSpy() {
             if (entry.isIntersecting) {
                 const sectionId = entry.target.id;
 
+                // Fetch this section's data chunks on first view
+                loadSectionData(sectionId);
+
                 // Update Sidebar Visuals
                 updateSidebarState(sectionId);
 
@@ -144,6 +150,152 @@ function updatePageTitle(sectionId) {
     }
 }
 
+/* ========================================
+   Data Bundle (lazy-loaded chunks)
+   Built by scripts/build_dashboard_data.py; data.js is the
+   fallback when the bundle cannot be fetched (e.g. file://)
+   ======================================== */
+const DATA_BUNDLE_DIR = 'data';
+const DATA_BUNDLE_SCHEMA = 1;
+
+// Chunks each section needs, fetched the first time it scrolls into view
+const SECTION_CHUNKS = {
+    overview: ['national', 'states'],
+    temporal: ['national'],
+    spatial: ['states'],
+    clusters: ['national'],
+    advanced: ['states'],
+    data: ['national', 'states', 'districts']
+};
+
+// Redraw a section once its chunks have arrived
+const SECTION_RENDERERS = {
+    overview: () => {
+        updateKpiCards();
+        rebuildChart('composition', createCompositionChart);
+        rebuildChart('stateVolume', createStateVolumeChart);
+    },
+    temporal: () => {
+        rebuildChart('monthlyTrend', createMonthlyTrendChart);
+        updateTrendChart();
+    },
+    spatial: () => {
+        rebuildChart('stateComparison', createStateComparisonChart);
+        updateStateChart();
+    },
+    clusters: () => rebuildChart('clusterPie', createClusterPieChart),
+    advanced: () => rebuildChart('correlation', createCorrelationChart),
+    data: () => initTables()
+};
+
+let bundleManifest = null;
+const bundleChunks = {};
+const loadedSections = {};
+
+function loadManifest() {
+    if (!bundleManifest) {
+        bundleManifest = fetch(`${DATA_BUNDLE_DIR}/manifest.json`, { cache: 'no-cache' })
+            .then(response => {
+                if (!response.ok) throw new Error(`manifest: HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(manifest => {
+                if (manifest.schema !== DATA_BUNDLE_SCHEMA) {
+                    throw new Error(`unsupported bundle schema ${manifest.schema}`);
+                }
+                window.dashboardData.version = manifest.version;
+                return manifest;
+            });
+    }
+    return bundleManifest;
+}
+
+function loadChunk(name) {
+    if (!bundleChunks[name]) {
+        // Chunk file names are content-hashed, so the browser cache can keep them
+        bundleChunks[name] = loadManifest()
+            .then(manifest => {
+                const entry = manifest.chunks[name];
+                if (!entry) throw new Error(`chunk ${name} missing from manifest`);
+                return fetch(`${DATA_BUNDLE_DIR}/${entry.file}`);
+            })
+            .then(response => {
+                if (!response.ok) throw new Error(`${name}: HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(chunk => {
+                applyChunk(chunk);
+                return chunk;
+            });
+    }
+    return bundleChunks[name];
+}
+
+// Columnar block {length, columns, dictionaries} -> array of row objects
+function decodeColumns(block) {
+    const names = Object.keys(block.columns);
+    const rows = new Array(block.length);
+    for (let i = 0; i < block.length; i++) {
+        const row = {};
+        names.forEach(name => {
+            const value = block.columns[name][i];
+            const labels = block.dictionaries && block.dictionaries[name];
+            row[name] = labels ? labels[value] : value;
+        });
+        rows[i] = row;
+    }
+    return rows;
+}
+
+function applyChunk(chunk) {
+    const data = window.dashboardData;
+    switch (chunk.chunk) {
+        case 'national':
+            data.kpi = chunk.kpi;
+            data.monthly = chunk.monthly;
+            data.clusters = { ...data.clusters, labels: chunk.clusters.labels, values: chunk.clusters.values };
+            data.critical = decodeColumns(chunk.critical);
+            break;
+        case 'states':
+            data.states = decodeColumns(chunk.rows);
+            break;
+        case 'districts':
+            data.districts = decodeColumns(chunk.rows);
+            break;
+    }
+}
+
+function loadSectionData(sectionId) {
+    const chunks = SECTION_CHUNKS[sectionId];
+    if (!chunks || loadedSections[sectionId]) return loadedSections[sectionId] || Promise.resolve();
+
+    loadedSections[sectionId] = Promise.all(chunks.map(loadChunk))
+        .then(() => SECTION_RENDERERS[sectionId]())
+        .catch(err => console.info(`Dashboard bundle unavailable (${err.message}); showing data.js values`));
+    return loadedSections[sectionId];
+}
+
+function rebuildChart(key, create) {
+    if (charts[key]) charts[key].destroy();
+    create();
+}
+
+function updateKpiCards() {
+    const kpi = window.dashboardData.kpi;
+    const cards = {
+        'total-enrolments': kpi.totalEnrolments,
+        'total-updates': kpi.totalUpdates,
+        'demo-updates': kpi.totalDemoUpdates,
+        'bio-updates': kpi.totalBioUpdates
+    };
+    Object.entries(cards).forEach(([id, value]) => {
+        const el = document.getElementById(id);
+        if (el && value != null) {
+            el.textContent = (value / 1e6).toFixed(value >= 1e7 ? 1 : 2) + 'M';
+        }
+    });
+}
+
 /* ========================================
    Chart Initialization
    ======================================== */
@@ -303,11 +455,12 @@ function renderAnalyticalOutputs() {
                         <!-- Image -->
                         <div class="relative w-full ${isFeatured ? 'h-[400px]' : 'h-[240px]'} bg-slate-100 dark:bg-slate-900 overflow-hidden cursor-zoom-in"
                              onclick='openImageModal("${plot.path}", "${plot.title}", "${plot.desc}")'>
-                            <img src="${plot.path}" 
-                                 alt="${plot.title}" 
-                                 class="w-full h-full object-contain p-4 transform group-hover:scale-105 transition-transform duration-500"
-                                 loading="lazy"
-                                 onerror="this.parentElement.innerHTML='<div class=\'flex flex-col items-center justify-center h-full text-slate-400 bg-slate-50 dark:bg-slate-800\'><i class=\'fas fa-image-slash text-2xl mb-2 opacity-50\'></i><span class=\'text-xs font-mono opacity-50\'>${plot.path.split('/').pop()}</span></div>'">
+                            ${plotPicture(plot.path, plot.title, {
+                                maxWidth: THUMB_MAX_WIDTH,
+                                sizes: isFeatured ? '(min-width: 768px) 66vw, 100vw' : '(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw',
+                                imgClass: 'w-full h-full object-contain p-4 transform group-hover:scale-105 transition-transform duration-500',
+                                attrs: `onerror="this.closest('div').innerHTML='<div class=\'flex flex-col items-center justify-center h-full text-slate-400 bg-slate-50 dark:bg-slate-800\'><i class=\'fas fa-image-slash text-2xl mb-2 opacity-50\'></i><span class=\'text-xs font-mono opacity-50\'>${plot.path.split('/').pop()}</span></div>'"`
+                            })}
                         </div>
                         
                         <!-- Descriptor -->
@@ -456,7 +609,7 @@ function createStateComparisonChart() {
     const ctx = document.getElementById('stateComparisonChart');
     if (!ctx) return;
 
-    const states = window.dashboardData.states;
+    const states = window.dashboardData.states.slice(0, TOP_STATES);
 
     charts.stateComparison = new Chart(ctx, {
         type: 'bar',
@@ -636,7 +789,7 @@ function updateStateChart() {
     const chart = charts.stateComparison;
     if (!chart) return;
 
-    const states = window.dashboardData.states;
+    const states = window.dashboardData.states.slice(0, TOP_STATES);
 
     let data, label, color;
     switch (metric) {
@@ -661,6 +814,7 @@ function updateStateChart() {
             color = '#1a73e8';
     }
 
+    chart.data.labels = states.map(s => s.state);
     chart.data.datasets[0].data = data;
     chart.data.datasets[0].label = label;
     chart.data.datasets[0].backgroundColor = color;
@@ -688,6 +842,7 @@ function downloadChart(chartId) {
 function initTables() {
     populateStateTable();
     populateCriticalTable();
+    initDistrictExplorer();
 }
 
 function populateStateTable() {
@@ -752,6 +907,205 @@ function populateCriticalTable() {
     `}).join('');
 }
 
+/* ========================================
+   District Explorer (virtualized table)
+   Renders only the rows in view; sorting walks a
+   precomputed index per column and search uses a
+   sorted prefix index, so neither re-sorts or scans
+   all rows' strings on each keystroke
+   ======================================== */
+const EXPLORER_ROW_HEIGHT = 44;   // px, fixed so scroll offset -> row is arithmetic
+const EXPLORER_OVERSCAN = 10;     // extra rows rendered above/below the viewport
+
+const EXPLORER_COLUMNS = [
+    { key: 'district', label: 'District', type: 'text' },
+    { key: 'state', label: 'State', type: 'text' },
+    { key: 'enrol', label: 'Enrolments', type: 'count' },
+    { key: 'demo', label: 'Demo Updates', type: 'count' },
+    { key: 'bio', label: 'Bio Updates', type: 'count' },
+    { key: 'total', label: 'Total Updates', type: 'count' },
+    { key: 'childGap', label: 'Child Gap', type: 'pct' },
+    { key: 'intensity', label: 'Intensity', type: 'ratio' },
+    { key: 'cluster', label: 'Cluster', type: 'count' }
+];
+
+// Text fields tokenized into the search index
+const EXPLORER_SEARCH_FIELDS = ['district', 'state'];
+
+const explorer = {
+    rows: [],
+    sortIndex: {},     // column -> { order: Uint32Array, valid: rows with a value }
+    prefixIndex: [],   // [token, rowId] sorted by token
+    view: new Uint32Array(0),
+    sortKey: 'total',
+    sortDir: -1,
+    query: '',
+    frame: null
+};
+
+function initDistrictExplorer() {
+    const viewport = document.getElementById('districtViewport');
+    if (!viewport) return;
+
+    const rows = window.dashboardData.districts || [];
+    if (rows !== explorer.rows) {
+        explorer.rows = rows;
+        explorer.sortIndex = buildSortIndex(rows, EXPLORER_COLUMNS);
+        explorer.prefixIndex = buildPrefixIndex(rows, EXPLORER_SEARCH_FIELDS);
+    }
+
+    if (!viewport.dataset.bound) {
+        viewport.dataset.bound = 'true';
+        viewport.addEventListener('scroll', () => {
+            if (explorer.frame) return;
+            explorer.frame = requestAnimationFrame(() => {
+                explorer.frame = null;
+                renderExplorerRows();
+            });
+        });
+        document.getElementById('districtSearch').addEventListener('input', e => {
+            explorer.query = e.target.value;
+            updateExplorerView();
+        });
+        document.getElementById('districtTableHead').addEventListener('click', e => {
+            const th = e.target.closest('th[data-sort]');
+            if (!th) return;
+            const key = th.dataset.sort;
+            explorer.sortDir = key === explorer.sortKey ? -explorer.sortDir : (key === 'district' || key === 'state' ? 1 : -1);
+            explorer.sortKey = key;
+            updateExplorerView();
+        });
+    }
+    updateExplorerView();
+}
+
+// One row order per column (missing values last), built once per data load
+function buildSortIndex(rows, columns) {
+    const index = {};
+    const collator = new Intl.Collator();
+    columns.forEach(col => {
+        const ids = [];
+        const missing = [];
+        rows.forEach((row, i) => (row[col.key] == null ? missing : ids).push(i));
+        const compare = col.type === 'text'
+            ? (a, b) => collator.compare(rows[a][col.key], rows[b][col.key])
+            : (a, b) => rows[a][col.key] - rows[b][col.key];
+        ids.sort(compare);
+        index[col.key] = { order: Uint32Array.from(ids.concat(missing)), valid: ids.length };
+    });
+    return index;
+}
+
+function tokenize(text) {
+    return String(text).toLowerCase().split(/[^a-z0-9]+/).filter(Boolean);
+}
+
+// Every word of every searchable field, sorted so a prefix is one contiguous range
+function buildPrefixIndex(rows, fields) {
+    const entries = [];
+    rows.forEach((row, i) => {
+        fields.forEach(field => {
+            if (row[field] == null) return;
+            new Set(tokenize(row[field])).forEach(token => entries.push([token, i]));
+        });
+    });
+    entries.sort((a, b) => (a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : a[1] - b[1]));
+    return entries;
+}
+
+// Row ids having a word that starts with `prefix` (binary search to the range start)
+function prefixMatches(index, prefix) {
+    let lo = 0;
+    let hi = index.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >>> 1;
+        if (index[mid][0] < prefix) lo = mid + 1; else hi = mid;
+    }
+    const ids = new Set();
+    for (let i = lo; i < index.length && index[i][0].startsWith(prefix); i++) {
+        ids.add(index[i][1]);
+    }
+    return ids;
+}
+
+// Rows matching every word of the query (null = no filter)
+function searchRows(index, query) {
+    const words = tokenize(query);
+    if (!words.length) return null;
+    let matches = null;
+    words.forEach(word => {
+        const ids = prefixMatches(index, word);
+        matches = matches ? new Set([...matches].filter(id => ids.has(id))) : ids;
+    });
+    return matches;
+}
+
+function updateExplorerView() {
+    const { order, valid } = explorer.sortIndex[explorer.sortKey] || { order: new Uint32Array(0), valid: 0 };
+    // Descending reverses the rows with values; missing values stay last
+    const sorted = explorer.sortDir > 0
+        ? order
+        : Uint32Array.from([...order.subarray(0, valid)].reverse().concat([...order.subarray(valid)]));
+    const matches = searchRows(explorer.prefixIndex, explorer.query);
+    explorer.view = matches ? sorted.filter(id => matches.has(id)) : sorted;
+
+    renderExplorerHead();
+    const count = document.getElementById('districtExplorerCount');
+    if (count) {
+        count.textContent = explorer.rows.length
+            ? `${explorer.view.length.toLocaleString()} of ${explorer.rows.length.toLocaleString()} districts`
+            : 'District rows load from the dashboard data bundle (serve the dashboard over HTTP)';
+    }
+    document.getElementById('districtViewport').scrollTop = 0;
+    renderExplorerRows();
+}
+
+function renderExplorerHead() {
+    const head = document.getElementById('districtTableHead');
+    if (!head) return;
+    head.innerHTML = EXPLORER_COLUMNS.map(col => {
+        const active = col.key === explorer.sortKey;
+        const icon = active ? (explorer.sortDir > 0 ? 'fa-sort-up' : 'fa-sort-down') : 'fa-sort opacity-30';
+        return `<th data-sort="${col.key}">${col.label} <i class="fas ${icon} ml-1"></i></th>`;
+    }).join('');
+}
+
+function formatExplorerCell(col, value) {
+    if (value == null) return '–';
+    switch (col.type) {
+        case 'count': return col.key === 'cluster' ? String(value) : formatNumber(value);
+        case 'pct': return `${(value * 100).toFixed(1)}%`;
+        case 'ratio': return value.toFixed(2);
+        default: return escapeHtml(value);
+    }
+}
+
+function renderExplorerRows() {
+    const viewport = document.getElementById('districtViewport');
+    const tbody = document.getElementById('districtTableBody');
+    if (!viewport || !tbody) return;
+
+    const total = explorer.view.length;
+    const visible = Math.ceil(viewport.clientHeight / EXPLORER_ROW_HEIGHT) || 20;
+    const start = Math.max(0, Math.floor(viewport.scrollTop / EXPLORER_ROW_HEIGHT) - EXPLORER_OVERSCAN);
+    const end = Math.min(total, start + visible + 2 * EXPLORER_OVERSCAN);
+
+    // Spacer rows keep the scrollbar sized for the full result set
+    const spacer = height => (height > 0 ? `<tr style="height:${height}px"><td colspan="${EXPLORER_COLUMNS.length}" class="p-0"></td></tr>` : '');
+    const rows = [];
+    for (let i = start; i < end; i++) {
+        const row = explorer.rows[explorer.view[i]];
+        rows.push(`
+        <tr style="height:${EXPLORER_ROW_HEIGHT}px" class="hover:bg-slate-50 dark:hover:bg-slate-800/50 border-b border-slate-100 dark:border-slate-800">
+            ${EXPLORER_COLUMNS.map(col => {
+                const align = col.type === 'text' ? 'font-semibold text-slate-800 dark:text-white' : 'text-right font-mono tabular-nums text-slate-600 dark:text-slate-400';
+                return `<td class="px-6 py-2 text-sm whitespace-nowrap ${align}">${formatExplorerCell(col, row[col.key])}</td>`;
+            }).join('')}
+        </tr>`);
+    }
+    tbody.innerHTML = spacer(start * EXPLORER_ROW_HEIGHT) + rows.join('') + spacer((total - end) * EXPLORER_ROW_HEIGHT);
+}
+
 /* ========================================
    Tab Navigation
    ======================================== */
@@ -779,6 +1133,35 @@ function initTabNavigation() {
 /* ========================================
    Modal Functions
    ======================================== */
+// Cards only get variants up to this width; the modal may use any of them
+const THUMB_MAX_WIDTH = 960;
+
+/**
+ * <picture> for a curated plot using the AVIF/WebP/PNG variants listed in
+ * window.plotAssets (scripts/build_image_assets.py); a plain <img> when the
+ * plot has no variants.
+ */
+function plotPicture(path, alt, { maxWidth = Infinity, sizes = '100vw', lazy = true, fullResolution = false, imgClass = '', attrs = '' } = {}) {
+    const asset = window.plotAssets && window.plotAssets[path];
+    const loading = lazy ? 'loading="lazy" decoding="async"' : 'decoding="async"';
+    if (!asset) {
+        return `<img src="${path}" alt="${alt}" class="${imgClass}" ${loading} ${attrs}>`;
+    }
+
+    const srcset = variants => {
+        const fitting = variants.filter(([, w]) => w <= maxWidth);
+        return (fitting.length ? fitting : variants.slice(0, 1)).map(([url, w]) => `${url} ${w}w`).join(', ');
+    };
+    const sources = Object.entries(asset.sources)
+        .filter(([type]) => type !== 'image/png')
+        .map(([type, variants]) => `<source type="${type}" srcset="${srcset(variants)}" sizes="${sizes}">`)
+        .join('');
+    const png = asset.sources['image/png'] || [];
+    // Fallback src: the original full-resolution file in the modal, the smallest PNG on cards
+    const fallback = fullResolution || !png.length ? path : png[0][0];
+
+    return `<picture>${sources}<img src="${fallback}" srcset="${png.length ? srcset(png) : ''}" sizes="${sizes}" alt="${alt}" width="${asset.w}" height="${asset.h}" class="${imgClass}" ${loading} ${attrs}></picture>`;
+}
 function initModals() {
     // Close modals on escape
     document.addEventListener('keydown', function (e) {
@@ -801,7 +1184,12 @@ function openImageModal(src, alt, desc = '') {
                 </button>
             </div>
             <div class="w-full bg-black/20 rounded-xl overflow-hidden shadow-2xl border border-white/10 p-2">
-                 <img src="${src}" alt="${alt}" class="w-full h-auto max-h-[70vh] object-contain mx-auto rounded-lg">
+                 ${plotPicture(src, alt, {
+                     sizes: '(min-width: 1280px) 1280px, 100vw',
+                     lazy: false,
+                     fullResolution: true,
+                     imgClass: 'w-full h-auto max-h-[70vh] object-contain mx-auto rounded-lg'
+                 })}
             </div>
             <div class="w-full text-left space-y-4 bg-slate-900/80 p-8 rounded-xl backdrop-blur-sm border border-white/10">
                 <h3 class="text-3xl font-display font-bold text-white mb-2 border-b border-white/10 pb-4">${alt}</h3>
@@ -847,6 +1235,10 @@ function closeImageModal() {
 /* ========================================
    Utility Functions
    ======================================== */
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, ch => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' })[ch]);
+}
+
 function formatNumber(num) {
     if (num >= 1e9) return (num / 1e9).toFixed(1) + 'B';
     if (num >= 1e6) return (num / 1e6).toFixed(1) + 'M';
@@ -867,39 +1259,110 @@ function animateMetrics() {
     });
 }
 
+// Local query API (scripts/api_server.py); override by setting window.UIDAI_API_BASE
+const API_BASE = window.UIDAI_API_BASE || 'http://127.0.0.1:8765';
+
+// The API serves output CSV columns as-is; map them onto dashboardData fields
+function kpiFromApi(k) {
+    return {
+        ...window.dashboardData.kpi,
+        totalEnrolments: k.total_enrolments,
+        totalDemoUpdates: k.total_demo_updates,
+        totalBioUpdates: k.total_bio_updates,
+        totalUpdates: k.total_updates,
+        updateToEnrolRatio: k.update_to_enrol_ratio,
+        avgDemoIntensity: k.avg_demo_intensity,
+        avgBioIntensity: k.avg_bio_intensity,
+        avgChildAttentionGap: k.avg_child_attention_gap,
+        statesAnalyzed: k.states_analyzed,
+        districtsAnalyzed: k.districts_analyzed,
+        matureRegionsPct: k.mature_regions_pct,
+        underservedRegionsPct: k.underserved_regions_pct
+    };
+}
+
+function stateFromApi(s) {
+    return {
+        state: s.state,
+        enrol: s.total_enrol,
+        demo: s.total_demo,
+        bio: s.total_bio,
+        total: s.total_updates,
+        childGap: s.child_attention_gap,
+        intensity: s.total_intensity
+    };
+}
+
+// 'no-cache' lets the browser revalidate with If-None-Match, so unchanged data costs a 304
+function fetchApi(path) {
+    return fetch(`${API_BASE}${path}`, { cache: 'no-cache' }).then(response => {
+        if (!response.ok) throw new Error(`${path}: HTTP ${response.status}`);
+        return response.json();
+    });
+}
+
 function refreshData() {
     // Animate refresh button
     const btn = document.querySelector('.btn-refresh i');
     btn.classList.add('fa-spin');
 
-    // Refresh charts
-    Object.values(charts).forEach(chart => {
-        if (chart && chart.update) {
-            chart.update();
-        }
-    });
-
-    setTimeout(() => {
-        btn.classList.remove('fa-spin');
-    }, 1000);
+    Promise.all([fetchApi('/kpis'), fetchApi('/states')])
+        .then(([kpi, states]) => {
+            window.dashboardData.kpi = kpiFromApi(kpi);
+            window.dashboardData.states = states.map(stateFromApi);
+            updateKpiCards();
+            rebuildChart('stateVolume', createStateVolumeChart);
+            rebuildChart('stateComparison', createStateComparisonChart);
+            updateStateChart();
+            rebuildChart('correlation', createCorrelationChart);
+            populateStateTable();
+        })
+        .catch(err => {
+            // No API running: just redraw what is loaded
+            console.info(`Query API unavailable (${err.message}); redrawing current data`);
+            Object.values(charts).forEach(chart => {
+                if (chart && chart.update) {
+                    chart.update();
+                }
+            });
+        })
+        .finally(() => btn.classList.remove('fa-spin'));
 }
 
 function exportDashboard() {
     alert('Export functionality would generate a PDF report of all visualizations and data.');
 }
 
-function exportTableCSV(tableId) {
-    const table = document.getElementById(tableId);
-    if (!table) return;
+// Table id -> rows and fields to export (from the data model, not the DOM)
+const TABLE_EXPORTS = {
+    stateDataTable: () => ({
+        rows: window.dashboardData.states,
+        fields: ['state', 'enrol', 'demo', 'bio', 'total', 'childGap', 'intensity']
+    }),
+    criticalDataTable: () => ({
+        rows: window.dashboardData.critical,
+        fields: ['rank', 'state', 'district', 'gap', 'severity', 'recommendation']
+    }),
+    // Current search results in the current sort order
+    districtDataTable: () => ({
+        rows: Array.from(explorer.view, id => explorer.rows[id]),
+        fields: EXPLORER_COLUMNS.map(col => col.key)
+    })
+};
+
+function csvField(value) {
+    if (value == null) return '';
+    const text = String(value);
+    return /[",\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
 
-    let csv = [];
-    const rows = table.querySelectorAll('tr');
+function exportTableCSV(tableId) {
+    const source = TABLE_EXPORTS[tableId];
+    if (!source) return;
 
-    rows.forEach(row => {
-        const cols = row.querySelectorAll('td, th');
-        const rowData = Array.from(cols).map(col => col.textContent.trim());
-        csv.push(rowData.join(','));
-    });
+    const { rows, fields } = source();
+    const csv = [fields.join(',')];
+    rows.forEach(row => csv.push(fields.map(field => csvField(row[field])).join(',')));
 
     const csvContent = csv.join('\n');
     const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
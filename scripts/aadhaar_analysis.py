@@ -1,5 +1,6 @@
 
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -16,6 +17,12 @@ DIRS = {
 }
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "aadhaar_plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from schema_registry import read_dataset_csv, concat_frames, infer_dataset
+from calendar_utils import parse_dates
+from data_utils import deduplicate_data
+
 def load_data(directory, dataset_name):
     """Loads all CSV files from a directory into a single DataFrame."""
     print(f"Loading {dataset_name} data from {directory}...")
@@ -28,7 +35,7 @@ def load_data(directory, dataset_name):
     df_list = []
     for filename in all_files:
         try:
-            df = pd.read_csv(filename)
+            df = read_dataset_csv(filename, infer_dataset(directory))
             df_list.append(df)
         except Exception as e:
             print(f"Error reading {filename}: {e}")
@@ -36,12 +43,17 @@ def load_data(directory, dataset_name):
     if not df_list:
         return pd.DataFrame()
         
-    full_df = pd.concat(df_list, ignore_index=True)
+    full_df = concat_frames(df_list)
     print(f"Loaded {len(full_df)} rows for {dataset_name}.")
     return full_df
 
 def preprocess_data(df):
-    """Standardizes dates and state names with comprehensive cleaning."""
+    """
+    Standardizes dates and state names with comprehensive cleaning.
+
+    Duplicates repeated across shards or runs are the job of the
+    dedup stage (scripts/utils/dedup_index.py), not this in-memory pass.
+    """
     if df.empty:
         return df
     
@@ -49,7 +61,7 @@ def preprocess_data(df):
         
     # parse dates
     if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+        df['date'] = parse_dates(df['date'])
         df = df[df['date'].notna()]  # Remove invalid dates
         
     # clean state names - comprehensive mapping
@@ -94,14 +106,8 @@ def preprocess_data(df):
     if 'district' in df.columns:
         df['district'] = df['district'].astype(str).str.strip().str.title()
     
-    # Deduplicate
-    dup_cols = ['date', 'state', 'district']
-    if 'pincode' in df.columns:
-        dup_cols.append('pincode')
-    dup_cols = [c for c in dup_cols if c in df.columns]
-    before_dedup = len(df)
-    df = df.drop_duplicates(subset=dup_cols, keep='first')
-    dup_count = before_dedup - len(df)
+    # Deduplicate on date-state-district-pincode
+    df, dup_count = deduplicate_data(df)
     
     removed = initial_len - len(df)
     if removed > 0:
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Local Query API
+Serve the integrated analysis outputs as JSON over HTTP.
+
+This module provides:
+- GET /kpis, /states, /states/{state}/districts, /anomalies, /forecast
+- OutputStore: CSV outputs loaded once and reloaded when the file changes
+- ResponseCache: in-process LRU of rendered (JSON + gzip) responses
+- ETag / If-None-Match (304) and gzip Content-Encoding
+
+Standard library only (http.server). Responses are keyed by the request and
+the modification stamps of the CSVs behind them, so re-running the pipeline
+invalidates exactly the affected entries. /anomalies and /forecast read the
+files written by `uidai anomalies` and forecast_analysis.py.
+
+Usage:
+    python scripts/api_server.py                 # http://127.0.0.1:8765
+    curl --compressed http://127.0.0.1:8765/states/Bihar/districts
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+OUTPUTS_DIR = os.path.join(BASE_DIR, "outputs")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 256
+
+# Responses smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 512
+
+# Output files behind each dataset, relative to the outputs directory
+SOURCES = {
+    'kpis': ("integrated_analysis/kpis.csv", "integrated_analysis.py"),
+    'states': ("integrated_analysis/state_summary.csv", "integrated_analysis.py"),
+    'districts': ("integrated_analysis/district_clusters.csv", "integrated_analysis.py"),
+    'anomalies': ("anomalies_detected.csv", "uidai anomalies"),
+    'forecast': ("forecast_plots/declining_districts.csv", "forecast_analysis.py"),
+}
+
+
+class ApiError(Exception):
+    """Error returned to the client as {"error": message} with an HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================================================
+# DATA
+# ============================================================================
+class OutputStore:
+    """CSV outputs read on first use and re-read when their mtime or size changes."""
+
+    def __init__(self, outputs_dir=OUTPUTS_DIR):
+        self.outputs_dir = outputs_dir
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.outputs_dir, SOURCES[name][0])
+
+    def stamp(self, name):
+        """(mtime_ns, size) of a source file; raises ApiError 503 if it is missing."""
+        try:
+            st = os.stat(self.path(name))
+        except FileNotFoundError:
+            raise ApiError(503, f"{SOURCES[name][0]} not found - run {SOURCES[name][1]} first")
+        return st.st_mtime_ns, st.st_size
+
+    def frame(self, name):
+        stamp = self.stamp(name)
+        with self._lock:
+            cached = self._frames.get(name)
+            if cached is None or cached[0] != stamp:
+                cached = (stamp, pd.read_csv(self.path(name)))
+                self._frames[name] = cached
+        return cached[1]
+
+
+def records(df):
+    """JSON-ready list of row dicts (NaN/inf -> None, numpy scalars unboxed)."""
+    df = df.replace([np.inf, -np.inf], np.nan).astype(object)
+    return df.where(df.notna(), None).to_dict('records')
+
+
+def _top(query, default=20):
+    try:
+        top = int(query.get('top', [default])[0])
+    except ValueError:
+        raise ApiError(400, "top must be an integer")
+    if top < 1:
+        raise ApiError(400, "top must be positive")
+    return top
+
+
+# ============================================================================
+# ROUTES
+# ============================================================================
+def get_kpis(store, query):
+    return records(store.frame('kpis'))[0]
+
+
+def get_states(store, query):
+    return records(store.frame('states').sort_values('total_enrol', ascending=False))
+
+
+def get_state_districts(store, query, state):
+    districts = store.frame('districts')
+    match = districts[districts['state'].str.casefold() == state.casefold()]
+    if match.empty:
+        raise ApiError(404, f"unknown state: {state}")
+    return records(match.sort_values('total_enrol', ascending=False))
+
+
+def get_anomalies(store, query):
+    return records(store.frame('anomalies').nlargest(_top(query), 'anomaly_score'))
+
+
+def get_forecast(store, query):
+    return records(store.frame('forecast').nsmallest(_top(query), 'relative_slope'))
+
+
+# (path pattern, handler, datasets the response depends on)
+ROUTES = [
+    (re.compile(r"^/kpis$"), get_kpis, ['kpis']),
+    (re.compile(r"^/states$"), get_states, ['states']),
+    (re.compile(r"^/states/(?P<state>[^/]+)/districts$"), get_state_districts, ['districts']),
+    (re.compile(r"^/anomalies$"), get_anomalies, ['anomalies']),
+    (re.compile(r"^/forecast$"), get_forecast, ['forecast']),
+]
+
+
+def resolve(path):
+    """Route for a request path: (handler, path params, datasets)."""
+    for pattern, handler, datasets in ROUTES:
+        m = pattern.match(path)
+        if m:
+            return handler, {k: unquote(v) for k, v in m.groupdict().items()}, datasets
+    raise ApiError(404, f"no route for {path}")
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+class Rendered:
+    """A rendered response body in both encodings, with its ETag."""
+
+    __slots__ = ('body', 'gzipped', 'etag')
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        self.gzipped = gzip.compress(self.body, compresslevel=6) if len(self.body) >= GZIP_MIN_BYTES else None
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:20] + '"'
+
+
+class ResponseCache:
+    """Thread-safe LRU of Rendered responses."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def render(store, cache, path, query):
+    """
+    Rendered response for a request, from the cache when its sources are unchanged.
+
+    Returns:
+        (Rendered, hit)
+    """
+    handler, params, datasets = resolve(path)
+    key = (path, tuple(sorted((k, tuple(v)) for k, v in query.items())),
+           tuple(store.stamp(name) for name in datasets))
+    entry = cache.get(key)
+    if entry is not None:
+        return entry, True
+    entry = Rendered(handler(store, query, **params))
+    cache.put(key, entry)
+    return entry, False
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "UIDAI-API/1.0"
+    store = None
+    cache = None
+    quiet = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            entry, hit = render(self.store, self.cache, url.path.rstrip('/') or '/', parse_qs(url.query))
+        except ApiError as e:
+            return self._send_error(e.status, str(e))
+        except Exception as e:
+            return self._send_error(500, f"{type(e).__name__}: {e}")
+
+        if entry.etag in self._header_values('If-None-Match'):
+            self.send_response(304)
+            self._common_headers(entry, hit)
+            self.end_headers()
+            return
+
+        body = entry.body
+        use_gzip = entry.gzipped is not None and 'gzip' in self._header_values('Accept-Encoding')
+        if use_gzip:
+            body = entry.gzipped
+        self.send_response(200)
+        self._common_headers(entry, hit)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _header_values(self, name):
+        return {v.strip() for v in self.headers.get(name, '').split(',') if v.strip()}
+
+    def _common_headers(self, entry, hit):
+        self.send_header('ETag', entry.etag)
+        # Clients may keep responses but must revalidate (cheap 304s)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Expose-Headers', 'ETag, X-Cache')
+        self.send_header('X-Cache', 'HIT' if hit else 'MISS')
+
+    def _send_error(self, status, message):
+        body = json.dumps({'error': message}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, outputs_dir=OUTPUTS_DIR,
+                cache_size=DEFAULT_CACHE_SIZE, quiet=False):
+    """
+    Build (but do not start) the API server.
+
+    Args:
+        host, port: Bind address (port 0 picks a free port)
+        outputs_dir: Directory holding the pipeline outputs
+        cache_size: Rendered responses kept in the LRU
+        quiet: Suppress per-request logging
+
+    Returns:
+        ThreadingHTTPServer; call serve_forever() / shutdown()
+    """
+    handler = type('BoundApiHandler', (ApiHandler,), {
+        'store': OutputStore(outputs_dir),
+        'cache': ResponseCache(cache_size),
+        'quiet': quiet,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve UIDAI analysis outputs as a JSON API")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('--outputs', default=OUTPUTS_DIR, help="Outputs directory")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f"Rendered responses kept in memory (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument('--quiet', action='store_true', help="No per-request log lines")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.outputs, args.cache_size, args.quiet)
+    host, port = server.server_address[:2]
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - LOCAL QUERY API")
+    print("="*70)
+    print(f"🌐 Serving {args.outputs} on http://{host}:{port}")
+    for pattern, _, _ in ROUTES:
+        print(f"   GET {pattern.pattern.strip('^$').replace('(?P<state>[^/]+)', '{state}')}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,93 +1,34 @@
-import pandas as pd
-import glob
+"""
+Headline audit of the raw datasets (totals, shares, geography, date range).
+
+Reads the merged shard profiles from utils/shard_profiler.py; shards that
+have not changed since the last profile are not re-read.
+"""
+
 import os
+import sys
+
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
+from shard_profiler import profile_datasets, merge_profiles, distinct_pincodes
+
+
+def audit_data(merged=None):
+    if merged is None:
+        merged, _ = profile_datasets()
+    for name in ('biometric', 'demographic', 'enrolment'):
+        shards = merged[name]['shards'] if name in merged else 0
+        print(f"Found {shards} {name} files")
 
-DATA_DIR = 'data'
-
-def audit_data():
-    biometric_files = glob.glob(os.path.join(DATA_DIR, 'api_data_aadhar_biometric', '*.csv'))
-    demographic_files = glob.glob(os.path.join(DATA_DIR, 'api_data_aadhar_demographic', '*.csv'))
-    enrolment_files = glob.glob(os.path.join(DATA_DIR, 'api_data_aadhar_enrolment', '*.csv'))
-
-    print(f"Found {len(biometric_files)} biometric files")
-    print(f"Found {len(demographic_files)} demographic files")
-    print(f"Found {len(enrolment_files)} enrolment files")
-
-    # Counters
-    total_biometric = 0
-    total_demographic = 0
-    total_enrolment = 0
-    
-    total_demo_minor = 0 # demo_age_5_17
-    
-    unique_states = set()
-    unique_districts = set()
-    unique_pincodes = set()
-    
-    min_date = None
-    max_date = None
-
-    # Biometric Processing
-    print("\nProcessing Biometric Data...")
-    for f in biometric_files:
-        try:
-            df = pd.read_csv(f)
-            # Columns: date,state,district,pincode,bio_age_5_17,bio_age_17_
-            total_biometric += df['bio_age_5_17'].sum() + df['bio_age_17_'].sum()
-            
-            unique_states.update(df['state'].unique())
-            unique_districts.update(df['district'].unique())
-            unique_pincodes.update(df['pincode'].unique())
-            
-            dates = pd.to_datetime(df['date'], dayfirst=True)
-            if min_date is None or dates.min() < min_date:
-                min_date = dates.min()
-            if max_date is None or dates.max() > max_date:
-                max_date = dates.max()
-        except Exception as e:
-            print(f"Error processing {f}: {e}")
-
-    # Demographic Processing
-    print("Processing Demographic Data...")
-    for f in demographic_files:
-        try:
-            df = pd.read_csv(f)
-            # Columns: date,state,district,pincode,demo_age_5_17,demo_age_17_
-            batch_demo_minor = df['demo_age_5_17'].sum()
-            total_demo_minor += batch_demo_minor
-            total_demographic += batch_demo_minor + df['demo_age_17_'].sum()
-            
-            unique_states.update(df['state'].unique())
-            unique_districts.update(df['district'].unique())
-            unique_pincodes.update(df['pincode'].unique())
-            
-            dates = pd.to_datetime(df['date'], dayfirst=True)
-            if min_date is None or dates.min() < min_date:
-                min_date = dates.min()
-            if max_date is None or dates.max() > max_date:
-                max_date = dates.max()
-        except Exception as e:
-            print(f"Error processing {f}: {e}")
-
-    # Enrolment Processing
-    print("Processing Enrolment Data...")
-    for f in enrolment_files:
-        try:
-            df = pd.read_csv(f)
-            # Columns: date,state,district,pincode,age_0_5,age_5_17,age_18_greater
-            total_enrolment += df['age_0_5'].sum() + df['age_5_17'].sum() + df['age_18_greater'].sum()
-            
-            unique_states.update(df['state'].unique())
-            unique_districts.update(df['district'].unique())
-            unique_pincodes.update(df['pincode'].unique())
-            
-            dates = pd.to_datetime(df['date'], dayfirst=True)
-            if min_date is None or dates.min() < min_date:
-                min_date = dates.min()
-            if max_date is None or dates.max() > max_date:
-                max_date = dates.max()
-        except Exception as e:
-            print(f"Error processing {f}: {e}")
+    def total(name):
+        return sum(merged[name]['totals'].values()) if name in merged else 0
+
+    total_biometric = total('biometric')
+    total_demographic = total('demographic')
+    total_enrolment = total('enrolment')
+    total_demo_minor = merged['demographic']['totals'].get('demo_age_5_17', 0) if 'demographic' in merged else 0
+
+    everything = merge_profiles(merged.values())
 
     print("\n--- AUDIT RESULTS ---")
     print(f"Total Biometric Transactions: {total_biometric:,}")
@@ -98,7 +39,7 @@ def audit_data():
     # Ratios
     biometric_share = total_biometric / (total_biometric + total_demographic + total_enrolment) * 100
     demographic_share = total_demographic / (total_biometric + total_demographic + total_enrolment) * 100
-    
+
     print(f"\nBiometric Share of Total: {biometric_share:.2f}% (Report claims 85%)")
     print(f"Demographic Share of Total: {demographic_share:.2f}%")
 
@@ -110,14 +51,14 @@ def audit_data():
     else:
         print("No demographic data found.")
 
-    print(f"\nUnique States Count: {len(unique_states)}")
-    print(f"Unique Districts Count: {len(unique_districts)}")
-    print(f"Unique Pincodes Count: {len(unique_pincodes)}")
-    
-    print(f"\nDate Range: {min_date} to {max_date}")
-    
+    print(f"\nUnique States Count: {len(everything['states'])}")
+    print(f"Unique Districts Count: {len(everything['districts'])}")
+    print(f"Unique Pincodes Count: {distinct_pincodes(everything)}")
+
+    print(f"\nDate Range: {everything['dates']['min']} to {everything['dates']['max']}")
+
     print("\nStates Found:")
-    for s in sorted(list(unique_states)):
+    for s in sorted(everything['states']):
         print(f" - {s}")
 
 if __name__ == "__main__":
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Benchmark Suite
+Time and memory-profile the pipeline on synthetic data at 1M/10M/100M rows.
+
+This module provides:
+- Synthetic raw shards with the real schemas (see utils/synthetic_data.py),
+  generated once per scale and reused
+- A profiled integrated_analysis run (LOAD ... PLOT, EXPORT phases)
+- Profiled `uidai` commands run against the synthetic integrated dataset
+- Results saved per commit under outputs/benchmarks/results for comparison
+
+Usage:
+    python scripts/benchmark.py                    # 1M rows
+    python scripts/benchmark.py --scale 10M        # 10M rows
+    python scripts/benchmark.py --compare          # diff against the last run at this scale
+    python scripts/benchmark.py --commands dashboard analyze
+"""
+
+import os
+import sys
+import json
+import glob
+import argparse
+import platform
+import subprocess
+import traceback
+from datetime import datetime
+from functools import partial
+
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+BENCHMARK_DIR = os.path.join(BASE_DIR, "outputs", "benchmarks")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+sys.path.insert(0, SCRIPT_DIR)
+import profiler as profiler_module
+from profiler import PhaseProfiler, compare_profiles
+from synthetic_data import SCALES, DEFAULT_SHARD_ROWS, write_datasets
+
+DEFAULT_COMMANDS = ['dashboard', 'analyze', 'anomalies', 'forecast']
+
+# Raw dataset directory attributes in integrated_analysis
+DATA_DIR_ATTRS = {
+    'ENROL_DIR': 'api_data_aadhar_enrolment',
+    'DEMO_DIR': 'api_data_aadhar_demographic',
+    'BIO_DIR': 'api_data_aadhar_biometric',
+}
+
+
+def git_revision():
+    """Short commit hash of the working tree (suffixed with + if dirty)."""
+    try:
+        rev = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BASE_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return rev + ('+' if dirty else '')
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+def bench_pipeline(data_dir, run_dir, low_memory=False, trace_allocations=False):
+    """
+    Profile integrated_analysis.main() on the synthetic raw data.
+
+    Args:
+        data_dir: Root of the synthetic api_data_aadhar_* directories
+        run_dir: Scratch directory for outputs and the geography dimension
+        low_memory: Run in ownership-aware mode
+        trace_allocations: Record tracemalloc top allocations (inflates timings)
+
+    Returns:
+        Profile dict (with 'error' if the run failed)
+    """
+    import integrated_analysis as ia
+
+    for attr, directory in DATA_DIR_ATTRS.items():
+        setattr(ia, attr, os.path.join(data_dir, directory))
+    ia.OUTPUT_DIR = os.path.join(run_dir, "integrated_analysis")
+    ia.PLOTS_DIR = os.path.join(ia.OUTPUT_DIR, "plots")
+    ia.PARTITIONS_DIR = os.path.join(ia.OUTPUT_DIR, "partitions")
+    ia.GEO_DIMENSION_FILE = os.path.join(run_dir, "geo_dimension.csv")
+    if os.path.exists(ia.GEO_DIMENSION_FILE):
+        os.remove(ia.GEO_DIMENSION_FILE)  # time a cold key assignment every run
+
+    profiler = PhaseProfiler('integrated_analysis', trace_allocations=trace_allocations)
+    result = {}
+    try:
+        ia.main(low_memory=low_memory, profiler=profiler)
+    except Exception:
+        result['error'] = traceback.format_exc(limit=3)
+    result.update(profiler.to_dict())
+    return result
+
+
+def bench_commands(commands, data_file, run_dir, trace_allocations=False):
+    """
+    Profile `uidai` commands (in-process, with --profile) on the synthetic integrated data.
+
+    Args:
+        commands: Command names
+        data_file: integrated_data.csv produced by bench_pipeline()
+        run_dir: Scratch directory for command outputs
+        trace_allocations: Record tracemalloc top allocations (inflates timings)
+
+    Returns:
+        Dict of command -> profile dict (or {'skipped': reason} / {'error': ...})
+    """
+    try:
+        from typer.testing import CliRunner
+        import uidai
+    except ImportError as e:
+        print(f"  ⚠️ Skipping CLI benchmarks ({e})")
+        return {cmd: {'skipped': str(e)} for cmd in commands}
+
+    uidai.DATA_FILE = data_file
+    uidai.PARTITIONS_DIR = os.path.join(os.path.dirname(data_file), "partitions")
+    uidai.PhaseProfiler = partial(PhaseProfiler, trace_allocations=trace_allocations)
+    uidai.OUTPUTS_DIR = os.path.join(run_dir, "cli")
+    runner = CliRunner()
+    results = {}
+    for cmd in commands:
+        print(f"  ▶ uidai {cmd}")
+        invocation = runner.invoke(uidai.app, ['--profile', cmd])
+        if invocation.exit_code != 0:
+            results[cmd] = {'error': repr(invocation.exception) if invocation.exception
+                            else invocation.output[-2000:]}
+        else:
+            results[cmd] = uidai.PROFILER.to_dict()
+    return results
+
+
+def run_benchmark(scale='1M', rows=None, shard_rows=DEFAULT_SHARD_ROWS, seed=42,
+                  commands=None, low_memory=False, trace_allocations=False, work_dir=None):
+    """
+    Generate (or reuse) synthetic data and profile the pipeline and CLI on it.
+
+    Args:
+        scale: Key of SCALES (ignored when rows is given)
+        rows: Explicit total row count
+        shard_rows: Rows per synthetic CSV shard
+        seed: Random seed for the generator
+        commands: uidai commands to profile (default: DEFAULT_COMMANDS; [] to skip)
+        low_memory: Profile integrated_analysis in ownership-aware mode
+        trace_allocations: Also record tracemalloc top allocations per phase
+        work_dir: Where synthetic data and scratch outputs live
+
+    Returns:
+        Result dict (see save_result)
+    """
+    rows = rows or SCALES[scale]
+    label = scale if rows == SCALES.get(scale) else f"{rows:,}".replace(',', '_')
+    work_dir = work_dir or os.path.join(BENCHMARK_DIR, label)
+    data_dir = os.path.join(work_dir, "data")
+    run_dir = os.path.join(work_dir, "run")
+    os.makedirs(run_dir, exist_ok=True)
+    # uidai --profile saves a report per command; keep them with the run
+    profiler_module.PROFILE_DIR = os.path.join(run_dir, "profiles")
+
+    print("\n" + "="*70)
+    print(f"SYNTHETIC DATA: {rows:,} rows")
+    print("="*70)
+    manifest = write_datasets(data_dir, rows, shard_rows=shard_rows, seed=seed)
+
+    print("\n" + "="*70)
+    print("BENCHMARK: integrated_analysis")
+    print("="*70)
+    pipeline = bench_pipeline(data_dir, run_dir, low_memory=low_memory,
+                              trace_allocations=trace_allocations)
+
+    print("\n" + "="*70)
+    print("BENCHMARK: uidai commands")
+    print("="*70)
+    data_file = os.path.join(run_dir, "integrated_analysis", "integrated_data.csv")
+    commands = DEFAULT_COMMANDS if commands is None else commands
+    if 'error' in pipeline or not os.path.exists(data_file):
+        cli = {cmd: {'skipped': 'integrated_analysis failed'} for cmd in commands}
+    else:
+        cli = bench_commands(commands, data_file, run_dir, trace_allocations=trace_allocations)
+
+    return {
+        'scale': label,
+        'rows': rows,
+        'commit': git_revision(),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'cpus': os.cpu_count(),
+        'low_memory': low_memory,
+        'trace_allocations': trace_allocations,
+        'synthetic': manifest,
+        'pipeline': pipeline,
+        'commands': cli,
+    }
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+def save_result(result, results_dir=RESULTS_DIR):
+    """Write a result as <scale>_<created>_<commit>.json."""
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = result['created'].replace(':', '').replace('-', '')
+    name = f"{result['scale']}_{stamp}_{result['commit'].replace('+', '-dirty')}.json"
+    path = os.path.join(results_dir, name)
+    with open(path, 'w') as fp:
+        json.dump(result, fp, indent=2)
+    return path
+
+
+def previous_result(scale, exclude=None, results_dir=RESULTS_DIR):
+    """Most recent saved result for a scale (other than `exclude`), or None."""
+    paths = [p for p in sorted(glob.glob(os.path.join(results_dir, f"{scale}_*.json"))) if p != exclude]
+    return paths[-1] if paths else None
+
+
+def print_summary(result):
+    """Per-phase and per-command wall time and peak RSS."""
+    print("\n" + "="*70)
+    print(f"BENCHMARK RESULTS: {result['scale']} rows @ {result['commit']}")
+    print("="*70)
+    print(f"   {'Phase':<22} {'Wall s':>8} {'CPU s':>8} {'Peak RSS MB':>12}")
+    sections = [('', result['pipeline'])] + [(f"uidai {c} ", p) for c, p in result['commands'].items()]
+    for prefix, profile in sections:
+        if 'error' in profile:
+            print(f"   {prefix or 'integrated_analysis '}❌ {profile['error'].strip().splitlines()[-1]}")
+        elif 'skipped' in profile:
+            print(f"   {prefix}skipped ({profile['skipped']})")
+        for phase in profile.get('phases', []):
+            if phase['depth'] == 0:
+                label = prefix.strip() or phase['phase']
+                print(f"   {label:<22} {phase['wall_seconds']:>8.2f} {phase['cpu_seconds']:>8.2f} "
+                      f"{phase['peak_rss_mb'] or 0:>12,.1f}")
+
+
+def print_comparison(old_path, result):
+    """Per-phase wall-time changes against an earlier result file."""
+    with open(old_path) as fp:
+        old = json.load(fp)
+    print(f"\n📊 Compared with {os.path.basename(old_path)} ({old['commit']})")
+    print(f"   {'Phase':<22} {'Old s':>8} {'New s':>8} {'Change':>8}")
+    pairs = [('', old['pipeline'], result['pipeline'])]
+    pairs += [(f"uidai {c}/", old['commands'].get(c, {}), p) for c, p in result['commands'].items()]
+    for prefix, before, after in pairs:
+        if 'phases' not in before or 'phases' not in after:
+            continue
+        for row in compare_profiles(before, after):
+            change = row['wall_change_pct']
+            flag = " ⚠️" if change is not None and change > 20 else ""
+            change = f"{change:+.1f}%" if change is not None else '-'
+            print(f"   {prefix + row['phase']:<22} {row['wall_old']:>8.2f} {row['wall_new']:>8.2f} "
+                  f"{change:>8}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the UIDAI pipeline on synthetic data")
+    parser.add_argument('--scale', default='1M', choices=list(SCALES), help="Synthetic data size")
+    parser.add_argument('--rows', type=int, default=None, help="Explicit total row count (overrides --scale)")
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS, help="Rows per CSV shard")
+    parser.add_argument('--seed', type=int, default=42, help="Generator seed")
+    parser.add_argument('--commands', nargs='*', default=None,
+                        help=f"uidai commands to profile (default: {' '.join(DEFAULT_COMMANDS)})")
+    parser.add_argument('--low-memory', action='store_true', help="Run integrated_analysis in low-memory mode")
+    parser.add_argument('--trace-allocations', action='store_true',
+                        help="Record tracemalloc top allocations per phase (slower; timings not comparable)")
+    parser.add_argument('--compare', nargs='?', const='latest', default=None,
+                        help="Compare with a result file (default: previous run at this scale)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - BENCHMARKS")
+    print("="*70)
+
+    result = run_benchmark(scale=args.scale, rows=args.rows, shard_rows=args.shard_rows, seed=args.seed,
+                           commands=args.commands, low_memory=args.low_memory,
+                           trace_allocations=args.trace_allocations)
+    path = save_result(result)
+    print_summary(result)
+    print(f"\n📁 Result saved: {path}")
+
+    if args.compare:
+        old = previous_result(result['scale'], exclude=path) if args.compare == 'latest' else args.compare
+        if old:
+            print_comparison(old, result)
+        else:
+            print("\n⚠️ No earlier result to compare with")
+    return 1 if 'error' in result['pipeline'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ Author: UIDAI Hackathon Team
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -25,6 +26,15 @@ DATA_DIR = os.path.join(BASE_DIR, "data", "api_data_aadhar_biometric")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "biometric_analysis")
 PLOTS_DIR = os.path.join(OUTPUT_DIR, "plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from metrics_kernel import compute_metrics
+from memory_utils import ensure_owned
+from schema_registry import read_dataset_csv, concat_frames
+from calendar_utils import add_calendar_features
+from plot_registry import PlotRegistry
+from distinct_sketch import count_distinct
+
 # State name normalization
 STATE_FIX = {
     "Orissa": "Odisha",
@@ -50,31 +60,27 @@ def load_biometric_data():
     dfs = []
     
     for f in files:
-        df = pd.read_csv(f)
+        df = read_dataset_csv(f, 'biometric')
         print(f"  ✓ Loaded {os.path.basename(f)}: {len(df):,} rows")
         dfs.append(df)
     
-    data = pd.concat(dfs, ignore_index=True)
+    data = concat_frames(dfs)
     print(f"\n  📊 Total records: {len(data):,}")
     return data
 
-def preprocess_data(df):
-    """Clean and prepare data."""
+def preprocess_data(df, inplace=False):
+    """Clean and prepare data (inplace=True: caller hands over df, no copy)."""
     print("\n" + "="*60)
     print("PHASE 2: DATA PREPROCESSING")
     print("="*60)
     
-    df = df.copy()
+    df = ensure_owned(df, inplace)
     
-    # Parse dates
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    df['month_name'] = df['date'].dt.month_name()
-    df['day'] = df['date'].dt.day
-    df['day_of_week'] = df['date'].dt.day_name()
-    df['week_of_year'] = df['date'].dt.isocalendar().week
-    df['is_weekend'] = df['day_of_week'].isin(['Saturday', 'Sunday'])
+    # Parse each distinct date once and derive calendar columns per date
+    add_calendar_features(df, features={
+        'year': 'year', 'month': 'month', 'month_name': 'month_name', 'day': 'day',
+        'week': 'week_of_year', 'day_of_week': 'day_of_week', 'is_weekend': 'is_weekend',
+    })
     
     # Standardize state names
     df['state'] = df['state'].astype(str).str.strip().str.title()
@@ -93,33 +99,22 @@ def preprocess_data(df):
 # ============================================================================
 # FEATURE ENGINEERING
 # ============================================================================
-def engineer_features(df):
+def engineer_features(df, inplace=False):
     """Create analysis features."""
     print("\n" + "="*60)
     print("PHASE 3: FEATURE ENGINEERING")
     print("="*60)
     
-    df = df.copy()
+    df = ensure_owned(df, inplace)
     
-    # Total biometric updates
-    df['total_bio'] = df['bio_age_5_17'] + df['bio_age_17_']
-    
-    # Age-group ratios (KEY METRICS)
-    df['minor_share'] = np.where(
-        df['total_bio'] > 0,
-        df['bio_age_5_17'] / df['total_bio'],
-        0
-    )
-    df['adult_share'] = np.where(
-        df['total_bio'] > 0,
-        df['bio_age_17_'] / df['total_bio'],
-        0
-    )
-    df['minor_to_adult_ratio'] = np.where(
-        df['bio_age_17_'] > 0,
-        df['bio_age_5_17'] / df['bio_age_17_'],
-        0
-    )
+    # Total biometric updates and age-group ratios (KEY METRICS, shared registry)
+    compute_metrics(df, [
+        'total_bio', 'bio_minor_share', 'bio_adult_share', 'bio_minor_to_adult_ratio',
+    ], aliases={
+        'bio_minor_share': 'minor_share',
+        'bio_adult_share': 'adult_share',
+        'bio_minor_to_adult_ratio': 'minor_to_adult_ratio',
+    })
     
     print(f"  ✓ Created age-group metrics: minor_share, adult_share, ratio")
     return df
@@ -128,14 +123,15 @@ def aggregate_levels(df):
     """Create aggregations at different levels."""
     
     # District-Date level
-    district_date = df.groupby(['date', 'year', 'month', 'day_of_week', 'is_weekend', 
-                                 'state', 'district']).agg({
+    district_keys = ['date', 'year', 'month', 'day_of_week', 'is_weekend', 'state', 'district']
+    district_date = df.groupby(district_keys).agg({
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum',
-        'total_bio': 'sum',
-        'pincode': 'nunique'
-    }).reset_index()
-    district_date.rename(columns={'pincode': 'active_pincodes'}, inplace=True)
+        'total_bio': 'sum'
+    })
+    # Distinct counts via mergeable sketches (exact below the sketch threshold)
+    district_date['active_pincodes'] = count_distinct(df, district_keys, 'pincode')
+    district_date = district_date.reset_index()
     
     # Recalculate ratios
     district_date['minor_share'] = np.where(
@@ -145,14 +141,15 @@ def aggregate_levels(df):
     )
     
     # State-Month level
-    state_month = df.groupby(['year', 'month', 'state']).agg({
+    state_keys = ['year', 'month', 'state']
+    state_month = df.groupby(state_keys).agg({
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum',
-        'total_bio': 'sum',
-        'district': 'nunique',
-        'pincode': 'nunique'
-    }).reset_index()
-    state_month.rename(columns={'district': 'active_districts', 'pincode': 'active_pincodes'}, inplace=True)
+        'total_bio': 'sum'
+    })
+    state_month['active_districts'] = count_distinct(df, state_keys, 'district')
+    state_month['active_pincodes'] = count_distinct(df, state_keys, 'pincode')
+    state_month = state_month.reset_index()
     state_month['minor_share'] = np.where(
         state_month['total_bio'] > 0,
         state_month['bio_age_5_17'] / state_month['total_bio'],
@@ -769,8 +766,8 @@ def main():
     
     # Load and preprocess
     df = load_biometric_data()
-    df = preprocess_data(df)
-    df = engineer_features(df)
+    df = preprocess_data(df, inplace=True)
+    df = engineer_features(df, inplace=True)
     
     # Aggregate
     print("\n" + "="*60)
@@ -797,16 +794,16 @@ def main():
     print("\n" + "="*60)
     print("PHASE 5: GENERATING VISUALIZATIONS")
     print("="*60)
-    setup_plots()
-    
-    plot_national_timeseries(national_date, PLOTS_DIR)
-    plot_state_heatmaps(state_month, PLOTS_DIR)
-    plot_age_group_analysis(age_results['state_minor_share'], age_results['district_minor_share'], PLOTS_DIR)
-    plot_temporal_patterns(national_date, temporal_results['dow_pattern'], PLOTS_DIR)
-    plot_concentration(concentration, PLOTS_DIR)
-    plot_clusters(cluster_data, cluster_summary, PLOTS_DIR)
-    plot_top_districts(age_results['district_minor_share'], PLOTS_DIR)
-    plot_volatility(volatility, PLOTS_DIR)
+    plots = PlotRegistry(PLOTS_DIR, setup=setup_plots)
+    plots.add(plot_national_timeseries, national_date, PLOTS_DIR, outputs='01_national_timeseries.png')
+    plots.add(plot_state_heatmaps, state_month, PLOTS_DIR, outputs='02_state_heatmaps.png')
+    plots.add(plot_age_group_analysis, age_results['state_minor_share'], age_results['district_minor_share'], PLOTS_DIR, outputs='03_age_group_analysis.png')
+    plots.add(plot_temporal_patterns, national_date, temporal_results['dow_pattern'], PLOTS_DIR, outputs='04_temporal_patterns.png')
+    plots.add(plot_concentration, concentration, PLOTS_DIR, outputs='05_concentration.png')
+    plots.add(plot_clusters, cluster_data, cluster_summary, PLOTS_DIR, outputs='06_clusters.png')
+    plots.add(plot_top_districts, age_results['district_minor_share'], PLOTS_DIR, outputs='07_top_districts.png')
+    plots.add(plot_volatility, volatility, PLOTS_DIR, outputs='08_volatility.png')
+    plots.render()
     
     # Insights
     print("\n" + "="*60)
@@ -14,6 +14,7 @@ Author: UIDAI Hackathon Team - Enhanced Edition
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -33,6 +34,11 @@ DATA_DIR = os.path.join(BASE_DIR, "data", "api_data_aadhar_biometric")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "biometric_analysis")
 PLOTS_DIR = os.path.join(OUTPUT_DIR, "plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from schema_registry import read_dataset_csv, concat_frames
+from calendar_utils import add_calendar_features
+
 # State name normalization
 STATE_FIX = {
     "Orissa": "Odisha",
@@ -59,19 +65,14 @@ def load_and_prepare_data():
     dfs = []
     
     for f in files:
-        df = pd.read_csv(f)
+        df = read_dataset_csv(f, 'biometric')
         dfs.append(df)
     
-    data = pd.concat(dfs, ignore_index=True)
+    data = concat_frames(dfs)
     print(f"  ✓ Loaded {len(data):,} records from {len(files)} files")
     
     # Parse dates
-    data['date'] = pd.to_datetime(data['date'], format='%d-%m-%Y', errors='coerce')
-    data['year'] = data['date'].dt.year
-    data['month'] = data['date'].dt.month
-    data['month_name'] = data['date'].dt.month_name()
-    data['day_of_week'] = data['date'].dt.day_name()
-    data['is_weekend'] = data['day_of_week'].isin(['Saturday', 'Sunday'])
+    add_calendar_features(data, features=['year', 'month', 'month_name', 'day_of_week', 'is_weekend'])
     
     # Standardize names
     data['state'] = data['state'].astype(str).str.strip().str.title()
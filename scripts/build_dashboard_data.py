@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Dashboard Data Bundle
+Build the dashboard's data files from the integrated analysis outputs.
+
+This module provides:
+- Columnar JSON chunks (national / states / districts) with repeated labels
+  dictionary-encoded, so they stay small and gzip well
+- Content-hashed chunk file names (safe to cache forever)
+- dashboard/data/manifest.json listing the current chunks and bundle version
+
+dashboard/script.js loads the manifest, then fetches each chunk only when a
+section that needs it scrolls into view. dashboard/data.js stays as the
+offline fallback (e.g. when index.html is opened from disk).
+
+Usage:
+    python scripts/build_dashboard_data.py
+"""
+
+import os
+import sys
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+INTEGRATED_DIR = os.path.join(BASE_DIR, "outputs", "integrated_analysis")
+BUNDLE_DIR = os.path.join(BASE_DIR, "dashboard", "data")
+MANIFEST_FILE = "manifest.json"
+
+# Bump when the chunk layout changes (script.js checks it)
+BUNDLE_SCHEMA = 1
+
+FLOAT_DIGITS = 4
+CRITICAL_DISTRICTS = 20
+CRITICAL_GAP = -0.5
+
+# Whole-number fields (written without a decimal point)
+COUNT_FIELDS = ['enrol', 'demo', 'bio', 'total']
+
+MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+def _clean(values):
+    """JSON-safe list: NaN/inf -> null, floats rounded, numpy scalars unboxed."""
+    out = []
+    for v in values:
+        if isinstance(v, (float, np.floating)):
+            out.append(round(float(v), FLOAT_DIGITS) if np.isfinite(v) else None)
+        elif isinstance(v, (np.integer,)):
+            out.append(int(v))
+        elif isinstance(v, (np.bool_,)):
+            out.append(bool(v))
+        else:
+            out.append(None if v is None or (isinstance(v, float) and np.isnan(v)) else v)
+    return out
+
+
+def columnar(df, dictionary=()):
+    """
+    Encode a frame column by column.
+
+    Args:
+        df: DataFrame
+        dictionary: String columns stored as integer codes into a label list
+
+    Returns:
+        {'length', 'columns': {name: values}, 'dictionaries': {name: labels}}
+    """
+    columns, dictionaries = {}, {}
+    for col in df.columns:
+        if col in dictionary:
+            codes, labels = pd.factorize(df[col], sort=True)
+            columns[col] = codes.tolist()
+            dictionaries[col] = _clean(labels)
+        else:
+            columns[col] = _clean(df[col].tolist())
+    return {'length': len(df), 'columns': columns, 'dictionaries': dictionaries}
+
+
+def write_chunk(name, payload, out_dir):
+    """Write one chunk as <name>.<hash>.json; returns its manifest entry."""
+    body = json.dumps({'schema': BUNDLE_SCHEMA, 'chunk': name, **payload},
+                      separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    digest = hashlib.sha256(body).hexdigest()[:10]
+    filename = f"{name}.{digest}.json"
+    with open(os.path.join(out_dir, filename), 'wb') as fp:
+        fp.write(body)
+    return {'file': filename, 'hash': digest, 'bytes': len(body)}
+
+
+# ============================================================================
+# CHUNKS
+# ============================================================================
+def load_outputs(integrated_dir=INTEGRATED_DIR):
+    """Read the integrated analysis CSVs the bundle is built from."""
+    def read(name):
+        return pd.read_csv(os.path.join(integrated_dir, name))
+    return {
+        'integrated': read('integrated_data.csv'),
+        'state_summary': read('state_summary.csv'),
+        'district_clusters': read('district_clusters.csv'),
+        'kpis': read('kpis.csv').to_dict('records')[0],
+    }
+
+
+def national_chunk(outputs):
+    """KPIs, monthly series, cluster sizes and the most critical districts."""
+    kpis = outputs['kpis']
+    kpi = {
+        'totalEnrolments': kpis['total_enrolments'],
+        'totalDemoUpdates': kpis['total_demo_updates'],
+        'totalBioUpdates': kpis['total_bio_updates'],
+        'totalUpdates': kpis['total_updates'],
+        'updateToEnrolRatio': kpis['update_to_enrol_ratio'],
+        'avgDemoIntensity': kpis['avg_demo_intensity'],
+        'avgBioIntensity': kpis['avg_bio_intensity'],
+        'avgChildAttentionGap': kpis['avg_child_attention_gap'],
+        'statesAnalyzed': kpis['states_analyzed'],
+        'districtsAnalyzed': kpis['districts_analyzed'],
+        'matureRegionsPct': kpis['mature_regions_pct'],
+        'underservedRegionsPct': kpis['underserved_regions_pct'],
+    }
+    kpi = dict(zip(kpi, _clean(kpi.values())))
+
+    monthly = (outputs['integrated'].groupby(['year', 'month'], sort=True)[['total_demo', 'total_bio']]
+               .sum().reset_index())
+    monthly_data = {
+        'labels': [f"{MONTH_LABELS[m - 1]} {y}" for y, m in zip(monthly['year'], monthly['month'])],
+        'demographic': _clean((monthly['total_demo'] / 1e6).round(2)),
+        'biometric': _clean((monthly['total_bio'] / 1e6).round(2)),
+    }
+
+    # One slice per cluster label written by integrated_analysis.py
+    dc = outputs['district_clusters'].dropna(subset=['cluster']).sort_values('cluster', kind='stable')
+    labels = dc['cluster_label'] if 'cluster_label' in dc else 'Cluster ' + dc['cluster'].astype(int).astype(str)
+    counts = labels.value_counts(sort=False)
+    clusters = {'labels': counts.index.tolist(), 'values': _clean(counts.to_numpy())}
+
+    critical = (outputs['district_clusters'].dropna(subset=['child_attention_gap'])
+                .nsmallest(CRITICAL_DISTRICTS, 'child_attention_gap')[['state', 'district', 'child_attention_gap']]
+                .rename(columns={'child_attention_gap': 'gap'}))
+    critical.insert(0, 'rank', np.arange(1, len(critical) + 1))
+    critical['severity'] = np.where(critical['gap'] < CRITICAL_GAP, 'Critical', 'High')
+    critical['recommendation'] = 'Increase child update campaigns'
+
+    return {'kpi': kpi, 'monthly': monthly_data, 'clusters': clusters, 'critical': columnar(critical)}
+
+
+def states_chunk(outputs):
+    """Every state (not just the top 20), in dashboard field names."""
+    s = outputs['state_summary'].sort_values('total_enrol', ascending=False)
+    states = pd.DataFrame({
+        'state': s['state'],
+        'enrol': s['total_enrol'],
+        'demo': s['total_demo'],
+        'bio': s['total_bio'],
+        'total': s['total_updates'],
+        'childGap': s['child_attention_gap'],
+        'intensity': s['total_intensity'],
+    })
+    states[COUNT_FIELDS] = states[COUNT_FIELDS].round().astype('int64')
+    return {'rows': columnar(states)}
+
+
+def districts_chunk(outputs):
+    """Every district with totals, child gap, update intensity and cluster."""
+    d = outputs['integrated'].groupby(['state', 'district'], sort=True).agg(
+        enrol=('total_enrol', 'sum'), demo=('total_demo', 'sum'), bio=('total_bio', 'sum'),
+        total=('total_updates', 'sum'), childGap=('child_attention_gap', 'mean'),
+    ).reset_index()
+    d['intensity'] = d['total'] / d['enrol'].where(d['enrol'] > 0)
+    d[COUNT_FIELDS] = d[COUNT_FIELDS].round().astype('int64')
+    clusters = outputs['district_clusters'][['state', 'district', 'cluster']]
+    d = d.merge(clusters, on=['state', 'district'], how='left')
+    d['cluster'] = d['cluster'].astype('Int64').astype(object).where(d['cluster'].notna(), None)
+    return {'rows': columnar(d, dictionary=('state',))}
+
+
+CHUNKS = {
+    'national': national_chunk,
+    'states': states_chunk,
+    'districts': districts_chunk,
+}
+
+
+# ============================================================================
+# BUNDLE
+# ============================================================================
+def build_bundle(integrated_dir=INTEGRATED_DIR, out_dir=BUNDLE_DIR):
+    """
+    Write all chunks and the manifest; stale chunk files are removed.
+
+    Returns:
+        Manifest dict
+    """
+    outputs = load_outputs(integrated_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    entries = {name: write_chunk(name, build(outputs), out_dir) for name, build in CHUNKS.items()}
+    current = {e['file'] for e in entries.values()}
+    for old in os.listdir(out_dir):
+        if old.endswith('.json') and old != MANIFEST_FILE and old not in current:
+            os.remove(os.path.join(out_dir, old))
+
+    version = hashlib.sha256(''.join(e['hash'] for e in entries.values()).encode()).hexdigest()[:12]
+    manifest = {
+        'schema': BUNDLE_SCHEMA,
+        'version': version,
+        'chunks': entries,
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), 'w') as fp:
+        json.dump(manifest, fp, indent=2)
+    return manifest
+
+
+def main():
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - DASHBOARD DATA BUNDLE")
+    print("="*70)
+    manifest = build_bundle()
+    for name, entry in manifest['chunks'].items():
+        print(f"  ✓ {name}: {entry['file']} ({entry['bytes'] / 1024:,.1f} KB)")
+    print(f"\n📁 Bundle {manifest['version']} written to {BUNDLE_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
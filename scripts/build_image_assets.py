@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Responsive Image Assets
+Re-encode the curated dashboard plots into web-sized variants.
+
+This module provides:
+- AVIF / WebP variants of every curated plot at several widths, PNG
+  fallbacks at card widths
+- Content-hashed file names (<plot>.<hash>.<width>.<ext>), safe to cache forever
+- An encode cache (.assets.json) so unchanged plots are never re-encoded
+- srcset metadata (window.plotAssets) in a generated variants.js next to
+  the variants, loaded by the dashboard after plots_manifest.js
+
+Cards in the dashboard get the small widths (lazy-loaded); the image modal
+asks for the large widths only when it is opened. AVIF is skipped with a
+warning when the installed Pillow cannot encode it. The variants are build
+output (not committed); without them the dashboard shows the curated PNGs.
+
+Usage:
+    python scripts/build_image_assets.py
+    python scripts/build_image_assets.py --force -j 4
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, features
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+DASHBOARD_DIR = os.path.join(BASE_DIR, "dashboard")
+SOURCE_DIR = os.path.join(DASHBOARD_DIR, "assets", "curated_plots")
+OUTPUT_DIR = os.path.join(DASHBOARD_DIR, "assets", "responsive")
+STATE_FILE = ".assets.json"
+VARIANTS_FILE = "variants.js"
+
+# Bump to re-encode everything (e.g. after changing widths or quality)
+ASSETS_VERSION = 2
+
+WIDTHS = (480, 960, 1600, 2400)
+
+# PNG is only the fallback for browsers without WebP, so it stops at card size
+# (resampled PNGs of these plots are larger than the 300-dpi originals)
+PNG_MAX_WIDTH = 960
+
+# Encoder settings, in the order the browser should prefer them
+FORMATS = {
+    'avif': {'quality': 55},
+    'webp': {'quality': 82, 'method': 6},
+    'png': {'optimize': True},
+}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'png': 'image/png'}
+
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+def file_hash(path):
+    """Short SHA-256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as fp:
+        for block in iter(lambda: fp.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()[:10]
+
+
+def available_formats(formats=tuple(FORMATS)):
+    """Requested formats the installed Pillow can write."""
+    usable = []
+    for fmt in formats:
+        if fmt == 'avif' and not features.check('avif'):
+            print("⚠️ Pillow has no AVIF encoder; skipping AVIF variants")
+            continue
+        usable.append(fmt)
+    return usable
+
+
+def variant_widths(width):
+    """Standard widths below the image's own width, plus that width if it is not above the largest."""
+    widths = [w for w in WIDTHS if w < width]
+    return widths + [width] if width <= WIDTHS[-1] else widths
+
+
+def encode_image(source, digest, out_dir, formats):
+    """
+    Write every width/format variant of one image.
+
+    Args:
+        source: Path to the source PNG
+        digest: Content hash of the source (goes into the file names)
+        out_dir: Output directory
+        formats: Formats to write
+
+    Returns:
+        {'width', 'height', 'hash', 'variants': {fmt: [[file, width], ...]}}
+    """
+    stem = os.path.splitext(os.path.basename(source))[0]
+    with Image.open(source) as img:
+        img.load()
+        width, height = img.size
+        variants = {fmt: [] for fmt in formats}
+        for w in variant_widths(width):
+            h = round(height * w / width)
+            resized = img if w == width else img.resize((w, h), Image.LANCZOS)
+            for fmt in formats:
+                if fmt == 'png' and w > PNG_MAX_WIDTH and variants[fmt]:
+                    continue
+                filename = f"{stem}.{digest}.{w}.{fmt}"
+                resized.save(os.path.join(out_dir, filename), format=fmt.upper(), **FORMATS[fmt])
+                variants[fmt].append([filename, w])
+    return {'width': width, 'height': height, 'hash': digest, 'variants': variants}
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+def _load_state(out_dir):
+    path = os.path.join(out_dir, STATE_FILE)
+    if os.path.exists(path):
+        with open(path) as fp:
+            state = json.load(fp)
+        if state.get('version') == ASSETS_VERSION:
+            return state['images']
+    return {}
+
+
+def _is_current(entry, digest, formats, out_dir):
+    """Cached entry matches the source hash and all of its files exist."""
+    if not entry or entry['hash'] != digest or sorted(entry['variants']) != sorted(formats):
+        return False
+    return all(os.path.exists(os.path.join(out_dir, f))
+               for files in entry['variants'].values() for f, _ in files)
+
+
+def build_assets(source_dir=SOURCE_DIR, out_dir=OUTPUT_DIR, formats=None, jobs=1, force=False):
+    """
+    Encode variants for every PNG in source_dir, reusing unchanged ones.
+
+    Files in out_dir that no current image refers to are removed.
+
+    Returns:
+        (images, encoded) - {source file name: entry} and the names re-encoded
+    """
+    formats = available_formats(formats or tuple(FORMATS))
+    os.makedirs(out_dir, exist_ok=True)
+    cached = {} if force else _load_state(out_dir)
+
+    images, pending = {}, {}
+    for name in sorted(os.listdir(source_dir)):
+        if not name.lower().endswith('.png'):
+            continue
+        digest = file_hash(os.path.join(source_dir, name))
+        if _is_current(cached.get(name), digest, formats, out_dir):
+            images[name] = cached[name]
+        else:
+            pending[name] = digest
+
+    if pending:
+        args = [(os.path.join(source_dir, name), digest, out_dir, formats) for name, digest in pending.items()]
+        if jobs > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(encode_image, *zip(*args)))
+        else:
+            results = [encode_image(*a) for a in args]
+        images.update(zip(pending, results))
+
+    keep = {f for entry in images.values() for files in entry['variants'].values() for f, _ in files}
+    for old in os.listdir(out_dir):
+        if old not in (STATE_FILE, VARIANTS_FILE) and old not in keep:
+            os.remove(os.path.join(out_dir, old))
+
+    with open(os.path.join(out_dir, STATE_FILE), 'w') as fp:
+        json.dump({'version': ASSETS_VERSION, 'images': dict(sorted(images.items()))}, fp, indent=2)
+    return images, sorted(pending)
+
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+def asset_metadata(images, source_dir=SOURCE_DIR, out_dir=OUTPUT_DIR, base_dir=DASHBOARD_DIR):
+    """
+    srcset data keyed by the plot paths used in plots_manifest.js.
+
+    Returns:
+        {'assets/curated_plots/x.png': {'w', 'h', 'sources': {mime: [[url, width], ...]}}}
+    """
+    source_url = os.path.relpath(source_dir, base_dir).replace(os.sep, '/')
+    out_url = os.path.relpath(out_dir, base_dir).replace(os.sep, '/')
+    return {
+        f"{source_url}/{name}": {
+            'w': entry['width'],
+            'h': entry['height'],
+            'sources': {MIME_TYPES[fmt]: [[f"{out_url}/{f}", w] for f, w in files]
+                        for fmt, files in entry['variants'].items()},
+        }
+        for name, entry in images.items()
+    }
+
+
+def write_variants(metadata, path=os.path.join(OUTPUT_DIR, VARIANTS_FILE)):
+    """Write window.plotAssets to the generated variants.js."""
+    with open(path, 'w') as fp:
+        fp.write("// Generated by scripts/build_image_assets.py, do not edit\n")
+        fp.write(f"window.plotAssets = {json.dumps(metadata, indent=1, sort_keys=True)};\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive dashboard image variants")
+    parser.add_argument('--force', action='store_true', help="Re-encode every image")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="Parallel encoders")
+    parser.add_argument('--formats', nargs='+', choices=list(FORMATS), default=list(FORMATS),
+                        help="Formats to write (default: all)")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - RESPONSIVE IMAGE ASSETS")
+    print("="*70)
+    images, encoded = build_assets(formats=args.formats, jobs=args.jobs, force=args.force)
+    write_variants(asset_metadata(images))
+
+    source_bytes = sum(os.path.getsize(os.path.join(SOURCE_DIR, name)) for name in images)
+    out_bytes = sum(os.path.getsize(os.path.join(OUTPUT_DIR, f)) for f in os.listdir(OUTPUT_DIR))
+    print(f"  ✓ {len(images)} images ({len(encoded)} re-encoded, {len(images) - len(encoded)} unchanged)")
+    print(f"  ✓ Sources {source_bytes / 1e6:,.1f} MB -> variants {out_bytes / 1e6:,.1f} MB")
+    print(f"\n📁 Variants and srcset data ({VARIANTS_FILE}) in {OUTPUT_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,43 @@
-import pandas as pd
-import glob
+"""
+Deep audit of report claims (August collapse, weekday pattern, child
+attention gap, district extremes).
+
+Works from the merged shard profiles (monthly, weekday and district totals)
+of utils/shard_profiler.py instead of loading every row.
+"""
+
 import os
-import datetime
+import sys
+import pandas as pd
 
-DATA_DIR = 'data'
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
+from shard_profiler import profile_datasets
 
-def deep_audit():
-    print("Loading data for deep audit...")
-    
-    # Load all files
-    bio_files = glob.glob(os.path.join(DATA_DIR, 'api_data_aadhar_biometric', '*.csv'))
-    demo_files = glob.glob(os.path.join(DATA_DIR, 'api_data_aadhar_demographic', '*.csv'))
-    enrol_files = glob.glob(os.path.join(DATA_DIR, 'api_data_aadhar_enrolment', '*.csv'))
-    
-    # helper to load and concat
-    def load_dfs(files, type_name):
-        dfs = []
-        for f in files:
-            try:
-                df = pd.read_csv(f)
-                # Parse dates immediately
-                df['date'] = pd.to_datetime(df['date'], dayfirst=True)
-                dfs.append(df)
-            except Exception as e:
-                print(f"Error loading {f}: {e}")
-        if not dfs:
-            return pd.DataFrame()
-        return pd.concat(dfs, ignore_index=True)
 
-    df_bio = load_dfs(bio_files, "Biometric")
-    df_demo = load_dfs(demo_files, "Demographic")
-    df_enrol = load_dfs(enrol_files, "Enrolment")
+def _totals_frame(merged, dataset, key, columns):
+    """Profile totals ({label: {column: sum}}) as a DataFrame, zero-filled."""
+    rows = merged.get(dataset, {}).get(key, {})
+    return pd.DataFrame.from_dict(rows, orient='index').reindex(columns=columns).fillna(0).sort_index()
+
+
+def deep_audit(merged=None):
+    print("Loading shard profiles for deep audit...")
+    if merged is None:
+        merged, _ = profile_datasets()
+    
+    demo_cols = ['demo_age_5_17', 'demo_age_17_']
+    enrol_cols = ['age_0_5', 'age_5_17', 'age_18_greater']
+    demo_totals = pd.Series(merged.get('demographic', {}).get('totals', {})).reindex(demo_cols).fillna(0)
+    enrol_totals = pd.Series(merged.get('enrolment', {}).get('totals', {})).reindex(enrol_cols).fillna(0)
     
-    print(f"Loaded: Bio({len(df_bio)}), Demo({len(df_demo)}), Enrol({len(df_enrol)})")
+    rows = {name: merged[name]['rows'] if name in merged else 0 for name in ('biometric', 'demographic', 'enrolment')}
+    print(f"Loaded: Bio({rows['biometric']}), Demo({rows['demographic']}), Enrol({rows['enrolment']})")
 
     # --- 1. Temporal Analysis (August Collapse) ---
     print("\n--- 1. Temporal Analysis (August Collapse Check) ---")
-    if not df_demo.empty:
-        df_demo['month'] = df_demo['date'].dt.to_period('M')
-        monthly_counts = df_demo.groupby('month')[['demo_age_5_17', 'demo_age_17_']].sum()
+    if rows['demographic']:
+        monthly_counts = _totals_frame(merged, 'demographic', 'monthly', demo_cols)
         monthly_counts['total'] = monthly_counts['demo_age_5_17'] + monthly_counts['demo_age_17_']
         print("Monthly Demographic Volume:")
         print(monthly_counts)
@@ -58,14 +57,10 @@ def deep_audit():
 
     # --- 2. Day of Week Analysis (Tuesday Anomaly) ---
     print("\n--- 2. Day of Week Analysis (Tuesday Anomaly) ---")
-    if not df_demo.empty:
-        df_demo['day_name'] = df_demo['date'].dt.day_name()
-        daily_avg = df_demo.groupby('day_name')[['demo_age_5_17', 'demo_age_17_']].sum().sum(axis=1)
-        # We need average per occurrence, not sum, because dataset might have different count of Mondays/Tuesdays
-        day_counts = df_demo['date'].dt.day_name().value_counts()
-        # This is rough because 'date' column in CSV might be unique dates or transaction dates. 
-        # Assuming 'date' is the transaction date.
-        # Actually, let's just look at the Sum distribution first.
+    if rows['demographic']:
+        daily_avg = _totals_frame(merged, 'demographic', 'weekday', demo_cols).sum(axis=1)
+        # Sum distribution per weekday (not per occurrence: the number of
+        # Mondays/Tuesdays in the range can differ)
         
         print("Total Volume by Day of Week:")
         print(daily_avg.sort_values(ascending=False))
@@ -80,16 +75,16 @@ def deep_audit():
     # --- 3. Child Attention Gap ---
     print("\n--- 3. Child Attention Gap Verification ---")
     # Share of updates (Demo)
-    minor_update_count = df_demo['demo_age_5_17'].sum()
-    total_update_count = df_demo['demo_age_5_17'].sum() + df_demo['demo_age_17_'].sum()
+    minor_update_count = demo_totals['demo_age_5_17']
+    total_update_count = demo_totals.sum()
     minor_update_share = minor_update_count / total_update_count if total_update_count else 0
     
     # Share of Enrolment (Population Proxy)
     # Report says: "Minors (5-17)... representing 25-30% of population"
     # Let's see what the *Enrolment* dataset says about share.
     # Dataset cols: age_0_5, age_5_17, age_18_greater
-    minor_enrol_count = df_enrol['age_5_17'].sum()
-    total_enrol_count = df_enrol['age_0_5'].sum() + df_enrol['age_5_17'].sum() + df_enrol['age_18_greater'].sum()
+    minor_enrol_count = enrol_totals['age_5_17']
+    total_enrol_count = enrol_totals.sum()
     minor_enrol_share = minor_enrol_count / total_enrol_count if total_enrol_count else 0
     
     child_attention_gap = minor_update_share - minor_enrol_share
@@ -105,11 +100,11 @@ def deep_audit():
     # Note: State names might be dirty.
     
     # Group by district and sum updates
-    dist_updates = df_demo.groupby('district')[['demo_age_5_17', 'demo_age_17_']].sum()
+    dist_updates = _totals_frame(merged, 'demographic', 'districts', demo_cols)
     dist_updates['total_updates'] = dist_updates['demo_age_5_17'] + dist_updates['demo_age_17_']
     
     # Group by district and sum enrolments (for normalization)
-    dist_enrol = df_enrol.groupby('district')[['age_0_5', 'age_5_17', 'age_18_greater']].sum()
+    dist_enrol = _totals_frame(merged, 'enrolment', 'districts', enrol_cols)
     dist_enrol['total_enrol'] = dist_enrol['age_0_5'] + dist_enrol['age_5_17'] + dist_enrol['age_18_greater']
     
     # Merge
@@ -7,6 +7,7 @@ Author: UIDAI Hackathon Team
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -25,6 +26,16 @@ DATA_DIR = os.path.join(BASE_DIR, "data", "api_data_aadhar_demographic")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "demographic_analysis")
 PLOTS_DIR = os.path.join(OUTPUT_DIR, "plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from metrics_kernel import compute_metrics
+from memory_utils import ensure_owned
+from schema_registry import read_dataset_csv, concat_frames
+from calendar_utils import add_calendar_features
+from plot_registry import PlotRegistry
+from distinct_sketch import count_distinct
+from quantile_sketch import sketch_values
+
 # State name normalization (same as biometric)
 STATE_FIX = {
     "Orissa": "Odisha",
@@ -50,31 +61,27 @@ def load_demographic_data():
     dfs = []
     
     for f in sorted(files):
-        df = pd.read_csv(f)
+        df = read_dataset_csv(f, 'demographic')
         print(f"  ✓ Loaded {os.path.basename(f)}: {len(df):,} rows")
         dfs.append(df)
     
-    data = pd.concat(dfs, ignore_index=True)
+    data = concat_frames(dfs)
     print(f"\n  📊 Total records: {len(data):,}")
     return data
 
-def preprocess_data(df):
-    """Clean and prepare data."""
+def preprocess_data(df, inplace=False):
+    """Clean and prepare data (inplace=True: caller hands over df, no copy)."""
     print("\n" + "="*60)
     print("PHASE 2: DATA PREPROCESSING")
     print("="*60)
     
-    df = df.copy()
+    df = ensure_owned(df, inplace)
     
-    # Parse dates
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    df['month_name'] = df['date'].dt.month_name()
-    df['day'] = df['date'].dt.day
-    df['week'] = df['date'].dt.isocalendar().week
-    df['day_of_week'] = df['date'].dt.day_name()
-    df['is_weekend'] = df['day_of_week'].isin(['Saturday', 'Sunday'])
+    # Parse each distinct date once and derive calendar columns per date
+    add_calendar_features(df, features={
+        'year': 'year', 'month': 'month', 'month_name': 'month_name', 'day': 'day',
+        'week': 'week', 'day_of_week': 'day_of_week', 'is_weekend': 'is_weekend',
+    })
     
     # Standardize state names
     df['state'] = df['state'].astype(str).str.strip().str.title()
@@ -90,9 +97,9 @@ def preprocess_data(df):
         for col, count in missing[missing > 0].items():
             print(f"      {col}: {count}")
     
-    # Check for outliers (extreme values)
+    # Check for outliers (extreme values; 99th percentile from a chunk-fed quantile sketch)
     for col in ['demo_age_5_17', 'demo_age_17_']:
-        q99 = df[col].quantile(0.99)
+        q99 = sketch_values(df[col]).quantile(0.99)
         outliers = (df[col] > q99 * 10).sum()
         if outliers > 0:
             print(f"  ⚠️ {outliers} extreme outliers in {col} (capped at 99th percentile × 10)")
@@ -108,26 +115,18 @@ def preprocess_data(df):
 # ============================================================================
 # FEATURE ENGINEERING
 # ============================================================================
-def engineer_features(df):
+def engineer_features(df, inplace=False):
     """Create demographic-specific features."""
     print("\n" + "="*60)
     print("PHASE 3: FEATURE ENGINEERING")
     print("="*60)
     
-    df = df.copy()
-    
-    # Total demographic updates
-    df['total_demo'] = df['demo_age_5_17'] + df['demo_age_17_']
+    df = ensure_owned(df, inplace)
     
-    # Age-group ratios (with epsilon to avoid division by zero)
-    eps = 1e-10
-    df['demo_minor_share'] = df['demo_age_5_17'] / (df['total_demo'] + eps)
-    df['demo_adult_share'] = df['demo_age_17_'] / (df['total_demo'] + eps)
-    df['demo_minor_to_adult_ratio'] = df['demo_age_5_17'] / (df['demo_age_17_'] + eps)
-    
-    # Cap ratios where total is 0
-    df.loc[df['total_demo'] == 0, ['demo_minor_share', 'demo_adult_share']] = 0
-    df.loc[df['demo_age_17_'] == 0, 'demo_minor_to_adult_ratio'] = 0
+    # Total demographic updates and age-group ratios (shared metric registry)
+    compute_metrics(df, [
+        'total_demo', 'demo_minor_share', 'demo_adult_share', 'demo_minor_to_adult_ratio',
+    ])
     
     print(f"  ✓ Created age-group metrics: demo_minor_share, demo_adult_share, ratio")
     return df
@@ -139,14 +138,15 @@ def aggregate_levels(df):
     print("="*60)
     
     # District-Date level
-    district_date = df.groupby(['date', 'year', 'month', 'day_of_week', 'is_weekend', 
-                                 'state', 'district']).agg({
+    district_keys = ['date', 'year', 'month', 'day_of_week', 'is_weekend', 'state', 'district']
+    district_date = df.groupby(district_keys).agg({
         'demo_age_5_17': 'sum',
         'demo_age_17_': 'sum',
-        'total_demo': 'sum',
-        'pincode': 'nunique'
-    }).reset_index()
-    district_date.rename(columns={'pincode': 'active_pincodes'}, inplace=True)
+        'total_demo': 'sum'
+    })
+    # Distinct counts via mergeable sketches (exact below the sketch threshold)
+    district_date['active_pincodes'] = count_distinct(df, district_keys, 'pincode')
+    district_date = district_date.reset_index()
     
     # Recalculate ratios at aggregated level
     eps = 1e-10
@@ -154,14 +154,15 @@ def aggregate_levels(df):
     district_date.loc[district_date['total_demo'] == 0, 'demo_minor_share'] = 0
     
     # State-Month level
-    state_month = df.groupby(['year', 'month', 'state']).agg({
+    state_keys = ['year', 'month', 'state']
+    state_month = df.groupby(state_keys).agg({
         'demo_age_5_17': 'sum',
         'demo_age_17_': 'sum',
-        'total_demo': 'sum',
-        'district': 'nunique',
-        'pincode': 'nunique'
-    }).reset_index()
-    state_month.rename(columns={'district': 'active_districts', 'pincode': 'active_pincodes'}, inplace=True)
+        'total_demo': 'sum'
+    })
+    state_month['active_districts'] = count_distinct(df, state_keys, 'district')
+    state_month['active_pincodes'] = count_distinct(df, state_keys, 'pincode')
+    state_month = state_month.reset_index()
     state_month['demo_minor_share'] = state_month['demo_age_5_17'] / (state_month['total_demo'] + eps)
     state_month.loc[state_month['total_demo'] == 0, 'demo_minor_share'] = 0
     
@@ -846,8 +847,8 @@ def main():
     
     # Load and preprocess
     df = load_demographic_data()
-    df = preprocess_data(df)
-    df = engineer_features(df)
+    df = preprocess_data(df, inplace=True)
+    df = engineer_features(df, inplace=True)
     
     # Aggregate
     district_date, state_date, state_month, national_date, national_month = aggregate_levels(df)
@@ -875,16 +876,16 @@ def main():
     print("\n" + "="*60)
     print("PHASE 5: GENERATING VISUALIZATIONS")
     print("="*60)
-    setup_plots()
-    
-    plot_national_timeseries(national_date, national_month, PLOTS_DIR)
-    plot_state_heatmaps(state_month, PLOTS_DIR)
-    plot_age_analysis(age_results['state_minor_share'], age_results['district_minor_share'], PLOTS_DIR)
-    plot_temporal_patterns(national_date, temporal_results['dow_pattern'], temporal_results['state_weekend'], PLOTS_DIR)
-    plot_concentration(concentration, PLOTS_DIR)
-    plot_clusters(cluster_data, cluster_summary, PLOTS_DIR)
-    plot_top_districts(age_results['district_minor_share'], PLOTS_DIR)
-    plot_volatility(volatility, PLOTS_DIR)
+    plots = PlotRegistry(PLOTS_DIR, setup=setup_plots)
+    plots.add(plot_national_timeseries, national_date, national_month, PLOTS_DIR, outputs='01_national_timeseries.png')
+    plots.add(plot_state_heatmaps, state_month, PLOTS_DIR, outputs='02_state_heatmaps.png')
+    plots.add(plot_age_analysis, age_results['state_minor_share'], age_results['district_minor_share'], PLOTS_DIR, outputs='03_age_analysis.png')
+    plots.add(plot_temporal_patterns, national_date, temporal_results['dow_pattern'], temporal_results['state_weekend'], PLOTS_DIR, outputs='04_temporal_patterns.png')
+    plots.add(plot_concentration, concentration, PLOTS_DIR, outputs='05_concentration.png')
+    plots.add(plot_clusters, cluster_data, cluster_summary, PLOTS_DIR, outputs='06_clusters.png')
+    plots.add(plot_top_districts, age_results['district_minor_share'], PLOTS_DIR, outputs='07_top_districts.png')
+    plots.add(plot_volatility, volatility, PLOTS_DIR, outputs='08_volatility.png')
+    plots.render()
     
     # Insights
     print("\n" + "="*60)
@@ -29,6 +29,10 @@ BASE_DIR = os.path.dirname(SCRIPT_DIR)
 DATA_FILE = os.path.join(BASE_DIR, "outputs", "integrated_analysis", "integrated_data.csv")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "geospatial_plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from plot_registry import PlotRegistry
+
 FIGURE_DPI = 300
 
 # ============================================================================
@@ -449,6 +453,7 @@ def main():
     
     # Load district data
     df = load_district_data()
+    plots = PlotRegistry(OUTPUT_DIR)
     
     print("\\n" + "=" * 70)
     print("📊 CREATING DISTRICT-LEVEL VISUALIZATIONS")
@@ -456,19 +461,23 @@ def main():
     
     # 1. District choropleth
     print("\\n1️⃣ Creating District-Level Choropleth...")
-    create_district_choropleth(df, '09_district_choropleth.png')
+    plots.add(create_district_choropleth, df, '09_district_choropleth.png',
+              outputs='09_district_choropleth.png')
     
     # 2. Lorenz curve
     print("\\n2️⃣ Creating Lorenz Curve Analysis...")
-    create_lorenz_curve(df, '10_lorenz_curve_inequality.png')
+    plots.add(create_lorenz_curve, df, '10_lorenz_curve_inequality.png',
+              outputs='10_lorenz_curve_inequality.png')
     
-    # 3. Gini coefficient analysis
+    # 3. Gini coefficient analysis (rendered inline: its table is used below)
     print("\\n3️⃣ Creating Gini Coefficient Analysis...")
     _, gini_df = create_gini_analysis(df, '11_gini_coefficient_analysis.png')
     
     # 4. Within-state heterogeneity
     print("\\n4️⃣ Creating Within-State Heterogeneity Analysis...")
-    create_heterogeneity_analysis(df, '12_within_state_heterogeneity.png')
+    plots.add(create_heterogeneity_analysis, df, '12_within_state_heterogeneity.png',
+              outputs='12_within_state_heterogeneity.png')
+    plots.render()
     
     print("\\n" + "=" * 70)
     print("✅ DISTRICT-LEVEL ANALYSIS COMPLETE")
@@ -35,6 +35,10 @@ BASE_DIR = os.path.dirname(SCRIPT_DIR)
 DATA_FILE = os.path.join(BASE_DIR, "outputs", "analysis_output", "processed_data.csv")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "analysis_output", "plots", "enhanced_plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from plot_registry import PlotRegistry
+
 # Visual theme - consistent with audit recommendations
 sns.set_style("whitegrid")
 COLORS = {
@@ -679,11 +683,13 @@ def main():
     print("GENERATING MISSING VISUALIZATIONS")
     print("="*80)
     
-    viz1_age_decomposition(df)
-    viz2_child_intensity_scatter(df)
-    viz3_monthly_age_volume(df)
-    viz4_state_age_bio_bubble(df)
-    viz5_enhanced_timeseries(df)
+    plots = PlotRegistry(OUTPUT_DIR, context={'OUTPUT_DIR': OUTPUT_DIR})
+    plots.add(viz1_age_decomposition, df, outputs='missing_viz_01_age_decomposition.png')
+    plots.add(viz2_child_intensity_scatter, df, outputs='missing_viz_02_child_intensity_scatter.png')
+    plots.add(viz3_monthly_age_volume, df, outputs='missing_viz_03_monthly_age_volume.png')
+    plots.add(viz4_state_age_bio_bubble, df, outputs='missing_viz_04_state_age_bio_bubble.png')
+    plots.add(viz5_enhanced_timeseries, df, outputs='missing_viz_05_enhanced_timeseries.png')
+    plots.render()
     
     print("\n" + "="*80)
     print("ALL VISUALIZATIONS GENERATED SUCCESSFULLY")
@@ -7,6 +7,7 @@ Author: UIDAI Hackathon Team
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -25,6 +26,17 @@ DATA_DIR = os.path.join(BASE_DIR, "data", "api_data_aadhar_enrolment")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "enrolment_analysis")
 PLOTS_DIR = os.path.join(OUTPUT_DIR, "plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from metrics_kernel import compute_metrics
+from memory_utils import ensure_owned
+from schema_registry import read_dataset_csv, concat_frames
+from calendar_utils import add_calendar_features
+from plot_registry import PlotRegistry
+from distinct_sketch import count_distinct
+from quantile_sketch import sketch_values
+from data_utils import deduplicate_data
+
 # State name normalization
 STATE_FIX = {
     "Orissa": "Odisha",
@@ -50,31 +62,32 @@ def load_enrolment_data():
     dfs = []
     
     for f in sorted(files):
-        df = pd.read_csv(f)
+        df = read_dataset_csv(f, 'enrolment')
         print(f"  ✓ Loaded {os.path.basename(f)}: {len(df):,} rows")
         dfs.append(df)
     
-    data = pd.concat(dfs, ignore_index=True)
+    data = concat_frames(dfs)
     print(f"\n  📊 Total records: {len(data):,}")
     return data
 
-def preprocess_data(df):
-    """Clean and prepare data."""
+def preprocess_data(df, inplace=False):
+    """
+    Clean and prepare data (inplace=True: caller hands over df, no copy).
+
+    Duplicates repeated across shards or runs are the job of the
+    dedup stage (scripts/utils/dedup_index.py), not this in-memory pass.
+    """
     print("\n" + "="*60)
     print("PHASE 2: DATA PREPROCESSING")
     print("="*60)
     
-    df = df.copy()
+    df = ensure_owned(df, inplace)
     
-    # Parse dates
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    df['month_name'] = df['date'].dt.month_name()
-    df['day'] = df['date'].dt.day
-    df['week'] = df['date'].dt.isocalendar().week
-    df['day_of_week'] = df['date'].dt.day_name()
-    df['is_weekend'] = df['day_of_week'].isin(['Saturday', 'Sunday'])
+    # Parse each distinct date once and derive calendar columns per date
+    add_calendar_features(df, features={
+        'year': 'year', 'month': 'month', 'month_name': 'month_name', 'day': 'day',
+        'week': 'week', 'day_of_week': 'day_of_week', 'is_weekend': 'is_weekend',
+    })
     
     # Standardize state names
     df['state'] = df['state'].astype(str).str.strip().str.title()
@@ -91,14 +104,13 @@ def preprocess_data(df):
             df.loc[df[col] < 0, col] = 0
     
     # Check for duplicates
-    dupes = df.duplicated(subset=['date', 'pincode']).sum()
+    df, dupes = deduplicate_data(df, subset_cols=['date', 'pincode'])
     if dupes > 0:
         print(f"  ⚠️ {dupes} duplicate date-pincode rows (keeping first)")
-        df = df.drop_duplicates(subset=['date', 'pincode'], keep='first')
     
-    # Check for extreme outliers
+    # Check for extreme outliers (99th percentile from a chunk-fed quantile sketch)
     for col in ['age_0_5', 'age_5_17', 'age_18_greater']:
-        q99 = df[col].quantile(0.99)
+        q99 = sketch_values(df[col]).quantile(0.99)
         outliers = (df[col] > q99 * 10).sum()
         if outliers > 0:
             print(f"  ⚠️ {outliers} extreme outliers in {col} (capped)")
@@ -114,33 +126,24 @@ def preprocess_data(df):
 # ============================================================================
 # FEATURE ENGINEERING
 # ============================================================================
-def engineer_features(df):
+def engineer_features(df, inplace=False):
     """Create enrolment-specific features."""
     print("\n" + "="*60)
     print("PHASE 3: FEATURE ENGINEERING")
     print("="*60)
     
-    df = df.copy()
-    eps = 1e-10
-    
-    # Total enrolments
-    df['total_enrol'] = df['age_0_5'] + df['age_5_17'] + df['age_18_greater']
-    
-    # Age shares
-    df['share_0_5'] = df['age_0_5'] / (df['total_enrol'] + eps)
-    df['share_5_17'] = df['age_5_17'] / (df['total_enrol'] + eps)
-    df['share_18_plus'] = df['age_18_greater'] / (df['total_enrol'] + eps)
-    
-    # Cap shares where total is 0
-    df.loc[df['total_enrol'] == 0, ['share_0_5', 'share_5_17', 'share_18_plus']] = 0
-    
-    # Ratios
-    df['child_to_adult_ratio'] = (df['age_0_5'] + df['age_5_17']) / (df['age_18_greater'] + eps)
-    df['infant_to_child_ratio'] = df['age_0_5'] / (df['age_5_17'] + eps)
-    
-    # Cap extreme ratios
-    df['child_to_adult_ratio'] = df['child_to_adult_ratio'].clip(upper=100)
-    df['infant_to_child_ratio'] = df['infant_to_child_ratio'].clip(upper=100)
+    df = ensure_owned(df, inplace)
+    
+    # Total enrolments, age shares and capped ratios (shared metric registry)
+    compute_metrics(df, [
+        'total_enrol',
+        'enrol_share_0_5', 'enrol_share_5_17', 'enrol_share_18_plus',
+        'child_to_adult_ratio', 'infant_to_child_ratio',
+    ], aliases={
+        'enrol_share_0_5': 'share_0_5',
+        'enrol_share_5_17': 'share_5_17',
+        'enrol_share_18_plus': 'share_18_plus',
+    })
     
     print(f"  ✓ Created age-share metrics: share_0_5, share_5_17, share_18_plus")
     print(f"  ✓ Created ratio metrics: child_to_adult_ratio, infant_to_child_ratio")
@@ -155,15 +158,16 @@ def aggregate_levels(df):
     eps = 1e-10
     
     # District-Date level
-    district_date = df.groupby(['date', 'year', 'month', 'day_of_week', 'is_weekend', 
-                                 'state', 'district']).agg({
+    district_keys = ['date', 'year', 'month', 'day_of_week', 'is_weekend', 'state', 'district']
+    district_date = df.groupby(district_keys).agg({
         'age_0_5': 'sum',
         'age_5_17': 'sum',
         'age_18_greater': 'sum',
-        'total_enrol': 'sum',
-        'pincode': 'nunique'
-    }).reset_index()
-    district_date.rename(columns={'pincode': 'active_pincodes'}, inplace=True)
+        'total_enrol': 'sum'
+    })
+    # Distinct counts via mergeable sketches (exact below the sketch threshold)
+    district_date['active_pincodes'] = count_distinct(df, district_keys, 'pincode')
+    district_date = district_date.reset_index()
     
     # Recalculate shares
     district_date['share_0_5'] = district_date['age_0_5'] / (district_date['total_enrol'] + eps)
@@ -172,15 +176,16 @@ def aggregate_levels(df):
     district_date['child_to_adult_ratio'] = (district_date['age_0_5'] + district_date['age_5_17']) / (district_date['age_18_greater'] + eps)
     
     # State-Month level
-    state_month = df.groupby(['year', 'month', 'state']).agg({
+    state_keys = ['year', 'month', 'state']
+    state_month = df.groupby(state_keys).agg({
         'age_0_5': 'sum',
         'age_5_17': 'sum',
         'age_18_greater': 'sum',
-        'total_enrol': 'sum',
-        'district': 'nunique',
-        'pincode': 'nunique'
-    }).reset_index()
-    state_month.rename(columns={'district': 'active_districts', 'pincode': 'active_pincodes'}, inplace=True)
+        'total_enrol': 'sum'
+    })
+    state_month['active_districts'] = count_distinct(df, state_keys, 'district')
+    state_month['active_pincodes'] = count_distinct(df, state_keys, 'pincode')
+    state_month = state_month.reset_index()
     state_month['share_0_5'] = state_month['age_0_5'] / (state_month['total_enrol'] + eps)
     state_month['share_5_17'] = state_month['age_5_17'] / (state_month['total_enrol'] + eps)
     state_month['share_18_plus'] = state_month['age_18_greater'] / (state_month['total_enrol'] + eps)
@@ -820,8 +825,8 @@ def main():
     
     # Load and preprocess
     df = load_enrolment_data()
-    df = preprocess_data(df)
-    df = engineer_features(df)
+    df = preprocess_data(df, inplace=True)
+    df = engineer_features(df, inplace=True)
     
     # Aggregate
     district_date, state_date, state_month, national_date, national_month = aggregate_levels(df)
@@ -844,16 +849,16 @@ def main():
     print("\n" + "="*60)
     print("PHASE 5: GENERATING VISUALIZATIONS")
     print("="*60)
-    setup_plots()
-    
-    plot_national_timeseries(national_date, national_month, PLOTS_DIR)
-    plot_state_heatmaps(state_month, PLOTS_DIR)
-    plot_age_analysis(age_results['state_agg'], age_results['district_agg'], PLOTS_DIR)
-    plot_temporal_patterns(national_date, temporal_results['dow_pattern'], PLOTS_DIR)
-    plot_concentration(concentration, PLOTS_DIR)
-    plot_clusters(cluster_data, cluster_summary, PLOTS_DIR)
-    plot_top_districts(age_results['district_agg'], PLOTS_DIR)
-    plot_volatility(volatility, PLOTS_DIR)
+    plots = PlotRegistry(PLOTS_DIR, setup=setup_plots)
+    plots.add(plot_national_timeseries, national_date, national_month, PLOTS_DIR, outputs='01_national_timeseries.png')
+    plots.add(plot_state_heatmaps, state_month, PLOTS_DIR, outputs='02_state_heatmaps.png')
+    plots.add(plot_age_analysis, age_results['state_agg'], age_results['district_agg'], PLOTS_DIR, outputs='03_age_analysis.png')
+    plots.add(plot_temporal_patterns, national_date, temporal_results['dow_pattern'], PLOTS_DIR, outputs='04_temporal_patterns.png')
+    plots.add(plot_concentration, concentration, PLOTS_DIR, outputs='05_concentration.png')
+    plots.add(plot_clusters, cluster_data, cluster_summary, PLOTS_DIR, outputs='06_clusters.png')
+    plots.add(plot_top_districts, age_results['district_agg'], PLOTS_DIR, outputs='07_top_districts.png')
+    plots.add(plot_volatility, volatility, PLOTS_DIR, outputs='08_volatility.png')
+    plots.render()
     
     # Insights
     print("\n" + "="*60)
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Differential Equivalence Harness
+Run reference and optimized implementations side by side and compare results.
+
+This module provides:
+- CASES: reference function -> optimized candidates, with input generators
+- Randomized generators for dirty state names, zero-heavy counts,
+  district-month panels and gap values (seeded, edge cases included)
+- Real inputs from data/ and outputs/integrated_analysis when present
+- Tolerance-bounded comparison and a speedup report per candidate
+
+An optimized path is ready to replace its reference once every seed and
+every real input passes here.
+
+Usage:
+    python scripts/equivalence.py                       # all cases, 20 seeds
+    python scripts/equivalence.py --cases gini trends   # selected cases
+    python scripts/equivalence.py --seeds 100 --size 50000
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+DATA_DIR = os.path.join(BASE_DIR, "data")
+INTEGRATED_FILE = os.path.join(BASE_DIR, "outputs", "integrated_analysis", "integrated_data.csv")
+
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+sys.path.insert(0, SCRIPT_DIR)
+from data_utils import VALID_STATES, STATE_NAME_MAP, INVALID_STATE_ENTRIES, normalize_state_name
+from schema_registry import map_distinct, to_state_category
+from geo_dimension import GeoDimension
+from group_stats import grouped_gini, trend_slopes
+
+DEFAULT_SEEDS = 20
+DEFAULT_SIZE = 5000
+DEFAULT_REPEAT = 3
+
+STATES = sorted(VALID_STATES)
+
+
+# ============================================================================
+# GENERATORS
+# ============================================================================
+def _mutate(name, rng):
+    """Random case, inner-space and padding variant of a label."""
+    style = rng.integers(5)
+    if style == 1:
+        name = name.upper()
+    elif style == 2:
+        name = name.lower()
+    elif style == 3:
+        name = name.title()
+    if rng.random() < 0.2:
+        name = name.replace(' ', '  ', 1)
+    if rng.random() < 0.2:
+        name = ' ' * rng.integers(1, 3) + name + ' ' * rng.integers(0, 3)
+    return name
+
+
+def dirty_state_names(rng, n):
+    """
+    Raw state labels as they appear in the API extract.
+
+    Mix of canonical names, STATE_NAME_MAP spellings and INVALID_STATE_ENTRIES
+    (all with random casing and whitespace), pincodes, blanks, NaN and
+    unknown strings.
+    """
+    pools = [STATES, sorted(STATE_NAME_MAP), sorted(INVALID_STATE_ENTRIES)]
+    kind = rng.choice(6, size=n, p=[0.6, 0.2, 0.05, 0.05, 0.05, 0.05])
+    labels = np.empty(n, dtype=object)
+    for i, k in enumerate(kind):
+        if k < 3:
+            pool = pools[k]
+            labels[i] = _mutate(pool[rng.integers(len(pool))], rng)
+        elif k == 3:
+            labels[i] = str(rng.integers(100000, 999999))
+        elif k == 4:
+            labels[i] = [np.nan, None, '', '   '][rng.integers(4)]
+        else:
+            letters = rng.choice(list('abcdefghij &'), size=rng.integers(1, 12))
+            labels[i] = ''.join(letters)
+    return pd.Series(labels, name='state')
+
+
+def zero_heavy_counts(rng, n, zero_share=None):
+    """Non-negative integer counts: mostly zeros with a Pareto tail."""
+    zero_share = rng.uniform(0.3, 0.99) if zero_share is None else zero_share
+    counts = np.floor(rng.pareto(1.2, n) * rng.integers(1, 20)).astype(np.int64)
+    counts[rng.random(n) < zero_share] = 0
+    return counts
+
+
+def _districts(rng, n_districts):
+    states = rng.choice(STATES, size=n_districts)
+    return [(s, f"{s[:4]} District {i}") for i, s in enumerate(states)]
+
+
+def enrolment_frame(rng, n):
+    """Preprocessed enrolment rows (year, month, state, district, age counts)."""
+    districts = _districts(rng, max(1, n // rng.integers(5, 50)))
+    pick = rng.integers(len(districts), size=n)
+    return pd.DataFrame({
+        'year': rng.choice([2025, 2026], size=n),
+        'month': rng.integers(1, 13, size=n),
+        'state': [districts[p][0] for p in pick],
+        'district': [districts[p][1] for p in pick],
+        'age_0_5': zero_heavy_counts(rng, n),
+        'age_5_17': zero_heavy_counts(rng, n),
+        'age_18_greater': zero_heavy_counts(rng, n, zero_share=0.95),
+    })
+
+
+def district_panel(rng, n):
+    """
+    District-month panel in shuffled order: ragged history lengths (including
+    single months), constant and all-zero series, zero-heavy totals.
+    """
+    months = pd.date_range('2024-01-01', periods=24, freq='MS')
+    rows = []
+    for state, district in _districts(rng, max(1, n // 12)):
+        length = rng.integers(1, len(months) + 1)
+        dates = np.sort(rng.choice(months, size=length, replace=False))
+        if rng.random() < 0.1:
+            enrol = np.full(length, rng.integers(0, 3))
+            updates = np.zeros(length, dtype=np.int64)
+        else:
+            enrol = zero_heavy_counts(rng, length)
+            updates = zero_heavy_counts(rng, length) * 10
+        rows.append(pd.DataFrame({'state': state, 'district': district, 'date': dates,
+                                  'total_enrol': enrol, 'total_updates': updates}))
+    panel = pd.concat(rows, ignore_index=True)
+    return panel.sample(frac=1, random_state=int(rng.integers(1 << 31))).reset_index(drop=True)
+
+
+def gap_frame(rng, n):
+    """Signed attention gaps per district with NaNs, zeros, ties and tiny states."""
+    gaps = np.round(rng.normal(0, 0.2, n), int(rng.integers(1, 6)))
+    gaps[rng.random(n) < 0.1] = np.nan
+    gaps[rng.random(n) < 0.1] = 0.0
+    weights = rng.pareto(1.0, len(STATES)) + 0.01
+    states = rng.choice(STATES, size=n, p=weights / weights.sum())
+    return pd.DataFrame({'state': states, 'child_attention_gap': gaps})
+
+
+# ============================================================================
+# REAL INPUTS
+# ============================================================================
+def _raw_csvs():
+    return sorted(glob.glob(os.path.join(DATA_DIR, "api_data_aadhar_*", "*.csv")))
+
+
+def real_state_labels():
+    """Raw state columns of the checked-in extract."""
+    return [(os.path.basename(f), (pd.read_csv(f, usecols=['state'], dtype=str)['state'],))
+            for f in _raw_csvs()]
+
+
+def real_enrolment():
+    """Enrolment extract, normalized the way the pipeline does before aggregation."""
+    inputs = []
+    for f in glob.glob(os.path.join(DATA_DIR, "api_data_aadhar_enrolment", "*.csv")):
+        df = pd.read_csv(f)
+        df['state'] = map_distinct(df['state'], normalize_state_name)
+        df = df[df['state'].notna()].reset_index(drop=True)
+        dates = pd.to_datetime(df.pop('date'), format='%d-%m-%Y')
+        df.insert(0, 'year', dates.dt.year)
+        df.insert(1, 'month', dates.dt.month)
+        inputs.append((os.path.basename(f), (df.drop(columns='pincode'),)))
+    return inputs
+
+
+def _integrated():
+    if not os.path.exists(INTEGRATED_FILE):
+        return None
+    df = pd.read_csv(INTEGRATED_FILE)
+    df['date'] = pd.to_datetime(df['year'].astype(str) + '-' + df['month'].astype(str).str.zfill(2) + '-01')
+    return df
+
+
+def real_panel():
+    df = _integrated()
+    return [] if df is None else [('integrated_data.csv', (df[['state', 'district', 'date',
+                                                               'total_enrol', 'total_updates']],))]
+
+
+def real_gaps():
+    df = _integrated()
+    return [] if df is None else [('integrated_data.csv', (df[['state', 'child_attention_gap']],))]
+
+
+# ============================================================================
+# IMPLEMENTATIONS UNDER TEST
+# ============================================================================
+def _states_per_row(labels):
+    return labels.map(normalize_state_name)
+
+
+def _states_map_distinct(labels):
+    return map_distinct(labels, normalize_state_name)
+
+
+def _states_categorical(labels):
+    return to_state_category(labels).astype(object)
+
+
+def _aggregate_by_name(df):
+    import integrated_analysis as ia
+    return ia.aggregate_enrolment(df)
+
+
+def _aggregate_by_id(df):
+    import integrated_analysis as ia
+    geo = GeoDimension(path=None)
+    geo.assign(df, levels=('district',))
+    agg = ia.aggregate_enrolment(df)
+    geo.attach_names(agg, 'district', position=2)
+    return agg.drop(columns='district_id')
+
+
+def _gini_loop(df):
+    """create_gini_analysis(): calculate_gini() per state with >1 value."""
+    from district_inequality_analysis import calculate_gini
+    ginis = {}
+    for state in df['state'].unique():
+        values = df[df['state'] == state]['child_attention_gap'].dropna()
+        if len(values) > 1:
+            ginis[state] = calculate_gini(values.values)
+    return pd.Series(ginis, name='gini', dtype=float)
+
+
+def _gini_grouped(df):
+    return grouped_gini(df['child_attention_gap'], df['state'], min_size=2)
+
+
+def _gini_undefined(df):
+    """States whose gaps cancel to ~0: G divides by the sum, so both sides are rounding noise."""
+    gaps = df['child_attention_gap']
+    totals = gaps.groupby(df['state']).agg(['sum', lambda g: g.abs().sum()])
+    return totals.index[totals.iloc[:, 0].abs() <= 1e-9 * totals.iloc[:, 1]]
+
+
+def _trends_loop(df):
+    from forecast_analysis import analyze_district_trends
+    return analyze_district_trends(df)
+
+
+def _trends_closed_form(df):
+    return trend_slopes(df, ['state', 'district'], 'date', df['total_updates'] + df['total_enrol'])
+
+
+def _sorted_frame(keys):
+    def normalize(df):
+        return df.sort_values(keys).reset_index(drop=True)
+    return normalize
+
+
+def _sorted_series(s):
+    return s.sort_index()
+
+
+# Case -> reference, optimized candidates, generators, comparison settings
+CASES = {
+    'normalize_state': {
+        'reference': _states_per_row,
+        'candidates': {'map_distinct': _states_map_distinct, 'to_state_category': _states_categorical},
+        'generate': lambda rng, n: (dirty_state_names(rng, n),),
+        'real': real_state_labels,
+        'exact': True,
+    },
+    'aggregate_enrolment': {
+        'reference': _aggregate_by_name,
+        'candidates': {'district_id_keys': _aggregate_by_id},
+        'generate': lambda rng, n: (enrolment_frame(rng, n),),
+        'real': real_enrolment,
+        'normalize': _sorted_frame(['year', 'month', 'state', 'district']),
+    },
+    'gini': {
+        'reference': _gini_loop,
+        'candidates': {'grouped_gini': _gini_grouped},
+        'generate': lambda rng, n: (gap_frame(rng, n),),
+        'real': real_gaps,
+        'normalize': _sorted_series,
+        'exclude': _gini_undefined,
+    },
+    'trends': {
+        'reference': _trends_loop,
+        'candidates': {'trend_slopes': _trends_closed_form},
+        'generate': lambda rng, n: (district_panel(rng, n),),
+        'real': real_panel,
+        'normalize': _sorted_frame(['state', 'district']),
+    },
+}
+
+
+# ============================================================================
+# HARNESS
+# ============================================================================
+def _fresh(args):
+    """Copies of the inputs, so in-place implementations cannot affect each other."""
+    return tuple(a.copy() if hasattr(a, 'copy') else a for a in args)
+
+
+def _timed(func, args, repeat):
+    best = None
+    for _ in range(repeat):
+        call_args = _fresh(args)
+        start = time.perf_counter()
+        out = func(*call_args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return out, best
+
+
+def max_abs_diff(expected, actual):
+    """Largest absolute difference over the numeric values of two results."""
+    def numeric(x):
+        if isinstance(x, pd.DataFrame):
+            x = x.select_dtypes('number').to_numpy(dtype=float)
+        elif isinstance(x, pd.Series):
+            x = x.to_numpy() if pd.api.types.is_numeric_dtype(x) else np.array([])
+        return np.asarray(x, dtype=float).ravel()
+    a, b = numeric(expected), numeric(actual)
+    if a.size == 0 or a.shape != b.shape:
+        return 0.0
+    with np.errstate(invalid='ignore'):
+        diff = np.abs(a - b)
+    diff[np.isnan(a) & np.isnan(b)] = 0.0
+    diff[(a == b)] = 0.0  # matching infinities
+    return float(np.nanmax(diff)) if diff.size else 0.0
+
+
+def assert_equivalent(expected, actual, rtol=1e-9, atol=1e-12, exact=False):
+    """
+    Raise AssertionError unless two results match within tolerance.
+
+    Frames and Series must have the same labels; dtypes may differ
+    (e.g. int64 vs uint32 sums), None and NaN are equal.
+    """
+    opts = dict(check_dtype=False, check_exact=exact)
+    if not exact:
+        opts.update(rtol=rtol, atol=atol)
+    if isinstance(expected, pd.DataFrame):
+        pd.testing.assert_frame_equal(expected.reset_index(drop=True), actual.reset_index(drop=True),
+                                      check_index_type=False, **opts)
+    elif isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(expected, actual, check_names=False, check_index_type=False, **opts)
+    else:
+        np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+                                   rtol=rtol, atol=atol, equal_nan=True)
+
+
+def check_case(name, inputs, rtol=1e-9, atol=1e-12, repeat=DEFAULT_REPEAT):
+    """
+    Run one case's reference and candidates on a list of inputs.
+
+    Args:
+        name: Key of CASES
+        inputs: List of (label, args tuple)
+        rtol, atol: Comparison tolerances for non-exact cases
+        repeat: Timing repetitions (best is kept)
+
+    Returns:
+        List of result dicts (case, candidate, input, ok, error, seconds, speedup, max_abs_diff)
+    """
+    case = CASES[name]
+    normalize = case.get('normalize', lambda x: x)
+    results = []
+    for label, args in inputs:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            expected, ref_seconds = _timed(case['reference'], args, repeat)
+        expected = normalize(expected)
+        excluded = case['exclude'](*args) if 'exclude' in case else []
+        expected = expected.drop(excluded, errors='ignore') if len(excluded) else expected
+        for cand_name, func in case['candidates'].items():
+            row = {'case': name, 'candidate': cand_name, 'input': label,
+                   'rows': len(args[0]), 'reference_s': ref_seconds}
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    actual, seconds = _timed(func, args, repeat)
+                actual = normalize(actual)
+                actual = actual.drop(excluded, errors='ignore') if len(excluded) else actual
+                assert_equivalent(expected, actual, rtol=rtol, atol=atol, exact=case.get('exact', False))
+                row.update(ok=True, error=None)
+            except Exception as e:  # a crash is a failed candidate, not a harness error
+                message = str(e).strip().splitlines() or [type(e).__name__]
+                row.update(ok=False, error=message[0][:200], candidate_s=None)
+                seconds = None
+            if seconds is not None:
+                row['candidate_s'] = seconds
+                row['speedup'] = ref_seconds / seconds if seconds > 0 else None
+                row['max_abs_diff'] = max_abs_diff(expected, actual)
+            results.append(row)
+    return results
+
+
+def run_harness(cases=None, seeds=DEFAULT_SEEDS, size=DEFAULT_SIZE, real=True,
+                rtol=1e-9, atol=1e-12, repeat=DEFAULT_REPEAT):
+    """
+    Check every candidate against its reference on randomized and real inputs.
+
+    Args:
+        cases: Case names (default: all of CASES)
+        seeds: Number of random seeds per case
+        size: Rows per randomized input (varied +/-50% per seed)
+        real: Also run on data/ and outputs/integrated_analysis inputs
+        rtol, atol: Comparison tolerances
+        repeat: Timing repetitions
+
+    Returns:
+        List of result dicts
+    """
+    results = []
+    for name in cases or CASES:
+        case = CASES[name]
+        inputs = []
+        for seed in range(seeds):
+            rng = np.random.default_rng(seed)
+            n = max(1, int(size * rng.uniform(0.5, 1.5)))
+            inputs.append((f"seed={seed}", case['generate'](rng, n)))
+        if real and case.get('real'):
+            inputs += [(f"real:{label}", args) for label, args in case['real']()]
+        results += check_case(name, inputs, rtol=rtol, atol=atol, repeat=repeat)
+    return results
+
+
+def summarize(results):
+    """Per (case, candidate): inputs checked, failures, median speedup."""
+    frame = pd.DataFrame(results)
+    return frame.groupby(['case', 'candidate'], sort=False).agg(
+        inputs=('ok', 'size'),
+        failures=('ok', lambda ok: int((~ok.astype(bool)).sum())),
+        median_speedup=('speedup', 'median'),
+        real_speedup=('speedup', lambda s: s[frame.loc[s.index, 'input'].str.startswith('real:')].median()),
+        max_abs_diff=('max_abs_diff', 'max'),
+    ).reset_index()
+
+
+def print_report(results):
+    summary = summarize(results)
+    print(f"\n   {'Case':<20} {'Candidate':<18} {'Inputs':>6} {'Fail':>5} {'Speedup':>8} "
+          f"{'Real':>7} {'Max |diff|':>11}")
+    for _, r in summary.iterrows():
+        real = f"{r['real_speedup']:.1f}x" if pd.notna(r['real_speedup']) else '-'
+        speed = f"{r['median_speedup']:.1f}x" if pd.notna(r['median_speedup']) else '-'
+        status = '✓' if r['failures'] == 0 else '❌'
+        print(f" {status} {r['case']:<20} {r['candidate']:<18} {r['inputs']:>6} {r['failures']:>5} "
+              f"{speed:>8} {real:>7} {r['max_abs_diff'] or 0:>11.2e}")
+    for r in results:
+        if not r['ok']:
+            print(f"   ❌ {r['case']}/{r['candidate']} on {r['input']}: {r['error']}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check optimized implementations against the references")
+    parser.add_argument('--cases', nargs='*', choices=list(CASES), default=None, help="Cases to run (default all)")
+    parser.add_argument('--seeds', type=int, default=DEFAULT_SEEDS, help="Random inputs per case")
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help="Rows per random input")
+    parser.add_argument('--no-real', action='store_true', help="Skip inputs from data/ and outputs/")
+    parser.add_argument('--rtol', type=float, default=1e-9, help="Relative tolerance")
+    parser.add_argument('--atol', type=float, default=1e-12, help="Absolute tolerance")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - EQUIVALENCE HARNESS")
+    print("="*70)
+    results = run_harness(cases=args.cases, seeds=args.seeds, size=args.size, real=not args.no_real,
+                          rtol=args.rtol, atol=args.atol)
+    summary = print_report(results)
+    return 1 if summary['failures'].sum() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,6 +14,7 @@ Generated: 2026-01-20
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -31,6 +32,11 @@ BASE_DIR = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "enrolment_analysis")
 PLOTS_FINAL_DIR = os.path.join(OUTPUT_DIR, "plots_final")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from schema_registry import read_dataset_csv, concat_frames
+from calendar_utils import add_calendar_features
+
 # Create output directory
 os.makedirs(PLOTS_FINAL_DIR, exist_ok=True)
 
@@ -85,18 +91,15 @@ def load_processed_data():
     
     print("Loading data...")
     for f in sorted(files):
-        df = pd.read_csv(f)
+        df = read_dataset_csv(f, 'enrolment')
         dfs.append(df)
     
-    df = pd.concat(dfs, ignore_index=True)
+    df = concat_frames(dfs)
     
     # Preprocessing
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
+    add_calendar_features(df, features=['year', 'month', 'is_weekend'])
     df['state'] = df['state'].astype(str).str.strip().str.title().replace(STATE_FIX)
     df['district'] = df['district'].astype(str).str.strip().str.title()
-    df['is_weekend'] = df['date'].dt.day_name().isin(['Saturday', 'Sunday'])
     
     # Features
     df['total_enrol'] = df['age_0_5'] + df['age_5_17'] + df['age_18_greater']
@@ -641,8 +641,8 @@ def main():
     # Load and process data
     print("\n[1/4] Loading and preprocessing data...")
     df = load_demographic_data()
-    df = preprocess_data(df)
-    df = engineer_features(df)
+    df = preprocess_data(df, inplace=True)
+    df = engineer_features(df, inplace=True)
     
     print("\n[2/4] Aggregating data at multiple levels...")
     district_date, state_date, state_month, national_date, national_month = aggregate_levels(df)
@@ -5,16 +5,24 @@ Implements time-series forecasting using Prophet/statsmodels for:
 1. National Enrolment Forecast (6-month projection)
 2. National Updates Forecast
 3. District Risk Analysis (declining trends)
+4. State and District Forecasts (batched engines, all series at once)
+
+Engines (--engine): prophet, trend (single-series linear extrapolation),
+linear and holt (utils/batch_forecast.py). The default, auto, keeps the old
+choice: Prophet when installed, else the simple trend. State and district
+forecasts always use a batched engine (linear unless --engine holt).
 
 Outputs: Forecast visualizations with confidence intervals
 """
 
 import os
 import sys
+import argparse
 import warnings
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy import stats
 from datetime import datetime, timedelta
 
 warnings.filterwarnings('ignore')
@@ -37,12 +45,18 @@ except ImportError:
 # CONFIGURATION
 # ============================================================================
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from batch_forecast import BATCH_ENGINES, series_matrix, forecast_matrix, forecast_frame
+
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
 DATA_FILE = os.path.join(BASE_DIR, "outputs", "integrated_analysis", "integrated_data.csv")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "forecast_plots")
 
 # Forecast parameters
 FORECAST_MONTHS = 6
+INTERVAL_WIDTH = 0.80
+ENGINES = ('auto', 'prophet', 'trend') + BATCH_ENGINES
 
 # ============================================================================
 # DATA LOADING
@@ -88,7 +102,7 @@ def prepare_prophet_data(monthly, value_col):
 # FORECASTING FUNCTIONS
 # ============================================================================
 
-def forecast_with_prophet(monthly, value_col, periods=FORECAST_MONTHS):
+def forecast_with_prophet(monthly, value_col, periods=FORECAST_MONTHS, interval_width=INTERVAL_WIDTH):
     """Generate forecast using Prophet."""
     if not HAS_PROPHET:
         return None, None
@@ -101,7 +115,7 @@ def forecast_with_prophet(monthly, value_col, periods=FORECAST_MONTHS):
         yearly_seasonality=True,
         weekly_seasonality=False,
         daily_seasonality=False,
-        interval_width=0.80
+        interval_width=interval_width
     )
     model.fit(prophet_df)
     
@@ -114,7 +128,7 @@ def forecast_with_prophet(monthly, value_col, periods=FORECAST_MONTHS):
     return model, forecast
 
 
-def forecast_with_simple_trend(monthly, value_col, periods=FORECAST_MONTHS):
+def forecast_with_simple_trend(monthly, value_col, periods=FORECAST_MONTHS, interval_width=INTERVAL_WIDTH):
     """Simple linear trend extrapolation as fallback."""
     
     ts = monthly.set_index('date')[value_col]
@@ -144,17 +158,72 @@ def forecast_with_simple_trend(monthly, value_col, periods=FORECAST_MONTHS):
     
     # Calculate simple confidence interval (based on historical std)
     std = np.std(y_clean)
+    z = stats.norm.ppf(0.5 + interval_width / 2)
     
     forecast = pd.DataFrame({
         'ds': future_dates,
         'yhat': predictions,
-        'yhat_lower': predictions - 1.96 * std,
-        'yhat_upper': predictions + 1.96 * std
+        'yhat_lower': predictions - z * std,
+        'yhat_upper': predictions + z * std
     })
     
     return forecast
 
 
+def forecast_with_batch(monthly, value_col, periods=FORECAST_MONTHS, engine='linear'):
+    """One-series forecast from a batched engine (see utils/batch_forecast.py)."""
+    _, months, Y = series_matrix(monthly, [], value_col)
+    yhat, lower, upper = forecast_matrix(Y, months, periods, engine, INTERVAL_WIDTH)
+    if np.isnan(yhat).all():
+        return None
+    future = pd.period_range(months[-1] + 1, periods=periods, freq='M').to_timestamp()
+    return pd.DataFrame({'ds': future, 'yhat': yhat[0], 'yhat_lower': lower[0], 'yhat_upper': upper[0]})
+
+
+def resolve_engine(engine):
+    """Map 'auto' (and an unavailable Prophet) onto an engine that can run here."""
+    if engine == 'auto':
+        return 'prophet' if HAS_PROPHET else 'trend'
+    if engine == 'prophet' and not HAS_PROPHET:
+        print("⚠️ Prophet not installed; using the batched linear engine instead.")
+        return 'linear'
+    return engine
+
+
+def forecast_series(monthly, value_col, engine, periods=FORECAST_MONTHS):
+    """National forecast with the chosen engine."""
+    if engine == 'prophet':
+        _, forecast = forecast_with_prophet(monthly, value_col, periods)
+        return forecast
+    if engine == 'trend':
+        return forecast_with_simple_trend(monthly, value_col, periods)
+    return forecast_with_batch(monthly, value_col, periods, engine)
+
+
+def forecast_regions(df, keys, engine='linear', periods=FORECAST_MONTHS,
+                     value_cols=('total_enrol', 'total_updates')):
+    """
+    Forecast every state or district series in one batched fit per metric.
+
+    Args:
+        df: Integrated frame with a 'date' column
+        keys: ['state'] or ['state', 'district']
+        engine: One of BATCH_ENGINES
+        periods: Months to forecast
+        value_cols: Metrics to forecast
+
+    Returns:
+        Long DataFrame: keys, metric, ds, yhat, yhat_lower, yhat_upper
+    """
+    forecasts = []
+    for value_col in value_cols:
+        labels, months, Y = series_matrix(df, keys, value_col)
+        forecast = forecast_frame(labels, months, Y, periods, engine, INTERVAL_WIDTH)
+        forecast.insert(len(keys), 'metric', value_col)
+        forecasts.append(forecast)
+    return pd.concat(forecasts, ignore_index=True)
+
+
 # ============================================================================
 # VISUALIZATION
 # ============================================================================
@@ -320,10 +389,11 @@ def plot_declining_districts(trends_df, output_file, n_top=20):
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
+def main(engine='auto'):
+    engine = resolve_engine(engine)
     print("=" * 60)
     print("📈 UIDAI FORECAST ANALYSIS")
-    print(f"    Generating {FORECAST_MONTHS}-Month Predictions")
+    print(f"    Generating {FORECAST_MONTHS}-Month Predictions (engine: {engine})")
     print("=" * 60)
     
     # Load data
@@ -335,10 +405,7 @@ def main():
     
     # 1. Enrolment Forecast
     print("\n1️⃣ Forecasting Total Enrolments...")
-    if HAS_PROPHET:
-        _, forecast_enrol = forecast_with_prophet(monthly, 'total_enrol')
-    else:
-        forecast_enrol = forecast_with_simple_trend(monthly, 'total_enrol')
+    forecast_enrol = forecast_series(monthly, 'total_enrol', engine)
     
     plot_forecast(monthly, forecast_enrol, 'total_enrol',
                  '📊 National Enrolment Forecast\nUIDAI Data Hackathon 2026',
@@ -347,10 +414,7 @@ def main():
     
     # 2. Updates Forecast
     print("\n2️⃣ Forecasting Total Updates...")
-    if HAS_PROPHET:
-        _, forecast_updates = forecast_with_prophet(monthly, 'total_updates')
-    else:
-        forecast_updates = forecast_with_simple_trend(monthly, 'total_updates')
+    forecast_updates = forecast_series(monthly, 'total_updates', engine)
     
     plot_forecast(monthly, forecast_updates, 'total_updates',
                  '📊 National Updates Forecast\nUIDAI Data Hackathon 2026',
@@ -367,8 +431,18 @@ def main():
     declining.to_csv(declining_path, index=False)
     print(f"   ✅ Saved: {declining_path}")
     
-    # 4. Combined Forecast Summary
-    print("\n4️⃣ Creating Forecast Summary...")
+    # 4. State and District Forecasts
+    regional_engine = engine if engine in BATCH_ENGINES else 'linear'
+    print(f"\n4️⃣ Forecasting every state and district ({regional_engine})...")
+    for keys, name in ((['state'], 'state_forecasts.csv'), (['state', 'district'], 'district_forecasts.csv')):
+        regional = forecast_regions(df, keys, regional_engine)
+        regional_path = os.path.join(OUTPUT_DIR, name)
+        regional.to_csv(regional_path, index=False)
+        n_series = len(regional) // (2 * FORECAST_MONTHS)
+        print(f"   ✅ Saved: {regional_path} ({n_series:,} series)")
+
+    # 5. Combined Forecast Summary
+    print("\n5️⃣ Creating Forecast Summary...")
     
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
     
@@ -432,4 +506,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='UIDAI national, state and district forecasts')
+    parser.add_argument('--engine', choices=ENGINES, default='auto',
+                        help='auto: Prophet if installed, else the simple trend; '
+                             'linear/holt: batched engines in utils/batch_forecast.py')
+    args = parser.parse_args()
+    main(engine=args.engine)
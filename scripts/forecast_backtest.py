@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Forecast Backtesting
+Rolling-origin cross-validation of every available forecast engine.
+
+This module provides:
+- rolling_origins(): fold origins (train on months [0, o), test [o, o+h))
+- backtest_level(): forecasts every fold of every series of one hierarchy
+  level with one engine; cache misses run in a process pool
+- score_folds(): MAPE, sMAPE and coverage of the interval_width bands
+- select_engines(): per level, the fastest engine whose sMAPE is within
+  a tolerance of the best one
+- main(): national / state / district backtest of the integrated data
+
+Engines are the ones forecast_analysis.py can run here: trend, linear,
+holt and (when installed) prophet. Per-series engines (trend, prophet)
+are run one series at a time exactly as forecast_analysis.py runs them;
+the batched engines get a whole chunk of series per call.
+
+Fold results are cached per series in outputs/forecast_backtest: the key
+hashes the engine, horizon, interval width, first month and the series'
+training values, so a rerun only fits series whose history changed.
+
+Usage:
+    python scripts/forecast_backtest.py
+    python scripts/forecast_backtest.py --engines linear holt --levels district -j 8
+    python scripts/forecast_backtest.py --horizon 3 --min-train 6 --tolerance 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from batch_forecast import BATCH_ENGINES, series_matrix, forecast_matrix
+import forecast_analysis as fa
+
+BACKTEST_DIR = os.path.join(BASE_DIR, "outputs", "forecast_backtest")
+CACHE_FILE = os.path.join(BACKTEST_DIR, "fold_cache.json")
+SUMMARY_FILE = os.path.join(BACKTEST_DIR, "backtest_summary.csv")
+SELECTION_FILE = os.path.join(BACKTEST_DIR, "selected_engines.json")
+
+# Bump when an engine or the fold layout changes (invalidates the cache)
+BACKTEST_VERSION = 2
+
+LEVELS = {'national': [], 'state': ['state'], 'district': ['state', 'district']}
+VALUE_COLS = ('total_enrol', 'total_updates')
+HORIZON = 3
+MIN_TRAIN = 6
+CHUNK_SERIES = 128
+
+
+# ============================================================================
+# ENGINES
+# ============================================================================
+def available_engines():
+    """Engines forecast_analysis.py can run in this environment."""
+    return ['trend'] + list(BATCH_ENGINES) + (['prophet'] if fa.HAS_PROPHET else [])
+
+
+def _forecast_one(engine, months, values, horizon, interval_width):
+    """Single-series engine on one history; NaN arrays when it cannot fit."""
+    monthly = pd.DataFrame({'date': months.to_timestamp(), 'value': values})
+    empty = np.full((3, horizon), np.nan)
+    if np.isfinite(values).sum() < 2:
+        return empty
+    if engine == 'prophet':
+        _, forecast = fa.forecast_with_prophet(monthly, 'value', horizon, interval_width)
+        forecast = forecast.tail(horizon)
+    else:
+        forecast = fa.forecast_with_simple_trend(monthly, 'value', horizon, interval_width)
+    if forecast is None:
+        return empty
+    return forecast[['yhat', 'yhat_lower', 'yhat_upper']].to_numpy(dtype=float).T
+
+
+def _run_chunk(engine, train, months, horizon, interval_width):
+    """
+    Forecast a chunk of training histories (process-pool worker).
+
+    Returns:
+        (yhat, lower, upper, seconds per series)
+    """
+    start = time.perf_counter()
+    if engine in BATCH_ENGINES:
+        yhat, lower, upper = forecast_matrix(train, months, horizon, engine, interval_width)
+    else:
+        bands = np.stack([_forecast_one(engine, months, row, horizon, interval_width) for row in train])
+        yhat, lower, upper = bands[:, 0], bands[:, 1], bands[:, 2]
+    return yhat, lower, upper, (time.perf_counter() - start) / max(len(train), 1)
+
+
+# ============================================================================
+# FOLDS
+# ============================================================================
+def rolling_origins(n_months, horizon=HORIZON, min_train=MIN_TRAIN, step=1):
+    """Training lengths o with a full test window [o, o + horizon)."""
+    return list(range(min_train, n_months - horizon + 1, step))
+
+
+def fold_key(engine, months, train, horizon, interval_width):
+    """Cache key of one series' fold: engine settings + first month + training values."""
+    digest = hashlib.sha1(f"{BACKTEST_VERSION}|{engine}|{horizon}|{interval_width}|{months[0]}|".encode())
+    digest.update(np.ascontiguousarray(train, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def _load_cache(cache_path):
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as fp:
+            cache = json.load(fp)
+        if cache.get('version') == BACKTEST_VERSION:
+            return cache['folds']
+    return {}
+
+
+def _save_cache(cache_path, folds):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w') as fp:
+        json.dump({'version': BACKTEST_VERSION, 'folds': folds}, fp)
+
+
+def backtest_level(Y, months, engine, horizon=HORIZON, min_train=MIN_TRAIN, interval_width=fa.INTERVAL_WIDTH,
+                   cache=None, pool=None):
+    """
+    Rolling-origin forecasts of every series in Y with one engine.
+
+    Args:
+        Y: Float array (series x months), NaN for missing
+        months: PeriodIndex matching Y's columns
+        engine: 'trend', 'prophet' or one of BATCH_ENGINES
+        horizon: Months forecast from each origin
+        min_train: Months in the first training window
+        interval_width: Band coverage requested from the engine
+        cache: {fold key: result} dict, updated in place (None = no cache)
+        pool: Executor for cache misses (None = run inline)
+
+    Returns:
+        (DataFrame of folds: series, origin, step, actual, yhat, yhat_lower,
+         yhat_upper; seconds spent fitting, cached folds included)
+    """
+    cache = {} if cache is None else cache
+    folds, misses, seconds = [], [], 0.0
+    for origin in rolling_origins(Y.shape[1], horizon, min_train):
+        train, test = Y[:, :origin], Y[:, origin:origin + horizon]
+        keys = [fold_key(engine, months, row, horizon, interval_width) for row in train]
+        folds.append((origin, test, keys))
+        todo = [i for i, key in enumerate(keys) if key not in cache]
+        for start in range(0, len(todo), CHUNK_SERIES):
+            rows = todo[start:start + CHUNK_SERIES]
+            misses.append(([keys[i] for i in rows], (engine, train[rows], months[:origin], horizon, interval_width)))
+
+    if misses:
+        if pool is not None:
+            results = list(pool.map(_run_chunk, *zip(*[args for _, args in misses])))
+        else:
+            results = [_run_chunk(*args) for _, args in misses]
+        for (keys, _), (yhat, lower, upper, per_series) in zip(misses, results):
+            for key, f, lo, hi in zip(keys, yhat, lower, upper):
+                cache[key] = {'yhat': f.tolist(), 'lower': lo.tolist(), 'upper': hi.tolist(),
+                              'seconds': per_series}
+
+    frames = []
+    steps = np.arange(1, horizon + 1)
+    for origin, test, keys in folds:
+        entries = [cache[key] for key in keys]
+        seconds += sum(entry['seconds'] for entry in entries)
+        frames.append(pd.DataFrame({
+            'series': np.repeat(np.arange(len(keys)), horizon),
+            'origin': str(months[origin]),
+            'step': np.tile(steps, len(keys)),
+            'actual': test.ravel(),
+            'yhat': np.array([entry['yhat'] for entry in entries], dtype=float).ravel(),
+            'yhat_lower': np.array([entry['lower'] for entry in entries], dtype=float).ravel(),
+            'yhat_upper': np.array([entry['upper'] for entry in entries], dtype=float).ravel(),
+        }))
+    columns = ['series', 'origin', 'step', 'actual', 'yhat', 'yhat_lower', 'yhat_upper']
+    return (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)), seconds
+
+
+# ============================================================================
+# SCORING
+# ============================================================================
+def score_folds(folds):
+    """
+    Accuracy of backtest folds (points with an actual and a forecast).
+
+    MAPE skips zero actuals; sMAPE = 2|a - f| / (|a| + |f|) skips 0/0.
+    Coverage is the share of actuals inside [yhat_lower, yhat_upper], over
+    the points whose engine produced a band (NaN bounds are left out).
+
+    Returns:
+        dict with points, mape, smape, coverage (percentages)
+    """
+    scored = folds.dropna(subset=['actual', 'yhat'])
+    actual, forecast = scored['actual'].to_numpy(dtype=float), scored['yhat'].to_numpy(dtype=float)
+    error = np.abs(actual - forecast)
+    nonzero = actual != 0
+    scale = np.abs(actual) + np.abs(forecast)
+    lower, upper = scored['yhat_lower'].to_numpy(dtype=float), scored['yhat_upper'].to_numpy(dtype=float)
+    banded = ~np.isnan(lower) & ~np.isnan(upper)
+    inside = (actual >= lower) & (actual <= upper)
+    return {
+        'points': len(scored),
+        'mape': (error[nonzero] / np.abs(actual[nonzero])).mean() * 100 if nonzero.any() else np.nan,
+        'smape': (2 * error[scale > 0] / scale[scale > 0]).mean() * 100 if (scale > 0).any() else np.nan,
+        'coverage': inside[banded].mean() * 100 if banded.any() else np.nan,
+    }
+
+
+def select_engines(summary, tolerance=0.1):
+    """
+    Fastest engine per level whose mean sMAPE is within `tolerance` (relative)
+    of the most accurate engine at that level.
+
+    Args:
+        summary: Output of run_backtest() (level, metric, engine, smape, seconds)
+        tolerance: 0.1 = up to 10% worse sMAPE than the best is accurate enough
+
+    Returns:
+        {level: engine}
+    """
+    per_engine = summary.groupby(['level', 'engine'], sort=False)[['smape', 'seconds']].mean().reset_index()
+    selected = {}
+    for level, group in per_engine.groupby('level', sort=False):
+        group = group.dropna(subset=['smape'])
+        if group.empty:
+            continue
+        good = group[group['smape'] <= group['smape'].min() * (1 + tolerance)]
+        selected[level] = good.sort_values(['seconds', 'smape'])['engine'].iloc[0]
+    return selected
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+def run_backtest(df, engines=None, levels=None, horizon=HORIZON, min_train=MIN_TRAIN,
+                 interval_width=fa.INTERVAL_WIDTH, jobs=None, cache_path=CACHE_FILE, force=False):
+    """
+    Backtest each engine at each hierarchy level for both metrics.
+
+    Args:
+        df: Integrated frame with a 'date' column
+        engines: Engine names (default: available_engines())
+        levels: Subset of LEVELS (default: all)
+        horizon, min_train, interval_width: Fold settings
+        jobs: Worker processes (default: CPU count; 1 = inline)
+        cache_path: Fold cache file (None = no cache)
+        force: Ignore cached folds
+
+    Returns:
+        DataFrame: level, metric, engine, series, folds, points, mape,
+        smape, coverage, seconds
+    """
+    engines = engines or available_engines()
+    levels = levels or list(LEVELS)
+    cache = {} if force else _load_cache(cache_path)
+    jobs = jobs or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+
+    rows = []
+    try:
+        for level in levels:
+            for value_col in VALUE_COLS:
+                _, months, Y = series_matrix(df, LEVELS[level], value_col)
+                n_folds = len(rolling_origins(Y.shape[1], horizon, min_train))
+                for engine in engines:
+                    folds, seconds = backtest_level(Y, months, engine, horizon, min_train, interval_width,
+                                                    cache, pool)
+                    rows.append({'level': level, 'metric': value_col, 'engine': engine,
+                                 'series': len(Y), 'folds': n_folds, **score_folds(folds),
+                                 'seconds': seconds})
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if cache_path:
+        _save_cache(cache_path, cache)
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the forecast engines")
+    parser.add_argument('--engines', nargs='+', choices=['trend', 'prophet'] + list(BATCH_ENGINES),
+                        help="Engines to test (default: every available one)")
+    parser.add_argument('--levels', nargs='+', choices=list(LEVELS), help="Hierarchy levels (default: all)")
+    parser.add_argument('--horizon', type=int, default=HORIZON, help="Months forecast per fold")
+    parser.add_argument('--min-train', type=int, default=MIN_TRAIN, help="Months in the first training window")
+    parser.add_argument('--interval-width', type=float, default=fa.INTERVAL_WIDTH, help="Band coverage to test")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Relative sMAPE slack when picking the fastest engine per level")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="Parallel workers")
+    parser.add_argument('--force', action='store_true', help="Ignore cached folds")
+    args = parser.parse_args()
+
+    engines = args.engines or available_engines()
+    if 'prophet' in engines and not fa.HAS_PROPHET:
+        print("❌ Prophet is not installed")
+        return 1
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - FORECAST BACKTEST")
+    print("="*70)
+    df, _ = fa.load_and_prepare_data()
+    start = time.perf_counter()
+    summary = run_backtest(df, engines, args.levels, args.horizon, args.min_train, args.interval_width,
+                           args.jobs, force=args.force)
+    print(f"  ✓ {len(summary)} backtests in {time.perf_counter() - start:.1f}s\n")
+
+    if summary['folds'].max() == 0:
+        print(f"❌ Need at least {args.min_train + args.horizon} months of data for one fold")
+        return 1
+
+    print("📊 ROLLING-ORIGIN ACCURACY")
+    print("-" * 70)
+    print(f"  {'level':9} {'metric':14} {'engine':8} {'series':>7} {'MAPE%':>8} {'sMAPE%':>8} "
+          f"{'cover%':>7} {'fit s':>8}")
+    for row in summary.itertuples():
+        print(f"  {row.level:9} {row.metric:14} {row.engine:8} {row.series:>7,} {row.mape:>8.1f} "
+              f"{row.smape:>8.1f} {row.coverage:>7.1f} {row.seconds:>8.2f}")
+    print(f"\n  Target coverage: {args.interval_width * 100:.0f}%")
+
+    selected = select_engines(summary, args.tolerance)
+    print("\n🏁 FASTEST ENGINE WITHIN "
+          f"{args.tolerance * 100:.0f}% OF THE BEST sMAPE")
+    print("-" * 70)
+    for level, engine in selected.items():
+        print(f"  {level:9}: {engine}")
+
+    os.makedirs(BACKTEST_DIR, exist_ok=True)
+    summary.to_csv(SUMMARY_FILE, index=False)
+    with open(SELECTION_FILE, 'w') as fp:
+        json.dump(selected, fp, indent=1)
+    print(f"\n📁 Summary: {SUMMARY_FILE}")
+    print(f"📁 Selection: {SELECTION_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,10 +9,15 @@ import pandas as pd
 import folium
 from folium import plugins
 import os
+import sys
 import numpy as np
 import re
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'utils'))
+from metrics_kernel import compute_metrics
+from schema_registry import read_dataset_csv, concat_frames
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -175,7 +180,7 @@ def load_all_data():
         'data/api_data_aadhar_enrolment/api_data_aadhar_enrolment_500000_1000000.csv',
         'data/api_data_aadhar_enrolment/api_data_aadhar_enrolment_1000000_1006029.csv'
     ]
-    enrol_df = pd.concat([pd.read_csv(f) for f in enrol_files], ignore_index=True)
+    enrol_df = concat_frames([read_dataset_csv(f, 'enrolment') for f in enrol_files])
     
     print("Loading biometric data...")
     bio_files = [
@@ -184,7 +189,7 @@ def load_all_data():
         'data/api_data_aadhar_biometric/api_data_aadhar_biometric_1000000_1500000.csv',
         'data/api_data_aadhar_biometric/api_data_aadhar_biometric_1500000_1861108.csv'
     ]
-    bio_df = pd.concat([pd.read_csv(f) for f in bio_files], ignore_index=True)
+    bio_df = concat_frames([read_dataset_csv(f, 'biometric') for f in bio_files])
     
     print("Loading demographic data...")
     demo_files = [
@@ -194,7 +199,7 @@ def load_all_data():
         'data/api_data_aadhar_demographic/api_data_aadhar_demographic_1500000_2000000.csv',
         'data/api_data_aadhar_demographic/api_data_aadhar_demographic_2000000_2071700.csv'
     ]
-    demo_df = pd.concat([pd.read_csv(f) for f in demo_files], ignore_index=True)
+    demo_df = concat_frames([read_dataset_csv(f, 'demographic') for f in demo_files])
     
     # Standardize names
     print("Standardizing state and district names...")
@@ -214,45 +219,45 @@ def calculate_district_metrics(enrol_df, bio_df, demo_df):
         'age_5_17': 'sum',
         'age_18_greater': 'sum'
     }).reset_index()
-    enrol_agg['total_enrol'] = enrol_agg['age_0_5'] + enrol_agg['age_5_17'] + enrol_agg['age_18_greater']
-    enrol_agg['child_enrol'] = enrol_agg['age_0_5'] + enrol_agg['age_5_17']
-    enrol_agg['child_enrol_share'] = enrol_agg['child_enrol'] / enrol_agg['total_enrol'].replace(0, 1)
     
     # Aggregate biometric updates
     bio_agg = bio_df.groupby(['state', 'district']).agg({
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum'
     }).reset_index()
-    bio_agg.columns = ['state', 'district', 'bio_child', 'bio_adult']
-    bio_agg['total_bio'] = bio_agg['bio_child'] + bio_agg['bio_adult']
-    bio_agg['bio_child_share'] = bio_agg['bio_child'] / bio_agg['total_bio'].replace(0, 1)
     
     # Aggregate demographic updates
     demo_agg = demo_df.groupby(['state', 'district']).agg({
         'demo_age_5_17': 'sum',
         'demo_age_17_': 'sum'
     }).reset_index()
-    demo_agg.columns = ['state', 'district', 'demo_child', 'demo_adult']
-    demo_agg['total_demo'] = demo_agg['demo_child'] + demo_agg['demo_adult']
-    demo_agg['demo_child_share'] = demo_agg['demo_child'] / demo_agg['total_demo'].replace(0, 1)
     
     # Merge all data - use outer join to include ALL districts
     merged = enrol_agg.merge(bio_agg, on=['state', 'district'], how='outer')
     merged = merged.merge(demo_agg, on=['state', 'district'], how='outer')
     merged = merged.fillna(0)
     
-    # Calculate combined metrics
-    merged['total_updates'] = merged['total_bio'] + merged['total_demo']
+    # Shares and totals from the shared metric registry
+    compute_metrics(merged, [
+        'total_enrol', 'total_bio', 'total_demo', 'total_updates',
+        'enrol_child_share', 'bio_minor_share', 'demo_minor_share',
+        'child_share_updates',
+    ], aliases={
+        'enrol_child_share': 'child_enrol_share',
+        'bio_minor_share': 'bio_child_share',
+        'demo_minor_share': 'demo_child_share',
+        'child_share_updates': 'child_update_share',
+    })
+    merged['child_enrol'] = merged['age_0_5'] + merged['age_5_17']
+    merged = merged.rename(columns={
+        'bio_age_5_17': 'bio_child', 'bio_age_17_': 'bio_adult',
+        'demo_age_5_17': 'demo_child', 'demo_age_17_': 'demo_adult',
+    })
     merged['child_updates'] = merged['bio_child'] + merged['demo_child']
     merged['adult_updates'] = merged['bio_adult'] + merged['demo_adult']
     
-    # Child update share (within updates)
-    merged['child_update_share'] = merged['child_updates'] / merged['total_updates'].replace(0, 1)
-    
     # BIOMETRIC child share is the key metric - this captures school-based drives
     # Use biometric child share as the primary indicator (higher = better)
-    merged['bio_child_share'] = merged['bio_child'] / merged['total_bio'].replace(0, 1)
-    
     # Child attention gap: biometric child share - 0.5 (parity benchmark)
     # Positive = more children than adults in biometric updates
     # Negative = fewer children than adults  
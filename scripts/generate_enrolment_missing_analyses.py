@@ -8,6 +8,7 @@ Generated: 2026-01-20
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -20,6 +21,10 @@ warnings.filterwarnings('ignore')
 # ============================================================================
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
+
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from window_kernels import GroupedWindows
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "enrolment_analysis")
 # Output strictly to plots_final to match core script
 PLOTS_FINAL_DIR = os.path.join(OUTPUT_DIR, "plots_final")
@@ -221,9 +226,9 @@ def create_13_campaign_index(df):
     monthly = df.groupby(['state', 'year_month'])['total_enrol'].sum().reset_index()
     monthly = monthly.sort_values(['state', 'year_month'])
     
-    monthly['rolling_3m'] = monthly.groupby('state')['total_enrol'].transform(
-        lambda x: x.rolling(3, min_periods=1).mean().shift(1)
-    )
+    # Mean of the previous 3 months per state (rolling(3).mean().shift(1))
+    monthly['rolling_3m'] = GroupedWindows(monthly, 'state').rolling(
+        ['total_enrol'], 3, 'mean', min_periods=1, lag=1)['total_enrol']
     monthly['index'] = monthly['total_enrol'] / monthly['rolling_3m']
     monthly['index'] = monthly['index'].clip(upper=5) # Cap outliers
     
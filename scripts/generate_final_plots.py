@@ -15,6 +15,7 @@ Date: January 18, 2026
 """
 
 import os
+import sys
 import glob
 import pandas as pd
 import numpy as np
@@ -35,6 +36,11 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 DATA_DIR_ENROL = os.path.join(DATA_DIR, "api_data_aadhar_enrolment")
 DATA_DIR_BIO = os.path.join(DATA_DIR, "api_data_aadhar_biometric")
 DATA_DIR_DEMO = os.path.join(DATA_DIR, "api_data_aadhar_demographic")
+
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from schema_registry import read_dataset_csv, concat_frames, infer_dataset
+from calendar_utils import parse_dates, add_calendar_features
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "plots_final")
 
 # Visual theme
@@ -70,7 +76,7 @@ def load_dataset(directory, name):
     dfs = []
     for file in files:
         try:
-            df = pd.read_csv(file)
+            df = read_dataset_csv(file, infer_dataset(directory))
             dfs.append(df)
         except Exception as e:
             print(f"  ERROR loading {file}: {e}")
@@ -78,7 +84,7 @@ def load_dataset(directory, name):
     if not dfs:
         return pd.DataFrame()
     
-    combined = pd.concat(dfs, ignore_index=True)
+    combined = concat_frames(dfs)
     print(f"  Loaded {len(combined):,} records from {len(files)} files")
     return combined
 
@@ -88,14 +94,12 @@ def preprocess_data(df, name):
         return df
     
     # Parse dates
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    df['date'] = parse_dates(df['date'])
     df = df.dropna(subset=['date'])
     
-    # Extract time components
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    df['dayofweek'] = df['date'].dt.dayofweek  # 0=Monday, 6=Sunday
-    df['is_weekend'] = df['dayofweek'].isin([5, 6])
+    # Extract time components (dayofweek: 0=Monday, 6=Sunday)
+    add_calendar_features(df, features={'year': 'year', 'month': 'month',
+                                        'weekday': 'dayofweek', 'is_weekend': 'is_weekend'})
     
     # Clean state names
     df['state'] = df['state'].str.strip().str.title()
@@ -38,6 +38,10 @@ from demographic_deep_analysis import (
     calculate_concentration
 )
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from window_kernels import GroupedWindows
+
 # Configuration
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "demographic_analysis")
@@ -373,9 +377,10 @@ def plot_analysis_07_spike_detection(national_date, output_dir):
             color=FORENSIC_COLORS['primary'], linewidth=1.5, alpha=0.8,
             label='Daily Updates')
     
-    # Calculate rolling statistics for spike detection
-    rolling_mean = national_date['total_demo'].rolling(window=7, center=True).mean()
-    rolling_std = national_date['total_demo'].rolling(window=7, center=True).std()
+    # Calculate rolling statistics for spike detection (centred 7-day window)
+    windows = GroupedWindows(national_date)
+    rolling_mean = windows.rolling(['total_demo'], 7, 'mean', center=True)['total_demo']
+    rolling_std = windows.rolling(['total_demo'], 7, 'std', center=True)['total_demo']
     
     # Define threshold for spikes (3 standard deviations above mean)
     threshold = rolling_mean + 3 * rolling_std
@@ -452,8 +457,8 @@ def main():
     # Load and process data
     print("\n[1/4] Loading and preprocessing data...")
     df = load_demographic_data()
-    df = preprocess_data(df)
-    df = engineer_features(df)
+    df = preprocess_data(df, inplace=True)
+    df = engineer_features(df, inplace=True)
     
     print("\n[2/4] Aggregating data at multiple levels...")
     district_date, state_date, state_month, national_date, national_month = aggregate_levels(df)
@@ -4,6 +4,8 @@ Generate 4 New High-Impact Analyses for UIDAI Integrated Analysis
 Based on Forensic Audit Recommendations
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -11,6 +13,10 @@ import seaborn as sns
 from pathlib import Path
 from scipy.stats import pearsonr
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
+from window_kernels import GroupedWindows
+
 # Set style
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
@@ -36,7 +42,7 @@ state_month = df.groupby(['state', 'month'])['total_intensity'].sum().reset_inde
 state_month = state_month.sort_values(['state', 'month'])
 
 # Calculate growth rate
-state_month['growth_rate'] = state_month.groupby('state')['total_intensity'].pct_change() * 100
+state_month['growth_rate'] = GroupedWindows(state_month, 'state').pct_change(['total_intensity'])['total_intensity'] * 100
 
 # Pivot for heatmap
 pivot_growth = state_month.pivot(index='state', columns='month', values='growth_rate')
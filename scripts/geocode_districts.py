@@ -8,6 +8,7 @@ Creates a comprehensive coordinates file for accurate map generation.
 import pandas as pd
 import json
 import os
+import sys
 import time
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
@@ -19,6 +20,10 @@ DATA_DIR = "data"
 OUTPUT_FILE = os.path.join(DATA_DIR, "all_district_coordinates.json")
 ENROL_DIR = os.path.join(DATA_DIR, "api_data_aadhar_enrolment")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "utils"))
+from schema_registry import read_dataset_csv
+
 # Rate limiting - Nominatim requires 1 request per second max
 RATE_LIMIT_SECONDS = 1.1
 
@@ -120,7 +125,7 @@ def load_all_districts():
     for filename in os.listdir(ENROL_DIR):
         if filename.endswith('.csv'):
             filepath = os.path.join(ENROL_DIR, filename)
-            df = pd.read_csv(filepath)
+            df = read_dataset_csv(filepath, 'enrolment', columns=['state', 'district'])
             
             for _, row in df.iterrows():
                 state = standardize_state(row['state'])
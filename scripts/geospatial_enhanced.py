@@ -22,6 +22,7 @@ from scipy import stats
 # Import data quality validator
 sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
 from data_quality_validator import validate_state_data
+from plot_registry import PlotRegistry
 
 warnings.filterwarnings('ignore')
 
@@ -490,6 +491,7 @@ def main():
     
     # Load and validate data
     df, state_data, quality_report = load_and_validate_data()
+    plots = PlotRegistry(OUTPUT_DIR)
     
     print("\\n" + "=" * 70)
     print("📊 CREATING ENHANCED VISUALIZATIONS")
@@ -497,37 +499,47 @@ def main():
     
     # 1. Enhanced Update Intensity Map (FIXED VERSION)
     print("\\n1️⃣ Creating Enhanced Update Intensity Map (Quality-Annotated)...")
-    create_enhanced_intensity_map(
+    plots.add(
+        create_enhanced_intensity_map,
         state_data, 
         quality_report,
-        '01_update_intensity_map_enhanced.png'
+        '01_update_intensity_map_enhanced.png',
+        outputs='01_update_intensity_map_enhanced.png'
     )
     
     # 2. Enhanced Child Attention Gap Map (with CIs)
     print("\\n2️⃣ Creating Enhanced Child Attention Gap Map (with Confidence Intervals)...")
-    create_enhanced_child_gap_map(
+    plots.add(
+        create_enhanced_child_gap_map,
         state_data,
         quality_report,
-        '02_child_gap_map_enhanced.png'
+        '02_child_gap_map_enhanced.png',
+        outputs='02_child_gap_map_enhanced.png'
     )
     
     # 3. Enhanced State Performance Matrix (with warnings)
     print("\\n3️⃣ Creating Enhanced State Performance Matrix (with Interpretation Warnings)...")
-    create_enhanced_performance_matrix(
+    plots.add(
+        create_enhanced_performance_matrix,
         state_data,
-        '03_state_performance_matrix_enhanced.png'
+        '03_state_performance_matrix_enhanced.png',
+        outputs='03_state_performance_matrix_enhanced.png'
     )
     
     # 4. Enhanced Geographic Choropleth (if available)
     gdf = load_india_shapefile() if HAS_GEOPANDAS else None
     if gdf is not None:
         print("\\n4️⃣ Creating Enhanced Geographic Choropleth...")
-        create_enhanced_choropleth(
+        plots.add(
+            create_enhanced_choropleth,
             gdf,
             state_data,
-            '04_india_choropleth_enhanced.png'
+            '04_india_choropleth_enhanced.png',
+            outputs='04_india_choropleth_enhanced.png'
         )
     
+    plots.render()
+    
     print("\\n" + "=" * 70)
     print("✅ ENHANCED GEOSPATIAL ANALYSIS COMPLETE")
     print(f"   Output directory: {OUTPUT_DIR}")
@@ -10,11 +10,14 @@ Author: UIDAI Hackathon Team
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import glob
+import argparse
+from contextlib import ExitStack
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
@@ -30,15 +33,28 @@ DEMO_DIR = os.path.join(DATA_DIR, "api_data_aadhar_demographic")
 BIO_DIR = os.path.join(DATA_DIR, "api_data_aadhar_biometric")
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "integrated_analysis")
 PLOTS_DIR = os.path.join(OUTPUT_DIR, "plots")
+# state=/year=/month= partitions of integrated_data.csv (single-state loads in uidai.py)
+PARTITIONS_DIR = os.path.join(OUTPUT_DIR, "partitions")
+GEO_DIMENSION_FILE = os.path.join(BASE_DIR, "outputs", "geo_dimension", "geo_dimension.csv")
+
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from metrics_kernel import compute_metrics, ENROLMENT_SHARE_METRICS, CROSS_DOMAIN_METRICS
+from memory_utils import MemoryReport, enable_copy_on_write, ensure_owned
+from profiler import PhaseProfiler, profile_phase
+from quantile_sketch import sketch_values
+from schema_registry import read_dataset_csv, concat_frames, map_distinct, to_state_category, CATEGORICAL_GEO
+from calendar_utils import parse_dates, add_calendar_features
+from geo_dimension import GeoDimension
+from partitioned_store import write_partitions
 
 # Import comprehensive data utilities
 try:
     from data_utils import (
         normalize_state_name,
         normalize_district_name,
-        deduplicate_data,
-        filter_valid_activity,
         validate_data_quality,
+        union_align,
     )
     USE_DATA_UTILS = True
 except ImportError:
@@ -76,75 +92,91 @@ INVALID_STATES = {
 
 EPS = 1e-10  # Small epsilon for division
 
+# Columns each phase actually needs (explicit projection at load time)
+RAW_COLUMNS = {
+    'Enrolment': ['date', 'state', 'district', 'pincode', 'age_0_5', 'age_5_17', 'age_18_greater'],
+    'Demographic': ['date', 'state', 'district', 'pincode', 'demo_age_5_17', 'demo_age_17_'],
+    'Biometric': ['date', 'state', 'district', 'pincode', 'bio_age_5_17', 'bio_age_17_'],
+}
+
 # ============================================================================
 # DATA LOADING
 # ============================================================================
-def load_dataset(data_dir, name):
-    """Load all CSVs from a directory."""
+def load_dataset(data_dir, name, columns=None):
+    """Load all CSVs from a directory with the dataset schema, optionally reading only `columns`."""
     files = glob.glob(os.path.join(data_dir, "*.csv"))
     dfs = []
     for f in sorted(files):
-        df = pd.read_csv(f)
+        df = read_dataset_csv(f, name.lower(), columns)
         dfs.append(df)
-    data = pd.concat(dfs, ignore_index=True)
+    data = concat_frames(dfs)
+    del dfs
     print(f"  ✓ Loaded {name}: {len(data):,} rows from {len(files)} files")
     return data
 
-def load_all_data():
-    """Load all three datasets."""
+def load_all_data(project=False):
+    """Load all three datasets (only the columns the pipeline uses if project=True)."""
     print("\n" + "="*70)
     print("PHASE 1: DATA LOADING")
     print("="*70)
     
-    enrol = load_dataset(ENROL_DIR, "Enrolment")
-    demo = load_dataset(DEMO_DIR, "Demographic")
-    bio = load_dataset(BIO_DIR, "Biometric")
+    enrol = load_dataset(ENROL_DIR, "Enrolment", RAW_COLUMNS['Enrolment'] if project else None)
+    demo = load_dataset(DEMO_DIR, "Demographic", RAW_COLUMNS['Demographic'] if project else None)
+    bio = load_dataset(BIO_DIR, "Biometric", RAW_COLUMNS['Biometric'] if project else None)
     
     return enrol, demo, bio
 
 # ============================================================================
 # DATA PREPROCESSING
 # ============================================================================
-def preprocess(df, name):
-    """Clean and standardize a dataset."""
-    df = df.copy()
+def preprocess(df, name, inplace=False, geo_dim=None):
+    """
+    Clean and standardize a dataset.
+    
+    All row filters (invalid date, invalid state, duplicate) are combined into
+    a single mask so the frame is sliced once. With inplace=True the caller
+    hands over ownership of df and no defensive copy is made. With a
+    GeoDimension, an integer district_id key is added for aggregation.
+    """
+    df = ensure_owned(df, inplace)
     initial_len = len(df)
     
     # Parse dates
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-    # Remove rows with invalid dates
-    df = df[df['date'].notna()]
-    df['year'] = df['date'].dt.year
-    df['month'] = df['date'].dt.month
-    df['day_of_week'] = df['date'].dt.day_name()
-    df['is_weekend'] = df['day_of_week'].isin(['Saturday', 'Sunday'])
+    df['date'] = parse_dates(df['date'])
     
     # Standardize geography using comprehensive normalization
     if USE_DATA_UTILS:
-        df['state'] = df['state'].apply(normalize_state_name)
-        df['district'] = df['district'].apply(normalize_district_name)
+        df['state'] = to_state_category(df['state'])
+        df['district'] = map_distinct(df['district'], normalize_district_name)
+        if CATEGORICAL_GEO:
+            df['district'] = df['district'].astype('category')
     else:
         df['state'] = df['state'].astype(str).str.strip().str.title().replace(STATE_FIX)
         df['district'] = df['district'].astype(str).str.strip().str.title()
     
-    # Filter out invalid states (districts/pincodes mistakenly in state column)
+    # Invalid dates and invalid states (districts/pincodes mistakenly in state column)
+    valid = df['date'].notna() & df['state'].notna()
     if not USE_DATA_UTILS:
-        df = df[~df['state'].isin(INVALID_STATES)]
-    df = df[df['state'].notna()]
+        valid &= ~df['state'].isin(INVALID_STATES)
     
-    # Deduplicate: keep first occurrence of each date-state-district-pincode combo
-    if USE_DATA_UTILS:
-        df, dup_count = deduplicate_data(df)
-    else:
-        dup_cols = ['date', 'state', 'district']
-        if 'pincode' in df.columns:
-            dup_cols.append('pincode')
-        before_dedup = len(df)
-        df = df.drop_duplicates(subset=dup_cols, keep='first')
-        dup_count = before_dedup - len(df)
+    # Deduplicate: keep first occurrence of each date-state-district-pincode combo.
+    # Invalid rows never collide with valid ones (NaT date / missing state).
+    dup_cols = ['date', 'state', 'district']
+    if 'pincode' in df.columns:
+        dup_cols.append('pincode')
+    duplicated = df.duplicated(subset=dup_cols, keep='first')
+    dup_count = int((valid & duplicated).sum())
+    keep = valid & ~duplicated
     
-    # Create geo_key
-    df['geo_key'] = df['state'] + '|' + df['district']
+    if not keep.all():
+        df = df.loc[keep]
+    del valid, duplicated, keep
+    
+    add_calendar_features(df, features=['year', 'month', 'day_of_week', 'is_weekend'])
+    
+    # Integer surrogate key for (state, district)
+    if geo_dim is not None:
+        geo_dim.assign(df, levels=('district',))
     
     removed = initial_len - len(df)
     if removed > 0:
@@ -152,31 +184,67 @@ def preprocess(df, name):
     
     return df
 
-def preprocess_all(enrol, demo, bio):
+def preprocess_all(enrol, demo, bio, geo_dim=None):
     """Preprocess all datasets."""
     print("\n" + "="*70)
     print("PHASE 2: DATA PREPROCESSING")
     print("="*70)
     
-    enrol = preprocess(enrol, "Enrolment")
-    demo = preprocess(demo, "Demographic")
-    bio = preprocess(bio, "Biometric")
+    enrol = preprocess(enrol, "Enrolment", geo_dim=geo_dim)
+    demo = preprocess(demo, "Demographic", geo_dim=geo_dim)
+    bio = preprocess(bio, "Biometric", geo_dim=geo_dim)
+    
+    print_date_ranges(enrol, demo, bio)
+    
+    return enrol, demo, bio
+
+def preprocess_owned(frames, geo_dim=None):
+    """
+    Preprocess datasets in place, taking ownership of them.
+    
+    Each raw frame is popped from `frames` before cleaning so the only
+    reference to it is inside preprocess(); it is freed as soon as the
+    filtered frame replaces it. Only one raw/clean pair is alive at a time.
+    
+    Args:
+        frames: Dict of {name: raw DataFrame}, replaced with cleaned frames
+        geo_dim: Optional GeoDimension for integer district keys
+        
+    Returns:
+        The same dict
+    """
+    print("\n" + "="*70)
+    print("PHASE 2: DATA PREPROCESSING (in place)")
+    print("="*70)
+    
+    for name in list(frames):
+        frames[name] = preprocess(frames.pop(name), name, inplace=True, geo_dim=geo_dim)
+    
+    print_date_ranges(frames['Enrolment'], frames['Demographic'], frames['Biometric'])
     
+    return frames
+
+def print_date_ranges(enrol, demo, bio):
+    """Print the date coverage of each cleaned dataset."""
     print(f"  ✓ Date ranges:")
     print(f"      Enrolment: {enrol['date'].min().date()} to {enrol['date'].max().date()}")
     print(f"      Demographic: {demo['date'].min().date()} to {demo['date'].max().date()}")
     print(f"      Biometric: {bio['date'].min().date()} to {bio['date'].max().date()}")
-    
-    return enrol, demo, bio
 
 # ============================================================================
 # AGGREGATION
 # ============================================================================
+def group_keys(df):
+    """Aggregation keys: integer district_id when available, else names."""
+    if 'district_id' in df.columns:
+        return ['year', 'month', 'district_id']
+    return ['year', 'month', 'state', 'district']
+
 def aggregate_enrolment(df):
     """Aggregate enrolment to state-month level."""
-    df['total_enrol'] = df['age_0_5'] + df['age_5_17'] + df['age_18_greater']
+    compute_metrics(df, ['total_enrol'])
     
-    agg = df.groupby(['year', 'month', 'state', 'district']).agg({
+    agg = df.groupby(group_keys(df)).agg({
         'age_0_5': 'sum',
         'age_5_17': 'sum',
         'age_18_greater': 'sum',
@@ -184,38 +252,35 @@ def aggregate_enrolment(df):
     }).reset_index()
     
     # Shares
-    agg['enrol_share_0_5'] = agg['age_0_5'] / (agg['total_enrol'] + EPS)
-    agg['enrol_share_5_17'] = agg['age_5_17'] / (agg['total_enrol'] + EPS)
-    agg['enrol_share_18_plus'] = agg['age_18_greater'] / (agg['total_enrol'] + EPS)
-    agg['enrol_child_share'] = (agg['age_0_5'] + agg['age_5_17']) / (agg['total_enrol'] + EPS)
+    compute_metrics(agg, ENROLMENT_SHARE_METRICS)
     
     return agg
 
 def aggregate_demographic(df):
     """Aggregate demographic to state-month level."""
-    df['total_demo'] = df['demo_age_5_17'] + df['demo_age_17_']
+    compute_metrics(df, ['total_demo'])
     
-    agg = df.groupby(['year', 'month', 'state', 'district']).agg({
+    agg = df.groupby(group_keys(df)).agg({
         'demo_age_5_17': 'sum',
         'demo_age_17_': 'sum',
         'total_demo': 'sum'
     }).reset_index()
     
-    agg['demo_minor_share'] = agg['demo_age_5_17'] / (agg['total_demo'] + EPS)
+    compute_metrics(agg, ['demo_minor_share'])
     
     return agg
 
 def aggregate_biometric(df):
     """Aggregate biometric to state-month level."""
-    df['total_bio'] = df['bio_age_5_17'] + df['bio_age_17_']
+    compute_metrics(df, ['total_bio'])
     
-    agg = df.groupby(['year', 'month', 'state', 'district']).agg({
+    agg = df.groupby(group_keys(df)).agg({
         'bio_age_5_17': 'sum',
         'bio_age_17_': 'sum',
         'total_bio': 'sum'
     }).reset_index()
     
-    agg['bio_minor_share'] = agg['bio_age_5_17'] / (agg['total_bio'] + EPS)
+    compute_metrics(agg, ['bio_minor_share'])
     
     return agg
 
@@ -238,124 +303,82 @@ def aggregate_all(enrol, demo, bio):
 # ============================================================================
 # CROSS-DOMAIN INTEGRATION
 # ============================================================================
-def integrate_datasets(enrol_agg, demo_agg, bio_agg):
+def integrate_datasets(enrol_agg, demo_agg, bio_agg, geo_dim=None):
     """Merge all three datasets on common keys with proper handling of missing data."""
     print("\n" + "="*70)
     print("PHASE 4: CROSS-DOMAIN INTEGRATION")
     print("="*70)
     
-    # Merge on year, month, state, district
-    merged = enrol_agg.merge(
-        demo_agg,
-        on=['year', 'month', 'state', 'district'],
-        how='outer'
-    )
-    merged = merged.merge(
-        bio_agg,
-        on=['year', 'month', 'state', 'district'],
-        how='outer'
-    )
+    # Align on year, month and the integer district key (or state, district names):
+    # one key table for all three aggregates instead of two chained outer merges
+    keys = group_keys(enrol_agg)
+    merged = union_align([enrol_agg, demo_agg, bio_agg], keys, names=['enrol', 'demo', 'bio'])
     
-    # Track source of each record to identify merge-created rows
-    merged['has_enrol'] = merged['total_enrol'].notna() & (merged['total_enrol'] > 0)
-    merged['has_demo'] = merged['total_demo'].notna() & (merged['total_demo'] > 0)
-    merged['has_bio'] = merged['total_bio'].notna() & (merged['total_bio'] > 0)
+    # Track source of each record to identify alignment-created rows
+    merged['has_enrol'] &= merged['total_enrol'] > 0
+    merged['has_demo'] &= merged['total_demo'] > 0
+    merged['has_bio'] &= merged['total_bio'] > 0
     
     # Fill NaN with 0 ONLY for numeric columns
     numeric_cols = merged.select_dtypes(include=[np.number]).columns
     merged[numeric_cols] = merged[numeric_cols].fillna(0)
     
     # CRITICAL FIX: Filter out rows with no actual activity
-    # This prevents false data from outer join + fillna(0)
+    # This prevents false data from outer alignment + fillna(0)
     # A valid row must have either enrolments OR updates
     total_before_filter = len(merged)
     has_activity = (merged['total_enrol'] > 0) | (merged['total_demo'] > 0) | (merged['total_bio'] > 0)
     merged = merged[has_activity]
     filtered_count = total_before_filter - len(merged)
     
+    # Readable names back from the geography dimension
+    if 'district_id' in keys and geo_dim is not None:
+        geo_dim.attach_names(merged, 'district', position=2)
+        merged = merged.sort_values(['year', 'month', 'state', 'district'], ignore_index=True)
+    
     print(f"  ✓ Integrated dataset: {len(merged):,} records")
     if filtered_count > 0:
-        print(f"  ✓ Filtered {filtered_count:,} rows with no activity (from outer join)")
+        print(f"  ✓ Filtered {filtered_count:,} rows with no activity (from outer alignment)")
     print(f"  ✓ States: {merged['state'].nunique()}")
     print(f"  ✓ Districts: {merged[['state', 'district']].drop_duplicates().shape[0]}")
     
     return merged
 
-def compute_cross_domain_metrics(df):
+def categorize_interactions(df, median_enrol, median_intensity):
+    """Interaction category per row: enrolment and update intensity vs. their medians."""
+    high_enrol = (df['total_enrol'] > median_enrol).to_numpy()
+    high_intensity = (df['total_intensity'] > median_intensity).to_numpy()
+    return pd.Series(np.select(
+        [high_enrol & high_intensity, high_enrol, high_intensity],
+        ['Mature (High E, High U)', 'Emerging (High E, Low U)', 'Legacy (Low E, High U)'],
+        default='Under-served (Low E, Low U)'), index=df.index)
+
+def compute_cross_domain_metrics(df, inplace=False):
     """Compute cross-domain interaction metrics."""
     print("\n" + "="*70)
     print("PHASE 5: CROSS-DOMAIN METRICS")
     print("="*70)
     
-    df = df.copy()
-    
-    # Total updates
-    df['total_updates'] = df['total_demo'] + df['total_bio']
+    df = ensure_owned(df, inplace)
     
-    # Update intensity relative to enrolment
-    df['demo_intensity'] = df['total_demo'] / (df['total_enrol'] + EPS)
-    df['bio_intensity'] = df['total_bio'] / (df['total_enrol'] + EPS)
-    df['total_intensity'] = df['total_updates'] / (df['total_enrol'] + EPS)
-    
-    # Age-wise intensities
+    # Totals, intensities, shares and gaps from the shared metric registry.
     # NOTE: Age buckets are misaligned between datasets:
     #   - Enrolment: 0-5, 5-17, 18+
     #   - Updates: 5-17, 17+
-    # The 5-17 bucket aligns exactly, but "17+" includes 17-year-olds
-    # while "18+" does not. We handle this by:
-    #   1. Computing exact 5-17 intensities (aligned)
-    #   2. Computing "17+ updates per total enrolment" (not per-bucket)
-    #   3. Documenting the limitation for cross-age comparisons
-    
-    # 5-17 age group: EXACT ALIGNMENT - safe to compare directly
-    df['demo_intensity_5_17'] = df['demo_age_5_17'] / (df['age_5_17'] + EPS)
-    df['bio_intensity_5_17'] = df['bio_age_5_17'] / (df['age_5_17'] + EPS)
-    
-    # 17+ updates (adult-ish): Cannot compute per-bucket intensity due to misalignment
-    # Instead, compute as share of total enrolments (interpretable, not inflated)
-    df['demo_intensity_17plus'] = df['demo_age_17_'] / (df['total_enrol'] + EPS)
-    df['bio_intensity_17plus'] = df['bio_age_17_'] / (df['total_enrol'] + EPS)
+    # The 5-17 intensities are exact; 17+ updates are normalised by total
+    # enrolment, and "child" in updates is 5-17 only (no 0-5 bucket).
+    compute_metrics(df, CROSS_DOMAIN_METRICS)
     
     # Legacy column names for backward compatibility (but with corrected formula)
     # These now represent "17+ updates per total enrolment" not "per 18+ enrolment"
     df['demo_intensity_adult'] = df['demo_intensity_17plus']
     df['bio_intensity_adult'] = df['bio_intensity_17plus']
     
-    # Child share in enrolment vs updates
-    # NOTE: "Child" in enrolment = 0-5 + 5-17, but in updates = only 5-17 (no 0-5 bucket)
-    # This is a known limitation - update data doesn't distinguish 0-5 from 5-17
-    df['child_share_enrol'] = (df['age_0_5'] + df['age_5_17']) / (df['total_enrol'] + EPS)
-    df['child_share_updates'] = (df['demo_age_5_17'] + df['bio_age_5_17']) / (df['total_updates'] + EPS)
-    
-    # Child attention gap (positive = children over-represented in updates)
-    # Interpretation note: This slightly underestimates child updates since 0-5 not tracked
-    df['child_attention_gap'] = df['child_share_updates'] - df['child_share_enrol']
-    
-    # Adult share comparison (same limitation as above)
-    df['adult_share_enrol'] = df['age_18_greater'] / (df['total_enrol'] + EPS)
-    # 17+ updates includes 17-year-olds who are in 5-17 enrolment bucket
-    df['adult_share_updates'] = (df['demo_age_17_'] + df['bio_age_17_']) / (df['total_updates'] + EPS)
-    # Gap is conceptually correct but buckets don't perfectly align
-    df['adult_attention_gap'] = df['adult_share_updates'] - df['adult_share_enrol']
-    
-    # Interaction category
-    median_enrol = df[df['total_enrol'] > 0]['total_enrol'].median()
-    median_intensity = df[df['total_intensity'] > 0]['total_intensity'].median()
-    
-    def categorize(row):
-        high_enrol = row['total_enrol'] > median_enrol
-        high_intensity = row['total_intensity'] > median_intensity
-        
-        if high_enrol and high_intensity:
-            return 'Mature (High E, High U)'
-        elif high_enrol and not high_intensity:
-            return 'Emerging (High E, Low U)'
-        elif not high_enrol and high_intensity:
-            return 'Legacy (Low E, High U)'
-        else:
-            return 'Under-served (Low E, Low U)'
-    
-    df['interaction_category'] = df.apply(categorize, axis=1)
+    # Interaction category: medians from quantile sketches fed chunk by chunk
+    # (exact at this size; per-shard sketches can be merged for streaming runs)
+    median_enrol = sketch_values(df['total_enrol'].where(df['total_enrol'] > 0)).median()
+    median_intensity = sketch_values(df['total_intensity'].where(df['total_intensity'] > 0)).median()
+    df['interaction_category'] = categorize_interactions(df, median_enrol, median_intensity)
     
     print(f"  ✓ Computed intensity metrics")
     print(f"  ✓ Computed child attention gap")
@@ -512,6 +535,11 @@ def cluster_districts(df):
         labels.append(", ".join(parts))
     
     cluster_summary['label'] = labels
+    # Clusters with the same profile stay distinguishable (one label per cluster)
+    shared = cluster_summary['label'].duplicated(keep=False)
+    cluster_summary.loc[shared, 'label'] += ' (C' + cluster_summary.loc[shared, 'cluster'].astype(str) + ')'
+    district_summary['cluster_label'] = district_summary['cluster'].map(
+        cluster_summary.set_index('cluster')['label'])
     
     print(f"\n  Cross-Domain Cluster Summary:")
     for _, row in cluster_summary.iterrows():
@@ -710,7 +738,8 @@ def plot_child_gap_analysis(df, output_dir):
     axes[0,0].set_title('Distribution of Child Attention Gap', fontweight='bold')
     
     # Child share in enrol vs updates
-    sample = df[df['total_enrol'] > 100].sample(min(1000, len(df)))
+    active = df[df['total_enrol'] > 100]
+    sample = active.sample(min(1000, len(active)))
     axes[0,1].scatter(sample['child_share_enrol'], sample['child_share_updates'], alpha=0.3)
     axes[0,1].plot([0, 1], [0, 1], 'r--', label='Parity Line')
     axes[0,1].set_xlabel('Child Share in Enrolment')
@@ -895,7 +924,74 @@ def generate_integrated_kpis(df):
 # ============================================================================
 # MAIN EXECUTION
 # ============================================================================
-def main():
+def _phase(name, report, profiler):
+    """Enter the memory-report and profiler scopes for one phase (either may be None)."""
+    stack = ExitStack()
+    if report is not None:
+        stack.enter_context(report.phase(name.lower()))
+    stack.enter_context(profile_phase(profiler, name))
+    return stack
+
+def run_core_phases(low_memory=False, profiler=None):
+    """
+    Run load -> preprocess -> aggregate -> integrate -> metrics.
+    
+    With low_memory=True the pipeline runs in ownership-aware mode:
+    copy-on-write is enabled, only the needed columns are read, every
+    transform works in place, row-level frames are released as soon as
+    they are aggregated, and peak RSS is recorded per phase.
+    
+    Args:
+        low_memory: Ownership-aware mode with a MemoryReport
+        profiler: Optional PhaseProfiler timing each phase
+    
+    Returns:
+        Tuple of (merged DataFrame, MemoryReport or None)
+    """
+    geo_dim = GeoDimension.load(GEO_DIMENSION_FILE)
+    report = None
+    if low_memory:
+        enable_copy_on_write()
+        report = MemoryReport()
+    
+    with _phase('LOAD', report, profiler):
+        frames = dict(zip(RAW_COLUMNS, load_all_data(project=low_memory)))
+        if report is not None:
+            report.set_raw_frames(*frames.values())
+    
+    with _phase('PREPROCESS', report, profiler):
+        if low_memory:
+            preprocess_owned(frames, geo_dim=geo_dim)
+        else:
+            frames = dict(zip(RAW_COLUMNS, preprocess_all(*frames.values(), geo_dim=geo_dim)))
+        geo_dim.save()
+    
+    with _phase('AGGREGATE', report, profiler):
+        aggregates = aggregate_all(frames.pop('Enrolment'), frames.pop('Demographic'),
+                                   frames.pop('Biometric'))
+    
+    with _phase('INTEGRATE', report, profiler):
+        merged = integrate_datasets(*aggregates, geo_dim=geo_dim)
+        del aggregates
+    
+    with _phase('METRICS', report, profiler):
+        merged = compute_cross_domain_metrics(merged, inplace=low_memory)
+    
+    return merged, report
+
+def main(low_memory=False, profile=False, profile_dir=None, profiler=None):
+    """
+    Run the full integrated analysis.
+    
+    Args:
+        low_memory: Ownership-aware mode with a per-phase memory report
+        profile: Record per-phase CPU/memory instrumentation (JSON in outputs/profiles)
+        profile_dir: Also write a cProfile dump per phase to this directory
+        profiler: Existing PhaseProfiler to record into (the caller reports it)
+    """
+    if profiler is None and profile:
+        profiler = PhaseProfiler('integrated_analysis', cprofile_dir=profile_dir)
+    
     print("="*80)
     print("UIDAI DATA HACKATHON 2026 - INTEGRATED CROSS-DOMAIN ANALYSIS")
     print("Combining Enrolment + Demographic + Biometric for Ultimate Insights")
@@ -904,25 +1000,18 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     os.makedirs(PLOTS_DIR, exist_ok=True)
     
-    # Load data
-    enrol, demo, bio = load_all_data()
-    
-    # Preprocess
-    enrol, demo, bio = preprocess_all(enrol, demo, bio)
-    
-    # Aggregate
-    enrol_agg, demo_agg, bio_agg = aggregate_all(enrol, demo, bio)
-    
-    # Integrate
-    merged = integrate_datasets(enrol_agg, demo_agg, bio_agg)
-    
-    # Cross-domain metrics
-    merged = compute_cross_domain_metrics(merged)
+    # Load, preprocess, aggregate, integrate, cross-domain metrics
+    merged, memory_report = run_core_phases(low_memory=low_memory, profiler=profiler)
+    if memory_report is not None:
+        memory_report.print_report()
+        memory_report.save(os.path.join(OUTPUT_DIR, 'memory_report.json'))
     
     # Analyses
-    analysis_results = analyze_cross_domain_patterns(merged)
-    monthly = analyze_temporal_joint(merged)
-    district_clusters, cluster_summary = cluster_districts(merged)
+    with profile_phase(profiler, 'ANALYZE'):
+        analysis_results = analyze_cross_domain_patterns(merged)
+        monthly = analyze_temporal_joint(merged)
+    with profile_phase(profiler, 'CLUSTER'):
+        district_clusters, cluster_summary = cluster_districts(merged)
     
     # Visualizations
     print("\n" + "="*70)
@@ -930,12 +1019,13 @@ def main():
     print("="*70)
     setup_plots()
     
-    plot_national_overview(monthly, PLOTS_DIR)
-    plot_state_comparison(analysis_results['state_summary'], PLOTS_DIR)
-    plot_interaction_categories(merged, PLOTS_DIR)
-    plot_child_gap_analysis(merged, PLOTS_DIR)
-    plot_cross_domain_clusters(district_clusters, cluster_summary, PLOTS_DIR)
-    plot_intensity_heatmap(merged, PLOTS_DIR)
+    with profile_phase(profiler, 'PLOT'):
+        plot_national_overview(monthly, PLOTS_DIR)
+        plot_state_comparison(analysis_results['state_summary'], PLOTS_DIR)
+        plot_interaction_categories(merged, PLOTS_DIR)
+        plot_child_gap_analysis(merged, PLOTS_DIR)
+        plot_cross_domain_clusters(district_clusters, cluster_summary, PLOTS_DIR)
+        plot_intensity_heatmap(merged, PLOTS_DIR)
     
     # Insights
     print("\n" + "="*70)
@@ -966,12 +1056,19 @@ def main():
     print("PHASE 8: EXPORTING RESULTS")
     print("="*70)
     
-    merged.to_csv(os.path.join(OUTPUT_DIR, 'integrated_data.csv'), index=False)
-    district_clusters.to_csv(os.path.join(OUTPUT_DIR, 'district_clusters.csv'), index=False)
-    analysis_results['state_summary'].to_csv(os.path.join(OUTPUT_DIR, 'state_summary.csv'), index=False)
-    pd.DataFrame([kpis]).to_csv(os.path.join(OUTPUT_DIR, 'kpis.csv'), index=False)
+    with profile_phase(profiler, 'EXPORT'):
+        merged.to_csv(os.path.join(OUTPUT_DIR, 'integrated_data.csv'), index=False)
+        district_clusters.to_csv(os.path.join(OUTPUT_DIR, 'district_clusters.csv'), index=False)
+        analysis_results['state_summary'].to_csv(os.path.join(OUTPUT_DIR, 'state_summary.csv'), index=False)
+        pd.DataFrame([kpis]).to_csv(os.path.join(OUTPUT_DIR, 'kpis.csv'), index=False)
+        store = write_partitions(merged, PARTITIONS_DIR)
     
     print(f"  ✓ Saved all outputs to {OUTPUT_DIR}")
+    print(f"  ✓ Partitioned store: {len(store['partitions'])} state/year/month partitions in {PARTITIONS_DIR}")
+    
+    if profile and profiler is not None:
+        profiler.print_report()
+        print(f"  ✓ Profile saved: {profiler.save()}")
     
     print("\n" + "="*80)
     print("✅ INTEGRATED CROSS-DOMAIN ANALYSIS COMPLETE!")
@@ -982,4 +1079,14 @@ def main():
     return merged, insights, kpis
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Integrated cross-domain analysis')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Ownership-aware mode: in-place transforms, column projection, '
+                             'per-phase peak-RSS report')
+    parser.add_argument('--profile', action='store_true',
+                        help='Per-phase CPU, peak RSS and top-allocation report (JSON in outputs/profiles)')
+    parser.add_argument('--profile-dir', default=None,
+                        help='With --profile, also write a cProfile dump per phase here')
+    args = parser.parse_args()
+    main(low_memory=args.low_memory, profile=args.profile or bool(args.profile_dir),
+         profile_dir=args.profile_dir)
@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Pipeline Runner
+Run every analysis script in dependency order, skipping unchanged stages.
+
+This module provides:
+- STAGES: declared script, inputs and outputs for each pipeline stage
+- Dependency graph derived from overlapping input/output paths
+- Content-hash cache: a stage is skipped when its code and input contents
+  are unchanged and its outputs exist
+- Parallel execution of independent stages (-j N)
+- Timing and cache-hit report (printed and saved as JSON)
+
+Usage:
+    python scripts/pipeline.py                 # run everything that changed
+    python scripts/pipeline.py -j 4            # up to 4 stages at once
+    python scripts/pipeline.py forecast        # one stage plus its upstream
+    python scripts/pipeline.py --list          # show the stage graph
+    python scripts/pipeline.py --force         # ignore the cache
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+PIPELINE_DIR = os.path.join(BASE_DIR, "outputs", ".pipeline")
+CACHE_FILE = os.path.join(PIPELINE_DIR, "cache.json")
+REPORT_FILE = os.path.join(PIPELINE_DIR, "report.json")
+LOG_DIR = os.path.join(PIPELINE_DIR, "logs")
+
+HASH_CHUNK = 1 << 20
+
+# ============================================================================
+# STAGE DEFINITIONS
+# ============================================================================
+# Paths are relative to the repository root. 'code' lists extra source files
+# (besides the script) whose changes invalidate the stage; scripts/utils is
+# always included.
+ENROL_RAW = "data/api_data_aadhar_enrolment"
+DEMO_RAW = "data/api_data_aadhar_demographic"
+BIO_RAW = "data/api_data_aadhar_biometric"
+RAW_ALL = [ENROL_RAW, DEMO_RAW, BIO_RAW]
+INTEGRATED = "outputs/integrated_analysis/integrated_data.csv"
+
+STAGES = {
+    # --- Raw data -> core tables ---
+    'integrated': {
+        'script': "scripts/integrated_analysis.py",
+        'inputs': RAW_ALL,
+        'outputs': [INTEGRATED,
+                    "outputs/integrated_analysis/district_clusters.csv",
+                    "outputs/integrated_analysis/state_summary.csv",
+                    "outputs/integrated_analysis/kpis.csv",
+                    "outputs/integrated_analysis/partitions",
+                    "outputs/integrated_analysis/plots"],
+    },
+    'comprehensive': {
+        'script': "scripts/uidai_comprehensive_analysis.py",
+        'inputs': RAW_ALL,
+        'outputs': ["outputs/analysis_output/processed_data.csv",
+                    "outputs/analysis_output/volatility_metrics.csv",
+                    "outputs/analysis_output/anomalies.csv",
+                    "outputs/analysis_output/plots"],
+    },
+    'enrolment_deep': {
+        'script': "scripts/enrolment_deep_analysis.py",
+        'inputs': [ENROL_RAW],
+        'outputs': ["outputs/enrolment_analysis/district_clusters.csv",
+                    "outputs/enrolment_analysis/anomalies.csv",
+                    "outputs/enrolment_analysis/concentration_metrics.csv",
+                    "outputs/enrolment_analysis/volatility_metrics.csv",
+                    "outputs/enrolment_analysis/kpis.csv",
+                    "outputs/enrolment_analysis/plots"],
+    },
+    'demographic_deep': {
+        'script': "scripts/demographic_deep_analysis.py",
+        'inputs': [DEMO_RAW],
+        'outputs': ["outputs/demographic_analysis/district_clusters.csv",
+                    "outputs/demographic_analysis/anomalies.csv",
+                    "outputs/demographic_analysis/concentration_metrics.csv",
+                    "outputs/demographic_analysis/volatility_metrics.csv",
+                    "outputs/demographic_analysis/kpis.csv",
+                    "outputs/demographic_analysis/plots"],
+    },
+    'biometric_deep': {
+        'script': "scripts/biometric_deep_analysis.py",
+        'inputs': [BIO_RAW],
+        'outputs': ["outputs/biometric_analysis/district_clusters.csv",
+                    "outputs/biometric_analysis/anomalies.csv",
+                    "outputs/biometric_analysis/concentration_metrics.csv",
+                    "outputs/biometric_analysis/volatility_metrics.csv",
+                    "outputs/biometric_analysis/kpis.csv",
+                    "outputs/biometric_analysis/plots"],
+    },
+    'biometric_enhanced': {
+        'script': "scripts/biometric_enhanced_analysis.py",
+        'inputs': [BIO_RAW],
+        'outputs': ["outputs/biometric_analysis/minor_share_volatility.csv",
+                    "outputs/biometric_analysis/weekend_weekday_comparison.csv",
+                    "outputs/biometric_analysis/plots"],
+    },
+    'aadhaar_plots': {
+        'script': "scripts/aadhaar_analysis.py",
+        'inputs': RAW_ALL,
+        'outputs': ["outputs/aadhaar_plots"],
+    },
+    'final_plots': {
+        'script': "scripts/generate_final_plots.py",
+        'inputs': RAW_ALL,
+        'outputs': ["outputs/plots_final"],
+    },
+    'district_map': {
+        'script': "scripts/generate_complete_district_map.py",
+        'inputs': RAW_ALL + ["data/all_district_coordinates.json"],
+        'outputs': ["outputs/interactive_maps/india_child_gap_map_complete.html",
+                    "outputs/interactive_maps/district_child_gap_data.csv"],
+    },
+
+    # --- Per-dataset final plots ---
+    'enrolment_core': {
+        'script': "scripts/extract_core_enrolment.py",
+        'inputs': [ENROL_RAW,
+                   "outputs/enrolment_analysis/concentration_metrics.csv",
+                   "outputs/enrolment_analysis/district_clusters.csv",
+                   "outputs/enrolment_analysis/volatility_metrics.csv"],
+        'outputs': ["outputs/enrolment_analysis/plots_final"],
+    },
+    'enrolment_high_impact': {
+        'script': "scripts/generate_enrolment_missing_analyses.py",
+        'inputs': ["outputs/enrolment_analysis/anomalies.csv",
+                   "outputs/enrolment_analysis/concentration_metrics.csv",
+                   "outputs/enrolment_analysis/volatility_metrics.csv",
+                   "outputs/enrolment_analysis/district_clusters.csv"],
+        'outputs': ["outputs/enrolment_analysis/plots_final"],
+    },
+    'demographic_core': {
+        'script': "scripts/extract_core_visualizations.py",
+        'code': ["scripts/demographic_deep_analysis.py"],
+        'inputs': [DEMO_RAW],
+        'outputs': ["outputs/demographic_analysis/plots_final"],
+    },
+    'demographic_high_impact': {
+        'script': "scripts/generate_high_impact_analyses.py",
+        'code': ["scripts/demographic_deep_analysis.py"],
+        'inputs': [DEMO_RAW],
+        'outputs': ["outputs/demographic_analysis/plots_final"],
+    },
+    'aadhaar_plots_final': {
+        'script': "scripts/reorganize_visualizations.py",
+        'inputs': ["outputs/aadhaar_plots"],
+        'outputs': ["outputs/aadhaar_plots_final"],
+    },
+    'enhanced_plots': {
+        'script': "scripts/enhanced_visualizations.py",
+        'inputs': ["outputs/analysis_output/processed_data.csv"],
+        'outputs': ["outputs/analysis_output/plots/enhanced_plots"],
+    },
+    'modified_core_plots': {
+        'script': "scripts/modified_core_visualizations.py",
+        'inputs': ["outputs/analysis_output/processed_data.csv"],
+        'outputs': ["outputs/analysis_output/plots/enhanced_plots"],
+    },
+
+    # --- Integrated data consumers ---
+    'integrated_core_plots': {
+        'script': "scripts/generate_core_plots.py",
+        'inputs': [INTEGRATED, "outputs/integrated_analysis/state_summary.csv"],
+        'outputs': ["outputs/integrated_analysis/plots_final"],
+    },
+    'integrated_new_analyses': {
+        'script': "scripts/generate_new_analyses.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/integrated_analysis/plots_final"],
+    },
+    'geospatial': {
+        'script': "scripts/geospatial_analysis.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/geospatial_plots"],
+    },
+    'geospatial_enhanced': {
+        'script': "scripts/geospatial_enhanced.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/geospatial_plots"],
+    },
+    'temporal_geospatial': {
+        'script': "scripts/temporal_geospatial_analysis.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/geospatial_plots"],
+    },
+    'district_inequality': {
+        'script': "scripts/district_inequality_analysis.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/geospatial_plots"],
+    },
+    'forecast': {
+        'script': "scripts/forecast_analysis.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/forecast_plots"],
+    },
+    'forecast_backtest': {
+        'script': "scripts/forecast_backtest.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/forecast_backtest/backtest_summary.csv"],
+    },
+    'forecast_new_analyses': {
+        'script': "scripts/generate_missing_forecast_analyses.py",
+        'inputs': [INTEGRATED, "outputs/forecast_plots/declining_districts.csv"],
+        'outputs': ["outputs/forecast_final/new_analyses"],
+    },
+    'actionable_insights': {
+        'script': "scripts/actionable_insights.py",
+        'inputs': [INTEGRATED, "outputs/integrated_analysis/district_clusters.csv"],
+        'outputs': ["outputs/actionable_insights"],
+    },
+    'aadhaar_plots_enhanced': {
+        'script': "scripts/generate_missing_analyses.py",
+        'inputs': [INTEGRATED],
+        'outputs': ["outputs/aadhaar_plots_enhanced"],
+    },
+
+    # --- Dashboard ---
+    'dashboard_assets': {
+        'script': "copy_assets.py",
+        'inputs': ["outputs/actionable_insights",
+                   "outputs/aadhaar_plots_final",
+                   "outputs/analysis_output/plots/enhanced_plots",
+                   "outputs/biometric_analysis/plots",
+                   "outputs/demographic_analysis/plots_final",
+                   "outputs/enrolment_analysis/plots_final",
+                   "outputs/geospatial_plots",
+                   "outputs/forecast_final/new_analyses",
+                   "outputs/integrated_analysis/plots_final",
+                   "outputs/plots_final"],
+        'outputs': ["dashboard/assets/curated_plots"],
+    },
+    'dashboard_images': {
+        'script': "scripts/build_image_assets.py",
+        'inputs': ["dashboard/assets/curated_plots"],
+        'outputs': ["dashboard/assets/responsive"],
+    },
+    'dashboard_data': {
+        'script': "scripts/build_dashboard_data.py",
+        'inputs': [INTEGRATED,
+                   "outputs/integrated_analysis/district_clusters.csv",
+                   "outputs/integrated_analysis/state_summary.csv",
+                   "outputs/integrated_analysis/kpis.csv"],
+        'outputs': ["dashboard/data"],
+    },
+}
+
+# Always part of every stage's code hash
+SHARED_CODE = ["scripts/utils"]
+
+
+# ============================================================================
+# DEPENDENCY GRAPH
+# ============================================================================
+def _overlaps(a, b):
+    """True if path a equals, contains or lies inside path b."""
+    a, b = os.path.normpath(a), os.path.normpath(b)
+    return a == b or a.startswith(b + os.sep) or b.startswith(a + os.sep)
+
+
+def build_graph(stages):
+    """
+    Derive upstream dependencies from declared inputs and outputs.
+
+    A stage depends on every other stage that writes a path overlapping one
+    of its inputs.
+
+    Returns:
+        Dict of {stage: sorted list of upstream stages}
+    """
+    deps = {}
+    for name, spec in stages.items():
+        upstream = set()
+        for other, other_spec in stages.items():
+            if other == name:
+                continue
+            if any(_overlaps(i, o) for i in spec['inputs'] for o in other_spec['outputs']):
+                upstream.add(other)
+        deps[name] = sorted(upstream)
+    return deps
+
+
+def topological_order(deps):
+    """Stage names ordered so every stage follows its upstream (raises on cycles)."""
+    order, state = [], {}
+
+    def visit(node, path):
+        if state.get(node) == 'done':
+            return
+        if state.get(node) == 'active':
+            raise ValueError(f"Pipeline cycle: {' -> '.join(path + [node])}")
+        state[node] = 'active'
+        for up in deps[node]:
+            visit(up, path + [node])
+        state[node] = 'done'
+        order.append(node)
+
+    for node in deps:
+        visit(node, [])
+    return order
+
+
+def select_stages(deps, targets):
+    """Targets plus everything upstream of them."""
+    unknown = [t for t in targets if t not in deps]
+    if unknown:
+        raise KeyError(f"Unknown stage(s): {unknown}. Known: {sorted(deps)}")
+    selected, stack = set(), list(targets)
+    while stack:
+        node = stack.pop()
+        if node not in selected:
+            selected.add(node)
+            stack.extend(deps[node])
+    return selected
+
+
+# ============================================================================
+# CONTENT HASHING
+# ============================================================================
+class ContentHasher:
+    """
+    SHA-256 of files and directory trees.
+
+    Digests are memoized by (size, mtime) so unchanged multi-hundred-MB raw
+    shards are not re-read on every run.
+    """
+
+    def __init__(self, root, memo=None):
+        self.root = root
+        self.memo = memo if memo is not None else {}
+
+    def file_digest(self, path):
+        stat = os.stat(path)
+        rel = os.path.relpath(path, self.root)
+        cached = self.memo.get(rel)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        h = hashlib.sha256()
+        with open(path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(HASH_CHUNK), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.memo[rel] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def path_digest(self, rel_path):
+        """Digest of a file or directory tree ('missing' if absent)."""
+        path = os.path.join(self.root, rel_path)
+        if os.path.isfile(path):
+            return self.file_digest(path)
+        if not os.path.isdir(path):
+            return 'missing'
+        h = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+            for filename in sorted(filenames):
+                if filename.startswith('.'):
+                    continue
+                full = os.path.join(dirpath, filename)
+                h.update(os.path.relpath(full, path).encode())
+                h.update(self.file_digest(full).encode())
+        return h.hexdigest()
+
+    def stage_key(self, spec):
+        """Cache key covering a stage's code and every input's content."""
+        h = hashlib.sha256()
+        for rel in [spec['script']] + spec.get('code', []) + SHARED_CODE:
+            h.update(f"code:{rel}:{self.path_digest(rel)}\n".encode())
+        for rel in spec['inputs']:
+            h.update(f"input:{rel}:{self.path_digest(rel)}\n".encode())
+        h.update(json.dumps(spec.get('args', [])).encode())
+        return h.hexdigest()
+
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+def load_cache(path=CACHE_FILE):
+    if os.path.exists(path):
+        with open(path) as fp:
+            return json.load(fp)
+    return {'stages': {}, 'files': {}}
+
+
+def save_cache(cache, path=CACHE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as fp:
+        json.dump(cache, fp, indent=2, sort_keys=True)
+
+
+def outputs_exist(spec, root):
+    return all(os.path.exists(os.path.join(root, o)) for o in spec['outputs'])
+
+
+def run_stage(name, spec, root, log_dir, plot_jobs=None):
+    """
+    Run one stage's script in a subprocess from the repository root.
+
+    plot_jobs caps each stage's plot worker pool so parallel stages share
+    the CPUs instead of each starting one worker per core.
+
+    Returns:
+        Tuple of (return code, seconds)
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    env = dict(os.environ, MPLBACKEND='Agg', PYTHONUNBUFFERED='1')
+    if plot_jobs:
+        env.setdefault('PLOT_JOBS', str(plot_jobs))
+    cmd = [sys.executable, os.path.join(root, spec['script'])] + list(spec.get('args', []))
+    start = time.perf_counter()
+    with open(os.path.join(log_dir, f"{name}.log"), 'w') as log:
+        result = subprocess.run(cmd, cwd=root, env=env, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, time.perf_counter() - start
+
+
+def run_pipeline(stages=None, targets=None, jobs=1, force=False, root=BASE_DIR,
+                 cache_file=CACHE_FILE, log_dir=LOG_DIR):
+    """
+    Run the selected stages in dependency order.
+
+    A stage is hashed only once its upstream stages have finished, so its key
+    reflects the outputs they just produced. If those outputs came out
+    byte-identical, downstream stages stay cached.
+
+    Args:
+        stages: Stage definitions (default: STAGES)
+        targets: Stage names to run with their upstream (default: all)
+        jobs: Maximum number of stages running at once
+        force: Ignore the cache and run every selected stage
+        root: Repository root the stage paths are relative to
+        cache_file: Cache JSON path
+        log_dir: Directory for per-stage logs
+
+    Returns:
+        List of per-stage result dicts (stage, status, seconds, upstream)
+    """
+    stages = stages or STAGES
+    deps = build_graph(stages)
+    selected = select_stages(deps, targets) if targets else set(stages)
+    order = [s for s in topological_order(deps) if s in selected]
+
+    cache = load_cache(cache_file)
+    hasher = ContentHasher(root, cache.setdefault('files', {}))
+    stage_cache = cache.setdefault('stages', {})
+
+    plot_jobs = max(1, (os.cpu_count() or 1) // max(1, jobs))
+    results = {}
+    pending = list(order)
+    running = {}
+
+    def finished(name, status, seconds=0.0, key=None):
+        results[name] = {'stage': name, 'status': status, 'seconds': round(seconds, 2),
+                         'upstream': deps[name]}
+        if status == 'ran' and key:
+            stage_cache[name] = key
+        icon = {'cached': '⏭️ ', 'ran': '✓', 'failed': '❌', 'skipped': '⚠️ '}[status]
+        print(f"  {icon} {name:<26} {status:<8} {seconds:>7.1f}s")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name in list(pending):
+                if len(running) >= max(1, jobs):
+                    break
+                upstream = [u for u in deps[name] if u in selected]
+                if any(u not in results for u in upstream):
+                    continue
+                pending.remove(name)
+                spec = stages[name]
+                if any(results[u]['status'] in ('failed', 'skipped') for u in upstream):
+                    finished(name, 'skipped')
+                    continue
+                key = hasher.stage_key(spec)
+                if not force and stage_cache.get(name) == key and outputs_exist(spec, root):
+                    finished(name, 'cached')
+                    continue
+                print(f"  ▶ {name} ...")
+                running[pool.submit(run_stage, name, spec, root, log_dir, plot_jobs)] = (name, key)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, key = running.pop(future)
+                code, seconds = future.result()
+                finished(name, 'ran' if code == 0 else 'failed', seconds, key)
+            save_cache(cache, cache_file)
+
+    save_cache(cache, cache_file)
+    return [results[name] for name in order]
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+def print_report(results, wall_seconds):
+    """Print per-stage timings and the cache-hit summary."""
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+    total = sum(r['seconds'] for r in results)
+    print("\n📊 Pipeline Report")
+    for r in sorted(results, key=lambda r: -r['seconds']):
+        print(f"   {r['stage']:<26} {r['status']:<8} {r['seconds']:>8.1f}s")
+    hits = counts.get('cached', 0)
+    print(f"\n   Stages: {len(results)} | ran {counts.get('ran', 0)} | cached {hits} | "
+          f"failed {counts.get('failed', 0)} | skipped {counts.get('skipped', 0)}")
+    print(f"   Cache hit rate: {hits / max(len(results), 1):.0%}")
+    print(f"   Stage time: {total:,.1f}s | wall time: {wall_seconds:,.1f}s")
+
+
+def save_report(results, wall_seconds, jobs, path=REPORT_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as fp:
+        json.dump({'jobs': jobs, 'wall_seconds': round(wall_seconds, 2), 'stages': results},
+                  fp, indent=2)
+    return path
+
+
+def print_graph(stages=None):
+    """Print stages in execution order with their upstream dependencies."""
+    stages = stages or STAGES
+    deps = build_graph(stages)
+    for name in topological_order(deps):
+        upstream = ", ".join(deps[name]) or "-"
+        print(f"   {name:<26} {stages[name]['script']:<45} ← {upstream}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the UIDAI analysis pipeline")
+    parser.add_argument('targets', nargs='*', help="Stages to run (with their upstream); default all")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="Stages to run in parallel")
+    parser.add_argument('--force', action='store_true', help="Ignore the content-hash cache")
+    parser.add_argument('--list', action='store_true', help="Show the stage graph and exit")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - PIPELINE")
+    print("="*70)
+
+    if args.list:
+        print_graph()
+        return 0
+
+    start = time.perf_counter()
+    results = run_pipeline(targets=args.targets or None, jobs=args.jobs, force=args.force)
+    wall = time.perf_counter() - start
+    print_report(results, wall)
+    print(f"\n📁 Report saved: {save_report(results, wall, args.jobs)}")
+    print(f"📁 Logs: {LOG_DIR}")
+    return 1 if any(r['status'] == 'failed' for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,7 @@ Date: January 20, 2026
 
 import os
 import shutil
+import filecmp
 import warnings
 
 warnings.filterwarnings('ignore')
@@ -224,8 +225,9 @@ def copy_and_caption_plots():
         caption_path = dest_path.replace('.png', '_caption.txt')
         
         if os.path.exists(source_path):
-            # Copy image
-            shutil.copy2(source_path, dest_path)
+            # Copy image (skipped when the destination already has the same bytes)
+            if not (os.path.exists(dest_path) and filecmp.cmp(source_path, dest_path, shallow=False)):
+                shutil.copy2(source_path, dest_path)
             
             # Write caption
             with open(caption_path, 'w') as f:
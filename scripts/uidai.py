@@ -56,7 +56,7 @@ import numpy as np
 # CONFIGURATION
 # ============================================================================
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_FILE = os.path.join(SCRIPT_DIR, "outputs", "integrated_analysis", "integrated_data.csv")
+DATA_FILE = os.path.join(os.path.dirname(SCRIPT_DIR), "outputs", "integrated_analysis", "integrated_data.csv")
 OUTPUTS_DIR = os.path.join(SCRIPT_DIR, "outputs")
 # Navigate up to project root from scripts/ if needed, but this script is in project root
 # Actually, wait, checking file path: /Users/ayushpatel/Documents/Projects/UIDAI/UIDAI/uidai.py
@@ -179,17 +179,35 @@ OUTPUTS_DIR = os.path.join(SCRIPT_DIR, "outputs")
 # The user mentioned checking "Utility Scripts".
 # Let me list the `scripts/utils` directory.
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from schema_registry import read_dataset_csv
+from profiler import PhaseProfiler, profile_phase
+from sql_engine import TABLES, QueryError, connect, describe_tables, run_query, export_query
+from sql_engine import OUTPUTS_DIR as QUERY_OUTPUTS_DIR
+from partitioned_store import STORE_DIR, list_partitions, match_states, read_partitions, store_rows
+
+# state=/year=/month= partitions written by integrated_analysis.py (repo-root outputs/)
+PARTITIONS_DIR = STORE_DIR
+
 console = Console()
 
+# Set by --profile; commands and data loading record their phases into it
+PROFILER = None
+
 
 def timed_command(func):
     """Decorator to add timing to commands."""
     @wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.time()
-        result = func(*args, **kwargs)
+        with profile_phase(PROFILER, func.__name__.upper()):
+            result = func(*args, **kwargs)
         elapsed = time.time() - start_time
         console.print(f"\n[dim]⏱️  Completed in {elapsed:.2f}s[/dim]")
+        if PROFILER is not None:
+            PROFILER.print_report()
+            console.print(f"[dim]📄 Profile saved to {PROFILER.save()}[/dim]")
         return result
     return wrapper
 
@@ -217,9 +235,14 @@ app = typer.Typer(
 @app.callback(invoke_without_command=True)
 def main(
     ctx: typer.Context,
-    version: bool = typer.Option(None, "--version", "-v", callback=version_callback, is_eager=True, help="Show version")
+    version: bool = typer.Option(None, "--version", "-v", callback=version_callback, is_eager=True, help="Show version"),
+    profile: bool = typer.Option(False, "--profile", help="Record per-phase time, CPU and memory (JSON in outputs/profiles)"),
+    profile_dir: Optional[str] = typer.Option(None, "--profile-dir", help="Also write per-phase cProfile dumps here")
 ):
     """UIDAI Data Hackathon 2026 - Interactive CLI for Aadhaar Analysis."""
+    global PROFILER
+    if profile:
+        PROFILER = PhaseProfiler(name=f"uidai_{ctx.invoked_subcommand or 'cli'}", cprofile_dir=profile_dir)
     if ctx.invoked_subcommand is None:
         console.print(f"[bold cyan]{ASCII_BANNER}[/bold cyan]")
         console.print("[yellow]Run 'python uidai.py --help' to see available commands.[/yellow]")
@@ -235,7 +258,38 @@ def load_data():
         console.print("[yellow]Run integrated_analysis.py first.[/yellow]")
         raise typer.Exit(1)
     
-    df = pd.read_csv(DATA_FILE)
+    report = {}
+    with profile_phase(PROFILER, 'LOAD'):
+        df = read_dataset_csv(DATA_FILE, 'integrated', report=report)
+    
+    # Rows whose state is not one of the 36 valid states cannot be attributed
+    unmapped = report.get('state', {}).get('coerced', 0)
+    if unmapped:
+        console.print(f"[yellow]⚠️ Dropped {unmapped:,} rows with unrecognised state names "
+                      f"(re-run integrated_analysis.py to refresh the data)[/yellow]")
+        df = df[df['state'].notna()]
+    return df
+
+
+def load_state_data(query):
+    """
+    Rows of every state whose name contains `query` (case-insensitive).
+
+    The query is matched against the partition list, and only those states'
+    partitions are read. Without a partitioned store this falls back to
+    loading the full table and filtering it.
+    """
+    partitions = list_partitions(PARTITIONS_DIR)
+    if not partitions:
+        df = load_data()
+        return df[df['state'].str.lower().str.contains(query.lower(), regex=False)]
+    
+    states = match_states(partitions, query)
+    with profile_phase(PROFILER, 'LOAD'):
+        df = read_partitions(PARTITIONS_DIR, states=states)
+    if states:
+        console.print(f"[dim]📂 Read {store_rows(partitions, states):,} of {store_rows(partitions):,} rows "
+                      f"({sum(p['state'] in states for p in partitions)} of {len(partitions)} partitions)[/dim]")
     return df
 
 # ============================================================================
@@ -346,12 +400,9 @@ def analyze(
 ):
     """🔍 Analyze specific state or district data."""
     
-    df = load_data()
-    
     if state:
-        # Filter by state (case-insensitive partial match)
-        mask = df['state'].str.lower().str.contains(state.lower())
-        df_filtered = df[mask]
+        # Case-insensitive partial match, resolved against the partition list
+        df_filtered = load_state_data(state)
         
         if len(df_filtered) == 0:
             console.print(f"[red]No data found for state: {state}[/red]")
@@ -420,6 +471,7 @@ def analyze(
     
     else:
         # Show all states summary
+        df = load_data()
         console.print(Panel.fit("[bold]All States Summary[/bold]", border_style="cyan"))
         
         state_summary = df.groupby('state').agg({
@@ -552,8 +604,8 @@ def anomalies(
     
     console.print(table)
     
-    # Save anomalies
-    output_path = os.path.join(OUTPUTS_DIR, "anomalies_detected.csv")
+    # Save anomalies where the API server and `uidai query` read them (repo-root outputs/)
+    output_path = os.path.join(QUERY_OUTPUTS_DIR, TABLES['anomalies'])
     anomalies_df.to_csv(output_path, index=False)
     console.print(f"\n[dim]Saved to: {output_path}[/dim]")
 
@@ -610,6 +662,70 @@ def forecast():
                 console.print(f"  📊 {f}")
 
 
+@app.command()
+@timed_command
+def query(
+    sql: Optional[str] = typer.Argument(None, help=f"SQL over: {', '.join(TABLES)}"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Write all result rows to a .csv or .parquet file"),
+    limit: int = typer.Option(50, "--limit", "-n", help="Rows to show in the table"),
+    threads: Optional[int] = typer.Option(None, "--threads", "-t", help="Worker threads (default: all cores)"),
+    tables: bool = typer.Option(False, "--tables", help="List queryable tables and their columns")
+):
+    """🦆 Run ad-hoc SQL over the pipeline outputs (DuckDB)."""
+    
+    try:
+        with profile_phase(PROFILER, 'CONNECT'):
+            con, available = connect(threads=threads)
+    except ImportError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+    
+    if not available:
+        console.print(f"[red]❌ No pipeline outputs found under {QUERY_OUTPUTS_DIR}[/red]")
+        console.print("[yellow]Run integrated_analysis.py first.[/yellow]")
+        raise typer.Exit(1)
+    
+    if tables or not sql:
+        tree = Tree("[bold]Queryable tables[/bold]")
+        for table, columns in describe_tables(con, available).items():
+            branch = tree.add(f"[cyan]{table}[/cyan] [dim]({os.path.relpath(available[table], QUERY_OUTPUTS_DIR)})[/dim]")
+            branch.add(", ".join(f"{name} [dim]{dtype.lower()}[/dim]" for name, dtype in columns))
+        console.print(tree)
+        if not sql:
+            console.print('\n[yellow]Example: python uidai.py query "SELECT state, SUM(total_enrol) FROM integrated GROUP BY 1 ORDER BY 2 DESC LIMIT 5"[/yellow]')
+        return
+    
+    try:
+        with profile_phase(PROFILER, 'EXECUTE'):
+            if output:
+                n_rows = export_query(con, sql, output)
+                console.print(f"[green]✅ Wrote {n_rows:,} rows to {output}[/green]")
+                return
+            columns, rows, truncated, seconds = run_query(con, sql, limit)
+    except QueryError as e:
+        console.print(f"[red]❌ Query failed:[/red] {e}")
+        raise typer.Exit(1)
+    
+    table = Table(box=box.ROUNDED, border_style="cyan", caption=f"{len(rows)}{'+' if truncated else ''} rows in {seconds * 1000:.0f} ms"
+                  + (" (use --output for all rows)" if truncated else ""))
+    for name in columns:
+        table.add_column(str(name))
+    for row in rows:
+        table.add_row(*[_format_cell(v) for v in row])
+    console.print(table)
+
+
+def _format_cell(value):
+    """Rich table cell text for a query result value."""
+    if value is None:
+        return "[dim]NULL[/dim]"
+    if isinstance(value, float):
+        return f"{value:,.4g}" if abs(value) < 1e4 else f"{value:,.0f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
 @app.command()
 @timed_command
 def report(
@@ -618,14 +734,15 @@ def report(
 ):
     """📄 Generate state-level report cards."""
     
-    df = load_data()
     output_dir = os.path.join(OUTPUTS_DIR, "state_reports")
     os.makedirs(output_dir, exist_ok=True)
     
     if all_states:
+        df = load_data()
         states = df['state'].unique()
     elif state:
-        states = [s for s in df['state'].unique() if state.lower() in s.lower()]
+        df = load_state_data(state)
+        states = list(df['state'].unique())
         if not states:
             console.print(f"[red]No state found matching: {state}[/red]")
             raise typer.Exit(1)
@@ -7,6 +7,7 @@ Author: UIDAI Hackathon Team
 """
 
 import os
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -30,6 +31,28 @@ DIRS = {
 OUTPUT_DIR = os.path.join(BASE_DIR, "outputs", "analysis_output")
 PLOTS_DIR = os.path.join(OUTPUT_DIR, "plots")
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(SCRIPT_DIR, "utils"))
+from metrics_kernel import compute_metrics
+from memory_utils import ensure_owned
+from schema_registry import read_dataset_csv, concat_frames, infer_dataset
+from calendar_utils import parse_dates, add_calendar_features
+from quantile_sketch import sketch_values, group_sketches, group_ranks
+from data_utils import deduplicate_data, union_align
+from window_kernels import GroupedWindows
+
+# This pipeline's historical names for registry metrics
+FEATURE_ALIASES = {
+    'total_enrol': 'total_enrolments',
+    'total_bio': 'total_bio_updates',
+    'total_demo': 'total_demo_updates',
+    'total_intensity': 'update_intensity',
+    'enrol_share_0_5': 'young_enrol_share',
+    'enrol_share_5_17': 'child_enrol_share',
+    'enrol_share_18_plus': 'adult_enrol_share',
+    'child_share_updates': 'child_update_share',
+}
+
 # Comprehensive state name normalization mapping (30+ variations)
 STATE_MAP = {
     # Andaman & Nicobar variations
@@ -89,13 +112,13 @@ def load_dataset(directory, name):
     dfs = []
     for f in files:
         try:
-            df = pd.read_csv(f)
+            df = read_dataset_csv(f, infer_dataset(directory))
             dfs.append(df)
             print(f"  ✓ Loaded {os.path.basename(f)}: {len(df):,} rows")
         except Exception as e:
             print(f"  ✗ Error loading {f}: {e}")
     
-    result = pd.concat(dfs, ignore_index=True)
+    result = concat_frames(dfs)
     print(f"  📊 Total {name} records: {len(result):,}")
     return result
 
@@ -110,23 +133,25 @@ def load_all_data():
 # ============================================================================
 # DATA PREPROCESSING
 # ============================================================================
-def preprocess_dataset(df, dataset_type):
-    """Clean and standardize a dataset with comprehensive normalization."""
+def preprocess_dataset(df, dataset_type, inplace=False):
+    """
+    Clean and standardize a dataset with comprehensive normalization.
+
+    Duplicates repeated across shards or runs are the job of the
+    dedup stage (scripts/utils/dedup_index.py), not this in-memory pass.
+    """
     if df.empty:
         return df
     
-    df = df.copy()
+    df = ensure_owned(df, inplace)
     initial_len = len(df)
     
     # Parse dates
     if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+        df['date'] = parse_dates(df['date'])
         # Remove rows with invalid dates
         df = df[df['date'].notna()]
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['month_name'] = df['date'].dt.month_name()
-        df['day_of_week'] = df['date'].dt.day_name()
+        add_calendar_features(df, features=['year', 'month', 'month_name', 'day_of_week'])
     
     # Normalize state names
     if 'state' in df.columns:
@@ -142,13 +167,7 @@ def preprocess_dataset(df, dataset_type):
         df['district'] = df['district'].astype(str).str.strip().str.title()
     
     # Deduplicate: keep first occurrence of each date-state-district-pincode combo
-    dup_cols = ['date', 'state', 'district']
-    if 'pincode' in df.columns:
-        dup_cols.append('pincode')
-    dup_cols = [c for c in dup_cols if c in df.columns]
-    before_dedup = len(df)
-    df = df.drop_duplicates(subset=dup_cols, keep='first')
-    dup_count = before_dedup - len(df)
+    df, dup_count = deduplicate_data(df)
     
     removed = initial_len - len(df)
     if removed > 0:
@@ -171,22 +190,15 @@ def merge_datasets(enrol, bio, demo):
     """Merge all datasets at state-district-date level with proper handling of missing data."""
     merge_keys = ['date', 'year', 'month', 'state', 'district']
     
-    # Merge enrolment with biometric
-    merged = pd.merge(enrol, bio, on=merge_keys, how='outer', suffixes=('', '_bio'))
-    # Merge with demographic
-    merged = pd.merge(merged, demo, on=merge_keys, how='outer', suffixes=('', '_demo'))
-    
-    # Track which source each record came from (before fillna)
-    has_enrol = merged.get('age_0_5', pd.Series([np.nan]*len(merged))).notna()
-    has_bio = merged.get('bio_age_5_17', pd.Series([np.nan]*len(merged))).notna()
-    has_demo = merged.get('demo_age_5_17', pd.Series([np.nan]*len(merged))).notna()
+    # One key table for all three sources instead of two chained outer merges
+    merged = union_align([enrol, bio, demo], merge_keys, suffixes=['', '_bio', '_demo'])
     
     # Fill NaN with 0 for numeric columns
     numeric_cols = merged.select_dtypes(include=[np.number]).columns
     merged[numeric_cols] = merged[numeric_cols].fillna(0)
     
     # CRITICAL FIX: Filter out rows with no actual activity
-    # This prevents false data from outer join + fillna(0)
+    # This prevents false data from outer alignment + fillna(0)
     total_before = len(merged)
     
     # Calculate totals for filtering
@@ -209,70 +221,20 @@ def merge_datasets(enrol, bio, demo):
 # ============================================================================
 # FEATURE ENGINEERING
 # ============================================================================
-def engineer_features(df):
+def engineer_features(df, inplace=False):
     """Create all analytical features."""
-    df = df.copy()
-    
-    # ------ BASE TOTALS ------
-    df['total_enrolments'] = df['age_0_5'] + df['age_5_17'] + df['age_18_greater']
-    df['total_bio_updates'] = df['bio_age_5_17'] + df['bio_age_17_']
-    df['total_demo_updates'] = df['demo_age_5_17'] + df['demo_age_17_']
-    df['total_updates'] = df['total_bio_updates'] + df['total_demo_updates']
-    
-    # ------ INTENSITY RATIOS ------
-    df['update_intensity'] = np.where(
-        df['total_enrolments'] > 0,
-        df['total_updates'] / df['total_enrolments'],
-        0
-    )
-    df['bio_intensity'] = np.where(
-        df['total_enrolments'] > 0,
-        df['total_bio_updates'] / df['total_enrolments'],
-        0
-    )
-    df['demo_intensity'] = np.where(
-        df['total_enrolments'] > 0,
-        df['total_demo_updates'] / df['total_enrolments'],
-        0
-    )
-    df['updates_per_1000'] = df['update_intensity'] * 1000
-    
-    # ------ COMPOSITION METRICS ------
-    df['bio_share'] = np.where(
-        df['total_updates'] > 0,
-        df['total_bio_updates'] / df['total_updates'],
-        0
-    )
-    df['demo_share'] = np.where(
-        df['total_updates'] > 0,
-        df['total_demo_updates'] / df['total_updates'],
-        0
-    )
-    
-    # Age group shares in enrolment
-    df['young_enrol_share'] = np.where(
-        df['total_enrolments'] > 0,
-        df['age_0_5'] / df['total_enrolments'],
-        0
-    )
-    df['child_enrol_share'] = np.where(
-        df['total_enrolments'] > 0,
-        df['age_5_17'] / df['total_enrolments'],
-        0
-    )
-    df['adult_enrol_share'] = np.where(
-        df['total_enrolments'] > 0,
-        df['age_18_greater'] / df['total_enrolments'],
-        0
-    )
-    
-    # Age group shares in updates
-    total_update_by_age = df['bio_age_5_17'] + df['demo_age_5_17'] + df['bio_age_17_'] + df['demo_age_17_']
-    df['child_update_share'] = np.where(
-        total_update_by_age > 0,
-        (df['bio_age_5_17'] + df['demo_age_5_17']) / total_update_by_age,
-        0
-    )
+    df = ensure_owned(df, inplace)
+    
+    compute_metrics(df, [
+        # ------ BASE TOTALS ------
+        'total_enrol', 'total_bio', 'total_demo', 'total_updates',
+        # ------ INTENSITY RATIOS ------
+        'total_intensity', 'bio_intensity', 'demo_intensity', 'updates_per_1000',
+        # ------ COMPOSITION METRICS ------
+        'bio_share', 'demo_share',
+        'enrol_share_0_5', 'enrol_share_5_17', 'enrol_share_18_plus',
+        'child_share_updates',
+    ], aliases=FEATURE_ALIASES)
     
     return df
 
@@ -291,14 +253,16 @@ def add_temporal_features(df):
     """Add month-over-month and rolling metrics."""
     df = df.sort_values(['state', 'district', 'date'])
     
-    # Group by state-district for temporal calculations
-    for col in ['total_enrolments', 'total_updates', 'update_intensity']:
+    # One group layout (state-district) for every metric: all columns, all districts at once
+    cols = ['total_enrolments', 'total_updates', 'update_intensity']
+    windows = GroupedWindows(df, ['state', 'district'])
+    mom = windows.pct_change(cols) * 100
+    roll3 = windows.rolling(cols, 3, 'mean', min_periods=1)
+    for col in cols:
         # Month-over-month change
-        df[f'{col}_mom'] = df.groupby(['state', 'district'])[col].pct_change() * 100
+        df[f'{col}_mom'] = mom[col]
         # 3-period rolling average
-        df[f'{col}_roll3'] = df.groupby(['state', 'district'])[col].transform(
-            lambda x: x.rolling(3, min_periods=1).mean()
-        )
+        df[f'{col}_roll3'] = roll3[col]
     
     return df
 
@@ -335,11 +299,16 @@ def add_volatility_features(df):
 
 def add_percentile_ranks(df):
     """Add state and national percentile rankings."""
+    # Percentile ranks from quantile sketches (exact at this size; the same
+    # sketches can be built per chunk or shard and merged)
+    values = df['update_intensity'].to_numpy(dtype=float)
+    
     # National percentile
-    df['national_percentile'] = df['update_intensity'].rank(pct=True) * 100
+    df['national_percentile'] = sketch_values(values).rank(values) * 100
     
     # State percentile
-    df['state_percentile'] = df.groupby('state')['update_intensity'].rank(pct=True) * 100
+    states = df['state'].to_numpy(dtype=object)
+    df['state_percentile'] = group_ranks(values, states, group_sketches(values, states)) * 100
     
     return df
 
@@ -443,16 +412,16 @@ def detect_anomalies(df, method='combined', zscore_threshold=3, iqr_multiplier=1
     df['is_zscore_anomaly'] = abs(df['update_intensity_zscore']) > zscore_threshold
     
     # IQR-based detection (more robust for skewed distributions)
-    q75 = df['update_intensity'].quantile(0.75)
-    q25 = df['update_intensity'].quantile(0.25)
+    sketch = sketch_values(df['update_intensity'])
+    q25, q75 = sketch.quantile([0.25, 0.75])
     iqr = q75 - q25
     lower_bound = q25 - (iqr_multiplier * iqr)
     upper_bound = q75 + (iqr_multiplier * iqr)
     df['is_iqr_anomaly'] = (df['update_intensity'] < lower_bound) | (df['update_intensity'] > upper_bound)
     
     # MAD-based detection (robust to outliers)
-    median = df['update_intensity'].median()
-    mad = (df['update_intensity'] - median).abs().median()
+    median = sketch.median()
+    mad = sketch_values((df['update_intensity'] - median).abs()).median()
     if mad > 0:
         df['mad_zscore'] = 0.6745 * (df['update_intensity'] - median) / mad
         df['is_mad_anomaly'] = abs(df['mad_zscore']) > zscore_threshold
@@ -921,8 +890,8 @@ def main():
     print("\n" + "="*50)
     print("PHASE 2: DATA PREPROCESSING")
     print("="*50)
-    for key in data:
-        data[key] = preprocess_dataset(data[key], key)
+    for key in list(data):
+        data[key] = preprocess_dataset(data.pop(key), key, inplace=True)
         data[key] = aggregate_to_district_level(data[key])
         print(f"  ✓ Preprocessed {key}: {len(data[key]):,} district-date records")
     
@@ -935,7 +904,7 @@ def main():
     print("\n" + "="*50)
     print("PHASE 3: FEATURE ENGINEERING")
     print("="*50)
-    merged_df = engineer_features(merged_df)
+    merged_df = engineer_features(merged_df, inplace=True)
     merged_df = add_zscore_features(merged_df)
     merged_df = add_temporal_features(merged_df)
     merged_df = add_percentile_ranks(merged_df)
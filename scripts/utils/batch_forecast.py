@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Batched Forecasting
+Forecasts every state / district series at once as matrix operations.
+
+This module provides:
+- series_matrix(): long frame -> (labels, months, Y) with one row per series
+  and one column per calendar month (gaps are NaN)
+- linear_forecast(): linear trend + Fourier yearly seasonality, fitted by
+  least squares for all series together (one batched p x p solve), with
+  t-based prediction intervals
+- holt_forecast(): damped-trend Holt-Winters (additive error-correction
+  form); smoothing parameters are picked per series from a grid, with every
+  grid point and every series updated together at each time step
+- forecast_matrix() / forecast_frame(): engine dispatch and long-format
+  output with Prophet's column names (ds, yhat, yhat_lower, yhat_upper)
+
+Series may have missing months: the linear fit drops them from that
+series' normal equations, and Holt-Winters carries its state forward over
+them. Series with fewer than 2 observations get NaN forecasts, and series
+with no residual degrees of freedom left after the fit (linear: n <= number
+of coefficients; Holt-Winters: n - 1 <= smoothing parameters + initial
+states) get a point forecast with NaN interval bounds.
+
+Yearly seasonality is only fitted once a series spans two full cycles
+(seasonal='auto'); shorter histories get the trend alone.
+
+Usage:
+    labels, months, Y = series_matrix(df, ['state', 'district'], 'total_enrol')
+    forecast = forecast_frame(labels, months, Y, periods=6, engine='holt')
+"""
+
+import warnings
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+SEASON_LENGTH = 12
+BATCH_ENGINES = ('linear', 'holt')
+
+# Holt-Winters search grid; beta is a fraction of alpha so it never exceeds it
+HOLT_ALPHAS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+HOLT_BETA_RATIOS = (0.01, 0.1, 0.3)
+HOLT_PHIS = (0.8, 0.9, 0.98)
+HOLT_GAMMAS = (0.05, 0.2, 0.5)
+
+
+# ============================================================================
+# SERIES LAYOUT
+# ============================================================================
+def series_matrix(df, keys, value_col, date_col='date'):
+    """
+    Pivot a long frame into a (series x month) matrix.
+
+    Rows sharing a key and month are summed. Months are a contiguous monthly
+    range from the first to the last date, so a gap in the data is a NaN
+    column entry rather than a missing column.
+
+    Args:
+        df: Frame with the key columns, date_col and value_col
+        keys: Series key columns ([] for one national series)
+        value_col: Column to forecast
+        date_col: Datetime column (any day within the month)
+
+    Returns:
+        (labels DataFrame of keys, PeriodIndex of months, float array S x T)
+    """
+    keys = list(keys)
+    dates = pd.to_datetime(df[date_col])
+    month_number = (dates.dt.year * 12 + dates.dt.month - 1).to_numpy()
+    months = pd.period_range(dates.min(), dates.max(), freq='M')
+    col = month_number - _month_numbers(months)[0]
+    if keys:
+        grouped = df.groupby(keys, sort=True, observed=True)
+        series = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        labels = grouped.size().index.to_frame(index=False)
+    else:
+        series = np.zeros(len(df), dtype=np.int64)
+        labels = pd.DataFrame(index=range(1))
+    keep = series >= 0
+    values = df[value_col].to_numpy(dtype=np.float64)
+    present = keep & ~np.isnan(values)
+
+    Y = np.zeros((len(labels), len(months)))
+    seen = np.zeros_like(Y, dtype=bool)
+    np.add.at(Y, (series[present], col[present]), values[present])
+    seen[series[present], col[present]] = True
+    Y[~seen] = np.nan
+    return labels, months, Y
+
+
+def _month_numbers(months):
+    """Absolute month count (year * 12 + month - 1) for a PeriodIndex."""
+    return months.year.to_numpy() * 12 + months.month.to_numpy() - 1
+
+
+def _future_months(months, periods):
+    return pd.period_range(months[-1] + 1, periods=periods, freq='M')
+
+
+def _use_seasonal(seasonal, n_months):
+    if seasonal == 'auto':
+        return n_months >= 2 * SEASON_LENGTH
+    return bool(seasonal)
+
+
+# ============================================================================
+# LINEAR TREND + SEASONALITY
+# ============================================================================
+def _design(t, month_numbers, fourier_order):
+    """Intercept, trend and Fourier yearly terms for the given time points."""
+    columns = [np.ones_like(t, dtype=float), t.astype(float)]
+    angle = 2 * np.pi * (month_numbers % SEASON_LENGTH) / SEASON_LENGTH
+    for k in range(1, fourier_order + 1):
+        columns += [np.sin(k * angle), np.cos(k * angle)]
+    return np.column_stack(columns)
+
+
+def linear_forecast(Y, months, periods, interval_width=0.80, seasonal='auto', fourier_order=3):
+    """
+    Least-squares trend (+ yearly Fourier terms) forecast for every series.
+
+    Each series gets its own fit over its observed months; the normal
+    equations of all series are built with one einsum and solved together.
+    Intervals use the OLS prediction variance and a t quantile with the
+    series' residual degrees of freedom.
+
+    Args:
+        Y: Float array (series x months), NaN for missing
+        months: PeriodIndex matching Y's columns
+        periods: Months to forecast
+        interval_width: Coverage of the prediction interval (Prophet default 0.80)
+        seasonal: True, False or 'auto' (needs two full years)
+        fourier_order: Sine/cosine pairs when seasonal
+
+    Returns:
+        (yhat, lower, upper), each series x periods
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    T = Y.shape[1]
+    order = min(fourier_order, SEASON_LENGTH // 2 - 1) if _use_seasonal(seasonal, T) else 0
+    X = _design(np.arange(T), _month_numbers(months), order)
+    X_future = _design(np.arange(T, T + periods), _month_numbers(_future_months(months, periods)), order)
+    p = X.shape[1]
+
+    observed = ~np.isnan(Y)
+    W = observed.astype(np.float64)
+    y = np.where(observed, Y, 0.0)
+    n = W.sum(axis=1)
+
+    # Normal equations per series: (X' W X) beta = X' W y
+    xtx = np.einsum('tp,tq,st->spq', X, X, W)
+    xty = np.einsum('tp,st->sp', X, y)
+    xtx_inv = np.linalg.pinv(xtx)
+    beta = np.einsum('spq,sq->sp', xtx_inv, xty)
+
+    residuals = np.where(observed, Y - beta @ X.T, 0.0)
+    # n <= p fits exactly: no residual dof, so no interval
+    dof = n - p
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sigma = np.where(dof >= 1, np.sqrt((residuals ** 2).sum(axis=1) / np.maximum(dof, 1)), np.nan)
+
+    yhat = beta @ X_future.T
+    leverage = np.einsum('hp,spq,hq->sh', X_future, xtx_inv, X_future)
+    quantile = stats.t.ppf(0.5 + interval_width / 2, np.maximum(dof, 1))[:, None]
+    half = quantile * sigma[:, None] * np.sqrt(1 + leverage)
+
+    yhat[n < 2] = np.nan
+    half[(n < 2) | (dof < 1)] = np.nan
+    return yhat, yhat - half, yhat + half
+
+
+# ============================================================================
+# DAMPED HOLT-WINTERS
+# ============================================================================
+def _holt_grid(seasonal):
+    gammas = HOLT_GAMMAS if seasonal else (0.0,)
+    grid = np.array([(a, a * r, phi, g) for a, r, phi, g in
+                     product(HOLT_ALPHAS, HOLT_BETA_RATIOS, HOLT_PHIS, gammas)])
+    return grid.T[:, :, None]  # 4 x G x 1, broadcast against series
+
+
+def _holt_initial(Y, position, seasonal):
+    """
+    Level, trend and seasonal states at each series' first observation.
+
+    A least-squares line through the first two cycles (or the whole series
+    if shorter) gives the trend; the seasonal states are the line's
+    residuals averaged per calendar month, centred on zero.
+    """
+    S, T = Y.shape
+    span = min(T, 2 * SEASON_LENGTH)
+    head = Y[:, :span]
+    observed = ~np.isnan(head)
+    t = np.broadcast_to(np.arange(span, dtype=float), head.shape)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        t_mean = np.nanmean(np.where(observed, t, np.nan), axis=1, keepdims=True)
+        y_mean = np.nanmean(head, axis=1, keepdims=True)
+        dt = np.where(observed, t - t_mean, 0.0)
+        dy = np.where(observed, head - y_mean, 0.0)
+        denominator = (dt ** 2).sum(axis=1)
+        trend = np.where(denominator > 0, (dt * dy).sum(axis=1) / np.where(denominator > 0, denominator, 1), 0.0)
+
+        season = np.zeros((S, SEASON_LENGTH))
+        if seasonal:
+            residual = head - (y_mean + trend[:, None] * (t - t_mean))
+            padded = np.full((S, 2 * SEASON_LENGTH), np.nan)
+            padded[:, :span] = residual
+            cycle = np.nanmean(padded.reshape(S, 2, SEASON_LENGTH), axis=1)
+            season[:, position[:SEASON_LENGTH]] = np.nan_to_num(
+                cycle - np.nanmean(cycle, axis=1, keepdims=True))
+
+    first = np.argmax(~np.isnan(Y), axis=1)
+    level = Y[np.arange(S), first] - season[np.arange(S), position[first]]
+    return np.nan_to_num(level), np.nan_to_num(trend), season
+
+
+def holt_forecast(Y, months, periods, interval_width=0.80, seasonal='auto'):
+    """
+    Damped-trend Holt-Winters forecast for every series.
+
+    Error-correction form: e = y - (l + phi*b + s), then
+    l += phi*b + alpha*e, b = phi*b + beta*e, s += gamma*e. Every
+    (alpha, beta, phi, gamma) grid point is run for all series in the same
+    time loop; each series keeps the point with the lowest one-step squared
+    error. Intervals use the ETS(A,Ad,A) h-step variance.
+
+    Args:
+        Y: Float array (series x months), NaN for missing
+        months: PeriodIndex matching Y's columns
+        periods: Months to forecast
+        interval_width: Coverage of the prediction interval
+        seasonal: True, False or 'auto' (needs two full years)
+
+    Returns:
+        (yhat, lower, upper), each series x periods
+    """
+    Y = np.atleast_2d(np.asarray(Y, dtype=np.float64))
+    S, T = Y.shape
+    seasonal = _use_seasonal(seasonal, T)
+    alpha, beta, phi, gamma = _holt_grid(seasonal)
+    G = alpha.shape[0]
+    position = _month_numbers(months) % SEASON_LENGTH
+
+    level0, trend0, season0 = _holt_initial(Y, position, seasonal)
+    level = np.broadcast_to(level0, (G, S)).copy()
+    trend = np.broadcast_to(trend0, (G, S)).copy()
+    season = np.broadcast_to(season0, (G, S, SEASON_LENGTH)).copy()
+    sse = np.zeros((G, S))
+    n = np.zeros(S)
+
+    for t in range(T):
+        m = position[t]
+        y = Y[:, t]
+        # The first observation seeds the state (see _holt_initial); the
+        # recursion and the error score start from the second one
+        started = n > 0
+        update = ~np.isnan(y) & started
+        error = np.where(update, y - (level + phi * trend + season[:, :, m]), 0.0)
+        sse += error ** 2
+        level = np.where(started, level + phi * trend + alpha * error, level)
+        trend = np.where(started, phi * trend + beta * error, trend)
+        season[:, :, m] += gamma * error
+        n += ~np.isnan(y)
+
+    best = np.argmin(sse, axis=0)
+    pick = (best, np.arange(S))
+    a, b, f, g = alpha[best, 0], beta[best, 0], phi[best, 0], gamma[best, 0]
+    level, trend, season = level[pick], trend[pick], season[pick]
+    # Residual dof: scored steps less alpha, beta, phi, level, trend (+ gamma, 11 seasonal states)
+    n_params = 5 + SEASON_LENGTH if seasonal else 5
+    dof = n - 1 - n_params
+    sigma2 = np.where(dof >= 1, sse[pick] / np.maximum(dof, 1), np.nan)
+
+    h = np.arange(1, periods + 1)
+    damped = np.cumsum(f[:, None] ** h, axis=1)  # phi + phi^2 + ... + phi^h
+    future_position = _month_numbers(_future_months(months, periods)) % SEASON_LENGTH
+    yhat = level[:, None] + damped * trend[:, None] + season[:, future_position]
+
+    # Var(e_{T+h}) = sigma^2 * (1 + sum_{j<h} c_j^2), c_j = alpha + beta*phi_j + gamma*[j % m == 0]
+    j = np.arange(1, periods)
+    c = a[:, None] + b[:, None] * damped[:, :periods - 1] + g[:, None] * (j % SEASON_LENGTH == 0)
+    spread = np.concatenate([np.ones((S, 1)), 1 + np.cumsum(c ** 2, axis=1)], axis=1)
+    half = stats.norm.ppf(0.5 + interval_width / 2) * np.sqrt(sigma2[:, None] * spread)
+
+    yhat[n < 2] = np.nan
+    half[(n < 2) | (dof < 1)] = np.nan
+    return yhat, yhat - half, yhat + half
+
+
+# ============================================================================
+# DISPATCH
+# ============================================================================
+ENGINES = {'linear': linear_forecast, 'holt': holt_forecast}
+
+
+def forecast_matrix(Y, months, periods, engine='linear', interval_width=0.80, **kwargs):
+    """Run one of BATCH_ENGINES on a series matrix; returns (yhat, lower, upper)."""
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {BATCH_ENGINES}, got {engine!r}")
+    return ENGINES[engine](Y, months, periods, interval_width=interval_width, **kwargs)
+
+
+def forecast_frame(labels, months, Y, periods, engine='linear', interval_width=0.80, **kwargs):
+    """
+    Forecast every series and return a long frame.
+
+    Returns:
+        DataFrame with the label columns, ds (month start), yhat,
+        yhat_lower and yhat_upper; one row per series and future month
+    """
+    yhat, lower, upper = forecast_matrix(Y, months, periods, engine, interval_width, **kwargs)
+    future = _future_months(months, periods).to_timestamp()
+    out = labels.loc[labels.index.repeat(periods)].reset_index(drop=True)
+    out['ds'] = np.tile(future, len(labels))
+    out['yhat'] = yhat.ravel()
+    out['yhat_lower'] = lower.ravel()
+    out['yhat_upper'] = upper.ravel()
+    return out
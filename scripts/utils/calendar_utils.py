@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Calendar Utilities
+Date dimension: parse each distinct date once, derive calendar features once.
+
+This module provides:
+- parse_dates(): fixed-format parsing of the distinct date strings only
+- calendar_table(): one row per date (weekday, ISO week, month, holiday flags)
+- add_calendar_features(): join calendar columns back to a fact frame via codes
+
+The raw shards hold tens of millions of rows but only a few hundred distinct
+dates, so every per-date computation is done on the distinct dates and
+broadcast with an integer take.
+"""
+
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%d-%m-%Y'
+
+# groupby() on categoricals only defaults to observed=True from pandas 3.0;
+# before that, categorical keys would expand into cartesian-product groups.
+OBSERVED_BY_DEFAULT = int(pd.__version__.split('.')[0]) >= 3
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+               'August', 'September', 'October', 'November', 'December']
+DAY_NAME_DTYPE = pd.CategoricalDtype(DAY_NAMES, ordered=True)
+MONTH_NAME_DTYPE = pd.CategoricalDtype(MONTH_NAMES, ordered=True)
+
+# Gazetted national holidays on fixed dates: (month, day) -> name.
+# Movable holidays (Diwali, Eid, Holi, ...) vary by year; pass them via
+# extra_holidays={Timestamp: name}.
+NATIONAL_HOLIDAYS = {
+    (1, 26): 'Republic Day',
+    (8, 15): 'Independence Day',
+    (10, 2): 'Gandhi Jayanti',
+}
+
+# Columns add_calendar_features() can produce
+CALENDAR_FEATURES = [
+    'year', 'month', 'month_name', 'day', 'week', 'day_of_week', 'weekday',
+    'is_weekend', 'is_holiday', 'holiday_name',
+]
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+def parse_dates(series, date_format=DATE_FORMAT):
+    """
+    Parse a date column by parsing each distinct value once.
+
+    Args:
+        series: Strings, categorical strings or already-parsed datetimes
+        date_format: strptime format (fixed, no inference)
+
+    Returns:
+        datetime64 Series (NaT where a value does not match the format)
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = pd.to_datetime(pd.Index(uniques, dtype=object), format=date_format, errors='coerce')
+    # Append NaT so missing values (code -1) take the last slot
+    values = np.append(parsed.to_numpy(), np.datetime64('NaT')).astype(parsed.dtype)
+    return pd.Series(values[codes], index=series.index, name=series.name)
+
+
+# ============================================================================
+# CALENDAR TABLE
+# ============================================================================
+def calendar_table(dates, extra_holidays=None, categorical=None):
+    """
+    Build one calendar row per distinct date.
+
+    Args:
+        dates: Iterable of dates (duplicates and NaT are dropped)
+        extra_holidays: Optional {date: name} for movable/state holidays
+        categorical: Store day/month names as ordered categoricals
+                     (defaults to True where groupby is observed-by-default)
+
+    Returns:
+        DataFrame indexed by date with year, month, month_name, day, week
+        (ISO), weekday (0=Monday), day_of_week, is_weekend, is_holiday,
+        holiday_name
+    """
+    if categorical is None:
+        categorical = OBSERVED_BY_DEFAULT
+    idx = pd.DatetimeIndex(pd.unique(pd.DatetimeIndex(dates).dropna())).sort_values()
+    idx.name = 'date'
+
+    weekday = idx.weekday.to_numpy().astype(np.int8)
+    month = idx.month.to_numpy()
+    day = idx.day.to_numpy()
+
+    holiday = pd.Series([NATIONAL_HOLIDAYS.get((m, d)) for m, d in zip(month, day)],
+                        index=idx, dtype=object)
+    if extra_holidays:
+        extra = {pd.Timestamp(k): v for k, v in extra_holidays.items()}
+        holiday = holiday.where(holiday.notna(), pd.Series(idx.map(extra), index=idx))
+
+    day_names = np.asarray(DAY_NAMES, dtype=object)[weekday]
+    month_names = np.asarray(MONTH_NAMES, dtype=object)[month - 1]
+
+    cal = pd.DataFrame({
+        'year': idx.year.to_numpy().astype(np.int32),
+        'month': month.astype(np.int32),
+        'month_name': pd.Categorical(month_names, dtype=MONTH_NAME_DTYPE) if categorical else month_names,
+        'day': day.astype(np.int32),
+        'week': idx.isocalendar()['week'].to_numpy().astype(np.int32),
+        'weekday': weekday,
+        'day_of_week': pd.Categorical(day_names, dtype=DAY_NAME_DTYPE) if categorical else day_names,
+        'is_weekend': weekday >= 5,
+        'is_holiday': holiday.notna().to_numpy(),
+        'holiday_name': holiday.to_numpy(),
+    }, index=idx)
+    return cal
+
+
+def add_calendar_features(df, date_col='date', features=('year', 'month', 'day_of_week', 'is_weekend'),
+                          extra_holidays=None):
+    """
+    Add calendar columns to a fact frame, in place.
+
+    The calendar is built for the distinct dates only and broadcast back with
+    integer codes, so no per-row datetime accessor or string is created.
+
+    Args:
+        df: DataFrame with a parsed (or parseable) date column
+        date_col: Name of the date column
+        features: Calendar columns to add (see CALENDAR_FEATURES), or a
+                  {feature: output_column} dict to rename them
+        extra_holidays: Optional {date: name} passed to calendar_table()
+
+    Returns:
+        The same DataFrame
+    """
+    if not isinstance(features, dict):
+        features = {f: f for f in features}
+    unknown = set(features) - set(CALENDAR_FEATURES)
+    if unknown:
+        raise KeyError(f"Unknown calendar features: {sorted(unknown)}")
+
+    dates = parse_dates(df[date_col])
+    if dates is not df[date_col]:
+        df[date_col] = dates
+    codes, uniques = pd.factorize(dates, use_na_sentinel=True)
+    if len(uniques) == 0:
+        uniques = pd.DatetimeIndex(['1970-01-01'])  # placeholder; every row is missing
+    cal = calendar_table(uniques, extra_holidays=extra_holidays).reindex(pd.DatetimeIndex(uniques))
+
+    missing = codes < 0
+    take = np.where(missing, 0, codes)
+    for feature, name in features.items():
+        column = cal[feature]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            cat_codes = column.cat.codes.to_numpy()[take]
+            cat_codes[missing] = -1
+            df[name] = pd.Categorical.from_codes(cat_codes, dtype=column.dtype)
+            continue
+        values = column.to_numpy()[take]
+        if missing.any():
+            # Same as the datetime accessors on NaT: NaN numbers, False flags
+            if values.dtype == bool:
+                values[missing] = False
+            elif values.dtype.kind in 'iuf':
+                values = values.astype(np.float64)
+                values[missing] = np.nan
+            else:
+                values[missing] = None
+        df[name] = values
+    return df
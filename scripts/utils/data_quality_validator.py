@@ -13,6 +13,42 @@ import warnings
 warnings.filterwarnings('ignore')
 
 
+def suspicious_value_flags(values: np.ndarray, threshold_multiplier: float = 1e9) -> Dict[str, np.ndarray]:
+    """
+    Suspicious-value checks for every column of a 2-D array at once.
+    
+    Args:
+        values: rows x columns array (missing values already filled with 0)
+        threshold_multiplier: Positive exact multiples of this are flagged as round
+        
+    Returns:
+        Dict of boolean rows x columns arrays: 'round' (exact multiples),
+        'outlier' (|z| > 5, needs more than 3 rows and a non-zero std),
+        'zero' (zero right after a non-zero value) and 'suspicious' (any)
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    
+    # Flag 1: Exact multiples of large round numbers
+    is_round = (values % threshold_multiplier == 0) & (values > 0)
+    
+    # Flag 2: Values that are suspiciously large outliers
+    is_outlier = np.zeros(values.shape, dtype=bool)
+    if len(values) > 3:
+        std = values.std(axis=0, ddof=1)
+        varying = std > 0
+        z_scores = np.abs((values[:, varying] - values[:, varying].mean(axis=0)) / std[varying])
+        is_outlier[:, varying] = z_scores > 5
+    
+    # Flag 3: Exactly zero when neighbors are non-zero
+    previous = np.vstack([np.zeros((1, values.shape[1])), values[:-1]])
+    is_zero = (values == 0) & (previous > 0)
+    
+    return {'round': is_round, 'outlier': is_outlier, 'zero': is_zero,
+            'suspicious': is_round | is_outlier | is_zero}
+
+
 class DataQualityValidator:
     """Validates UIDAI data quality and generates annotations."""
     
@@ -39,44 +75,22 @@ class DataQualityValidator:
         Returns:
             DataFrame with boolean flags for suspicious values
         """
-        flags = pd.DataFrame(index=self.df.index)
+        cols = [col for col in columns if col in self.df.columns]
+        values = self.df[cols].fillna(0).to_numpy(dtype=float)
+        checks = suspicious_value_flags(values, threshold_multiplier)
+        flags = pd.DataFrame(checks['suspicious'], index=self.df.index,
+                             columns=[f'{col}_suspicious' for col in cols])
         
-        for col in columns:
-            if col not in self.df.columns:
-                continue
-                
-            # Check if values are exact multiples of threshold (e.g., exactly 10 billion)
-            values = self.df[col].fillna(0)
-            
-            # Flag 1: Exact multiples of large round numbers
-            is_round = (values % threshold_multiplier == 0) & (values > 0)
-            
-            # Flag 2: Values that are suspiciously large outliers
-            if len(values) > 3:
-                mean_val = values.mean()
-                std_val = values.std()
-                if std_val > 0:
-                    z_scores = np.abs((values - mean_val) / std_val)
-                    is_outlier = z_scores > 5
-                else:
-                    is_outlier = pd.Series([False] * len(values), index=values.index)
-            else:
-                is_outlier = pd.Series([False] * len(values), index=values.index)
-            
-            # Flag 3: Exactly zero when neighbors are non-zero
-            is_suspicious_zero = (values == 0) & (values.shift(1).fillna(0) > 0)
-            
-            # Combine flags
-            flags[f'{col}_suspicious'] = is_round | is_outlier | is_suspicious_zero
-            
-            # Store counts
+        # Store counts
+        counts = {name: mask.sum(axis=0) for name, mask in checks.items()}
+        for i, col in enumerate(cols):
             self.quality_report[col] = {
                 'total_records': len(values),
-                'round_numbers': is_round.sum(),
-                'outliers': is_outlier.sum(),
-                'suspicious_zeros': is_suspicious_zero.sum(),
-                'flagged_total': flags[f'{col}_suspicious'].sum(),
-                'flagged_percentage': (flags[f'{col}_suspicious'].sum() / len(values) * 100)
+                'round_numbers': counts['round'][i],
+                'outliers': counts['outlier'][i],
+                'suspicious_zeros': counts['zero'][i],
+                'flagged_total': counts['suspicious'][i],
+                'flagged_percentage': (counts['suspicious'][i] / len(values) * 100)
             }
         
         self.quality_flags = pd.concat([self.quality_flags, flags], axis=1)
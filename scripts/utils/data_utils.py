@@ -6,14 +6,18 @@ Common data cleaning, normalization, and validation functions.
 This module provides:
 - Comprehensive state name normalization (30+ variants → 36 standard names)
 - Invalid entry filtering (districts/pincodes mistakenly in state column)
-- Deduplication utilities
-- Safe merge functions that don't create false data
+- Deduplication utilities (optionally against a cross-chunk KeyIndex)
+- Safe merge functions that don't create false data (union_align: N-way
+  outer alignment via one key table instead of chained merges)
 """
 
 import os
 import re
 import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+from calendar_utils import add_calendar_features
 
 # ============================================================================
 # CONFIGURATION - Use relative paths from script location
@@ -260,6 +264,99 @@ def deduplicate_data(df, subset_cols=None, keep='first'):
 # SAFE DATA MERGING
 # ============================================================================
 
+def _key_codes(parts):
+    """
+    Sorted codes of one key column across frames.
+    
+    Returns:
+        (codes with missing last, in the smallest integer dtype that fits,
+         Series of distinct values by code)
+    """
+    if all(isinstance(p.dtype, pd.CategoricalDtype) for p in parts):
+        column = union_categoricals(parts, sort_categories=True)
+    else:
+        column = pd.concat(parts, ignore_index=True)
+    codes, uniques = pd.factorize(column, sort=True, use_na_sentinel=True)
+    # Missing keys get their own code after every value (outer merges sort NaN last)
+    codes[codes < 0] = len(uniques)
+    return codes.astype(np.min_scalar_type(len(uniques))), pd.Series(uniques)
+
+
+def union_align(frames, keys, names=None, suffixes=None):
+    """
+    Outer-align N frames on shared keys without chained outer merges.
+    
+    Each key column is factorized once across all frames (sorted integer
+    codes); the codes combine into one int64 key per row, whose sorted
+    distinct values are the output rows (same order as an outer merge).
+    Each frame's value columns are then scattered into those rows, so no
+    pairwise join tables are built, however many frames are aligned.
+    
+    Args:
+        frames: List of DataFrames (keys unique per frame; repeated keys
+                are summed, as in a groupby-sum)
+        keys: Columns to align on
+        names: Optional source names; adds a bool has_<name> column per frame
+        suffixes: Optional per-frame suffix for value columns whose name is
+                  already taken by an earlier frame (default '_src<i>', 1-based)
+        
+    Returns:
+        Aligned DataFrame: the first frame's columns, then each later frame's
+        value columns (NaN where a key is absent from that frame), then the
+        has_<name> columns
+    """
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return pd.DataFrame(columns=keys)
+    suffixes = suffixes or [f'_src{i}' for i in range(1, len(frames) + 1)]
+    
+    # Mixed-radix row key; re-densify before it could overflow int64
+    combined = np.zeros(sum(len(f) for f in frames), dtype=np.int64)
+    radix = 1
+    key_values = {}
+    for key in keys:
+        codes, uniques = _key_codes([f[key] for f in frames])
+        key_values[key] = (codes, uniques)
+        if radix * (len(uniques) + 1) >= 2 ** 62:
+            _, combined = np.unique(combined, return_inverse=True)
+            radix = int(combined.max()) + 1 if len(combined) else 1
+        combined *= len(uniques) + 1
+        combined += codes
+        radix *= len(uniques) + 1
+    _, group = np.unique(combined, return_inverse=True)
+    del combined
+    n_groups = int(group.max()) + 1 if len(group) else 0
+    first = np.zeros(n_groups, dtype=np.intp)
+    first[group[::-1]] = np.arange(len(group) - 1, -1, -1)
+    
+    # reindex on the code turns the missing-key code into NaN
+    columns = [pd.DataFrame({key: uniques.reindex(codes[first]).reset_index(drop=True)
+                             for key, (codes, uniques) in key_values.items()})]
+    taken = set(keys)
+    provenance = {}
+    offset = 0
+    for i, frame in enumerate(frames):
+        rows = group[offset:offset + len(frame)]
+        offset += len(frame)
+        values = frame.drop(columns=keys)
+        values = values.rename(columns={c: f'{c}{suffixes[i]}' for c in values.columns if c in taken})
+        taken.update(values.columns)
+        values.index = rows
+        if values.index.has_duplicates:
+            values = values.groupby(level=0).sum()
+        columns.append(values.reindex(range(n_groups)).reset_index(drop=True))
+        if names:
+            present = np.zeros(n_groups, dtype=bool)
+            present[rows] = True
+            provenance[f'has_{names[i]}'] = present
+    
+    # Column order as a merge would give it: the first frame's layout, then the rest
+    aligned = pd.concat(columns, axis=1)
+    lead = list(frames[0].columns)
+    aligned = aligned[lead + [c for c in aligned.columns if c not in set(lead)]]
+    return aligned.assign(**provenance)
+
+
 def safe_merge_datasets(dfs, merge_keys, how='outer', fill_strategy='drop'):
     """
     Merge multiple DataFrames with proper handling of missing data.
@@ -287,20 +384,27 @@ def safe_merge_datasets(dfs, merge_keys, how='outer', fill_strategy='drop'):
     if len(dfs) == 1:
         return dfs[0].copy()
     
-    # Start with first dataframe
-    result = dfs[0].copy()
-    result['_source_count'] = 1
-    
-    # Merge remaining dataframes
-    for i, df in enumerate(dfs[1:], start=2):
-        df_copy = df.copy()
-        df_copy['_temp_source'] = 1
-        
-        result = result.merge(df_copy, on=merge_keys, how=how, suffixes=('', f'_src{i}'))
+    if how == 'outer':
+        # One key table + scatter instead of pairwise outer merges
+        names = [str(i) for i in range(1, len(dfs) + 1)]
+        result = union_align(dfs, merge_keys, names=names, suffixes=[''] + [f'_src{i}' for i in names[1:]])
+        has = [f'has_{n}' for n in names]
+        result.insert(len(dfs[0].columns), '_source_count', result[has].sum(axis=1))
+        result.drop(columns=has, inplace=True)
+    else:
+        # Start with first dataframe (merge always allocates a new result, so the
+        # inputs are never copied; source tracking uses merge's indicator column)
+        result = dfs[0].assign(_source_count=1)
         
-        # Update source count
-        result['_source_count'] = result['_source_count'].fillna(0) + result['_temp_source'].fillna(0)
-        result = result.drop(columns=['_temp_source'], errors='ignore')
+        # Merge remaining dataframes
+        for i, df in enumerate(dfs[1:], start=2):
+            result = result.merge(df, on=merge_keys, how=how, suffixes=('', f'_src{i}'),
+                                  indicator='_merge_side')
+            
+            # Update source count
+            from_right = result['_merge_side'].isin(['right_only', 'both'])
+            result['_source_count'] = result['_source_count'].fillna(0) + from_right
+            result.drop(columns=['_merge_side'], inplace=True)
     
     # Get numeric columns (excluding merge keys and source tracking)
     numeric_cols = result.select_dtypes(include=[np.number]).columns.tolist()
@@ -333,7 +437,7 @@ def filter_valid_activity(df, enrol_col='total_enrolments', update_col='total_up
     Returns:
         Filtered DataFrame
     """
-    df = df.copy()
+    # Read-only until the final boolean slice, so no defensive copy is needed
     
     # Handle update_col as string or list
     if isinstance(update_col, str):
@@ -422,7 +526,7 @@ def validate_data_quality(df, dataset_name="Dataset"):
     return results
 
 
-def preprocess_and_clean(df, dataset_name="Dataset", verbose=True):
+def preprocess_and_clean(df, dataset_name="Dataset", verbose=True, inplace=False):
     """
     Full preprocessing pipeline with all fixes applied.
     
@@ -430,6 +534,7 @@ def preprocess_and_clean(df, dataset_name="Dataset", verbose=True):
         df: Raw DataFrame
         dataset_name: Name for logging
         verbose: Whether to print progress
+        inplace: If True, the caller hands over df and no defensive copy is made
         
     Returns:
         Cleaned DataFrame
@@ -438,14 +543,12 @@ def preprocess_and_clean(df, dataset_name="Dataset", verbose=True):
         print(f"\n🔧 Preprocessing {dataset_name}...")
         print(f"   Initial rows: {len(df):,}")
     
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
     
     # 1. Parse dates
     if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-        df['year'] = df['date'].dt.year
-        df['month'] = df['date'].dt.month
-        df['day_of_week'] = df['date'].dt.day_name()
+        add_calendar_features(df, features=['year', 'month', 'day_of_week'])
         
         # Drop rows with invalid dates
         invalid_dates = df['date'].isna().sum()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Streaming Deduplication Index
+Drop repeated (date, state, district, pincode) rows across chunks, shards and runs.
+
+This module provides:
+- key_hashes(): one 64-bit hash per row of the key columns, hashing each
+  distinct value once (strings are not re-hashed per row)
+- BloomFilter: NumPy bit-array pre-check ("definitely new" vs "maybe seen")
+- KeyIndex: persistent set of key hashes in SQLite, fronted by the Bloom
+  filter; filter() keeps the first occurrence of each key and reports
+  per-shard counts (rows, kept, within-chunk and earlier duplicates)
+- dedup_shards(): stream every raw shard through one index per dataset,
+  skipping shards that an earlier run already ingested
+
+Only keys the Bloom filter reports as possibly present are confirmed in
+SQLite, so a run over new data rarely touches the disk index. Bloom false
+positives only cost a lookup; a 64-bit hash collision (about 1 in 3,700 for
+100M keys) would drop one row. Keys must be built from the same column
+types in every run (dates parsed, states/districts normalised the same way).
+
+Usage:
+    python scripts/utils/dedup_index.py                   # ingest new shards
+    python scripts/utils/dedup_index.py --reset --out outputs/dedup/clean
+"""
+
+import os
+import sys
+import glob
+import sqlite3
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from data_utils import get_data_dirs, normalize_state_name, normalize_district_name
+from schema_registry import map_distinct
+from calendar_utils import parse_dates
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEDUP_DIR = os.path.join(BASE_DIR, "outputs", "dedup")
+
+KEY_COLUMNS = ['date', 'state', 'district', 'pincode']
+CHUNK_ROWS = 250_000
+
+DEFAULT_CAPACITY = 1 << 24
+DEFAULT_ERROR_RATE = 0.01
+
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+_MIX = np.uint64(0x100000001B3)
+
+
+# ============================================================================
+# KEY HASHING
+# ============================================================================
+def _value_hashes(series):
+    """Per-row hash of one column, computed once per distinct value."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = pd.Index(uniques)
+    if pd.api.types.is_datetime64_any_dtype(uniques):
+        values = uniques.astype('datetime64[ns]').asi8
+    elif pd.api.types.is_numeric_dtype(uniques) and not pd.api.types.is_bool_dtype(uniques):
+        values = uniques.astype(np.float64).to_numpy()    # int and float pincodes hash alike
+    else:
+        values = np.asarray(uniques.astype(str), dtype=object)
+    lookup = np.append(pd.util.hash_array(values), _NULL_HASH)
+    return lookup[codes]
+
+
+def key_hashes(df, columns=None):
+    """
+    64-bit key hash per row.
+
+    Args:
+        df: Input frame
+        columns: Key columns (default: KEY_COLUMNS present in df)
+
+    Returns:
+        uint64 array, one hash per row
+    """
+    columns = [c for c in (columns or KEY_COLUMNS) if c in df.columns]
+    hashes = np.zeros(len(df), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for col in columns:
+            hashes = (hashes ^ _value_hashes(df[col])) * _MIX
+            hashes ^= hashes >> np.uint64(29)
+    return hashes
+
+
+# ============================================================================
+# BLOOM FILTER
+# ============================================================================
+class BloomFilter:
+    """
+    Bit-array Bloom filter over 64-bit hashes (double hashing, k probes).
+
+    Sized for `capacity` keys at `error_rate` false positives; more keys
+    only raise the false-positive rate.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE, bits=None, probes=None):
+        self.bits = int(bits or max(64, -capacity * np.log(error_rate) / np.log(2) ** 2))
+        self.probes = int(probes or max(1, round(self.bits / capacity * np.log(2))))
+        self.array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        with np.errstate(over='ignore'):
+            return (h1[:, None] + np.arange(self.probes, dtype=np.uint64) * h2[:, None]) % np.uint64(self.bits)
+
+    def add(self, hashes):
+        pos = self._positions(hashes).ravel()
+        np.bitwise_or.at(self.array, (pos >> np.uint64(3)).astype(np.intp),
+                         (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8)))
+
+    def might_contain(self, hashes):
+        """False where a hash is certainly absent."""
+        pos = self._positions(hashes)
+        bits = self.array[(pos >> np.uint64(3)).astype(np.intp)] >> (pos & np.uint64(7)).astype(np.uint8)
+        return (bits & 1).all(axis=1) if len(pos) else np.zeros(0, dtype=bool)
+
+
+# ============================================================================
+# KEY INDEX
+# ============================================================================
+class KeyIndex:
+    """
+    Persistent set of row-key hashes with first-occurrence filtering.
+
+    path=None keeps the index in memory (one run); a file path keeps it
+    across runs. The Bloom filter is stored alongside the keys on save().
+    Leaving a `with` block on an exception rolls back everything since the
+    last save(), so a shard's keys are kept only together with its
+    mark_ingested() row.
+    """
+
+    def __init__(self, path=None, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE, bloom=True):
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path or ':memory:')
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS keys (hash INTEGER PRIMARY KEY) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value);
+            CREATE TABLE IF NOT EXISTS shards (name TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER,
+                                               rows INTEGER, kept INTEGER, within INTEGER, across INTEGER);
+            CREATE TEMP TABLE probe (hash INTEGER PRIMARY KEY) WITHOUT ROWID;
+        """)
+        self.report = {}
+        self.bloom = self._load_bloom(capacity, error_rate) if bloom else None
+
+    def _load_bloom(self, capacity, error_rate):
+        meta = dict(self.conn.execute("SELECT name, value FROM meta"))
+        if 'bloom' in meta:
+            bloom = BloomFilter(bits=meta['bloom_bits'], probes=meta['bloom_probes'])
+            bloom.array = np.frombuffer(meta['bloom'], dtype=np.uint8).copy()
+            return bloom
+        bloom = BloomFilter(capacity, error_rate)
+        stored = len(self)
+        for offset in range(0, stored, CHUNK_ROWS):     # index written without a Bloom filter
+            rows = self.conn.execute("SELECT hash FROM keys LIMIT ? OFFSET ?", (CHUNK_ROWS, offset))
+            bloom.add(np.array([r[0] for r in rows], dtype=np.int64).view(np.uint64))
+        return bloom
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM keys").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.conn.rollback()
+            self.conn.close()
+
+    # ------------------------------------------------------------------- keys
+    def contains(self, hashes):
+        """
+        Which hashes are already in the index.
+
+        Returns:
+            (bool array, number of hashes confirmed against SQLite)
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        maybe = self.bloom.might_contain(hashes) if self.bloom is not None else np.ones(len(hashes), bool)
+        candidates = hashes[maybe].view(np.int64)
+        found = np.zeros(len(hashes), dtype=bool)
+        if len(candidates):
+            self.conn.execute("DELETE FROM probe")
+            self.conn.executemany("INSERT OR IGNORE INTO probe VALUES (?)", ((int(h),) for h in candidates))
+            present = [r[0] for r in self.conn.execute("SELECT hash FROM probe JOIN keys USING (hash)")]
+            found[maybe] = np.isin(candidates, np.array(present, dtype=np.int64))
+        return found, len(candidates)
+
+    def add(self, hashes):
+        """Insert hashes (assumed new and unique)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        self.conn.executemany("INSERT OR IGNORE INTO keys VALUES (?)", ((int(h),) for h in hashes.view(np.int64)))
+        if self.bloom is not None:
+            self.bloom.add(hashes)
+
+    def filter(self, df, columns=None, shard=None):
+        """
+        Keep the first occurrence of each key not already in the index, and add them.
+
+        Args:
+            df: Chunk to filter
+            columns: Key columns (default: KEY_COLUMNS present in df)
+            shard: Label the counts are reported under (default '-')
+
+        Returns:
+            bool mask of rows to keep
+        """
+        hashes = key_hashes(df, columns)
+        unique, first = np.unique(hashes, return_index=True)
+        seen, probed = self.contains(unique)
+        self.add(unique[~seen])
+        keep = np.zeros(len(df), dtype=bool)
+        keep[first[~seen]] = True
+
+        stats = self.report.setdefault(shard or '-', {'rows': 0, 'kept': 0, 'within': 0, 'across': 0, 'probed': 0})
+        stats['rows'] += len(df)
+        stats['kept'] += int(keep.sum())
+        stats['within'] += len(df) - len(unique)
+        stats['across'] += int(seen.sum())
+        stats['probed'] += probed
+        return keep
+
+    # ----------------------------------------------------------------- shards
+    def ingested(self, path):
+        """Stored counts if this exact file (name, size, mtime) was ingested before."""
+        st = os.stat(path)
+        row = self.conn.execute("SELECT rows, kept, within, across FROM shards WHERE name = ? AND size = ? "
+                                "AND mtime_ns = ?", (os.path.basename(path), st.st_size, st.st_mtime_ns)).fetchone()
+        return dict(zip(('rows', 'kept', 'within', 'across'), row)) if row else None
+
+    def mark_ingested(self, path, stats):
+        st = os.stat(path)
+        self.conn.execute("INSERT OR REPLACE INTO shards VALUES (?, ?, ?, ?, ?, ?, ?)",
+                          (os.path.basename(path), st.st_size, st.st_mtime_ns,
+                           stats['rows'], stats['kept'], stats['within'], stats['across']))
+
+    def save(self):
+        """Persist the Bloom filter and commit (call once a shard is fully ingested)."""
+        if self.bloom is not None:
+            self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                ('bloom', self.bloom.array.tobytes()), ('bloom_bits', self.bloom.bits),
+                ('bloom_probes', self.bloom.probes)])
+        self.conn.commit()
+
+    def close(self):
+        self.save()
+        self.conn.close()
+
+
+# ============================================================================
+# STREAMING STAGE
+# ============================================================================
+def normalize_keys(chunk):
+    """Key columns of a raw chunk, cleaned the way preprocess_and_clean cleans them."""
+    keys = pd.DataFrame(index=chunk.index)
+    if 'date' in chunk:
+        keys['date'] = parse_dates(chunk['date'])
+    if 'state' in chunk:
+        keys['state'] = map_distinct(chunk['state'], normalize_state_name)
+    if 'district' in chunk:
+        keys['district'] = map_distinct(chunk['district'], normalize_district_name)
+    if 'pincode' in chunk:
+        keys['pincode'] = pd.to_numeric(chunk['pincode'], errors='coerce')
+    return keys
+
+
+def dedup_shards(data_dirs=None, index_dir=DEDUP_DIR, out_dir=None, chunk_rows=CHUNK_ROWS, reset=False):
+    """
+    Stream every shard through a persistent per-dataset KeyIndex.
+
+    Args:
+        data_dirs: {dataset: directory} (default: data_utils.get_data_dirs())
+        index_dir: Where <dataset>.sqlite indexes live
+        out_dir: Optional directory for deduplicated copies of new shards
+        chunk_rows: Rows per chunk
+        reset: Start every index from scratch
+
+    Returns:
+        {dataset: {shard file: counts}} (counts from the index for shards
+        ingested by an earlier run, with 'cached': True)
+    """
+    data_dirs = data_dirs or get_data_dirs()
+    report = {}
+    for dataset, directory in sorted(data_dirs.items()):
+        files = sorted(glob.glob(os.path.join(directory, "*.csv")))
+        if not files:
+            continue
+        path = os.path.join(index_dir, f"{dataset}.sqlite")
+        if reset and os.path.exists(path):
+            os.remove(path)
+        report[dataset] = {}
+        with KeyIndex(path) as index:
+            for shard in files:
+                name = os.path.basename(shard)
+                previous = index.ingested(shard)
+                if previous:
+                    report[dataset][name] = {**previous, 'cached': True}
+                    continue
+                target = None
+                if out_dir:
+                    os.makedirs(os.path.join(out_dir, dataset), exist_ok=True)
+                    target = os.path.join(out_dir, dataset, name)
+                text_cols = {c: str for c in ('date', 'state', 'district')}
+                for i, chunk in enumerate(pd.read_csv(shard, chunksize=chunk_rows, dtype=text_cols)):
+                    keep = index.filter(normalize_keys(chunk), shard=name)
+                    if target:
+                        chunk[keep].to_csv(target, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+                index.mark_ingested(shard, index.report[name])
+                index.save()
+                report[dataset][name] = {**index.report[name], 'cached': False}
+    return report
+
+
+def print_dedup_report(report):
+    for dataset, shards in report.items():
+        print(f"\n📦 {dataset.upper()}")
+        for name, s in shards.items():
+            source = " (earlier run)" if s.get('cached') else ""
+            print(f"  {name:55} {s['rows']:>10,} rows  {s['kept']:>10,} kept  "
+                  f"{s['within']:>8,} in-shard  {s['across']:>8,} earlier{source}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicate the raw UIDAI shards across chunks, shards and runs")
+    parser.add_argument('--reset', action='store_true', help="Discard the persistent key indexes first")
+    parser.add_argument('--out', help="Write deduplicated copies of newly ingested shards here")
+    parser.add_argument('--index-dir', default=DEDUP_DIR, help="Directory of the per-dataset key indexes")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - STREAMING DEDUPLICATION")
+    print("="*70)
+    report = dedup_shards(index_dir=args.index_dir, out_dir=args.out, reset=args.reset)
+    print_dedup_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
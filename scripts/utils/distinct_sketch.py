@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Distinct-Count Sketches
+Mergeable approximate distinct counts (active pincodes / districts per cell).
+
+This module provides:
+- DistinctSketch: exact set of 64-bit value hashes that switches to a
+  HyperLogLog register array once it holds more than `threshold` values
+- count_distinct(): per-group distinct counts, a drop-in for groupby nunique
+- grouped_sketches() / merge_sketches(): per-group sketches that can be kept
+  from each chunk or shard and combined later without rescanning raw rows
+
+Exact mode is used up to threshold = 2**precision / 8 distinct values (the
+point where the hash set takes as much memory as the registers: 2,048 at the
+default precision 14), so per-cell counts of the sizes in this data (tens of
+pincodes per district-day, a few hundred to ~2,000 per state-month) are
+exact. Above it, the HyperLogLog estimate has a relative standard error of
+about 1.04 / sqrt(2**precision) (0.8% at precision 14).
+
+Values are hashed with pandas.util.hash_pandas_object (stable across runs
+and processes); sketches from different shards must be built from columns
+of the same dtype and with the same precision.
+"""
+
+import struct
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PRECISION = 14
+MIN_PRECISION, MAX_PRECISION = 4, 18
+
+# Serialized layout: magic, version, precision, mode, threshold, payload
+_MAGIC = b'UDS'
+_VERSION = 1
+_HEADER = struct.Struct('<3sBBBI')
+_EXACT, _DENSE = 0, 1
+
+
+# ============================================================================
+# HASHING / HYPERLOGLOG PRIMITIVES
+# ============================================================================
+def hash_values(values):
+    """64-bit hashes of the non-null values (unsorted, duplicates kept)."""
+    values = pd.Series(values) if not isinstance(values, pd.Series) else values
+    values = values[values.notna()]
+    return pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+
+
+def default_threshold(precision):
+    """Exact-mode cap: as many 8-byte hashes as fit in the 2**p register bytes."""
+    return (1 << precision) // 8
+
+
+def _check_precision(precision):
+    if not MIN_PRECISION <= precision <= MAX_PRECISION:
+        raise ValueError(f"precision must be between {MIN_PRECISION} and {MAX_PRECISION}, got {precision}")
+
+
+def _register_updates(hashes, precision):
+    """
+    Register index and rank for each hash.
+
+    The top `precision` bits pick the register; the rank is the position of
+    the first 1-bit in the remaining bits (leading zeros + 1).
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    index = (hashes >> np.uint64(64 - precision)).astype(np.intp)
+    rest = hashes << np.uint64(precision)
+    # Bit length via frexp on the 32-bit halves (exact in float64)
+    hi = (rest >> np.uint64(32)).astype(np.float64)
+    lo = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    bit_length = np.where(hi > 0, np.frexp(hi)[1] + 32, np.frexp(lo)[1])
+    rank = np.minimum(64 - bit_length + 1, 64 - precision + 1)
+    return index, rank.astype(np.uint8)
+
+
+def _registers(hashes, precision):
+    registers = np.zeros(1 << precision, dtype=np.uint8)
+    index, rank = _register_updates(hashes, precision)
+    np.maximum.at(registers, index, rank)
+    return registers
+
+
+def hll_estimate(registers):
+    """
+    HyperLogLog cardinality estimate for one register array (or one per row).
+
+    Uses linear counting while the raw estimate is below 2.5 m and some
+    registers are still empty; 64-bit hashes make the large-range
+    correction unnecessary.
+    """
+    registers = np.asarray(registers, dtype=np.float64)
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.exp2(-registers), axis=-1)
+    zeros = np.sum(registers == 0, axis=-1)
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+# ============================================================================
+# SKETCH
+# ============================================================================
+class DistinctSketch:
+    """
+    Mergeable distinct-value counter.
+
+    Holds the sorted unique value hashes (exact) until there are more than
+    `threshold` of them, then a HyperLogLog register array (approximate).
+    """
+
+    __slots__ = ('precision', 'threshold', 'hashes', 'registers')
+
+    def __init__(self, precision=DEFAULT_PRECISION, threshold=None):
+        _check_precision(precision)
+        self.precision = precision
+        self.threshold = default_threshold(precision) if threshold is None else int(threshold)
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.registers = None
+
+    @property
+    def is_exact(self):
+        return self.registers is None
+
+    def add(self, values):
+        """Add raw values (nulls are ignored, as in nunique)."""
+        return self.add_hashes(hash_values(values))
+
+    def add_hashes(self, hashes):
+        """Add pre-computed value hashes."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if self.registers is None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > self.threshold:
+                self.registers = _registers(self.hashes, self.precision)
+                self.hashes = None
+        elif len(hashes):
+            index, rank = _register_updates(hashes, self.precision)
+            np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """New sketch counting the union of both inputs."""
+        if other.precision != self.precision:
+            raise ValueError(f"cannot merge sketches of precision {self.precision} and {other.precision}")
+        merged = self.copy()
+        if other.registers is None:
+            return merged.add_hashes(other.hashes)
+        if merged.registers is None:
+            merged.registers = _registers(merged.hashes, self.precision)
+            merged.hashes = None
+        np.maximum(merged.registers, other.registers, out=merged.registers)
+        return merged
+
+    def __or__(self, other):
+        return self.merge(other)
+
+    def copy(self):
+        clone = DistinctSketch(self.precision, self.threshold)
+        clone.hashes = None if self.hashes is None else self.hashes.copy()
+        clone.registers = None if self.registers is None else self.registers.copy()
+        return clone
+
+    def count(self):
+        """Distinct values seen (exact in exact mode, rounded estimate otherwise)."""
+        if self.registers is None:
+            return len(self.hashes)
+        return int(round(float(hll_estimate(self.registers))))
+
+    def to_bytes(self):
+        """Compact serialized form (exact hashes or raw registers)."""
+        mode = _EXACT if self.registers is None else _DENSE
+        payload = self.hashes.astype('<u8').tobytes() if mode == _EXACT else self.registers.tobytes()
+        return _HEADER.pack(_MAGIC, _VERSION, self.precision, mode, self.threshold) + payload
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, precision, mode, threshold = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a serialized DistinctSketch")
+        sketch = cls(precision, threshold)
+        payload = data[_HEADER.size:]
+        if mode == _EXACT:
+            sketch.hashes = np.frombuffer(payload, dtype='<u8').astype(np.uint64)
+        else:
+            sketch.registers = np.frombuffer(payload, dtype=np.uint8).copy()
+            sketch.hashes = None
+        return sketch
+
+    def __repr__(self):
+        mode = 'exact' if self.registers is None else 'hll'
+        return f"DistinctSketch(count={self.count()}, mode={mode}, precision={self.precision})"
+
+
+# ============================================================================
+# GROUPED
+# ============================================================================
+def _group_hashes(df, keys, column):
+    """
+    Unique (group, value hash) pairs, sorted by group then hash.
+
+    Returns:
+        (group index, group codes, hashes, distinct values per group)
+    """
+    grouped = df.groupby(keys, sort=True, observed=True)
+    index = grouped.size().index
+    codes = grouped.ngroup().to_numpy()
+    values = df[column]
+    keep = ~np.isnan(codes) & values.notna().to_numpy()
+    codes = codes[keep].astype(np.intp)
+    hashes = pd.util.hash_pandas_object(values[keep], index=False).to_numpy(dtype=np.uint64)
+
+    order = np.lexsort((hashes, codes))
+    codes, hashes = codes[order], hashes[order]
+    first = np.ones(len(codes), dtype=bool)
+    first[1:] = (codes[1:] != codes[:-1]) | (hashes[1:] != hashes[:-1])
+    codes, hashes = codes[first], hashes[first]
+    return index, codes, hashes, np.bincount(codes, minlength=len(index))
+
+
+def _grouped_registers(codes, hashes, groups, precision):
+    """One register row per group in `groups` (sorted group codes)."""
+    rows = np.searchsorted(groups, codes)
+    take = (rows < len(groups)) & (groups[np.minimum(rows, len(groups) - 1)] == codes)
+    registers = np.zeros((len(groups), 1 << precision), dtype=np.uint8)
+    index, rank = _register_updates(hashes[take], precision)
+    np.maximum.at(registers, (rows[take], index), rank)
+    return registers
+
+
+def count_distinct(df, keys, column, precision=DEFAULT_PRECISION, threshold=None):
+    """
+    Distinct non-null values of `column` per group (groupby(keys)[column].nunique()).
+
+    Groups with up to `threshold` distinct values are counted exactly; larger
+    ones get the HyperLogLog estimate, rounded to an integer.
+
+    Args:
+        df: Input frame
+        keys: Group columns
+        column: Column whose distinct values are counted
+        precision: HyperLogLog precision (2**precision registers)
+        threshold: Exact-mode cap (default 2**precision / 8)
+
+    Returns:
+        int64 Series indexed like df.groupby(keys, sort=True, observed=True)
+    """
+    _check_precision(precision)
+    threshold = default_threshold(precision) if threshold is None else threshold
+    index, codes, hashes, counts = _group_hashes(df, keys, column)
+    counts = counts.astype(np.int64)
+    large = np.flatnonzero(counts > threshold)
+    if len(large):
+        estimates = hll_estimate(_grouped_registers(codes, hashes, large, precision))
+        counts[large] = np.rint(estimates).astype(np.int64)
+    return pd.Series(counts, index=index, name=column)
+
+
+def grouped_sketches(df, keys, column, precision=DEFAULT_PRECISION, threshold=None):
+    """
+    One DistinctSketch per group, for storing and merging with other chunks.
+
+    Returns:
+        Object Series of DistinctSketch indexed by the group keys
+    """
+    _check_precision(precision)
+    threshold = default_threshold(precision) if threshold is None else threshold
+    index, codes, hashes, counts = _group_hashes(df, keys, column)
+    ends = np.cumsum(counts)
+    large = np.flatnonzero(counts > threshold)
+    registers = _grouped_registers(codes, hashes, large, precision) if len(large) else None
+    large_row = {g: i for i, g in enumerate(large)}
+
+    sketches = []
+    for g, end in enumerate(ends):
+        sketch = DistinctSketch(precision, threshold)
+        if g in large_row:
+            sketch.registers = registers[large_row[g]]
+            sketch.hashes = None
+        else:
+            sketch.hashes = hashes[end - counts[g]:end]
+        sketches.append(sketch)
+    return pd.Series(sketches, index=index, name=column, dtype=object)
+
+
+def merge_sketches(*series):
+    """
+    Combine per-group sketch Series (e.g. one per shard or month) by group label.
+
+    Returns:
+        Object Series of merged sketches over the union of the group labels
+    """
+    merged = {}
+    for s in series:
+        for label, sketch in s.items():
+            merged[label] = merged[label].merge(sketch) if label in merged else sketch.copy()
+    if not series:
+        return pd.Series([], dtype=object)
+    template = series[0].index
+    if isinstance(template, pd.MultiIndex):
+        index = pd.MultiIndex.from_tuples(list(merged), names=template.names)
+    else:
+        index = pd.Index(list(merged), name=template.name)
+    combined = pd.Series(list(merged.values()), index=index, name=series[0].name, dtype=object)
+    return combined.sort_index()
+
+
+def sketch_counts(sketches):
+    """int64 Series of counts from a Series of sketches."""
+    return sketches.map(lambda s: s.count()).astype(np.int64)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Geography Dimension
+Stable integer surrogate keys for state, district and pincode.
+
+This module provides:
+- GeoDimension: pincode-level dimension table (geo_id, district_id, state_id)
+- assign(): add integer key columns to a fact frame (new keys get new IDs)
+- attach_names(): turn integer keys back into readable state/district names
+- Persistence to CSV so IDs stay the same across runs
+
+IDs are never reused or renumbered: keys already in the persisted table keep
+their ID and new keys are appended (in sorted order, so a fresh build is
+deterministic regardless of file order).
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DIMENSION_PATH = os.path.join(BASE_DIR, "outputs", "geo_dimension", "geo_dimension.csv")
+
+KEY_DTYPE = np.int32
+
+# Level -> (ID column, natural key columns)
+LEVELS = {
+    'state': ('state_id', ['state']),
+    'district': ('district_id', ['state', 'district']),
+    'pincode': ('geo_id', ['state', 'district', 'pincode']),
+}
+
+DIMENSION_COLUMNS = ['geo_id', 'district_id', 'state_id', 'state', 'district', 'pincode']
+
+
+class GeoDimension:
+    """Pincode-level geography dimension with stable integer IDs."""
+
+    def __init__(self, table=None, path=DEFAULT_DIMENSION_PATH):
+        self.path = path
+        if table is None:
+            table = pd.DataFrame({
+                'geo_id': pd.Series(dtype=KEY_DTYPE),
+                'district_id': pd.Series(dtype=KEY_DTYPE),
+                'state_id': pd.Series(dtype=KEY_DTYPE),
+                'state': pd.Series(dtype=object),
+                'district': pd.Series(dtype=object),
+                'pincode': pd.Series(dtype=np.int64),
+            })
+        self.table = table[DIMENSION_COLUMNS].reset_index(drop=True)
+        self._dirty = False
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, path=DEFAULT_DIMENSION_PATH):
+        """Load the persisted dimension (empty if the file does not exist)."""
+        if not os.path.exists(path):
+            return cls(path=path)
+        table = pd.read_csv(path, dtype={'state': str, 'district': str},
+                            keep_default_na=False, na_values=[])
+        for col in ('geo_id', 'district_id', 'state_id'):
+            table[col] = table[col].astype(KEY_DTYPE)
+        table['state'] = table['state'].astype(object)
+        table['district'] = table['district'].astype(object)
+        return cls(table, path=path)
+
+    def save(self, path=None):
+        """Write the dimension to CSV (only if new keys were added)."""
+        path = path or self.path
+        if not self._dirty and os.path.exists(path):
+            return path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.table.to_csv(path, index=False)
+        self._dirty = False
+        return path
+
+    # ------------------------------------------------------------------
+    # Key assignment
+    # ------------------------------------------------------------------
+    def _register(self, keys):
+        """
+        Add unseen (state, district, pincode) combinations to the table.
+
+        Args:
+            keys: DataFrame of distinct state/district/pincode rows
+        """
+        known = self.table[['state', 'district', 'pincode']]
+        new = keys.merge(known, on=['state', 'district', 'pincode'], how='left', indicator=True)
+        new = new[new['_merge'] == 'left_only'].drop(columns='_merge')
+        if new.empty:
+            return
+        new = new.sort_values(['state', 'district', 'pincode'], ignore_index=True)
+
+        # State and district IDs: reuse existing, append new
+        state_ids = dict(zip(self.table['state'], self.table['state_id']))
+        next_state = int(self.table['state_id'].max()) + 1 if len(self.table) else 0
+        for state in new['state'].unique():
+            if state not in state_ids:
+                state_ids[state] = next_state
+                next_state += 1
+
+        district_ids = dict(zip(zip(self.table['state'], self.table['district']), self.table['district_id']))
+        next_district = int(self.table['district_id'].max()) + 1 if len(self.table) else 0
+        for pair in zip(new['state'], new['district']):
+            if pair not in district_ids:
+                district_ids[pair] = next_district
+                next_district += 1
+
+        next_geo = int(self.table['geo_id'].max()) + 1 if len(self.table) else 0
+        new['geo_id'] = np.arange(next_geo, next_geo + len(new), dtype=KEY_DTYPE)
+        new['state_id'] = new['state'].map(state_ids).astype(KEY_DTYPE)
+        new['district_id'] = [district_ids[p] for p in zip(new['state'], new['district'])]
+        new['district_id'] = new['district_id'].astype(KEY_DTYPE)
+
+        self.table = pd.concat([self.table, new[DIMENSION_COLUMNS]], ignore_index=True)
+        self._dirty = True
+
+    def assign(self, df, levels=('state', 'district')):
+        """
+        Add integer key columns to a fact frame, in place.
+
+        Distinct (state, district, pincode) combinations are resolved once;
+        rows receive their IDs through an integer take.
+
+        Args:
+            df: Frame with normalized 'state' and 'district' columns
+                (and 'pincode' for the pincode level)
+            levels: Which ID columns to add ('state', 'district', 'pincode')
+
+        Returns:
+            The same DataFrame
+        """
+        cols = ['state', 'district', 'pincode'] if 'pincode' in df.columns else ['state', 'district']
+        grouped = df.groupby(cols, sort=False, observed=True, dropna=False)
+        codes = grouped.ngroup().to_numpy()
+        keys = grouped.size().index.to_frame(index=False)
+        for col in ('state', 'district'):
+            keys[col] = keys[col].astype(object)
+        if 'pincode' not in keys.columns:
+            keys['pincode'] = -1  # district-only facts map to a synthetic pincode
+        keys['pincode'] = keys['pincode'].astype(np.int64)
+
+        self._register(keys)
+        resolved = keys.merge(self.table, on=['state', 'district', 'pincode'], how='left')
+
+        for level in levels:
+            id_col = LEVELS[level][0]
+            df[id_col] = resolved[id_col].to_numpy(dtype=KEY_DTYPE)[codes]
+        return df
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def lookup(self, level='district'):
+        """
+        ID -> names table for one level.
+
+        Returns:
+            DataFrame indexed by the level's ID with its name columns
+        """
+        id_col, names = LEVELS[level]
+        return self.table.drop_duplicates(id_col).set_index(id_col)[names].sort_index()
+
+    def attach_names(self, df, level='district', position=None):
+        """
+        Insert readable name columns for an integer key, in place.
+
+        Args:
+            df: Frame with the level's ID column
+            level: 'state', 'district' or 'pincode'
+            position: Column position for the first name column (default: after the ID)
+
+        Returns:
+            The same DataFrame
+        """
+        id_col, names = LEVELS[level]
+        table = self.lookup(level)
+        idx = table.index.get_indexer(df[id_col].to_numpy())
+        if position is None:
+            position = df.columns.get_loc(id_col) + 1
+        for offset, name in enumerate(names):
+            values = table[name].to_numpy()[idx]
+            if name in df.columns:
+                df[name] = values
+            else:
+                df.insert(position + offset, name, values)
+        return df
+
+    def __len__(self):
+        return len(self.table)
+
+    def summary(self):
+        """Counts of states, districts and pincodes in the dimension."""
+        return {
+            'states': int(self.table['state_id'].nunique()),
+            'districts': int(self.table['district_id'].nunique()),
+            'pincodes': int((self.table['pincode'] >= 0).sum()),
+        }
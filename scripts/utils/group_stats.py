@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Grouped Statistics
+Per-group Gini coefficients and trend slopes without a Python loop per group.
+
+This module provides:
+- grouped_gini(): Gini coefficient per group from one sort of all values
+- trend_slopes(): least-squares slope per group (closed form over grouped sums)
+
+Both reproduce the per-group loops in district_inequality_analysis.py
+(calculate_gini) and forecast_analysis.py (analyze_district_trends); see
+scripts/equivalence.py for the side-by-side checks.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================================
+# GINI
+# ============================================================================
+def grouped_gini(values, groups, min_size=1):
+    """
+    Gini coefficient of `values` within each group.
+
+    Matches calculate_gini() per group: NaNs are dropped, values are ranked
+    ascending, G = 2*sum(i*x_i) / (n*sum(x)) - (n+1)/n, and |G| is returned.
+
+    Args:
+        values: Array-like of values
+        groups: Array-like of group labels (same length)
+        min_size: Groups with fewer non-NaN values are left out
+
+    Returns:
+        Series of Gini coefficients indexed by group label (sorted)
+    """
+    values = np.asarray(values, dtype=float)
+    groups = np.asarray(groups)
+    keep = ~np.isnan(values)
+    codes, labels = pd.factorize(groups[keep], sort=True)
+    values = values[keep]
+
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    n = np.bincount(codes, minlength=len(labels))
+    starts = np.concatenate([[0], np.cumsum(n)[:-1]])
+    rank = np.arange(1, len(values) + 1) - np.repeat(starts, n)
+
+    weighted = np.bincount(codes, weights=rank * values, minlength=len(labels))
+    total = np.bincount(codes, weights=values, minlength=len(labels))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gini = np.abs(2 * weighted / (n * total) - (n + 1) / n)
+
+    result = pd.Series(gini, index=pd.Index(labels), name='gini')
+    return result[n >= max(min_size, 1)]
+
+
+# ============================================================================
+# TRENDS
+# ============================================================================
+def trend_slopes(df, keys, order, values):
+    """
+    Linear trend per group, fitted against the row position 0..n-1.
+
+    Matches analyze_district_trends(): rows are ordered by `order` within
+    each group, groups with fewer than 2 rows or constant values are
+    dropped, and relative_slope = slope / mean * 100.
+
+    Args:
+        df: Frame with the key and order columns
+        keys: Group columns (e.g. ['state', 'district'])
+        order: Column that orders rows within a group (e.g. 'date')
+        values: Array-like aligned with df (e.g. total_updates + total_enrol)
+
+    Returns:
+        DataFrame with keys, slope, mean_activity, n_months, relative_slope
+    """
+    frame = df[keys + [order]].copy()
+    frame['_y'] = np.asarray(values, dtype=float)
+    frame = frame.sort_values(keys + [order], kind='stable')
+    grouped = frame.groupby(keys, sort=True)
+    frame['_x'] = grouped.cumcount().astype(float)
+    frame['_xy'] = frame['_x'] * frame['_y']
+    frame['_xx'] = frame['_x'] * frame['_x']
+    frame['_nan'] = frame['_y'].isna()
+
+    stats = frame.groupby(keys, sort=True).agg(
+        n=('_y', 'size'), sx=('_x', 'sum'), sy=('_y', 'sum'), sxy=('_xy', 'sum'), sxx=('_xx', 'sum'),
+        y_min=('_y', 'min'), y_max=('_y', 'max'), has_nan=('_nan', 'max'),
+    )
+    # np.std(y) > 0 with exact inputs <=> the group is not constant
+    stats = stats[(stats['n'] >= 2) & (stats['y_max'] > stats['y_min']) & ~stats['has_nan'].astype(bool)]
+
+    n = stats['n'].to_numpy(dtype=float)
+    slope = (n * stats['sxy'] - stats['sx'] * stats['sy']) / (n * stats['sxx'] - stats['sx'] ** 2)
+    trends = pd.DataFrame({
+        'slope': slope,
+        'mean_activity': stats['sy'] / n,
+        'n_months': stats['n'],
+    }).reset_index()
+    trends['relative_slope'] = (trends['slope'] / trends['mean_activity']) * 100
+    return trends
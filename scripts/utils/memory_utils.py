@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Memory Utilities
+Ownership-aware copying, column projection and per-phase peak-RSS reporting.
+
+This module provides:
+- Copy-on-write switch (pandas >= 2.0; always on in pandas >= 3.0)
+- ensure_owned(): copy a frame only when the caller keeps ownership
+- project_columns(): drop everything a phase does not need, in place
+- MemoryReport: per-phase peak RSS relative to the raw input frame
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Peak memory budget relative to the raw frame(s), per phase
+DEFAULT_PEAK_TARGET = 1.5
+
+
+# ============================================================================
+# COPY-ON-WRITE / OWNERSHIP
+# ============================================================================
+def _pandas_major():
+    return int(pd.__version__.split('.')[0])
+
+
+def enable_copy_on_write():
+    """
+    Enable pandas copy-on-write so shallow copies and chained derivations
+    share memory until they are written to.
+
+    Returns:
+        True if copy-on-write is active afterwards
+    """
+    if _pandas_major() >= 3:
+        return True  # Always on; setting the option is deprecated
+    try:
+        pd.set_option('mode.copy_on_write', True)
+        return True
+    except (KeyError, ValueError, pd.errors.OptionError):
+        return False
+
+
+def copy_on_write_enabled():
+    """Whether pandas is currently running with copy-on-write semantics."""
+    if _pandas_major() >= 3:
+        return True
+    try:
+        return bool(pd.get_option('mode.copy_on_write'))
+    except (KeyError, ValueError, pd.errors.OptionError):
+        return False
+
+
+def ensure_owned(df, inplace=False):
+    """
+    Return a frame the caller may mutate freely.
+
+    Args:
+        df: Input DataFrame
+        inplace: True if the caller hands over ownership of df
+
+    Returns:
+        df itself (inplace), a lazy shallow copy (copy-on-write) or a deep copy
+    """
+    if inplace:
+        return df
+    if copy_on_write_enabled():
+        return df.copy(deep=False)
+    return df.copy()
+
+
+def project_columns(df, columns):
+    """
+    Drop every column not listed, in place.
+
+    Args:
+        df: DataFrame to trim
+        columns: Columns to keep (missing ones are ignored)
+
+    Returns:
+        The same DataFrame
+    """
+    keep = set(columns)
+    drop = [c for c in df.columns if c not in keep]
+    if drop:
+        df.drop(columns=drop, inplace=True)
+    return df
+
+
+def frame_nbytes(*frames):
+    """Deep memory footprint of one or more DataFrames, in bytes."""
+    return int(sum(f.memory_usage(deep=True).sum() for f in frames if f is not None))
+
+
+# ============================================================================
+# RSS MEASUREMENT
+# ============================================================================
+def _read_proc_status(field):
+    """Read a kB field (e.g. VmRSS, VmHWM) from /proc/self/status."""
+    try:
+        with open('/proc/self/status') as fp:
+            for line in fp:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_bytes():
+    """Current resident set size in bytes (None if unavailable)."""
+    return _read_proc_status('VmRSS')
+
+
+def peak_rss_bytes():
+    """Peak resident set size in bytes since start (or the last reset)."""
+    hwm = _read_proc_status('VmHWM')
+    if hwm is not None:
+        return hwm
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kB, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def reset_peak_rss():
+    """
+    Reset the kernel's peak-RSS watermark so the next phase is measured alone.
+
+    Returns:
+        True if the watermark was reset (Linux only), False otherwise
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as fp:
+            fp.write('5')
+        return True
+    except OSError:
+        return False
+
+
+# ============================================================================
+# PER-PHASE REPORT
+# ============================================================================
+class MemoryReport:
+    """Records peak RSS for each pipeline phase relative to the raw input."""
+
+    def __init__(self, target_ratio=DEFAULT_PEAK_TARGET):
+        self.target_ratio = target_ratio
+        self.baseline_rss = current_rss_bytes() or peak_rss_bytes()
+        self.raw_bytes = None
+        self.phases = []
+
+    def set_raw_frames(self, *frames):
+        """Record the size of the raw input frame(s) that ratios refer to."""
+        self.raw_bytes = frame_nbytes(*frames)
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager measuring wall time and peak RSS of one phase."""
+        resettable = reset_peak_rss()
+        start_rss = current_rss_bytes()
+        start_peak = peak_rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            peak = peak_rss_bytes()
+            self.phases.append({
+                'phase': name,
+                'seconds': round(time.perf_counter() - start, 3),
+                'rss_start_mb': _mb(start_rss),
+                'rss_end_mb': _mb(current_rss_bytes()),
+                'peak_rss_mb': _mb(peak),
+                'peak_exact': resettable or peak > start_peak,
+                'peak_over_baseline_bytes': max(0, (peak or 0) - (self.baseline_rss or 0)),
+            })
+
+    def summary(self):
+        """Per-phase records with peak/raw ratios filled in."""
+        rows = []
+        for record in self.phases:
+            row = dict(record)
+            if self.raw_bytes:
+                ratio = row['peak_over_baseline_bytes'] / self.raw_bytes
+                row['peak_vs_raw'] = round(ratio, 2)
+                row['within_target'] = ratio <= self.target_ratio
+            rows.append(row)
+        return rows
+
+    def print_report(self):
+        """Print a per-phase memory table."""
+        print("\n📊 Memory Report (peak RSS per phase)")
+        if self.raw_bytes:
+            print(f"   Raw frame(s): {_mb(self.raw_bytes):,.1f} MB | "
+                  f"target ≤ {self.target_ratio:.1f}× raw above baseline")
+        for row in self.summary():
+            status = ""
+            if 'within_target' in row:
+                status = "✅" if row['within_target'] else "⚠️"
+                status = f"{row['peak_vs_raw']:>5.2f}× {status}"
+            print(f"   {row['phase']:<14} peak {row['peak_rss_mb']:>9,.1f} MB  "
+                  f"{row['seconds']:>7.2f}s  {status}")
+        if not any(r['peak_exact'] for r in self.phases):
+            print("   (peak is process-lifetime high-water mark; per-phase reset unavailable)")
+
+    def save(self, path):
+        """Write the report as JSON."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        payload = {
+            'baseline_rss_mb': _mb(self.baseline_rss),
+            'raw_frame_mb': _mb(self.raw_bytes),
+            'target_ratio': self.target_ratio,
+            'copy_on_write': copy_on_write_enabled(),
+            'phases': self.summary(),
+        }
+        with open(path, 'w') as fp:
+            json.dump(payload, fp, indent=2)
+        return path
+
+
+def _mb(nbytes):
+    return None if nbytes is None else round(nbytes / (1024 * 1024), 1)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Shared Derived-Metric Kernel
+Single definition of every share, intensity and gap column used by the pipelines.
+
+This module provides:
+- A metric registry (totals, shares, intensities, attention gaps)
+- A single-pass NumPy kernel that computes any set of registered metrics
+- Optional float32 output for the derived (ratio) columns
+- Output aliases so each script keeps its historical column names
+
+Zero-denominator policy (identical for every script):
+- x / 0 -> 0 (no epsilon blow-ups)
+- If the metric declares clip_upper, a positive numerator over a zero
+  denominator saturates to clip_upper (the ratio is effectively infinite)
+"""
+
+import numpy as np
+
+# ============================================================================
+# METRIC REGISTRY
+# ============================================================================
+METRIC_REGISTRY = {}
+
+
+def register_metric(name, kind, inputs, denominator=(), scale=1.0,
+                    clip_upper=None, description=""):
+    """
+    Declare a derived metric.
+
+    Args:
+        name: Canonical output column name
+        kind: 'sum' (inputs added), 'ratio' (sum(inputs) / sum(denominator))
+              or 'diff' (inputs[0] - inputs[1])
+        inputs: Raw columns or other registered metrics
+        denominator: Columns or metrics summed into the denominator ('ratio' only)
+        scale: Multiplier applied to a ratio (e.g. 1000 for per-thousand)
+        clip_upper: Upper cap for a ratio (also used when the denominator is 0)
+        description: Human-readable definition
+    """
+    if kind not in ('sum', 'ratio', 'diff'):
+        raise ValueError(f"Unknown metric kind: {kind}")
+    if kind == 'ratio' and not denominator:
+        raise ValueError(f"Ratio metric '{name}' needs a denominator")
+    if kind == 'diff' and len(inputs) != 2:
+        raise ValueError(f"Diff metric '{name}' needs exactly two inputs")
+
+    METRIC_REGISTRY[name] = {
+        'kind': kind,
+        'inputs': tuple(inputs),
+        'denominator': tuple(denominator),
+        'scale': scale,
+        'clip_upper': clip_upper,
+        'description': description,
+    }
+
+
+# ------ BASE TOTALS ------
+register_metric('total_enrol', 'sum', ['age_0_5', 'age_5_17', 'age_18_greater'],
+                description="All new enrolments")
+register_metric('total_demo', 'sum', ['demo_age_5_17', 'demo_age_17_'],
+                description="All demographic updates")
+register_metric('total_bio', 'sum', ['bio_age_5_17', 'bio_age_17_'],
+                description="All biometric updates")
+register_metric('total_updates', 'sum', ['total_demo', 'total_bio'],
+                description="Demographic + biometric updates")
+
+# ------ ENROLMENT COMPOSITION ------
+register_metric('enrol_share_0_5', 'ratio', ['age_0_5'], ['total_enrol'])
+register_metric('enrol_share_5_17', 'ratio', ['age_5_17'], ['total_enrol'])
+register_metric('enrol_share_18_plus', 'ratio', ['age_18_greater'], ['total_enrol'])
+register_metric('enrol_child_share', 'ratio', ['age_0_5', 'age_5_17'], ['total_enrol'],
+                description="Share of enrolments aged 0-17")
+register_metric('child_share_enrol', 'ratio', ['age_0_5', 'age_5_17'], ['total_enrol'],
+                description="Same as enrol_child_share (cross-domain naming)")
+register_metric('adult_share_enrol', 'ratio', ['age_18_greater'], ['total_enrol'])
+register_metric('child_to_adult_ratio', 'ratio', ['age_0_5', 'age_5_17'], ['age_18_greater'],
+                clip_upper=100)
+register_metric('infant_to_child_ratio', 'ratio', ['age_0_5'], ['age_5_17'],
+                clip_upper=100)
+
+# ------ UPDATE COMPOSITION ------
+register_metric('demo_minor_share', 'ratio', ['demo_age_5_17'], ['total_demo'])
+register_metric('demo_adult_share', 'ratio', ['demo_age_17_'], ['total_demo'])
+register_metric('demo_minor_to_adult_ratio', 'ratio', ['demo_age_5_17'], ['demo_age_17_'])
+register_metric('bio_minor_share', 'ratio', ['bio_age_5_17'], ['total_bio'])
+register_metric('bio_adult_share', 'ratio', ['bio_age_17_'], ['total_bio'])
+register_metric('bio_minor_to_adult_ratio', 'ratio', ['bio_age_5_17'], ['bio_age_17_'])
+register_metric('bio_share', 'ratio', ['total_bio'], ['total_updates'])
+register_metric('demo_share', 'ratio', ['total_demo'], ['total_updates'])
+# NOTE: Update data has no 0-5 bucket, so "child" in updates means 5-17 only
+register_metric('child_share_updates', 'ratio', ['demo_age_5_17', 'bio_age_5_17'], ['total_updates'])
+register_metric('adult_share_updates', 'ratio', ['demo_age_17_', 'bio_age_17_'], ['total_updates'])
+
+# ------ INTENSITY (updates per enrolment) ------
+register_metric('demo_intensity', 'ratio', ['total_demo'], ['total_enrol'])
+register_metric('bio_intensity', 'ratio', ['total_bio'], ['total_enrol'])
+register_metric('total_intensity', 'ratio', ['total_updates'], ['total_enrol'])
+register_metric('updates_per_1000', 'ratio', ['total_updates'], ['total_enrol'], scale=1000.0)
+# 5-17 buckets align exactly between enrolment and updates
+register_metric('demo_intensity_5_17', 'ratio', ['demo_age_5_17'], ['age_5_17'])
+register_metric('bio_intensity_5_17', 'ratio', ['bio_age_5_17'], ['age_5_17'])
+# 17+ updates vs 18+ enrolment are misaligned, so normalise by total enrolment
+register_metric('demo_intensity_17plus', 'ratio', ['demo_age_17_'], ['total_enrol'])
+register_metric('bio_intensity_17plus', 'ratio', ['bio_age_17_'], ['total_enrol'])
+
+# ------ ATTENTION GAPS ------
+register_metric('child_attention_gap', 'diff', ['child_share_updates', 'child_share_enrol'],
+                description="Positive = children over-represented in updates")
+register_metric('adult_attention_gap', 'diff', ['adult_share_updates', 'adult_share_enrol'])
+
+# Metric sets used by the pipelines
+ENROLMENT_SHARE_METRICS = [
+    'enrol_share_0_5', 'enrol_share_5_17', 'enrol_share_18_plus', 'enrol_child_share',
+]
+CROSS_DOMAIN_METRICS = [
+    'total_updates',
+    'demo_intensity', 'bio_intensity', 'total_intensity',
+    'demo_intensity_5_17', 'bio_intensity_5_17',
+    'demo_intensity_17plus', 'bio_intensity_17plus',
+    'child_share_enrol', 'child_share_updates', 'child_attention_gap',
+    'adult_share_enrol', 'adult_share_updates', 'adult_attention_gap',
+]
+
+
+# ============================================================================
+# KERNEL
+# ============================================================================
+def _total_dtype(arrays):
+    """Accumulator dtype for a sum: integers widen to 64-bit, floats stay as-is."""
+    dtype = np.result_type(*[a.dtype for a in arrays])
+    if dtype.kind in 'iu' and dtype.itemsize < 8:
+        dtype = np.dtype(np.int64)
+    elif dtype.kind == 'b':
+        dtype = np.dtype(np.int64)
+    return dtype
+
+
+def _sum_arrays(arrays, out=None):
+    """Add arrays into a single buffer (one allocation at most)."""
+    if out is None:
+        out = np.empty(len(arrays[0]), dtype=_total_dtype(arrays))
+    np.copyto(out, arrays[0], casting='unsafe')
+    for arr in arrays[1:]:
+        np.add(out, arr, out=out, casting='unsafe')
+    return out
+
+
+def compute_metrics(df, metrics, dtype=np.float64, aliases=None):
+    """
+    Compute registered metrics into df in a single pass.
+
+    Dependencies are resolved once and shared, so e.g. total_enrol is summed
+    only once no matter how many shares use it. Existing columns are reused
+    as inputs; requested metrics are always recomputed.
+
+    Args:
+        df: DataFrame holding the raw count columns (modified in place)
+        metrics: Iterable of registered metric names
+        dtype: Output dtype for ratio/diff metrics (np.float64 or np.float32)
+        aliases: Optional {canonical_name: output_column} mapping
+
+    Returns:
+        The same DataFrame with the metric columns added
+    """
+    aliases = aliases or {}
+    metrics = list(metrics)
+    requested = set(metrics)
+    dtype = np.dtype(dtype)
+    n = len(df)
+    cache = {}
+
+    def resolve(name):
+        if name in cache:
+            return cache[name]
+
+        if name not in requested:
+            for column in (aliases.get(name), name):
+                if column is not None and column in df.columns:
+                    cache[name] = df[column].to_numpy()
+                    return cache[name]
+
+        spec = METRIC_REGISTRY.get(name)
+        if spec is None:
+            raise KeyError(f"Column or metric not available: {name}")
+
+        inputs = [resolve(c) for c in spec['inputs']]
+
+        if spec['kind'] == 'sum':
+            out = _sum_arrays(inputs)
+        elif spec['kind'] == 'diff':
+            out = np.empty(n, dtype=dtype)
+            np.subtract(inputs[0], inputs[1], out=out, casting='unsafe')
+        else:
+            num = inputs[0] if len(inputs) == 1 else _sum_arrays(inputs)
+            den_parts = [resolve(c) for c in spec['denominator']]
+            den = den_parts[0] if len(den_parts) == 1 else _sum_arrays(den_parts)
+
+            out = np.zeros(n, dtype=dtype)
+            valid = den != 0
+            np.divide(num, den, out=out, where=valid, casting='unsafe')
+            if spec['scale'] != 1.0:
+                out *= spec['scale']
+            if spec['clip_upper'] is not None:
+                out[~valid & (num > 0)] = spec['clip_upper']
+                np.minimum(out, spec['clip_upper'], out=out)
+
+        cache[name] = out
+        return out
+
+    for name in metrics:
+        resolve(name)
+
+    for name in metrics:
+        df[aliases.get(name, name)] = cache[name]
+
+    return df
+
+
+def describe_metrics(metrics=None):
+    """
+    Return human-readable formulas for registered metrics.
+
+    Args:
+        metrics: Optional list of names (defaults to the whole registry)
+
+    Returns:
+        Dict of {name: formula string}
+    """
+    names = metrics or list(METRIC_REGISTRY)
+    formulas = {}
+    for name in names:
+        spec = METRIC_REGISTRY[name]
+        if spec['kind'] == 'sum':
+            formula = ' + '.join(spec['inputs'])
+        elif spec['kind'] == 'diff':
+            formula = f"{spec['inputs'][0]} - {spec['inputs'][1]}"
+        else:
+            formula = f"({' + '.join(spec['inputs'])}) / ({' + '.join(spec['denominator'])})"
+            if spec['scale'] != 1.0:
+                formula += f" * {spec['scale']:g}"
+            if spec['clip_upper'] is not None:
+                formula += f", capped at {spec['clip_upper']:g}"
+        formulas[name] = formula
+    return formulas
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Partitioned Store
+Hive-style state/year/month layout for the integrated table.
+
+This module provides:
+- write_partitions(): one CSV per state=<S>/year=<Y>/month=<M> directory,
+  plus a _partitions.json listing every partition and its row count
+- list_partitions() / match_states(): resolve filters against the partition
+  list (a few hundred entries) instead of scanning the state column
+- read_partitions(): read only the partitions that pass the filters, with
+  the integrated schema applied
+
+Partition key columns are not repeated inside the files (as in Hive, Spark,
+DuckDB and Arrow datasets); they are restored from the path on read. State
+names are percent-encoded in directory names ("Jammu%20And%20Kashmir").
+Rows with a missing key (unmapped state) are not stored.
+
+integrated_analysis.py writes the store; to build it from an existing
+integrated_data.csv without re-running the pipeline:
+    python scripts/utils/partitioned_store.py
+"""
+
+import os
+import json
+import shutil
+from urllib.parse import quote
+
+import pandas as pd
+
+from schema_registry import read_dataset_csv, coerce_to_schema, concat_frames
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+INTEGRATED_DIR = os.path.join(BASE_DIR, "outputs", "integrated_analysis")
+STORE_DIR = os.path.join(INTEGRATED_DIR, "partitions")
+
+PARTITION_KEYS = ('state', 'year', 'month')
+MANIFEST_FILE = "_partitions.json"
+PART_FILE = "part-0.csv"
+DATASET = 'integrated'
+
+
+# ============================================================================
+# WRITE
+# ============================================================================
+def partition_path(values, keys=PARTITION_KEYS):
+    """Relative directory for one partition, e.g. state=Goa/year=2025/month=3."""
+    return "/".join(f"{k}={quote(str(v), safe='')}" for k, v in zip(keys, values))
+
+
+def write_partitions(df, root, keys=PARTITION_KEYS):
+    """
+    Write a frame as a partitioned directory tree, replacing any previous one.
+
+    The tree is built next to `root` and swapped in at the end, so readers
+    never see a half-written store.
+
+    Args:
+        df: Frame containing the key columns
+        root: Output directory
+        keys: Partition columns, outermost first
+
+    Returns:
+        Manifest dict ({'keys', 'columns', 'partitions': [{...key values, 'path', 'rows'}]})
+    """
+    keys = list(keys)
+    tmp_root = root.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_root, ignore_errors=True)
+
+    partitions = []
+    data_columns = [c for c in df.columns if c not in keys]
+    for values, part in df.groupby(keys, sort=True, observed=True):
+        rel = partition_path(values, keys)
+        os.makedirs(os.path.join(tmp_root, rel), exist_ok=True)
+        part[data_columns].to_csv(os.path.join(tmp_root, rel, PART_FILE), index=False)
+        entry = {k: (v.item() if hasattr(v, 'item') else v) for k, v in zip(keys, values)}
+        partitions.append({**entry, 'path': f"{rel}/{PART_FILE}", 'rows': len(part)})
+
+    manifest = {'keys': keys, 'columns': list(df.columns), 'partitions': partitions}
+    with open(os.path.join(tmp_root, MANIFEST_FILE), 'w') as fp:
+        json.dump(manifest, fp, indent=1)
+
+    shutil.rmtree(root, ignore_errors=True)
+    os.replace(tmp_root, root)
+    return manifest
+
+
+# ============================================================================
+# READ
+# ============================================================================
+def load_manifest(root):
+    """Partition manifest of a store, or None if the store does not exist."""
+    path = os.path.join(root, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def list_partitions(root):
+    """Partition entries of a store ([] if there is none)."""
+    manifest = load_manifest(root)
+    return manifest['partitions'] if manifest else []
+
+
+def match_states(partitions, query):
+    """
+    State names containing `query` (case-insensitive), from the partition list.
+
+    Same matching as the old df['state'].str.lower().str.contains(query) filter,
+    but over the distinct partition values only.
+    """
+    query = query.lower()
+    return sorted({p['state'] for p in partitions if query in p['state'].lower()})
+
+
+def read_partitions(root, states=None, years=None, months=None, columns=None):
+    """
+    Read the partitions that pass the filters.
+
+    Args:
+        root: Store directory
+        states, years, months: Optional collections of allowed key values
+        columns: Optional data columns to read (projection; keys always included)
+
+    Returns:
+        Typed DataFrame in the original column order (empty if nothing matches)
+    """
+    manifest = load_manifest(root)
+    if manifest is None:
+        raise FileNotFoundError(f"No partitioned store at {root}")
+    keys = manifest['keys']
+    filters = {'state': states, 'year': years, 'month': months}
+
+    selected = [p for p in manifest['partitions']
+                if all(filters.get(k) is None or p[k] in filters[k] for k in keys)]
+    frames = []
+    for p in selected:
+        part = read_dataset_csv(os.path.join(root, p['path']), DATASET, columns=columns)
+        key_values = pd.DataFrame({k: [p[k]] * len(part) for k in keys}, index=part.index)
+        frames.append(pd.concat([coerce_to_schema(key_values, DATASET), part], axis=1))
+
+    order = [c for c in manifest['columns'] if columns is None or c in keys or c in columns]
+    if not frames:
+        return pd.DataFrame(columns=order)
+    return concat_frames(frames)[order]
+
+
+def store_rows(partitions, states=None):
+    """Rows in the store (optionally only the given states), from the manifest."""
+    return sum(p['rows'] for p in partitions if states is None or p['state'] in states)
+
+
+def main():
+    """Partition outputs/integrated_analysis/integrated_data.csv into STORE_DIR."""
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - PARTITIONED STORE")
+    print("="*70)
+    source = os.path.join(INTEGRATED_DIR, "integrated_data.csv")
+    df = read_dataset_csv(source, DATASET)
+    manifest = write_partitions(df, STORE_DIR)
+    states = {p['state'] for p in manifest['partitions']}
+    print(f"  ✓ {store_rows(manifest['partitions']):,} rows → {len(manifest['partitions'])} partitions "
+          f"({len(states)} states)")
+    print(f"\n📁 Store: {STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Plot Registry
+Render independent figures in parallel and skip figures whose inputs are unchanged.
+
+This module provides:
+- PlotRegistry: collect plot functions with their data and output files
+- Cache keys from the plotting function's source plus a hash of its input data
+- A process pool (Agg backend) for the figures that need re-rendering
+- A per-directory manifest (.plot_cache.json) recording each figure's key
+
+Plot functions must be module-level (picklable) and save their own PNGs;
+the registry only decides which ones run and where.
+"""
+
+import os
+import sys
+import json
+import time
+import inspect
+import pickle
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+CACHE_FILENAME = ".plot_cache.json"
+
+# Bump to invalidate every cached figure (e.g. after a shared style change)
+PLOT_CACHE_VERSION = 1
+
+
+# ============================================================================
+# CACHE KEYS
+# ============================================================================
+def _update_hash(h, obj):
+    """Feed an argument into a hash: data by content, everything else by repr."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        meta = (list(obj.columns), [str(d) for d in obj.dtypes]) if isinstance(obj, pd.DataFrame) \
+            else (obj.name, str(obj.dtype))
+        h.update(repr((meta, obj.shape)).encode())
+        try:
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+        except TypeError:
+            # e.g. geometry or list-valued columns
+            h.update(pickle.dumps(obj, protocol=4))
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.dtype.str, obj.shape)).encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            h.update(repr(key).encode())
+            _update_hash(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        for item in obj:
+            _update_hash(h, item)
+    else:
+        h.update(repr(obj).encode())
+
+
+def _code_version(func):
+    """Source of the plotting function (falls back to its qualified name)."""
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):
+        return f"{func.__module__}.{func.__qualname__}"
+
+
+def plot_key(func, args, kwargs, version=None):
+    """
+    Cache key for one figure.
+
+    Args:
+        func: Plot function
+        args: Positional arguments (data slices)
+        kwargs: Keyword arguments
+        version: Optional extra version tag
+
+    Returns:
+        Hex digest
+    """
+    h = hashlib.sha256()
+    h.update(f"v{PLOT_CACHE_VERSION}:{version}\n".encode())
+    h.update(_code_version(func).encode())
+    _update_hash(h, list(args))
+    _update_hash(h, kwargs)
+    return h.hexdigest()
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+def _init_worker(setup=None):
+    import matplotlib
+    matplotlib.use('Agg')
+    if setup is not None:
+        setup()
+
+
+def _render(func, args, kwargs, context=None):
+    """Run one plot function and close its figures; returns seconds taken."""
+    import matplotlib.pyplot as plt
+    if context:
+        # Re-apply globals the parent set at runtime (lost under spawn)
+        func.__globals__.update(context)
+    start = time.perf_counter()
+    try:
+        func(*args, **kwargs)
+    finally:
+        plt.close('all')
+    return time.perf_counter() - start
+
+
+def _pool_context():
+    # fork shares the already-imported script and its data without re-import;
+    # other platforms fall back to spawn
+    if sys.platform.startswith('linux') and 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
+
+
+def default_jobs():
+    """Worker count: PLOT_JOBS environment variable, else the CPU count."""
+    env = os.environ.get('PLOT_JOBS')
+    if env:
+        return max(1, int(env))
+    return os.cpu_count() or 1
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+class PlotRegistry:
+    """Collects plot tasks for one output directory and renders the stale ones."""
+
+    def __init__(self, output_dir, setup=None, context=None, cache_file=None):
+        """
+        Args:
+            output_dir: Directory the figures are written to
+            setup: Optional module-level style function run in every worker
+                   (part of every figure's cache key)
+            context: Optional {name: value} module globals the plot functions
+                     read (e.g. an OUTPUT_DIR chosen on the command line)
+            cache_file: Manifest path (default: output_dir/.plot_cache.json)
+        """
+        self.output_dir = output_dir
+        self.setup = setup
+        self.context = context or {}
+        self.cache_file = cache_file or os.path.join(output_dir, CACHE_FILENAME)
+        self.tasks = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def add(self, func, *args, outputs, name=None, version=None, **kwargs):
+        """
+        Register a figure.
+
+        Args:
+            func: Module-level plot function (saves its own file(s))
+            *args: Arguments passed to func; DataFrames are hashed by content
+            outputs: File name(s) the function writes, relative to output_dir
+            name: Task name in the cache manifest (default: function name)
+            version: Optional tag to force re-rendering of this figure
+            **kwargs: Keyword arguments passed to func
+        """
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        self.tasks.append({
+            'name': name or func.__name__,
+            'func': func,
+            'args': args,
+            'kwargs': kwargs,
+            'outputs': [os.path.join(self.output_dir, o) for o in outputs],
+            'version': version,
+        })
+        return self
+
+    def _load_manifest(self):
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file) as fp:
+                return json.load(fp)
+        return {}
+
+    def _save_manifest(self, manifest):
+        os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+        with open(self.cache_file, 'w') as fp:
+            json.dump(manifest, fp, indent=2, sort_keys=True)
+
+    def _entry(self, task, key):
+        return {'key': key, 'outputs': [os.path.relpath(o, self.output_dir) for o in task['outputs']]}
+
+    def render(self, jobs=None, force=False):
+        """
+        Render every registered figure whose cache key changed.
+
+        Args:
+            jobs: Worker processes (default: default_jobs()); 1 renders in-process
+            force: Ignore the manifest and render everything
+
+        Returns:
+            Dict with 'rendered', 'cached' (task names) and 'seconds'
+        """
+        start = time.perf_counter()
+        manifest = self._load_manifest()
+
+        stale = []
+        cached = []
+        for task in self.tasks:
+            key = plot_key(task['func'], task['args'], task['kwargs'],
+                           (task['version'], self.setup and _code_version(self.setup),
+                            sorted(self.context.items())))
+            entry = manifest.get(task['name'], {})
+            if (not force and entry.get('key') == key
+                    and all(os.path.exists(o) for o in task['outputs'])):
+                cached.append(task['name'])
+            else:
+                stale.append((task, key))
+
+        jobs = min(jobs or default_jobs(), len(stale)) if stale else 0
+        try:
+            if jobs <= 1:
+                if stale and self.setup is not None:
+                    self.setup()
+                for task, key in stale:
+                    _render(task['func'], task['args'], task['kwargs'], self.context)
+                    manifest[task['name']] = self._entry(task, key)
+            else:
+                with ProcessPoolExecutor(max_workers=jobs, mp_context=_pool_context(),
+                                         initializer=_init_worker, initargs=(self.setup,)) as pool:
+                    futures = [(task, key, pool.submit(_render, task['func'], task['args'], task['kwargs'],
+                                                        self.context))
+                               for task, key in stale]
+                    for task, key, future in futures:
+                        future.result()
+                        manifest[task['name']] = self._entry(task, key)
+        finally:
+            self._save_manifest(manifest)
+
+        seconds = time.perf_counter() - start
+        print(f"  ✓ Plots: {len(stale)} rendered, {len(cached)} cached "
+              f"({seconds:.1f}s, {max(jobs, 1)} worker{'s' if jobs > 1 else ''})")
+        self.tasks = []
+        return {'rendered': [t['name'] for t, _ in stale], 'cached': cached, 'seconds': seconds}
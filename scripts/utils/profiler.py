@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Phase Profiler
+Per-phase wall time, CPU time, peak RSS and allocation hot spots.
+
+This module provides:
+- PhaseProfiler: phase-scoped timers (LOAD, PREPROCESS, AGGREGATE, ...)
+- tracemalloc top allocations per phase (by source line)
+- Optional cProfile dump per top-level phase
+- Machine-readable JSON reports and a diff of two reports
+
+Usage:
+    python scripts/utils/profiler.py old.json new.json   # per-phase regressions
+"""
+
+import os
+import sys
+import json
+import time
+import cProfile
+import platform
+import resource
+import tracemalloc
+from datetime import datetime
+from contextlib import contextmanager, nullcontext
+
+from memory_utils import current_rss_bytes, peak_rss_bytes, reset_peak_rss
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.path.join(BASE_DIR, "outputs", "profiles")
+
+# Canonical pipeline phases (any other name is accepted too)
+PHASES = ['LOAD', 'PREPROCESS', 'AGGREGATE', 'INTEGRATE', 'METRICS', 'CLUSTER', 'PLOT']
+
+DEFAULT_TOP_ALLOCATIONS = 10
+
+# Stack depth kept per allocation so library allocations can be attributed
+# to the repository line that triggered them
+TRACE_FRAMES = 25
+
+
+def _cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _mb(nbytes):
+    return None if nbytes is None else round(nbytes / (1024 * 1024), 2)
+
+
+# ============================================================================
+# PROFILER
+# ============================================================================
+class PhaseProfiler:
+    """
+    Records one entry per phase. Phases may nest (e.g. LOAD inside a CLI
+    command); peaks are carried up to the enclosing phase, and cProfile runs
+    only for top-level phases since only one profiler can be active.
+    """
+
+    def __init__(self, name='pipeline', trace_allocations=True, top=DEFAULT_TOP_ALLOCATIONS,
+                 cprofile_dir=None):
+        """
+        Args:
+            name: Run name (used in the report and default file name)
+            trace_allocations: Record tracemalloc top allocations (slows Python-level code)
+            top: Number of allocation sites kept per phase
+            cprofile_dir: Directory for per-phase .prof dumps (None disables cProfile)
+        """
+        self.name = name
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self.cprofile_dir = cprofile_dir
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.phases = []
+        self._stack = []
+        self._owns_tracemalloc = False
+
+    @contextmanager
+    def phase(self, name):
+        """Measure one phase; use as `with profiler.phase('LOAD'):`."""
+        setup_start = time.perf_counter()
+        if self._stack:
+            # Keep the parent's peak before the watermark is reset for the child
+            parent = self._stack[-1]
+            parent['peak_rss'] = max(parent['peak_rss'], peak_rss_bytes() or 0)
+            if tracemalloc.is_tracing():
+                parent['traced_peak'] = max(parent['traced_peak'], tracemalloc.get_traced_memory()[1])
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._owns_tracemalloc = True
+
+        frame = {
+            'name': name,
+            'depth': len(self._stack),
+            'resettable': reset_peak_rss(),
+            'rss_start': current_rss_bytes(),
+            'peak_rss': 0,
+            'traced_peak': 0,
+            'snapshot': None,
+            'cprofile': None,
+            'index': len(self.phases),
+            'overhead': 0.0,  # children's profiling bookkeeping, excluded from this phase
+        }
+        self.phases.append(None)  # filled on exit, so phases stay in start order
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            frame['snapshot'] = tracemalloc.take_snapshot() if self.trace_allocations else None
+        if self.cprofile_dir and frame['depth'] == 0:
+            frame['cprofile'] = cProfile.Profile()
+        if len(self._stack):
+            self._stack[-1]['overhead'] += time.perf_counter() - setup_start
+        self._stack.append(frame)
+
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        if frame['cprofile'] is not None:
+            frame['cprofile'].enable()
+        try:
+            yield self
+        finally:
+            if frame['cprofile'] is not None:
+                frame['cprofile'].disable()
+            wall = time.perf_counter() - wall_start - frame['overhead']
+            cpu = _cpu_seconds() - cpu_start - frame['overhead']
+            self._stack.pop()
+            finish_start = time.perf_counter()
+            self._finish(frame, wall, max(cpu, 0.0))
+            if self._stack:
+                self._stack[-1]['overhead'] += time.perf_counter() - finish_start + frame['overhead']
+
+    def _finish(self, frame, wall, cpu):
+        peak = max(frame['peak_rss'], peak_rss_bytes() or 0)
+        record = {
+            'phase': frame['name'],
+            'depth': frame['depth'],
+            'wall_seconds': round(wall, 4),
+            'cpu_seconds': round(cpu, 4),
+            'cpu_utilization': round(cpu / wall, 2) if wall > 0 else None,
+            'rss_start_mb': _mb(frame['rss_start']),
+            'rss_end_mb': _mb(current_rss_bytes()),
+            'peak_rss_mb': _mb(peak),
+            'peak_exact': frame['resettable'],
+            'profiler_overhead_seconds': round(frame['overhead'], 4),
+        }
+
+        if tracemalloc.is_tracing():
+            traced_peak = max(frame['traced_peak'], tracemalloc.get_traced_memory()[1])
+            record['traced_peak_mb'] = _mb(traced_peak)
+            if frame['snapshot'] is not None:
+                record['top_allocations'] = self._top_allocations(frame['snapshot'])
+            if self._stack:
+                parent = self._stack[-1]
+                parent['traced_peak'] = max(parent['traced_peak'], traced_peak)
+            elif self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+
+        if frame['cprofile'] is not None:
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+            path = os.path.join(self.cprofile_dir, f"{self.name}_{frame['name']}.prof")
+            frame['cprofile'].dump_stats(path)
+            record['cprofile'] = path
+
+        if self._stack:
+            parent = self._stack[-1]
+            parent['peak_rss'] = max(parent['peak_rss'], peak)
+        self.phases[frame['index']] = record
+
+    def _top_allocations(self, start_snapshot):
+        """
+        Largest net allocations since the phase started.
+
+        Each allocation is attributed to the most recent stack frame inside
+        the repository (e.g. the integrated_analysis.py line that called
+        pandas), falling back to the allocating line itself.
+        """
+        stats = tracemalloc.take_snapshot().compare_to(start_snapshot, 'traceback')
+        sites = {}
+        for stat in stats:
+            if stat.size_diff <= 0:
+                continue
+            frames = list(stat.traceback)
+            if frames and frames[-1].filename == tracemalloc.__file__:
+                continue
+            repo = [f for f in frames if f.filename.startswith(BASE_DIR)]
+            frame = repo[-1] if repo else frames[-1]
+            key = f"{frame.filename}:{frame.lineno}"
+            site = sites.setdefault(key, {'location': key, 'size': 0, 'count': 0})
+            site['size'] += stat.size_diff
+            site['count'] += stat.count_diff
+        top = sorted(sites.values(), key=lambda x: -x['size'])[:self.top]
+        return [{'location': os.path.relpath(t['location'], BASE_DIR) if t['location'].startswith(BASE_DIR)
+                 else t['location'], 'size_mb': _mb(t['size']), 'count': t['count']} for t in top]
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'started': self.started,
+            'python': platform.python_version(),
+            'platform': sys.platform,
+            'trace_allocations': self.trace_allocations,
+            'phases': [r for r in self.phases if r is not None],
+        }
+
+    def save(self, path=None):
+        """Write the JSON report (default: outputs/profiles/<name>_<timestamp>.json)."""
+        if path is None:
+            stamp = self.started.replace(':', '').replace('-', '')
+            path = os.path.join(PROFILE_DIR, f"{self.name}_{stamp}.json")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as fp:
+            json.dump(self.to_dict(), fp, indent=2)
+        return path
+
+    def print_report(self):
+        """Print a per-phase table with the top allocation site of each phase."""
+        print(f"\n⏱️  Profile: {self.name}")
+        print(f"   {'Phase':<16} {'Wall s':>8} {'CPU s':>8} {'Peak RSS MB':>12} {'Traced MB':>10}")
+        for r in self.to_dict()['phases']:
+            label = "  " * r['depth'] + r['phase']
+            traced = r.get('traced_peak_mb')
+            print(f"   {label:<16} {r['wall_seconds']:>8.2f} {r['cpu_seconds']:>8.2f} "
+                  f"{r['peak_rss_mb'] or 0:>12,.1f} {traced if traced is not None else '-':>10}")
+            if r.get('top_allocations'):
+                top = r['top_allocations'][0]
+                print(f"   {'':<16} ↳ {top['size_mb']:,.1f} MB at {top['location']}")
+
+
+def profile_phase(profiler, name):
+    """profiler.phase(name), or a no-op context when profiling is off."""
+    return profiler.phase(name) if profiler is not None else nullcontext()
+
+
+# ============================================================================
+# COMPARISON
+# ============================================================================
+def compare_profiles(old, new):
+    """
+    Per-phase deltas between two reports (dicts or JSON paths).
+
+    Returns:
+        List of {phase, wall_old, wall_new, wall_change_pct, peak_rss_old, peak_rss_new}
+    """
+    def load(report):
+        if isinstance(report, str):
+            with open(report) as fp:
+                return json.load(fp)
+        return report
+
+    old_phases = {p['phase']: p for p in load(old)['phases']}
+    rows = []
+    for p in load(new)['phases']:
+        before = old_phases.get(p['phase'])
+        if before is None:
+            continue
+        wall_old = before['wall_seconds']
+        rows.append({
+            'phase': p['phase'],
+            'wall_old': wall_old,
+            'wall_new': p['wall_seconds'],
+            'wall_change_pct': round(100 * (p['wall_seconds'] - wall_old) / wall_old, 1) if wall_old else None,
+            'peak_rss_old': before['peak_rss_mb'],
+            'peak_rss_new': p['peak_rss_mb'],
+        })
+    return rows
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: python profiler.py OLD.json NEW.json")
+        return 1
+    print(f"{'Phase':<16} {'Old s':>8} {'New s':>8} {'Change':>8} {'Old MB':>10} {'New MB':>10}")
+    for row in compare_profiles(sys.argv[1], sys.argv[2]):
+        change = f"{row['wall_change_pct']:+.1f}%" if row['wall_change_pct'] is not None else '-'
+        flag = " ⚠️" if row['wall_change_pct'] is not None and row['wall_change_pct'] > 20 else ""
+        print(f"{row['phase']:<16} {row['wall_old']:>8.2f} {row['wall_new']:>8.2f} {change:>8} "
+              f"{row['peak_rss_old'] or 0:>10,.1f} {row['peak_rss_new'] or 0:>10,.1f}{flag}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Dataset Schema Registry
+Compact, declared dtypes for the raw and integrated datasets.
+
+This module provides:
+- Per-dataset column schemas (uint32 counts and pincodes, categorical geography)
+- Fixed-format date parsing at load time (no inference)
+- read_dataset_csv() / load_dataset(): typed loaders used by every pipeline
+- A validation mode that reports overflow, negatives and coercions per column
+
+Memory per demographic/biometric row drops from ~200 bytes (object strings,
+int64) to ~25 bytes (category codes, uint32, datetime64).
+"""
+
+import os
+import glob
+
+import numpy as np
+import pandas as pd
+
+from data_utils import VALID_STATES, normalize_state_name
+from calendar_utils import DATE_FORMAT, OBSERVED_BY_DEFAULT, parse_dates
+
+# ============================================================================
+# FIELD TYPES
+# ============================================================================
+COUNT_DTYPE = np.dtype(np.uint32)
+PINCODE_DTYPE = np.dtype(np.uint32)
+
+# On pandas < 3 (groupby observed=False by default) the geography columns
+# stay as strings to avoid cartesian-product groups in the aggregations.
+CATEGORICAL_GEO = OBSERVED_BY_DEFAULT
+
+STATE_DTYPE = pd.CategoricalDtype(sorted(VALID_STATES))
+
+# Logical field type -> (physical dtype, description)
+FIELD_TYPES = {
+    'date': ('datetime64', f"Parsed once with format {DATE_FORMAT}"),
+    'count': (COUNT_DTYPE, "Non-negative count"),
+    'pincode': (PINCODE_DTYPE, "6-digit postal code"),
+    'geo': ('category', "Raw geography label (dictionary-encoded)"),
+    'state': (STATE_DTYPE, "Normalized state (VALID_STATES categories)"),
+    'year': (np.dtype(np.uint16), "Calendar year"),
+    'month': (np.dtype(np.uint8), "Calendar month 1-12"),
+    'flag': (np.dtype(bool), "Boolean presence flag"),
+}
+
+# ============================================================================
+# DATASET SCHEMAS
+# ============================================================================
+_RAW_KEYS = {'date': 'date', 'state': 'geo', 'district': 'geo', 'pincode': 'pincode'}
+
+DATASET_SCHEMAS = {
+    'enrolment': {**_RAW_KEYS, 'age_0_5': 'count', 'age_5_17': 'count', 'age_18_greater': 'count'},
+    'demographic': {**_RAW_KEYS, 'demo_age_5_17': 'count', 'demo_age_17_': 'count'},
+    'biometric': {**_RAW_KEYS, 'bio_age_5_17': 'count', 'bio_age_17_': 'count'},
+    # outputs/integrated_analysis/integrated_data.csv (derived float columns keep inference)
+    'integrated': {
+        'year': 'year', 'month': 'month', 'state': 'state', 'district': 'geo',
+        'age_0_5': 'count', 'age_5_17': 'count', 'age_18_greater': 'count', 'total_enrol': 'count',
+        'demo_age_5_17': 'count', 'demo_age_17_': 'count', 'total_demo': 'count',
+        'bio_age_5_17': 'count', 'bio_age_17_': 'count', 'total_bio': 'count',
+        'total_updates': 'count',
+        'has_enrol': 'flag', 'has_demo': 'flag', 'has_bio': 'flag',
+        'interaction_category': 'geo',
+    },
+}
+
+
+def infer_dataset(path):
+    """
+    Guess the dataset name from a file or directory path.
+
+    Args:
+        path: Path containing 'enrolment', 'demographic', 'biometric' or 'integrated'
+
+    Returns:
+        Dataset name or None
+    """
+    name = os.path.basename(os.path.normpath(path)).lower()
+    for dataset in ('enrolment', 'demographic', 'biometric', 'integrated'):
+        if dataset in name:
+            return dataset
+    return None
+
+
+def get_schema(dataset):
+    """Return the {column: field_type} schema for a dataset."""
+    if dataset not in DATASET_SCHEMAS:
+        raise KeyError(f"Unknown dataset: {dataset}. Known: {sorted(DATASET_SCHEMAS)}")
+    return DATASET_SCHEMAS[dataset]
+
+
+def _read_dtypes(schema):
+    """dtype mapping passed to read_csv (everything else is coerced afterwards)."""
+    dtypes = {}
+    for col, field in schema.items():
+        if field == 'geo' and CATEGORICAL_GEO:
+            dtypes[col] = 'category'
+        elif field in ('date', 'state', 'geo'):
+            dtypes[col] = str
+    return dtypes
+
+
+# ============================================================================
+# COERCION
+# ============================================================================
+def _note(report, col, key, n):
+    if report is not None and n:
+        entry = report.setdefault(col, {})
+        entry[key] = entry.get(key, 0) + int(n)
+
+
+def _coerce_integer(series, dtype, col, report):
+    """Convert to an unsigned integer dtype, recording every value that changes."""
+    if series.dtype == dtype:
+        return series
+    values = pd.to_numeric(series, errors='coerce')
+    missing = values.isna()
+    _note(report, col, 'coerced', (missing & series.notna()).sum())
+    _note(report, col, 'missing', series.isna().sum())
+
+    info = np.iinfo(dtype)
+    negative = values < 0
+    overflow = values > info.max
+    _note(report, col, 'negative', negative.sum())
+    _note(report, col, 'overflow', overflow.sum())
+
+    if missing.any() or negative.any() or overflow.any():
+        values = values.fillna(0).clip(lower=0, upper=info.max)
+    return values.astype(dtype)
+
+
+def _coerce_date(series, col, report):
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    parsed = parse_dates(series, DATE_FORMAT)
+    _note(report, col, 'coerced', (parsed.isna() & series.notna()).sum())
+    _note(report, col, 'missing', series.isna().sum())
+    return parsed
+
+
+def _coerce_state(series, col, report):
+    """Normalize state labels once per distinct value into STATE_DTYPE."""
+    normalized = map_distinct(series, normalize_state_name)
+    _note(report, col, 'coerced', (normalized.isna() & series.notna()).sum())
+    if CATEGORICAL_GEO:
+        return normalized.astype(STATE_DTYPE)
+    return normalized
+
+
+def coerce_to_schema(df, dataset, report=None):
+    """
+    Convert a frame's columns to the dataset schema, in place.
+
+    Args:
+        df: DataFrame (columns not in the schema are left untouched)
+        dataset: Dataset name in DATASET_SCHEMAS
+        report: Optional dict collecting {column: {issue: count}}
+
+    Returns:
+        The same DataFrame
+    """
+    for col, field in get_schema(dataset).items():
+        if col not in df.columns:
+            continue
+        if field == 'date':
+            df[col] = _coerce_date(df[col], col, report)
+        elif field == 'state':
+            df[col] = _coerce_state(df[col], col, report)
+        elif field == 'geo':
+            if CATEGORICAL_GEO and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+        elif field == 'flag':
+            if df[col].dtype != bool:
+                _note(report, col, 'missing', df[col].isna().sum())
+                df[col] = df[col].fillna(False).astype(bool)
+        else:
+            df[col] = _coerce_integer(df[col], FIELD_TYPES[field][0], col, report)
+    return df
+
+
+def map_distinct(series, func):
+    """
+    Apply a scalar function once per distinct value instead of once per row.
+
+    Args:
+        series: Input Series (object, string or categorical)
+        func: Scalar mapping function
+
+    Returns:
+        Series of mapped values (object dtype, None for unmapped)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lookup = np.array([func(c) for c in series.cat.categories] + [func(np.nan)], dtype=object)
+        # codes == -1 (missing) index the trailing func(nan) entry
+        return pd.Series(lookup[series.cat.codes.to_numpy()], index=series.index, name=series.name)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    lookup = np.array([func(u) for u in uniques] + [func(np.nan)], dtype=object)
+    return pd.Series(lookup[codes], index=series.index, name=series.name)
+
+
+def to_state_category(series):
+    """Normalize a raw state column into the compact STATE_DTYPE categorical."""
+    return _coerce_state(series, series.name, None)
+
+
+# ============================================================================
+# LOADERS
+# ============================================================================
+def read_dataset_csv(path, dataset=None, columns=None, report=None):
+    """
+    Read one CSV with the declared schema applied.
+
+    Args:
+        path: CSV file path
+        dataset: Dataset name (inferred from the path if None)
+        columns: Optional list of columns to read (projection)
+        report: Optional dict collecting validation counts
+
+    Returns:
+        Typed DataFrame
+    """
+    dataset = dataset or infer_dataset(path) or infer_dataset(os.path.dirname(path))
+    if dataset is None:
+        return pd.read_csv(path, usecols=columns)
+
+    schema = get_schema(dataset)
+    usecols = (lambda c: c in columns) if columns else None
+    df = pd.read_csv(path, usecols=usecols, dtype=_read_dtypes(schema))
+    if report is not None:
+        report['_rows'] = report.get('_rows', 0) + len(df)
+    return coerce_to_schema(df, dataset, report)
+
+
+def concat_frames(frames):
+    """
+    Concatenate typed frames, keeping categorical columns categorical.
+
+    pd.concat falls back to object when category sets differ between files,
+    so categories are unioned first (cheap: only the category labels move).
+    """
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) > 1:
+        for col in frames[0].columns:
+            dtypes = [f[col].dtype for f in frames if col in f.columns]
+            if not all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+                continue
+            if all(d == dtypes[0] for d in dtypes):
+                continue
+            categories = dtypes[0].categories
+            for d in dtypes[1:]:
+                categories = categories.union(d.categories)
+            for f in frames:
+                if col in f.columns:
+                    f[col] = f[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_dataset(data_dir, dataset=None, columns=None, validate=False):
+    """
+    Load every CSV in a directory with the dataset schema.
+
+    Args:
+        data_dir: Directory of CSV shards
+        dataset: Dataset name (inferred from the directory if None)
+        columns: Optional column projection
+        validate: Print an overflow/coercion report after loading
+
+    Returns:
+        Typed DataFrame
+    """
+    dataset = dataset or infer_dataset(data_dir)
+    report = {} if validate else None
+    files = sorted(glob.glob(os.path.join(data_dir, "*.csv")))
+    data = concat_frames([read_dataset_csv(f, dataset, columns, report) for f in files])
+    if validate:
+        print_schema_report(report, dataset or data_dir)
+    return data
+
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+def print_schema_report(report, name):
+    """Print overflow/coercion counts collected while loading."""
+    rows = report.get('_rows', 0)
+    issues = {col: v for col, v in report.items() if col != '_rows'}
+    print(f"\n📋 Schema validation: {name} ({rows:,} rows)")
+    if not issues:
+        print("   ✅ All values fit the declared dtypes")
+        return
+    for col, counts in issues.items():
+        detail = ", ".join(f"{k}={v:,}" for k, v in sorted(counts.items()))
+        print(f"   ⚠️ {col}: {detail}")
+
+
+def compare_memory(path, dataset=None):
+    """
+    Compare inferred vs schema memory for one CSV.
+
+    Returns:
+        Tuple of (inferred_bytes, schema_bytes)
+    """
+    inferred = pd.read_csv(path).memory_usage(deep=True).sum()
+    typed = read_dataset_csv(path, dataset).memory_usage(deep=True).sum()
+    return int(inferred), int(typed)
+
+
+def main():
+    """Validate every raw dataset against its schema and report memory savings."""
+    from data_utils import get_data_dirs
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - SCHEMA VALIDATION")
+    print("="*70)
+
+    for dataset, data_dir in get_data_dirs().items():
+        files = sorted(glob.glob(os.path.join(data_dir, "*.csv")))
+        if not files:
+            print(f"\n⚠️ {dataset}: no files in {data_dir}")
+            continue
+        load_dataset(data_dir, dataset, validate=True)
+        inferred, typed = compare_memory(files[0], dataset)
+        print(f"   Memory ({os.path.basename(files[0])}): {inferred/1e6:,.1f} MB inferred → "
+              f"{typed/1e6:,.1f} MB typed ({inferred/max(typed, 1):.1f}× smaller)")
+
+
+if __name__ == "__main__":
+    main()
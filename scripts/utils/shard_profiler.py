@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Shard Profiler
+One-pass, parallel data-quality profile of the raw CSV shards.
+
+This module provides:
+- profile_shard(): streaming (chunked) profile of one CSV - rows, header
+  check, null / negative counts, date range, column totals, monthly and
+  weekday totals, raw state spellings, district totals, suspicious round
+  values, log2 histograms, per-column quantile sketches and a
+  distinct-pincode sketch
+- merge_profiles(): combine shard profiles (per dataset or across datasets)
+- profile_datasets(): profile every shard in parallel, reusing cached
+  profiles of shards whose size and mtime are unchanged
+- print_report(): the merged audit that audit_data.py and
+  deep_audit.py print from
+
+Every field of a profile is mergeable: counts and totals add, date ranges
+take min/max, histograms use fixed log2 bins, and pincodes are a
+DistinctSketch (exact up to PINCODE_EXACT_LIMIT values), and count column
+quantiles are QuantileSketches fed chunk by chunk, kept to a few hundred
+stored values (KLL with k=QUANTILE_K) so the cache does not grow with the
+shards. Outlier counts use
+each shard's own mean/std - every chunk adds to a per-shard tally of
+distinct values, and the |z| > 5 flags are counted from the tally once the
+shard is read - so they are per-shard flags summed.
+
+Usage:
+    python scripts/utils/shard_profiler.py            # profile + report
+    python scripts/utils/shard_profiler.py --force -j 4
+"""
+
+import os
+import sys
+import json
+import glob
+import base64
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_utils import get_data_dirs, normalize_state_name
+from schema_registry import get_schema
+from shard_scanner import read_header, validate_header
+from calendar_utils import parse_dates
+from data_quality_validator import suspicious_value_flags
+from distinct_sketch import DistinctSketch
+from quantile_sketch import QuantileSketch
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROFILE_DIR = os.path.join(BASE_DIR, "outputs", "data_profile")
+CACHE_FILE = os.path.join(PROFILE_DIR, "shard_profiles.json")
+REPORT_FILE = os.path.join(PROFILE_DIR, "data_profile.json")
+
+# Bump when the profile layout or any check changes (invalidates the cache)
+PROFILE_VERSION = 4
+
+CHUNK_ROWS = 250_000
+
+# Raw counts that are positive exact multiples of this are "round" values
+ROUND_MULTIPLE = 1000
+
+# Histogram bin b counts values in [2**(b-1), 2**b); bin 0 counts zeros
+HIST_BINS = 24
+
+# Exact distinct pincodes up to this many (India has ~19,000)
+PINCODE_EXACT_LIMIT = 1 << 15
+
+# Quantiles of each count column shown in the report
+REPORT_QUANTILES = (0.5, 0.99)
+
+# Quantile sketch size per column: exact up to this many values, then KLL
+# with the same k (a few hundred stored values, rank error ~1% of rows)
+QUANTILE_K = 256
+
+
+# ============================================================================
+# SHARD PROFILE
+# ============================================================================
+def _add_counts(target, source):
+    """Add a (possibly nested) dict of counts into target, in place."""
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _add_counts(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+    return target
+
+
+def _int_dict(series):
+    return {str(k): int(v) for k, v in series.items()}
+
+
+def log2_histogram(values):
+    """Counts per log2 bin of non-negative values (bin 0 = zero)."""
+    bins = np.minimum(np.frexp(values)[1], HIST_BINS - 1)
+    return np.bincount(bins, minlength=HIST_BINS)
+
+
+def _empty_profile(dataset, path, count_cols):
+    return {
+        'version': PROFILE_VERSION, 'dataset': dataset, 'file': os.path.basename(path),
+        'rows': 0, 'header': [], 'missing_columns': [], 'extra_columns': [],
+        'nulls': {}, 'negatives': {c: 0 for c in count_cols}, 'totals': {c: 0 for c in count_cols},
+        'round_values': {c: 0 for c in count_cols}, 'outliers': {c: 0 for c in count_cols},
+        'histograms': {c: [0] * HIST_BINS for c in count_cols},
+        'dates': {'min': None, 'max': None, 'invalid': 0},
+        'monthly': {}, 'weekday': {}, 'states': {}, 'districts': {}, 'pincodes': None,
+        'quantiles': {},
+    }
+
+
+def _profile_chunk(profile, chunk, count_cols, pincodes, tallies, quantiles):
+    """Fold one chunk of rows into a shard profile (and the shard's tallies and sketches)."""
+    profile['rows'] += len(chunk)
+    _add_counts(profile['nulls'], _int_dict(chunk.isna().sum()))
+
+    counts = chunk[count_cols].to_numpy(dtype=float)
+    valid = ~np.isnan(counts)
+    filled = np.where(valid, counts, 0)
+    checks = suspicious_value_flags(filled, ROUND_MULTIPLE)
+    for i, col in enumerate(count_cols):
+        column = counts[valid[:, i], i]
+        profile['negatives'][col] += int((column < 0).sum())
+        profile['totals'][col] += int(column.sum())
+        profile['round_values'][col] += int(checks['round'][:, i].sum())
+        values, n = np.unique(filled[:, i], return_counts=True)
+        _add_counts(tallies[col], dict(zip(values.tolist(), n.tolist())))
+        quantiles[col].update(column)
+        hist = log2_histogram(column[column >= 0])
+        profile['histograms'][col] = [a + int(b) for a, b in zip(profile['histograms'][col], hist)]
+
+    if 'date' in chunk.columns:
+        dates = parse_dates(chunk['date'])
+        profile['dates']['invalid'] += int(dates.isna().sum() - chunk['date'].isna().sum())
+        by_date = chunk[count_cols].groupby(dates).sum()
+        if len(by_date):
+            lo, hi = by_date.index.min().date().isoformat(), by_date.index.max().date().isoformat()
+            current = profile['dates']
+            current['min'] = lo if current['min'] is None else min(current['min'], lo)
+            current['max'] = hi if current['max'] is None else max(current['max'], hi)
+            for key, index in (('monthly', by_date.index.strftime('%Y-%m')),
+                               ('weekday', by_date.index.day_name())):
+                grouped = by_date.groupby(index).sum()
+                _add_counts(profile[key], {k: _int_dict(row) for k, row in grouped.iterrows()})
+
+    if 'state' in chunk.columns:
+        _add_counts(profile['states'], _int_dict(chunk['state'].value_counts()))
+    if 'district' in chunk.columns:
+        districts = chunk[count_cols].groupby(chunk['district']).sum()
+        _add_counts(profile['districts'], {k: _int_dict(row) for k, row in districts.iterrows()})
+    if 'pincode' in chunk.columns:
+        # float64 throughout so hashes agree across shards whatever the inferred dtype
+        pincodes.add(pd.to_numeric(chunk['pincode'], errors='coerce').astype(float))
+
+
+def tally_outliers(tally, z=5):
+    """
+    Values with |z-score| > z, from a {value: count} tally of a whole shard.
+
+    Same rule as suspicious_value_flags() on the full column: more than 3
+    rows and a non-zero sample std (ddof=1) are needed.
+    """
+    if not tally:
+        return 0
+    values = np.fromiter(tally.keys(), dtype=float)
+    counts = np.fromiter(tally.values(), dtype=float)
+    n = counts.sum()
+    if n <= 3:
+        return 0
+    mean = (values * counts).sum() / n
+    std = np.sqrt((((values - mean) ** 2) * counts).sum() / (n - 1))
+    if std == 0:
+        return 0
+    return int(counts[np.abs(values - mean) / std > z].sum())
+
+
+def profile_shard(path, dataset, chunk_rows=CHUNK_ROWS):
+    """
+    Profile one raw CSV shard in a single streaming pass.
+
+    Args:
+        path: CSV file
+        dataset: Dataset name (selects the expected schema)
+        chunk_rows: Rows read per chunk
+
+    Returns:
+        JSON-serialisable profile dict
+    """
+    schema = get_schema(dataset)
+    header = read_header(path)
+    count_cols = [c for c, field in schema.items() if field == 'count' and c in header]
+
+    profile = _empty_profile(dataset, path, count_cols)
+    profile['header'] = header
+    columns = validate_header(header, dataset)
+    profile['missing_columns'], profile['extra_columns'] = columns['missing'], columns['extra']
+
+    pincodes = DistinctSketch(threshold=PINCODE_EXACT_LIMIT)
+    text_cols = {c: str for c in ('date', 'state', 'district') if c in header}
+    tallies = {c: {} for c in count_cols}
+    quantiles = {c: QuantileSketch(k=QUANTILE_K, exact_limit=QUANTILE_K) for c in count_cols}
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype=text_cols):
+        _profile_chunk(profile, chunk, count_cols, pincodes, tallies, quantiles)
+    for col, tally in tallies.items():
+        profile['outliers'][col] = tally_outliers(tally)
+    profile['pincodes'] = _encode(pincodes)
+    profile['quantiles'] = {col: _encode(sketch) for col, sketch in quantiles.items()}
+    return profile
+
+
+# ============================================================================
+# MERGE
+# ============================================================================
+def _encode(sketch):
+    return base64.b64encode(sketch.to_bytes()).decode('ascii')
+
+
+def _sketch(encoded):
+    return DistinctSketch.from_bytes(base64.b64decode(encoded))
+
+
+def _quantile_sketch(encoded):
+    return QuantileSketch.from_bytes(base64.b64decode(encoded))
+
+
+def merge_profiles(profiles):
+    """
+    Combine shard (or already merged) profiles.
+
+    Returns:
+        Profile dict with the same fields plus 'shards' and 'files'
+    """
+    merged = {'shards': 0, 'files': [], 'rows': 0, 'missing_columns': {}, 'extra_columns': {},
+              'nulls': {}, 'negatives': {}, 'totals': {}, 'round_values': {}, 'outliers': {},
+              'histograms': {}, 'dates': {'min': None, 'max': None, 'invalid': 0},
+              'monthly': {}, 'weekday': {}, 'states': {}, 'districts': {}, 'pincodes': None,
+              'quantiles': {}}
+    pincodes, quantiles = None, {}
+    for p in profiles:
+        merged['shards'] += p.get('shards', 1)
+        merged['files'] += p.get('files', [p.get('file')])
+        merged['rows'] += p['rows']
+        for key in ('missing_columns', 'extra_columns'):
+            cols = p[key] if isinstance(p[key], dict) else {c: 1 for c in p[key]}
+            _add_counts(merged[key], cols)
+        for key in ('nulls', 'negatives', 'totals', 'round_values', 'outliers',
+                    'monthly', 'weekday', 'states', 'districts'):
+            _add_counts(merged[key], p[key])
+        for col, hist in p['histograms'].items():
+            merged['histograms'][col] = [a + b for a, b in zip(merged['histograms'].get(col, [0] * HIST_BINS), hist)]
+        for bound, pick in (('min', min), ('max', max)):
+            values = [d for d in (merged['dates'][bound], p['dates'][bound]) if d]
+            merged['dates'][bound] = pick(values) if values else None
+        merged['dates']['invalid'] += p['dates']['invalid']
+        if p['pincodes']:
+            sketch = _sketch(p['pincodes'])
+            pincodes = sketch if pincodes is None else pincodes.merge(sketch)
+        for col, encoded in p['quantiles'].items():
+            sketch = _quantile_sketch(encoded)
+            quantiles[col] = quantiles[col].merge(sketch) if col in quantiles else sketch
+    if pincodes is not None:
+        merged['pincodes'] = _encode(pincodes)
+    merged['quantiles'] = {col: _encode(sketch) for col, sketch in quantiles.items()}
+    return merged
+
+
+def distinct_pincodes(profile):
+    """Distinct pincodes in a profile (exact up to PINCODE_EXACT_LIMIT)."""
+    return _sketch(profile['pincodes']).count() if profile['pincodes'] else 0
+
+
+def column_quantiles(profile, qs=REPORT_QUANTILES):
+    """{column: {'p50': value, ...}} from a profile's quantile sketches."""
+    result = {}
+    for col, encoded in profile['quantiles'].items():
+        values = np.atleast_1d(_quantile_sketch(encoded).quantile(list(qs)))
+        result[col] = {f"p{q * 100:g}": float(v) for q, v in zip(qs, values)}
+    return result
+
+
+# ============================================================================
+# DATASETS
+# ============================================================================
+def discover_shards(data_dirs=None):
+    """[(dataset, path)] for every CSV shard, datasets in a fixed order."""
+    data_dirs = data_dirs or get_data_dirs()
+    return [(dataset, path) for dataset in sorted(data_dirs)
+            for path in sorted(glob.glob(os.path.join(data_dirs[dataset], "*.csv")))]
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _load_cache(cache_path):
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as fp:
+            cache = json.load(fp)
+        if cache.get('version') == PROFILE_VERSION:
+            return cache['shards']
+    return {}
+
+
+def profile_datasets(data_dirs=None, cache_path=CACHE_FILE, jobs=None, force=False):
+    """
+    Profile every shard (in parallel) and merge per dataset.
+
+    Shards whose (size, mtime) match the cache are not re-read.
+
+    Args:
+        data_dirs: {dataset: directory} (default: data_utils.get_data_dirs())
+        cache_path: Per-shard profile cache (None = no cache)
+        jobs: Worker processes (default: CPU count)
+        force: Ignore the cache
+
+    Returns:
+        ({dataset: merged profile}, [paths profiled in this run])
+    """
+    shards = discover_shards(data_dirs)
+    cached = {} if force else _load_cache(cache_path)
+
+    profiles, pending = {}, []
+    for dataset, path in shards:
+        key = os.path.abspath(path)
+        entry = cached.get(key)
+        if entry and entry['stamp'] == _stamp(path) and entry['profile']['dataset'] == dataset:
+            profiles[key] = entry
+        else:
+            pending.append((dataset, path))
+
+    jobs = jobs or os.cpu_count() or 1
+    if pending:
+        if jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(profile_shard, [p for _, p in pending], [d for d, _ in pending]))
+        else:
+            results = [profile_shard(path, dataset) for dataset, path in pending]
+        for (dataset, path), profile in zip(pending, results):
+            profiles[os.path.abspath(path)] = {'stamp': _stamp(path), 'profile': profile}
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w') as fp:
+            json.dump({'version': PROFILE_VERSION, 'shards': dict(sorted(profiles.items()))}, fp)
+
+    by_dataset = {}
+    for dataset, path in shards:
+        by_dataset.setdefault(dataset, []).append(profiles[os.path.abspath(path)]['profile'])
+    merged = {dataset: merge_profiles(items) for dataset, items in by_dataset.items()}
+    return merged, [path for _, path in pending]
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+def state_variants(profile):
+    """{canonical state: sorted raw spellings}; unmappable spellings under None."""
+    variants = {}
+    for raw in profile['states']:
+        variants.setdefault(normalize_state_name(raw), set()).add(raw)
+    return {state: sorted(raw) for state, raw in variants.items()}
+
+
+def print_report(merged):
+    """Print the merged audit for {dataset: profile}."""
+    print("📊 ROWS, DATES AND TOTALS")
+    print("-" * 70)
+    for dataset, p in merged.items():
+        dates = p['dates']
+        span = f"{dates['min']} to {dates['max']}" if dates['min'] else "no valid dates"
+        print(f"  {dataset:12}: {p['rows']:>12,} rows in {p['shards']} shard(s), {span}")
+        print(f"  {'':12}  total {sum(p['totals'].values()):,}  "
+              f"({', '.join(f'{c}={v:,}' for c, v in p['totals'].items())})")
+    print()
+
+    print("🔍 QUALITY")
+    print("-" * 70)
+    for dataset, p in merged.items():
+        issues = []
+        if p['missing_columns']:
+            issues.append(f"missing columns {sorted(p['missing_columns'])}")
+        if p['extra_columns']:
+            issues.append(f"extra columns {sorted(p['extra_columns'])}")
+        for key, label in (('nulls', 'nulls'), ('negatives', 'negative'), ('round_values', 'round'),
+                           ('outliers', 'outlier')):
+            n = sum(p[key].values())
+            if n:
+                issues.append(f"{n:,} {label}")
+        if p['dates']['invalid']:
+            issues.append(f"{p['dates']['invalid']:,} unparseable dates")
+        print(f"  {dataset:12}: {'; '.join(issues) if issues else 'no issues'}")
+    print()
+
+    print("📈 COUNT DISTRIBUTIONS")
+    print("-" * 70)
+    for dataset, p in merged.items():
+        for col, qs in column_quantiles(p).items():
+            print(f"  {dataset:12}  {col:18} " + "  ".join(f"{k}={v:,.0f}" for k, v in qs.items()))
+    print()
+
+    everything = merge_profiles(merged.values())
+    variants = state_variants(everything)
+    unmapped = variants.pop(None, [])
+    print("🗺️  GEOGRAPHY")
+    print("-" * 70)
+    print(f"  Raw state spellings: {len(everything['states'])} → {len(variants)} states")
+    for state, raw in sorted(variants.items()):
+        if len(raw) > 1:
+            print(f"    • {state}: {', '.join(raw)}")
+    if unmapped:
+        print(f"  Unmappable state values: {', '.join(unmapped[:10])}{' ...' if len(unmapped) > 10 else ''}")
+    print(f"  Districts (raw names): {len(everything['districts']):,}")
+    print(f"  Distinct pincodes: {distinct_pincodes(everything):,}")
+
+
+def write_report(merged, path=REPORT_FILE):
+    """Save the merged profiles as JSON (sketches replaced by counts and quantiles)."""
+    report = {dataset: {**p, 'pincodes': distinct_pincodes(p), 'quantiles': column_quantiles(p)}
+              for dataset, p in merged.items()}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as fp:
+        json.dump(report, fp, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the raw UIDAI CSV shards")
+    parser.add_argument('--force', action='store_true', help="Re-profile every shard")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help="Parallel workers")
+    args = parser.parse_args()
+
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - SHARD PROFILER")
+    print("="*70)
+    merged, profiled = profile_datasets(jobs=args.jobs, force=args.force)
+    shards = sum(p['shards'] for p in merged.values())
+    print(f"  ✓ {shards} shards ({len(profiled)} profiled, {shards - len(profiled)} cached)\n")
+    print_report(merged)
+    write_report(merged)
+    print(f"\n📁 Report: {REPORT_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Shard Scanner
+Row counts, header checks, date ranges and column totals without pandas.
+
+This module provides:
+- read_header() / validate_header(): header line vs. the dataset schema
+- count_rows(): non-blank line count over a memory-mapped file
+- scan_shard(): one pass per file - rows, min/max date, invalid dates,
+  and per-column totals / nulls / negatives / unparseable values
+- scan_datasets(): every shard of every dataset, scanned concurrently
+
+The file is memory-mapped and cut into blocks that end on a newline; each
+block is parsed as a uint8 NumPy array. Delimiter positions give every
+field's column and extent, count columns are summed digit by digit
+(digit * 10**place, so no per-value parsing), and dd-mm-yyyy dates become
+yyyymmdd integers for min/max. Blocks containing quote characters fall back
+to the csv module. Lines holding only whitespace are skipped, as
+pd.read_csv does, so row counts match the pandas loaders.
+
+Usage:
+    python scripts/utils/shard_scanner.py
+"""
+
+import os
+import sys
+import csv
+import glob
+import mmap
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from data_utils import get_data_dirs
+from schema_registry import get_schema
+
+BLOCK_BYTES = 1 << 24
+
+_NEWLINE, _COMMA, _CR, _QUOTE, _MINUS, _ZERO = 10, 44, 13, 34, 45, 48
+_SPACE, _TAB = 32, 9
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+# Longest integer that cannot overflow int64 in the digit sum
+_MAX_DIGITS = 18
+
+
+# ============================================================================
+# HEADER
+# ============================================================================
+def read_header(path):
+    """Column names from the first line of a CSV ([] for an empty file)."""
+    with open(path, 'rb') as fp:
+        line = fp.readline().decode('utf-8-sig').strip()
+    return next(csv.reader([line])) if line else []
+
+
+def validate_header(header, dataset):
+    """
+    Compare a header with the dataset schema.
+
+    Returns:
+        {'missing': [...], 'extra': [...], 'ordered': bool} - ordered is True
+        when the schema columns that are present appear in schema order
+    """
+    schema = list(get_schema(dataset))
+    present = [c for c in header if c in schema]
+    return {
+        'missing': [c for c in schema if c not in header],
+        'extra': [c for c in header if c not in schema],
+        'ordered': present == [c for c in schema if c in header],
+    }
+
+
+def count_rows(path, block_bytes=BLOCK_BYTES):
+    """Data rows in a CSV: non-blank lines after the header (a last line without newline counts)."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+    with open(path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = 0
+        for start, end in _blocks(mm, 0, size, block_bytes):
+            buf = np.frombuffer(mm, dtype=np.uint8, count=end - start, offset=start)
+            lines += int((~_blank_lines(buf)).sum())
+            del buf
+    return max(lines - 1, 0)
+
+
+def _blocks(mm, pos, size, block_bytes):
+    """(start, end) byte ranges of about block_bytes that end on a newline."""
+    while pos < size:
+        end = mm.find(b'\n', min(pos + block_bytes, size) - 1)
+        end = size if end < 0 else end + 1
+        yield pos, end
+        pos = end
+
+
+def _blank_lines(buf):
+    """For each line of a block: True if it holds only whitespace (pd.read_csv skips it)."""
+    starts = np.concatenate([[0], np.flatnonzero(buf == _NEWLINE) + 1])
+    starts = starts[starts < len(buf)]
+    if not len(starts):
+        return np.zeros(0, dtype=bool)
+    content = (buf != _NEWLINE) & (buf != _CR) & (buf != _SPACE) & (buf != _TAB)
+    # Every line holds at least one byte (its newline), so starts strictly increase
+    return np.add.reduceat(content, starts, dtype=np.int64) == 0
+
+
+# ============================================================================
+# BLOCK PARSING
+# ============================================================================
+def _fields(buf):
+    """
+    Field extents of a block of complete lines; blank lines are dropped.
+
+    Returns:
+        (starts, ends, column index, number of non-blank lines)
+    """
+    delims = np.flatnonzero((buf == _COMMA) | (buf == _NEWLINE) | (buf == _CR))
+    if not len(buf) or buf[-1] != _NEWLINE:
+        delims = np.append(delims, len(buf))    # last line without a newline
+    is_nl = np.append(buf[delims[:-1]] == _NEWLINE, True) if len(delims) else np.empty(0, bool)
+    k = np.arange(len(delims))
+    line_start = np.concatenate([[True], is_nl[:-1]])
+    first = np.maximum.accumulate(np.where(line_start, k, 0))
+    starts = np.concatenate([[0], delims[:-1] + 1])
+    blank = _blank_lines(buf)
+    keep = ~blank[np.cumsum(line_start) - 1]
+    return starts[keep], delims[keep], (k - first)[keep], int((~blank).sum())
+
+
+def _integer_fields(buf, starts, ends):
+    """
+    Integer value of each field, parsed in bulk.
+
+    Returns:
+        (values, valid) - valid is False for empty or non-integer fields
+    """
+    lengths = ends - starts
+    valid = (lengths > 0) & (lengths <= _MAX_DIGITS)
+    values = np.zeros(len(starts), dtype=np.int64)
+    s, e, n = starts[valid], ends[valid], lengths[valid]
+    if not len(s):
+        return values, valid
+    offsets = np.cumsum(n) - n
+    pos = np.repeat(s, n) + (np.arange(n.sum()) - np.repeat(offsets, n))
+    digits = buf[pos].astype(np.int16) - _ZERO
+    is_digit = (digits >= 0) & (digits <= 9)
+    is_sign = (buf[pos] == _MINUS) & (pos == np.repeat(s, n))
+    bad = np.add.reduceat((~is_digit & ~is_sign).astype(np.int64), offsets) > 0
+    bad |= np.add.reduceat(is_digit.astype(np.int64), offsets) == 0
+    place = np.repeat(e, n) - pos - 1
+    parsed = np.add.reduceat(np.where(is_digit, digits * _POW10[place], 0), offsets)
+    parsed = np.where(buf[s] == _MINUS, -parsed, parsed)
+    idx = np.flatnonzero(valid)
+    values[idx] = np.where(bad, 0, parsed)
+    valid[idx[bad]] = False
+    return values, valid
+
+
+def _date_keys(buf, starts, ends):
+    """
+    dd-mm-yyyy fields as yyyymmdd integers.
+
+    Returns:
+        (keys, valid)
+    """
+    valid = (ends - starts) == 10
+    keys = np.zeros(len(starts), dtype=np.int64)
+    if not valid.any():
+        return keys, valid
+    chars = buf[starts[valid][:, None] + np.arange(10)].astype(np.int16) - _ZERO
+    digit_cols = [0, 1, 3, 4, 6, 7, 8, 9]
+    ok = ((chars[:, digit_cols] >= 0) & (chars[:, digit_cols] <= 9)).all(axis=1)
+    ok &= (chars[:, 2] == _MINUS - _ZERO) & (chars[:, 5] == _MINUS - _ZERO)
+    day = chars[:, 0] * 10 + chars[:, 1]
+    month = chars[:, 3] * 10 + chars[:, 4]
+    year = chars[:, 6] * 1000 + chars[:, 7] * 100 + chars[:, 8] * 10 + chars[:, 9]
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+    idx = np.flatnonzero(valid)
+    keys[idx] = year.astype(np.int64) * 10000 + month * 100 + day
+    valid[idx[~ok]] = False
+    return keys, valid
+
+
+def _empty_stats(count_cols):
+    return {'rows': 0, 'date_min': None, 'date_max': None, 'invalid_dates': 0,
+            'totals': {c: 0 for c in count_cols}, 'nulls': {c: 0 for c in count_cols},
+            'negatives': {c: 0 for c in count_cols}, 'invalid_values': {c: 0 for c in count_cols}}
+
+
+def _fold_dates(stats, keys):
+    if len(keys):
+        lo, hi = int(keys.min()), int(keys.max())
+        stats['date_min'] = lo if stats['date_min'] is None else min(stats['date_min'], lo)
+        stats['date_max'] = hi if stats['date_max'] is None else max(stats['date_max'], hi)
+
+
+def _scan_block(buf, stats, date_index, count_index):
+    """Fold a block of complete lines into the running stats (vectorised)."""
+    starts, ends, column, lines = _fields(buf)
+    stats['rows'] += lines
+    if date_index is not None:
+        mask = column == date_index
+        keys, valid = _date_keys(buf, starts[mask], ends[mask])
+        stats['invalid_dates'] += int((~valid).sum())
+        _fold_dates(stats, keys[valid])
+    for col, index in count_index.items():
+        mask = column == index
+        s, e = starts[mask], ends[mask]
+        values, valid = _integer_fields(buf, s, e)
+        empty = (e - s) == 0
+        stats['nulls'][col] += int(empty.sum()) + (lines - len(s))   # short rows count as nulls
+        stats['invalid_values'][col] += int((~valid & ~empty).sum())
+        stats['negatives'][col] += int((values < 0).sum())
+        stats['totals'][col] += int(values[valid].sum())
+
+
+def _scan_block_csv(text, stats, date_index, count_index):
+    """Fallback for blocks with quoted fields."""
+    keys = []
+    for row in csv.reader(line for line in text.splitlines() if line.strip()):
+        stats['rows'] += 1
+        if date_index is not None:
+            value = row[date_index] if date_index < len(row) else ''
+            parts = value.split('-')
+            if len(value) == 10 and len(parts) == 3 and all(p.isdigit() for p in parts) \
+                    and 1 <= int(parts[1]) <= 12 and 1 <= int(parts[0]) <= 31:
+                keys.append(int(parts[2]) * 10000 + int(parts[1]) * 100 + int(parts[0]))
+            else:
+                stats['invalid_dates'] += 1
+        for col, index in count_index.items():
+            value = row[index] if index < len(row) else ''
+            if not value:
+                stats['nulls'][col] += 1
+            elif value.lstrip('-').isdigit():
+                stats['totals'][col] += int(value)
+                stats['negatives'][col] += value.startswith('-')
+            else:
+                stats['invalid_values'][col] += 1
+    _fold_dates(stats, np.array(keys, dtype=np.int64))
+
+
+def _iso(key):
+    return None if key is None else f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+def scan_shard(path, dataset, block_bytes=BLOCK_BYTES):
+    """
+    Scan one CSV shard in a single pass.
+
+    Args:
+        path: CSV file
+        dataset: Dataset name (expected schema)
+        block_bytes: Approximate bytes parsed per block
+
+    Returns:
+        {'file', 'dataset', 'bytes', 'rows', 'header', 'missing', 'extra',
+         'ordered', 'dates': {'min', 'max', 'invalid'}, 'totals', 'nulls',
+         'negatives', 'invalid_values', 'seconds'}
+    """
+    start_time = time.perf_counter()
+    header = read_header(path)
+    schema = get_schema(dataset)
+    count_cols = [c for c, field in schema.items() if field == 'count' and c in header]
+    date_index = header.index('date') if 'date' in header else None
+    count_index = {c: header.index(c) for c in count_cols}
+    stats = _empty_stats(count_cols)
+
+    size = os.path.getsize(path)
+    if size:
+        with open(path, 'rb') as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b'\n') + 1 or size      # skip the header line
+            for pos, end in _blocks(mm, header_end, size, block_bytes):
+                if mm.find(b'"', pos, end) >= 0:
+                    _scan_block_csv(mm[pos:end].decode('utf-8'), stats, date_index, count_index)
+                else:
+                    buf = np.frombuffer(mm, dtype=np.uint8, count=end - pos, offset=pos)
+                    _scan_block(buf, stats, date_index, count_index)
+                    del buf
+
+    return {
+        'file': os.path.basename(path), 'dataset': dataset, 'bytes': size, 'rows': stats['rows'],
+        'header': header, **validate_header(header, dataset),
+        'dates': {'min': _iso(stats['date_min']), 'max': _iso(stats['date_max']),
+                  'invalid': stats['invalid_dates']},
+        'totals': stats['totals'], 'nulls': stats['nulls'], 'negatives': stats['negatives'],
+        'invalid_values': stats['invalid_values'], 'seconds': time.perf_counter() - start_time,
+    }
+
+
+# ============================================================================
+# DATASETS
+# ============================================================================
+def merge_scans(scans):
+    """Combine shard scans of one dataset."""
+    merged = {'files': [], 'bytes': 0, 'rows': 0, 'header_issues': [],
+              'dates': {'min': None, 'max': None, 'invalid': 0},
+              'totals': {}, 'nulls': {}, 'negatives': {}, 'invalid_values': {}}
+    for scan in scans:
+        merged['files'].append(scan['file'])
+        merged['bytes'] += scan['bytes']
+        merged['rows'] += scan['rows']
+        if scan['missing'] or scan['extra'] or not scan['ordered']:
+            merged['header_issues'].append({k: scan[k] for k in ('file', 'missing', 'extra', 'ordered')})
+        for bound, pick in (('min', min), ('max', max)):
+            values = [d for d in (merged['dates'][bound], scan['dates'][bound]) if d]
+            merged['dates'][bound] = pick(values) if values else None
+        merged['dates']['invalid'] += scan['dates']['invalid']
+        for key in ('totals', 'nulls', 'negatives', 'invalid_values'):
+            for col, n in scan[key].items():
+                merged[key][col] = merged[key].get(col, 0) + n
+    return merged
+
+
+def scan_datasets(data_dirs=None, jobs=None):
+    """
+    Scan every shard concurrently.
+
+    Args:
+        data_dirs: {dataset: directory} (default: data_utils.get_data_dirs())
+        jobs: Worker processes (default: CPU count)
+
+    Returns:
+        {dataset: merged scan} for every dataset (empty scan if it has no files)
+    """
+    data_dirs = data_dirs or get_data_dirs()
+    shards = [(dataset, path) for dataset in sorted(data_dirs)
+              for path in sorted(glob.glob(os.path.join(data_dirs[dataset], "*.csv")))]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(shards))) as pool:
+            scans = list(pool.map(scan_shard, [p for _, p in shards], [d for d, _ in shards]))
+    else:
+        scans = [scan_shard(path, dataset) for dataset, path in shards]
+    return {dataset: merge_scans([s for s in scans if s['dataset'] == dataset]) for dataset in sorted(data_dirs)}
+
+
+def main():
+    print("="*70)
+    print("UIDAI DATA HACKATHON 2026 - SHARD SCANNER")
+    print("="*70)
+    start = time.perf_counter()
+    merged = scan_datasets()
+    for dataset, scan in merged.items():
+        span = f"{scan['dates']['min']} to {scan['dates']['max']}" if scan['dates']['min'] else "no valid dates"
+        print(f"  ✓ {dataset:12}: {scan['rows']:>12,} rows, {len(scan['files'])} file(s), "
+              f"{scan['bytes'] / 1e6:,.1f} MB, {span}")
+        for issue in scan['header_issues']:
+            print(f"      ⚠️ {issue['file']}: missing {issue['missing']}, extra {issue['extra']}"
+                  f"{'' if issue['ordered'] else ', columns out of order'}")
+    print(f"\n⏱️  {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
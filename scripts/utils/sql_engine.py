@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - SQL Query Engine
+Ad-hoc SQL over the pipeline outputs with an embedded DuckDB.
+
+This module provides:
+- TABLES: SQL table name -> output CSV (relative to outputs/)
+- Parquet mirrors of those CSVs, written on first use and refreshed when the
+  CSV is newer, so column projection and WHERE filters are pushed into the scan
+- connect(): DuckDB connection with one view per available table
+- run_query() / export_query(): first rows for display, or all rows to CSV/Parquet
+
+DuckDB runs the query multi-threaded in-process; nothing is loaded into
+pandas. duckdb is optional (pip install duckdb): connect() raises ImportError
+with an install hint when it is missing.
+"""
+
+import os
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(os.path.dirname(SCRIPT_DIR))
+OUTPUTS_DIR = os.path.join(BASE_DIR, "outputs")
+
+# Parquet mirrors live here, under the outputs directory
+MIRROR_DIR = "query_cache"
+
+TABLES = {
+    'integrated': "integrated_analysis/integrated_data.csv",
+    'districts': "integrated_analysis/district_clusters.csv",
+    'states': "integrated_analysis/state_summary.csv",
+    'kpis': "integrated_analysis/kpis.csv",
+    'anomalies': "anomalies_detected.csv",
+    'forecast': "forecast_plots/declining_districts.csv",
+}
+
+EXPORT_FORMATS = {'.csv': "FORMAT CSV, HEADER", '.parquet': "FORMAT PARQUET, COMPRESSION ZSTD"}
+
+
+class QueryError(Exception):
+    """SQL that DuckDB rejected (syntax, unknown table/column, ...)."""
+
+
+def _quote(path):
+    """SQL string literal for a file path."""
+    return "'" + path.replace("'", "''") + "'"
+
+
+def _strip(sql):
+    return sql.strip().rstrip(';').strip()
+
+
+# ============================================================================
+# CONNECTION
+# ============================================================================
+def mirror_parquet(con, csv_path, parquet_path):
+    """
+    Write (or refresh) the Parquet copy of a CSV.
+
+    Returns:
+        True if the mirror was (re)written
+    """
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+        return False
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    tmp_path = parquet_path + ".tmp"
+    con.execute(f"COPY (SELECT * FROM read_csv_auto({_quote(csv_path)})) "
+                f"TO {_quote(tmp_path)} ({EXPORT_FORMATS['.parquet']})")
+    os.replace(tmp_path, parquet_path)
+    return True
+
+
+def connect(outputs_dir=OUTPUTS_DIR, threads=None, use_parquet=True):
+    """
+    Open an in-memory DuckDB with a view per output table that exists.
+
+    Args:
+        outputs_dir: Pipeline outputs directory
+        threads: Worker threads (None = DuckDB default, all cores)
+        use_parquet: Query Parquet mirrors (pushdown) instead of the CSVs
+
+    Returns:
+        (connection, {table: file the view reads})
+    """
+    try:
+        import duckdb
+    except ImportError:
+        raise ImportError("DuckDB is not installed. Run: pip install duckdb")
+
+    con = duckdb.connect(database=':memory:')
+    if threads:
+        con.execute(f"SET threads TO {int(threads)}")
+
+    available = {}
+    for table, rel_path in TABLES.items():
+        csv_path = os.path.join(outputs_dir, rel_path)
+        if not os.path.exists(csv_path):
+            continue
+        if use_parquet:
+            source = os.path.join(outputs_dir, MIRROR_DIR, f"{table}.parquet")
+            mirror_parquet(con, csv_path, source)
+            reader = f"read_parquet({_quote(source)})"
+        else:
+            source = csv_path
+            reader = f"read_csv_auto({_quote(source)})"
+        con.execute(f"CREATE VIEW {table} AS SELECT * FROM {reader}")
+        available[table] = source
+    return con, available
+
+
+def describe_tables(con, tables):
+    """{table: [(column, type), ...]} for the registered views."""
+    return {table: [(row[0], row[1]) for row in con.execute(f"DESCRIBE {table}").fetchall()]
+            for table in tables}
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+def run_query(con, sql, limit=50):
+    """
+    Run a query and fetch at most `limit` rows.
+
+    Returns:
+        (columns, rows, truncated, seconds)
+    """
+    import duckdb
+    start = time.perf_counter()
+    try:
+        cursor = con.execute(_strip(sql))
+        columns = [d[0] for d in cursor.description]
+        rows = cursor.fetchmany(limit + 1)
+    except duckdb.Error as e:
+        raise QueryError(str(e)) from e
+    return columns, rows[:limit], len(rows) > limit, time.perf_counter() - start
+
+
+def export_query(con, sql, path):
+    """
+    Stream every result row to a .csv or .parquet file (no pandas round trip).
+
+    Returns:
+        Number of rows written
+    """
+    import duckdb
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise QueryError(f"Unsupported output format '{ext}' (use {', '.join(EXPORT_FORMATS)})")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    try:
+        return con.execute(f"COPY ({_strip(sql)}) TO {_quote(path)} ({EXPORT_FORMATS[ext]})").fetchone()[0]
+    except duckdb.Error as e:
+        raise QueryError(str(e)) from e
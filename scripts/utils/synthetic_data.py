@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+UIDAI Data Hackathon 2026 - Synthetic Aadhaar Data Generator
+Raw enrolment/demographic/biometric shards with the real schemas, at any scale.
+
+This module provides:
+- build_geography(): 36 states, ~1,041 districts, ~19,000 pincodes with
+  Pareto-distributed activity weights (a few pincodes carry most volume)
+- generate_rows(): one shard of a dataset (zero-heavy counts, dirty state
+  names drawn from STATE_NAME_MAP and INVALID_STATE_ENTRIES)
+- write_datasets(): sharded CSVs laid out like data/api_data_aadhar_*/
+
+Output is deterministic for a given seed, and rows are produced shard by
+shard so 100M-row datasets never have to fit in memory.
+"""
+
+import os
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_utils import VALID_STATES, STATE_NAME_MAP, INVALID_STATE_ENTRIES
+from schema_registry import DATASET_SCHEMAS
+from calendar_utils import DATE_FORMAT
+
+# Named scales (total rows across the three datasets)
+SCALES = {
+    '100K': 100_000,
+    '1M': 1_000_000,
+    '10M': 10_000_000,
+    '100M': 100_000_000,
+}
+
+# Dataset -> (directory, share of total rows, {column: (mean per row, share of zeros)})
+# Shares follow the full API extract (~1.0M / 2.07M / 1.86M rows); count
+# moments follow the checked-in samples.
+DATASETS = {
+    'enrolment': ('api_data_aadhar_enrolment', 0.20,
+                  {'age_0_5': (3.6, 0.17), 'age_5_17': (3.5, 0.30), 'age_18_greater': (0.1, 0.0)}),
+    'demographic': ('api_data_aadhar_demographic', 0.42,
+                    {'demo_age_5_17': (1.3, 0.45), 'demo_age_17_': (12.4, 0.02)}),
+    'biometric': ('api_data_aadhar_biometric', 0.38,
+                  {'bio_age_5_17': (9.0, 0.10), 'bio_age_17_': (10.0, 0.05)}),
+}
+
+DEFAULT_DISTRICTS = 1041
+DEFAULT_PINCODES = 19_000
+DEFAULT_SHARD_ROWS = 500_000
+
+PARETO_SHAPE = 1.16        # ~80/20 split of activity across pincodes
+DIRTY_STATE_RATE = 0.02    # Rows whose state is a known spelling variant
+INVALID_STATE_RATE = 0.0005  # Rows whose state is a district/pincode
+
+DATE_RANGE = ('2025-03-01', '2025-12-31')
+
+MANIFEST_FILE = "synthetic_manifest.json"
+
+
+# ============================================================================
+# GEOGRAPHY
+# ============================================================================
+def _state_variants():
+    """Canonical state -> raw spellings normalize_state_name() maps back to it."""
+    variants = {state: [state, state.upper(), state.lower(), f" {state} "] for state in VALID_STATES}
+    for raw, state in STATE_NAME_MAP.items():
+        variants[state].extend([raw, raw.title(), raw.upper()])
+    return variants
+
+
+def build_geography(n_districts=DEFAULT_DISTRICTS, n_pincodes=DEFAULT_PINCODES, seed=42):
+    """
+    Synthetic state -> district -> pincode hierarchy.
+
+    Args:
+        n_districts: Number of districts (at least one per state)
+        n_pincodes: Number of pincodes (at least one per district)
+        seed: Random seed
+
+    Returns:
+        DataFrame with state, district, pincode and activity weight
+        (one row per pincode, weights sum to 1)
+    """
+    rng = np.random.default_rng(seed)
+    states = sorted(VALID_STATES)
+    n_districts = max(n_districts, len(states))
+    n_pincodes = max(n_pincodes, n_districts)
+
+    # Large states get many districts, UTs a handful
+    state_weight = rng.pareto(PARETO_SHAPE, len(states)) + 1
+    per_state = 1 + rng.multinomial(n_districts - len(states), state_weight / state_weight.sum())
+    district_state = np.repeat(np.arange(len(states)), per_state)
+    district_names = np.concatenate([
+        [f"{states[s]} District {k + 1}" for k in range(count)] for s, count in enumerate(per_state)
+    ])
+
+    district_weight = rng.pareto(PARETO_SHAPE, n_districts) + 1
+    per_district = 1 + rng.multinomial(n_pincodes - n_districts, district_weight / district_weight.sum())
+    pin_district = np.repeat(np.arange(n_districts), per_district)
+
+    # Sorted 6-digit codes assigned in state order, so a state's pincodes share a prefix
+    pincodes = np.sort(rng.choice(np.arange(110000, 999999), n_pincodes, replace=False))
+
+    weight = rng.pareto(PARETO_SHAPE, n_pincodes) + 1
+    return pd.DataFrame({
+        'state': np.asarray(states, dtype=object)[district_state[pin_district]],
+        'district': district_names[pin_district].astype(object),
+        'pincode': pincodes,
+        'weight': weight / weight.sum(),
+    })
+
+
+# ============================================================================
+# ROWS
+# ============================================================================
+def generate_rows(dataset, n_rows, geography, rng, dirty_rate=DIRTY_STATE_RATE,
+                  invalid_rate=INVALID_STATE_RATE):
+    """
+    One shard of raw rows with the dataset's schema.
+
+    Args:
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        n_rows: Number of rows
+        geography: Output of build_geography()
+        rng: numpy Generator
+        dirty_rate: Share of rows with a spelling variant of the state
+        invalid_rate: Share of rows with an invalid state entry
+
+    Returns:
+        DataFrame with the columns of DATASET_SCHEMAS[dataset]
+    """
+    means = DATASETS[dataset][2]
+    weight = geography['weight'].to_numpy()
+    pin_idx = rng.choice(len(geography), size=n_rows, p=weight)
+
+    days = pd.date_range(*DATE_RANGE, freq='D')
+    date_labels = np.asarray(days.strftime(DATE_FORMAT), dtype=object)
+    dates = date_labels[rng.integers(0, len(days), n_rows)]
+
+    states = geography['state'].to_numpy()[pin_idx]
+    dirty = np.flatnonzero(rng.random(n_rows) < dirty_rate)
+    if len(dirty):
+        variants = _state_variants()
+        states[dirty] = [variants[s][rng.integers(len(variants[s]))] for s in states[dirty]]
+    invalid = np.flatnonzero(rng.random(n_rows) < invalid_rate)
+    if len(invalid):
+        entries = sorted(e.title() for e in INVALID_STATE_ENTRIES)
+        states[invalid] = np.asarray(entries, dtype=object)[rng.integers(0, len(entries), len(invalid))]
+
+    frame = {
+        'date': dates,
+        'state': states,
+        'district': geography['district'].to_numpy()[pin_idx],
+        'pincode': geography['pincode'].to_numpy()[pin_idx],
+    }
+    # Busy pincodes report larger counts as well as more rows (scaled so the
+    # row-level mean matches the column mean)
+    intensity = np.sqrt(weight * len(geography))
+    intensity = intensity[pin_idx] / (weight * intensity).sum()
+    for col, (mean, zero_share) in means.items():
+        counts = rng.poisson(np.minimum(mean / (1 - zero_share) * intensity, 5000))
+        counts[rng.random(n_rows) < zero_share] = 0
+        frame[col] = counts
+    return pd.DataFrame(frame)[list(DATASET_SCHEMAS[dataset])]
+
+
+# ============================================================================
+# SHARDED OUTPUT
+# ============================================================================
+def dataset_rows(total_rows):
+    """Split a total row count across the three datasets by their real shares."""
+    return {name: int(total_rows * share) for name, (_, share, _) in DATASETS.items()}
+
+
+def write_datasets(out_dir, total_rows, shard_rows=DEFAULT_SHARD_ROWS, seed=42,
+                   n_districts=DEFAULT_DISTRICTS, n_pincodes=DEFAULT_PINCODES):
+    """
+    Write sharded raw CSVs under out_dir/api_data_aadhar_<dataset>/.
+
+    Files are named <directory>_<first row>_<last row>.csv like the API
+    extract. An existing output with the same parameters is reused.
+
+    Args:
+        out_dir: Root directory (stands in for data/)
+        total_rows: Rows across all three datasets (see SCALES)
+        shard_rows: Rows per CSV file
+        seed: Random seed
+        n_districts: Number of districts
+        n_pincodes: Number of pincodes
+
+    Returns:
+        Manifest dict (parameters, rows and files per dataset, seconds taken)
+    """
+    params = {'total_rows': int(total_rows), 'shard_rows': int(shard_rows), 'seed': seed,
+              'n_districts': n_districts, 'n_pincodes': n_pincodes}
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as fp:
+            manifest = json.load(fp)
+        if manifest.get('params') == params:
+            print(f"  ✓ Reusing synthetic data in {out_dir}")
+            return manifest
+
+    start = time.perf_counter()
+    geography = build_geography(n_districts, n_pincodes, seed)
+    manifest = {'params': params, 'datasets': {}}
+    for offset, (name, rows) in enumerate(dataset_rows(total_rows).items()):
+        directory = DATASETS[name][0]
+        data_dir = os.path.join(out_dir, directory)
+        os.makedirs(data_dir, exist_ok=True)
+        for old in os.listdir(data_dir):
+            if old.endswith('.csv'):
+                os.remove(os.path.join(data_dir, old))
+
+        rng = np.random.default_rng([seed, offset])
+        files = []
+        for first in range(0, rows, shard_rows):
+            n = min(shard_rows, rows - first)
+            path = os.path.join(data_dir, f"{directory}_{first}_{first + n}.csv")
+            generate_rows(name, n, geography, rng).to_csv(path, index=False)
+            files.append(os.path.basename(path))
+        manifest['datasets'][name] = {'rows': rows, 'files': files}
+        print(f"  ✓ {name}: {rows:,} rows in {len(files)} shard(s)")
+
+    manifest['seconds'] = round(time.perf_counter() - start, 2)
+    with open(manifest_path, 'w') as fp:
+        json.dump(manifest, fp, indent=2)
+    return manifest
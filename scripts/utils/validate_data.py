@@ -4,105 +4,51 @@ UIDAI Data Hackathon 2026 - Data Validation Script
 Checks data quality and consistency across all three datasets.
 
 Key check: Validates that updates don't exceed enrolments baseline.
+
+Row counts, headers, date ranges and totals come from one concurrent raw
+scan of the shards (shard_scanner.py) - no pandas parsing of the CSVs.
 """
 
 import os
-import glob
-import pandas as pd
 from datetime import datetime
 
+import pandas as pd
+
+from shard_scanner import scan_datasets
+
+DATASETS = ['biometric', 'demographic', 'enrolment']
+
 
-def count_rows_per_dataset():
+def count_rows_per_dataset(merged=None):
     """Count rows in each dataset."""
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    data_dir = os.path.join(base_dir, "data")
-    
-    datasets = {
-        'biometric': os.path.join(data_dir, 'api_data_aadhar_biometric'),
-        'demographic': os.path.join(data_dir, 'api_data_aadhar_demographic'),
-        'enrolment': os.path.join(data_dir, 'api_data_aadhar_enrolment'),
-    }
-    
-    row_counts = {}
-    for name, path in datasets.items():
-        files = glob.glob(os.path.join(path, '*.csv'))
-        total = 0
-        for f in files:
-            with open(f, 'r') as fp:
-                total += sum(1 for _ in fp) - 1  # Subtract header
-        row_counts[name] = total
-    
-    return row_counts
+    merged = merged if merged is not None else scan_datasets()
+    return {name: merged[name]['rows'] if name in merged else 0 for name in DATASETS}
 
 
-def check_date_ranges():
+def check_date_ranges(merged=None):
     """Check date ranges for each dataset."""
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    data_dir = os.path.join(base_dir, "data")
-    
-    datasets = {
-        'biometric': os.path.join(data_dir, 'api_data_aadhar_biometric'),
-        'demographic': os.path.join(data_dir, 'api_data_aadhar_demographic'),
-        'enrolment': os.path.join(data_dir, 'api_data_aadhar_enrolment'),
-    }
-    
+    merged = merged if merged is not None else scan_datasets()
     date_ranges = {}
-    for name, path in datasets.items():
-        files = glob.glob(os.path.join(path, '*.csv'))
-        all_dates = []
-        for f in files:
-            try:
-                df = pd.read_csv(f, usecols=['date'])
-                df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-                all_dates.extend(df['date'].dropna().tolist())
-            except:
-                pass
-        
-        if all_dates:
-            date_ranges[name] = {
-                'min': min(all_dates),
-                'max': max(all_dates),
-                'days': (max(all_dates) - min(all_dates)).days
-            }
+    for name in DATASETS:
+        dates = merged[name]['dates'] if name in merged else {'min': None}
+        if dates['min']:
+            lo, hi = pd.Timestamp(dates['min']), pd.Timestamp(dates['max'])
+            date_ranges[name] = {'min': lo, 'max': hi, 'days': (hi - lo).days}
         else:
             date_ranges[name] = None
-    
     return date_ranges
 
 
-def check_value_scale():
+def check_headers(merged=None):
+    """Shards whose header does not match the dataset schema."""
+    merged = merged if merged is not None else scan_datasets()
+    return {name: merged[name]['header_issues'] if name in merged else [] for name in DATASETS}
+
+
+def check_value_scale(merged=None):
     """Check sum of values in each dataset."""
-    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    data_dir = os.path.join(base_dir, "data")
-    
-    datasets = {
-        'biometric': (
-            os.path.join(data_dir, 'api_data_aadhar_biometric'),
-            ['bio_age_5_17', 'bio_age_17_']
-        ),
-        'demographic': (
-            os.path.join(data_dir, 'api_data_aadhar_demographic'),
-            ['demo_age_5_17', 'demo_age_17_']
-        ),
-        'enrolment': (
-            os.path.join(data_dir, 'api_data_aadhar_enrolment'),
-            ['age_0_5', 'age_5_17', 'age_18_greater']
-        ),
-    }
-    
-    totals = {}
-    for name, (path, cols) in datasets.items():
-        files = glob.glob(os.path.join(path, '*.csv'))
-        total = 0
-        for f in files:
-            try:
-                df = pd.read_csv(f, usecols=cols)
-                total += df[cols].sum().sum()
-            except:
-                pass
-        totals[name] = int(total)
-    
-    return totals
+    merged = merged if merged is not None else scan_datasets()
+    return {name: int(sum(merged[name]['totals'].values())) if name in merged else 0 for name in DATASETS}
 
 
 def validate_data():
@@ -115,7 +61,9 @@ def validate_data():
     # Row counts
     print("📊 ROW COUNTS")
     print("-" * 40)
-    rows = count_rows_per_dataset()
+    # One concurrent raw scan of the shards feeds every check
+    merged = scan_datasets()
+    rows = count_rows_per_dataset(merged)
     for name, count in sorted(rows.items(), key=lambda x: -x[1]):
         print(f"  {name:15}: {count:>12,} rows")
     print()
@@ -131,10 +79,22 @@ def validate_data():
         print(f"     This may indicate incomplete data collection.")
     print()
     
+    # Headers
+    print("🧾 HEADERS")
+    print("-" * 40)
+    issues = check_headers(merged)
+    for name in DATASETS:
+        for issue in issues[name]:
+            order = '' if issue['ordered'] else ', columns out of order'
+            print(f"  ⚠️ {name}/{issue['file']}: missing {issue['missing']}, extra {issue['extra']}{order}")
+    if not any(issues.values()):
+        print("  ✅ All shard headers match their schemas")
+    print()
+    
     # Date ranges
     print("📅 DATE RANGES")
     print("-" * 40)
-    dates = check_date_ranges()
+    dates = check_date_ranges(merged)
     for name, info in dates.items():
         if info:
             print(f"  {name:15}: {info['min'].date()} to {info['max'].date()} ({info['days']} days)")
@@ -145,7 +105,7 @@ def validate_data():
     # Value totals
     print("💰 TOTAL VALUES (Sum of all numeric columns)")
     print("-" * 40)
-    totals = check_value_scale()
+    totals = check_value_scale(merged)
     for name, total in sorted(totals.items(), key=lambda x: -x[1]):
         print(f"  {name:15}: {total:>15,}")
     print()
@@ -188,6 +148,7 @@ def validate_data():
     
     return {
         'rows': rows,
+        'headers': issues,
         'dates': dates,
         'totals': totals,
         'has_scale_issue': update_total > enrol_total
@@ -7,12 +7,56 @@ Author: UIDAI Hackathon Team
 """
 
 import os
+import sys
+import glob
 import pandas as pd
 import numpy as np
 import unittest
 
 BASE_DIR = "/Users/ayushpatel/Documents/Projects/UIDAI/UIDAI"
 
+# Shared utilities live in scripts/utils
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "utils"))
+from metrics_kernel import compute_metrics, CROSS_DOMAIN_METRICS, METRIC_REGISTRY
+from memory_utils import ensure_owned, project_columns, MemoryReport
+from data_utils import safe_merge_datasets, normalize_state_name, deduplicate_data, union_align
+from schema_registry import (read_dataset_csv, concat_frames, map_distinct,
+                             to_state_category, coerce_to_schema, COUNT_DTYPE, CATEGORICAL_GEO)
+from calendar_utils import parse_dates, calendar_table, add_calendar_features
+from geo_dimension import GeoDimension
+from profiler import PhaseProfiler, compare_profiles
+from synthetic_data import build_geography, generate_rows, write_datasets
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+from pipeline import build_graph, run_pipeline
+from forecast_backtest import rolling_origins, backtest_level, score_folds, select_engines, run_backtest
+from plot_registry import PlotRegistry
+from equivalence import CASES, check_case, run_harness, dirty_state_names
+from build_dashboard_data import build_bundle, MANIFEST_FILE
+from build_image_assets import build_assets, asset_metadata, write_variants, VARIANTS_FILE
+from api_server import make_server
+from sql_engine import connect, run_query, export_query, QueryError
+from partitioned_store import write_partitions, list_partitions, match_states, read_partitions
+from distinct_sketch import DistinctSketch, count_distinct, grouped_sketches, merge_sketches, sketch_counts
+from quantile_sketch import QuantileSketch, sketch_values, group_sketches, group_ranks
+from shard_profiler import profile_datasets, profile_shard, distinct_pincodes, column_quantiles
+from data_quality_validator import suspicious_value_flags
+from shard_scanner import scan_shard, scan_datasets, count_rows, validate_header
+from dedup_index import KeyIndex, BloomFilter, key_hashes, dedup_shards
+from window_kernels import GroupedWindows
+from batch_forecast import series_matrix, linear_forecast, holt_forecast, forecast_frame
+
+try:
+    import duckdb  # noqa: F401 - optional engine behind `uidai query`
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+try:
+    import typer  # noqa: F401 - CLI framework behind uidai.py
+    HAS_TYPER = True
+except ImportError:
+    HAS_TYPER = False
+
 
 class TestShareMetrics(unittest.TestCase):
     """Test share/ratio metrics sum to 1."""
@@ -188,6 +232,1361 @@ class TestKPIValidity(unittest.TestCase):
         print(f"  ✓ All share KPIs in [0, 1] range")
 
 
+class TestMetricKernel(unittest.TestCase):
+    """Test the shared derived-metric kernel on synthetic data."""
+    
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'age_0_5': [10, 0, 5, 0],
+            'age_5_17': [20, 0, 5, 3],
+            'age_18_greater': [70, 0, 0, 0],
+            'demo_age_5_17': [5, 4, 0, 0],
+            'demo_age_17_': [45, 6, 0, 0],
+            'bio_age_5_17': [30, 0, 2, 0],
+            'bio_age_17_': [20, 0, 2, 0],
+        })
+    
+    def test_cross_domain_formulas(self):
+        """Kernel output should match the textbook formulas."""
+        df = self.df.copy()
+        compute_metrics(df, ['total_enrol', 'total_demo', 'total_bio'] + CROSS_DOMAIN_METRICS)
+        
+        self.assertEqual(df['total_enrol'].tolist(), [100, 0, 10, 3])
+        self.assertEqual(df['total_updates'].tolist(), [100, 10, 4, 0])
+        self.assertAlmostEqual(df.loc[0, 'demo_intensity'], 0.5)
+        self.assertAlmostEqual(df.loc[0, 'child_share_enrol'], 0.3)
+        self.assertAlmostEqual(df.loc[0, 'child_share_updates'], 0.35)
+        self.assertAlmostEqual(df.loc[0, 'child_attention_gap'], 0.05)
+        np.testing.assert_allclose(df['total_intensity'], df['demo_intensity'] + df['bio_intensity'])
+        print(f"  ✓ Kernel cross-domain formulas verified")
+    
+    def test_zero_denominator_is_zero(self):
+        """Division by an empty total should give 0, never a blow-up."""
+        df = self.df.copy()
+        compute_metrics(df, ['total_enrol', 'total_demo', 'total_bio'] + CROSS_DOMAIN_METRICS)
+        
+        # Row 1 has updates but no enrolments
+        self.assertEqual(df.loc[1, 'demo_intensity'], 0)
+        self.assertEqual(df.loc[1, 'child_share_enrol'], 0)
+        self.assertTrue(np.isfinite(df[CROSS_DOMAIN_METRICS].to_numpy(dtype=float)).all())
+        print(f"  ✓ Zero denominators handled")
+    
+    def test_clipped_ratio_saturates(self):
+        """Capped ratios saturate when the denominator is 0 but the numerator is not."""
+        df = self.df.copy()
+        compute_metrics(df, ['child_to_adult_ratio', 'infant_to_child_ratio'])
+        
+        self.assertEqual(df.loc[2, 'child_to_adult_ratio'], 100)
+        self.assertEqual(df.loc[1, 'child_to_adult_ratio'], 0)
+        self.assertAlmostEqual(df.loc[0, 'infant_to_child_ratio'], 0.5)
+        print(f"  ✓ Capped ratios saturate correctly")
+    
+    def test_float32_and_aliases(self):
+        """float32 output and alias names should be honoured."""
+        df = self.df.copy()
+        compute_metrics(df, ['total_enrol', 'enrol_share_0_5'], dtype=np.float32,
+                        aliases={'total_enrol': 'total_enrolments', 'enrol_share_0_5': 'share_0_5'})
+        
+        self.assertIn('total_enrolments', df.columns)
+        self.assertNotIn('total_enrol', df.columns)
+        self.assertEqual(df['share_0_5'].dtype, np.float32)
+        self.assertAlmostEqual(float(df.loc[0, 'share_0_5']), 0.1, places=6)
+        print(f"  ✓ float32 output and aliases work")
+    
+    def test_registry_inputs_resolvable(self):
+        """Every metric input must be a raw column or another registered metric."""
+        raw = set(self.df.columns)
+        for name, spec in METRIC_REGISTRY.items():
+            for col in spec['inputs'] + spec['denominator']:
+                self.assertTrue(col in raw or col in METRIC_REGISTRY, f"{name}: unknown input {col}")
+        print(f"  ✓ All {len(METRIC_REGISTRY)} registered metrics resolvable")
+
+
+class TestMemoryOwnership(unittest.TestCase):
+    """Test ownership-aware (copy-free) transforms."""
+    
+    def test_ensure_owned(self):
+        """inplace hands the frame over; otherwise the source is never mutated."""
+        df = pd.DataFrame({'a': [1, 2, 3]})
+        self.assertIs(ensure_owned(df, inplace=True), df)
+        
+        owned = ensure_owned(df)
+        owned.loc[0, 'a'] = 99
+        owned['b'] = 1
+        self.assertEqual(df['a'].tolist(), [1, 2, 3])
+        self.assertNotIn('b', df.columns)
+        print(f"  ✓ ensure_owned isolates the caller's frame")
+    
+    def test_project_columns_in_place(self):
+        """Projection drops unlisted columns without a new frame."""
+        df = pd.DataFrame({'a': [1], 'b': [2], 'c': [3]})
+        out = project_columns(df, ['a', 'c', 'missing'])
+        self.assertIs(out, df)
+        self.assertEqual(list(df.columns), ['a', 'c'])
+        print(f"  ✓ Column projection works in place")
+    
+    def test_safe_merge_source_count(self):
+        """Merging without input copies must keep source tracking and inputs intact."""
+        left = pd.DataFrame({'k': [1, 2], 'x': [10, 20]})
+        right = pd.DataFrame({'k': [2, 3], 'y': [5, 6]})
+        merged = safe_merge_datasets([left, right], ['k'], fill_strategy='keep').sort_values('k')
+        
+        self.assertEqual(merged['_source_count'].tolist(), [1, 2, 1])
+        self.assertEqual(list(left.columns), ['k', 'x'])
+        self.assertEqual(list(right.columns), ['k', 'y'])
+        print(f"  ✓ safe_merge_datasets tracks sources without copying inputs")
+    
+    def test_memory_report_phases(self):
+        """Each phase records a peak and a ratio against the raw frame."""
+        report = MemoryReport()
+        df = pd.DataFrame({'a': np.arange(1000)})
+        report.set_raw_frames(df)
+        with report.phase('double'):
+            df['b'] = df['a'] * 2
+        
+        summary = report.summary()
+        self.assertEqual(summary[0]['phase'], 'double')
+        self.assertIn('peak_vs_raw', summary[0])
+        self.assertGreater(summary[0]['peak_rss_mb'], 0)
+        print(f"  ✓ Memory report records per-phase peaks")
+
+
+class TestSchemaRegistry(unittest.TestCase):
+    """Test compact dtypes and the schema validation report."""
+    
+    def _write(self, text):
+        import tempfile
+        tmp = tempfile.NamedTemporaryFile('w', suffix='_demographic.csv', delete=False)
+        tmp.write(text)
+        tmp.close()
+        self.addCleanup(os.remove, tmp.name)
+        return tmp.name
+    
+    def test_typed_read_and_report(self):
+        """Counts become uint32 and every coercion is reported."""
+        path = self._write(
+            "date,state,district,pincode,demo_age_5_17,demo_age_17_\n"
+            "01-03-2025,Delhi,New Delhi,110001,5,10\n"
+            "2025-03-01,Delhi,New Delhi,110001,-2,5000000000\n"
+            "02-03-2025,Orissa,Puri,752001,x,3\n"
+        )
+        report = {}
+        df = read_dataset_csv(path, report=report)
+        
+        self.assertEqual(df['demo_age_5_17'].dtype, COUNT_DTYPE)
+        self.assertEqual(df['pincode'].dtype, np.uint32)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(df['date']))
+        self.assertEqual(df['demo_age_5_17'].tolist(), [5, 0, 0])
+        self.assertEqual(int(df['demo_age_17_'].iloc[1]), np.iinfo(np.uint32).max)
+        self.assertEqual(report['date']['coerced'], 1)
+        self.assertEqual(report['demo_age_5_17']['negative'], 1)
+        self.assertEqual(report['demo_age_5_17']['coerced'], 1)
+        self.assertEqual(report['demo_age_17_']['overflow'], 1)
+        print(f"  ✓ Typed read with overflow/coercion report")
+    
+    def test_concat_keeps_categories(self):
+        """Shards with different category sets concatenate without falling back to object."""
+        if not CATEGORICAL_GEO:
+            self.skipTest("categorical geography requires pandas >= 3")
+        a = pd.DataFrame({'state': pd.Categorical(['Delhi'])})
+        b = pd.DataFrame({'state': pd.Categorical(['Goa', 'Delhi'])})
+        out = concat_frames([a, b])
+        self.assertIsInstance(out['state'].dtype, pd.CategoricalDtype)
+        self.assertEqual(out['state'].tolist(), ['Delhi', 'Goa', 'Delhi'])
+        print(f"  ✓ Categorical shards concatenate as categorical")
+    
+    def test_state_normalization_per_distinct_value(self):
+        """Distinct-value mapping must equal the row-wise apply."""
+        raw = pd.Series(['Orissa', 'WEST BENGAL', '100000', None, 'Orissa', 'Delhi'])
+        expected = raw.apply(normalize_state_name)
+        got = map_distinct(raw, normalize_state_name)
+        self.assertEqual(got.tolist(), expected.tolist())
+        self.assertEqual(to_state_category(raw.astype('category')).tolist()[:2], ['Odisha', 'West Bengal'])
+        print(f"  ✓ State normalization once per distinct value")
+
+
+class TestCalendarUtils(unittest.TestCase):
+    """Test the cached date parser and calendar dimension."""
+    
+    def test_parse_dates_matches_to_datetime(self):
+        """Parsing distinct values once must equal a full to_datetime pass."""
+        raw = pd.Series(['01-03-2025', '15-08-2025', None, '2025-03-01', '01-03-2025'])
+        expected = pd.to_datetime(raw, format='%d-%m-%Y', errors='coerce')
+        got = parse_dates(raw)
+        self.assertEqual(got.isna().tolist(), expected.isna().tolist())
+        self.assertTrue((got.dropna() == expected.dropna()).all())
+        self.assertTrue((parse_dates(raw.astype('category')).dropna() == expected.dropna()).all())
+        print(f"  ✓ Cached date parsing matches pd.to_datetime")
+    
+    def test_calendar_features(self):
+        """Weekday, ISO week, weekend and holiday flags per date."""
+        cal = calendar_table(pd.to_datetime(['2025-08-15', '2025-08-16', '2025-08-15']))
+        self.assertEqual(len(cal), 2)
+        self.assertEqual(str(cal.loc['2025-08-15', 'day_of_week']), 'Friday')
+        self.assertEqual(cal.loc['2025-08-15', 'week'], 33)
+        self.assertTrue(cal.loc['2025-08-15', 'is_holiday'])
+        self.assertTrue(cal.loc['2025-08-16', 'is_weekend'])
+        
+        df = pd.DataFrame({'date': ['16-08-2025', '15-08-2025', 'bad']})
+        add_calendar_features(df, features={'weekday': 'dow', 'is_weekend': 'is_weekend', 'month': 'month'})
+        self.assertEqual(df['dow'].tolist()[:2], [5, 4])
+        self.assertEqual(df['is_weekend'].tolist(), [True, False, False])
+        self.assertTrue(np.isnan(df['month'].iloc[2]))
+        print(f"  ✓ Calendar dimension and feature broadcast")
+
+
+class TestGeoDimension(unittest.TestCase):
+    """Test stable integer surrogate keys for geography."""
+    
+    def test_ids_stable_across_reload(self):
+        """Existing keys keep their IDs; new keys are appended."""
+        import tempfile
+        path = os.path.join(tempfile.mkdtemp(), 'geo.csv')
+        first = pd.DataFrame({'state': ['Kerala', 'Bihar', 'Kerala'],
+                              'district': ['Idukki', 'Patna', 'Idukki'],
+                              'pincode': [685501, 800001, 685501]})
+        dim = GeoDimension.load(path)
+        dim.assign(first, levels=('state', 'district', 'pincode'))
+        dim.save()
+        self.assertEqual(first['district_id'].iloc[0], first['district_id'].iloc[2])
+        
+        second = pd.DataFrame({'state': ['Assam', 'Kerala'], 'district': ['Kamrup', 'Idukki'],
+                               'pincode': [781001, 685501]})
+        reloaded = GeoDimension.load(path)
+        reloaded.assign(second, levels=('state', 'district', 'pincode'))
+        self.assertEqual(second['geo_id'].iloc[1], first['geo_id'].iloc[0])
+        self.assertEqual(second['district_id'].iloc[1], first['district_id'].iloc[0])
+        self.assertEqual(second['geo_id'].iloc[0], 2)
+        self.assertEqual(reloaded.summary(), {'states': 3, 'districts': 3, 'pincodes': 3})
+        print(f"  ✓ Surrogate keys stable across reload")
+    
+    def test_attach_names_round_trip(self):
+        """Integer district keys map back to the original names."""
+        df = pd.DataFrame({'state': ['Bihar', 'Kerala', 'Bihar'], 'district': ['Patna', 'Idukki', 'Gaya']})
+        dim = GeoDimension(path=os.devnull)
+        dim.assign(df, levels=('district',))
+        facts = df[['district_id']].copy()
+        dim.attach_names(facts, 'district', position=0)
+        self.assertEqual(list(facts.columns), ['state', 'district', 'district_id'])
+        self.assertEqual(facts['district'].tolist(), ['Patna', 'Idukki', 'Gaya'])
+        self.assertEqual(facts['state'].tolist(), ['Bihar', 'Kerala', 'Bihar'])
+        print(f"  ✓ District names restored from integer keys")
+
+
+class TestPipelineRunner(unittest.TestCase):
+    """Test the content-hash-cached pipeline runner."""
+    
+    def _write(self, root, rel, text):
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fp:
+            fp.write(text)
+    
+    def test_graph_and_cache(self):
+        """Downstream stages follow upstream outputs and are skipped when unchanged."""
+        import tempfile
+        root = tempfile.mkdtemp()
+        copy = "import sys, shutil, os; os.makedirs('out', exist_ok=True); shutil.copy(sys.argv[1], sys.argv[2])\n"
+        self._write(root, 'a.py', copy)
+        self._write(root, 'b.py', copy)
+        self._write(root, 'in/x.txt', 'v1')
+        stages = {
+            'a': {'script': 'a.py', 'inputs': ['in'], 'outputs': ['out/a.txt'], 'args': ['in/x.txt', 'out/a.txt']},
+            'b': {'script': 'b.py', 'inputs': ['out/a.txt'], 'outputs': ['out/b.txt'], 'args': ['out/a.txt', 'out/b.txt']},
+        }
+        self.assertEqual(build_graph(stages), {'a': [], 'b': ['a']})
+        
+        kwargs = dict(stages=stages, root=root, cache_file=os.path.join(root, 'cache.json'),
+                      log_dir=os.path.join(root, 'logs'), jobs=2)
+        status = lambda: {r['stage']: r['status'] for r in run_pipeline(**kwargs)}
+        self.assertEqual(status(), {'a': 'ran', 'b': 'ran'})
+        self.assertEqual(status(), {'a': 'cached', 'b': 'cached'})
+        
+        self._write(root, 'in/x.txt', 'v2')
+        self.assertEqual(status(), {'a': 'ran', 'b': 'ran'})
+        with open(os.path.join(root, 'out', 'b.txt')) as fp:
+            self.assertEqual(fp.read(), 'v2')
+        print(f"  ✓ Pipeline dependencies and content-hash cache")
+
+
+def _write_plot(values, path):
+    """Module-level plot function for TestPlotRegistry (must be picklable)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.plot(values)
+    plt.savefig(path)
+
+
+class TestPlotRegistry(unittest.TestCase):
+    """Test cached parallel plot rendering."""
+    
+    def test_render_and_cache(self):
+        """Unchanged figures are skipped; changed data re-renders only that figure."""
+        import tempfile
+        out = tempfile.mkdtemp()
+        a = pd.Series([1, 2, 3])
+        b = pd.Series([3, 2, 1])
+        
+        def register(registry, a, b):
+            registry.add(_write_plot, a, os.path.join(out, 'a.png'), outputs='a.png', name='a')
+            registry.add(_write_plot, b, os.path.join(out, 'b.png'), outputs='b.png', name='b')
+        
+        registry = PlotRegistry(out)
+        register(registry, a, b)
+        result = registry.render(jobs=2)
+        self.assertEqual(sorted(result['rendered']), ['a', 'b'])
+        self.assertTrue(os.path.exists(os.path.join(out, 'a.png')))
+        
+        register(registry, a, b)
+        self.assertEqual(sorted(registry.render(jobs=1)['cached']), ['a', 'b'])
+        
+        register(registry, a, b * 2)
+        result = registry.render(jobs=1)
+        self.assertEqual((result['rendered'], result['cached']), (['b'], ['a']))
+        print(f"  ✓ Plot cache keyed by input data")
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    """Test per-phase profiling reports."""
+    
+    def test_nested_phases(self):
+        """Phases are reported in start order with depth and memory fields."""
+        profiler = PhaseProfiler(name='test')
+        with profiler.phase('ANALYZE'):
+            with profiler.phase('LOAD'):
+                data = [np.arange(100_000) for _ in range(5)]
+            del data
+        report = profiler.to_dict()
+        
+        self.assertEqual([p['phase'] for p in report['phases']], ['ANALYZE', 'LOAD'])
+        self.assertEqual([p['depth'] for p in report['phases']], [0, 1])
+        load = report['phases'][1]
+        for key in ('wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'traced_peak_mb', 'top_allocations'):
+            self.assertIn(key, load)
+        self.assertGreaterEqual(load['traced_peak_mb'], 3.0)
+        self.assertGreaterEqual(report['phases'][0]['traced_peak_mb'], load['traced_peak_mb'])
+        print(f"  ✓ Nested phases recorded in order")
+    
+    def test_compare_profiles(self):
+        """Wall-time change is computed per matching phase."""
+        old = {'phases': [{'phase': 'LOAD', 'wall_seconds': 2.0, 'peak_rss_mb': 100.0}]}
+        new = {'phases': [{'phase': 'LOAD', 'wall_seconds': 3.0, 'peak_rss_mb': 90.0},
+                          {'phase': 'PLOT', 'wall_seconds': 1.0, 'peak_rss_mb': 90.0}]}
+        rows = compare_profiles(old, new)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['wall_change_pct'], 50.0)
+        print(f"  ✓ Profile comparison: LOAD +50%")
+
+
+class TestSyntheticData(unittest.TestCase):
+    """Test the benchmark data generator."""
+    
+    def test_schema_and_dirty_states(self):
+        """Shards use the real columns; dirty state names normalize back."""
+        geo = build_geography(n_districts=100, n_pincodes=1000, seed=1)
+        self.assertEqual(geo['district'].nunique(), 100)
+        self.assertEqual(geo['state'].nunique(), 36)
+        
+        rows = generate_rows('enrolment', 20000, geo, np.random.default_rng(1),
+                             dirty_rate=0.2, invalid_rate=0.01)
+        self.assertEqual(list(rows.columns),
+                         ['date', 'state', 'district', 'pincode', 'age_0_5', 'age_5_17', 'age_18_greater'])
+        normalized = rows['state'].map(normalize_state_name)
+        self.assertGreater((rows['state'] != normalized).mean(), 0.1)
+        self.assertAlmostEqual(normalized.isna().mean(), 0.01, delta=0.005)
+        print(f"  ✓ Synthetic rows: {normalized.isna().sum()} invalid states")
+    
+    def test_sharded_output_deterministic(self):
+        """Same seed gives identical shards; row split follows dataset shares."""
+        import tempfile
+        a, b = tempfile.mkdtemp(), tempfile.mkdtemp()
+        manifest = write_datasets(a, 10000, shard_rows=1500, seed=3, n_districts=50, n_pincodes=200)
+        write_datasets(b, 10000, shard_rows=1500, seed=3, n_districts=50, n_pincodes=200)
+        
+        self.assertEqual(manifest['datasets']['demographic']['rows'], 4200)
+        self.assertEqual(len(manifest['datasets']['enrolment']['files']), 2)
+        name = manifest['datasets']['biometric']['files'][0]
+        path = os.path.join('api_data_aadhar_biometric', name)
+        pd.testing.assert_frame_equal(pd.read_csv(os.path.join(a, path)), pd.read_csv(os.path.join(b, path)))
+        print(f"  ✓ Deterministic shards: {name}")
+
+
+class TestEquivalenceHarness(unittest.TestCase):
+    """Test optimized implementations against their references."""
+    
+    def test_candidates_match_references(self):
+        """Every registered candidate matches on randomized inputs."""
+        results = run_harness(seeds=3, size=400, real=False, repeat=1)
+        failures = [(r['case'], r['candidate'], r['input'], r['error']) for r in results if not r['ok']]
+        self.assertEqual(failures, [])
+        self.assertEqual({r['case'] for r in results}, set(CASES))
+        print(f"  ✓ {len(results)} candidate runs match their references")
+    
+    def test_mismatch_detected(self):
+        """A candidate that drops invalid-state handling is reported as failing."""
+        CASES['broken'] = {
+            'reference': lambda s: s.map(normalize_state_name),
+            'candidates': {'title_case': lambda s: s.str.strip().str.title()},
+            'generate': lambda rng, n: (dirty_state_names(rng, n),),
+            'exact': True,
+        }
+        try:
+            rng = np.random.default_rng(0)
+            results = check_case('broken', [('seed=0', CASES['broken']['generate'](rng, 200))], repeat=1)
+        finally:
+            del CASES['broken']
+        self.assertFalse(results[0]['ok'])
+        print(f"  ✓ Mismatch reported: {results[0]['error'][:40]}")
+
+
+class TestDashboardBundle(unittest.TestCase):
+    """Test the dashboard data bundle built from integrated outputs."""
+    
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, 'integrated')
+        self.out = os.path.join(self.tmp.name, 'bundle')
+        os.makedirs(self.src)
+        pd.DataFrame({
+            'state': ['Kerala', 'Kerala', 'Kerala', 'Goa'],
+            'district': ['Idukki', 'Idukki', 'Wayanad', 'North Goa'],
+            'year': [2025, 2025, 2025, 2025], 'month': [3, 4, 3, 4],
+            'total_enrol': [10, 20, 0, 5], 'total_demo': [100, 200, 30, 50],
+            'total_bio': [50, 60, 20, 10], 'total_updates': [150, 260, 50, 60],
+            'child_attention_gap': [-0.6, -0.2, np.nan, 0.1],
+        }).to_csv(os.path.join(self.src, 'integrated_data.csv'), index=False)
+        pd.DataFrame({
+            'state': ['Goa', 'Kerala'], 'total_enrol': [5, 30], 'total_demo': [50, 330],
+            'total_bio': [10, 130], 'total_updates': [60, 460],
+            'child_attention_gap': [0.1, -0.4], 'total_intensity': [12.0, 15.33],
+        }).to_csv(os.path.join(self.src, 'state_summary.csv'), index=False)
+        pd.DataFrame({
+            'state': ['Kerala', 'Kerala', 'Goa'], 'district': ['Idukki', 'Wayanad', 'North Goa'],
+            'child_attention_gap': [-0.4, np.nan, 0.1], 'cluster': [0, 4, 1],
+            'cluster_label': ['High-Enrol', 'Low-Enrol', 'High-Enrol'],
+        }).to_csv(os.path.join(self.src, 'district_clusters.csv'), index=False)
+        pd.DataFrame([{
+            'total_enrolments': 35, 'total_demo_updates': 380, 'total_bio_updates': 140,
+            'total_updates': 520, 'update_to_enrol_ratio': 14.86, 'avg_demo_intensity': 10.0,
+            'avg_bio_intensity': 4.0, 'avg_child_attention_gap': -0.2, 'states_analyzed': 2,
+            'districts_analyzed': 3, 'mature_regions_pct': 33.3, 'underserved_regions_pct': 33.3,
+        }]).to_csv(os.path.join(self.src, 'kpis.csv'), index=False)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def _chunk(self, manifest, name):
+        import json
+        with open(os.path.join(self.out, manifest['chunks'][name]['file'])) as fp:
+            return json.load(fp)
+    
+    def test_manifest_and_chunks(self):
+        """Manifest lists hashed chunk files; rebuilding removes stale ones."""
+        manifest = build_bundle(self.src, self.out)
+        files = sorted(os.listdir(self.out))
+        self.assertEqual(files, sorted([MANIFEST_FILE] + [e['file'] for e in manifest['chunks'].values()]))
+        national = self._chunk(manifest, 'national')
+        self.assertEqual(national['kpi']['totalEnrolments'], 35)
+        self.assertEqual(national['monthly']['labels'], ['Mar 2025', 'Apr 2025'])
+        self.assertEqual(national['clusters'], {'labels': ['High-Enrol', 'Low-Enrol'], 'values': [2, 1]})
+        
+        # Same inputs -> same version; an unreferenced chunk is cleaned up
+        with open(os.path.join(self.out, 'states.0000000000.json'), 'w'):
+            pass
+        again = build_bundle(self.src, self.out)
+        self.assertEqual(again, manifest)
+        self.assertNotIn('states.0000000000.json', os.listdir(self.out))
+        print(f"  ✓ Bundle {manifest['version']}: {len(manifest['chunks'])} chunks")
+    
+    def test_columnar_round_trip(self):
+        """Dictionary-encoded district columns decode back to the rows."""
+        rows = self._chunk(build_bundle(self.src, self.out), 'districts')['rows']
+        states = [rows['dictionaries']['state'][c] for c in rows['columns']['state']]
+        self.assertEqual(states, ['Goa', 'Kerala', 'Kerala'])
+        self.assertEqual(rows['columns']['enrol'], [5, 30, 0])
+        self.assertEqual(rows['columns']['intensity'][2], None)   # no enrolments
+        self.assertEqual(rows['columns']['cluster'], [1, 0, 4])
+        print(f"  ✓ {rows['length']} districts decoded from columnar chunk")
+
+
+class TestImageAssets(unittest.TestCase):
+    """Test responsive image variants and their encode cache."""
+    
+    def setUp(self):
+        import tempfile
+        from PIL import Image
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, 'curated_plots')
+        self.out = os.path.join(self.tmp.name, 'responsive')
+        os.makedirs(self.src)
+        Image.new('RGB', (1200, 600), (30, 90, 160)).save(os.path.join(self.src, 'wide.png'))
+        Image.new('RGB', (400, 300), (200, 40, 40)).save(os.path.join(self.src, 'small.png'))
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_variants_and_cache(self):
+        """Widths are capped at the source; only changed sources are re-encoded."""
+        from PIL import Image
+        images, encoded = build_assets(self.src, self.out, formats=['webp', 'png'])
+        self.assertEqual(encoded, ['small.png', 'wide.png'])
+        self.assertEqual([w for _, w in images['wide.png']['variants']['webp']], [480, 960, 1200])
+        self.assertEqual([w for _, w in images['small.png']['variants']['png']], [400])
+        
+        _, encoded = build_assets(self.src, self.out, formats=['webp', 'png'])
+        self.assertEqual(encoded, [])
+        
+        old_files = {f for f, _ in images['small.png']['variants']['png']}
+        Image.new('RGB', (400, 300), (0, 0, 0)).save(os.path.join(self.src, 'small.png'))
+        images, encoded = build_assets(self.src, self.out, formats=['webp', 'png'])
+        self.assertEqual(encoded, ['small.png'])
+        self.assertFalse(old_files & set(os.listdir(self.out)))
+        print(f"  ✓ {len(os.listdir(self.out)) - 1} variant files, unchanged sources reused")
+    
+    def test_variants_file(self):
+        """srcset data goes to variants.js beside the variants and survives a rebuild."""
+        import json
+        images, _ = build_assets(self.src, self.out, formats=['png'])
+        metadata = asset_metadata(images, self.src, self.out, self.tmp.name)
+        self.assertIn('curated_plots/wide.png', metadata)
+        self.assertEqual(metadata['curated_plots/wide.png']['sources']['image/png'][0][0].split('/')[0], 'responsive')
+        
+        path = os.path.join(self.out, VARIANTS_FILE)
+        write_variants(metadata, path)
+        build_assets(self.src, self.out, formats=['png'])
+        with open(path) as fp:
+            text = fp.read()
+        body = text.split("window.plotAssets = ", 1)[1].rstrip().rstrip(';')
+        self.assertEqual(json.loads(body), metadata)
+        print(f"  ✓ srcset data for {len(metadata)} plots in {VARIANTS_FILE}")
+
+
+class TestApiServer(unittest.TestCase):
+    """Test the local JSON API against small outputs on localhost."""
+    
+    def setUp(self):
+        import tempfile
+        import threading
+        self.tmp = tempfile.TemporaryDirectory()
+        integrated = os.path.join(self.tmp.name, 'integrated_analysis')
+        os.makedirs(integrated)
+        pd.DataFrame([{'total_enrolments': 35, 'total_updates': 520}]).to_csv(
+            os.path.join(integrated, 'kpis.csv'), index=False)
+        pd.DataFrame({
+            'state': ['Goa', 'Kerala'], 'total_enrol': [5, 30], 'total_updates': [60, 460],
+            'child_attention_gap': [0.1, np.nan],
+        }).to_csv(os.path.join(integrated, 'state_summary.csv'), index=False)
+        pd.DataFrame({
+            'state': ['Kerala'] * 40 + ['Goa'], 'district': [f'D{i}' for i in range(41)],
+            'total_enrol': range(41), 'cluster': [0] * 41,
+        }).to_csv(os.path.join(integrated, 'district_clusters.csv'), index=False)
+        
+        self.server = make_server(port=0, outputs_dir=self.tmp.name, quiet=True)
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+    
+    def _get(self, path, **headers):
+        import urllib.request
+        import urllib.error
+        try:
+            with urllib.request.urlopen(urllib.request.Request(self.base + path, headers=headers)) as r:
+                return r.status, r.headers, r.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+    
+    def test_json_routes(self):
+        """Routes return the outputs as JSON; missing outputs and unknown states are errors."""
+        import json
+        status, _, body = self._get('/states')
+        states = json.loads(body)
+        self.assertEqual(status, 200)
+        self.assertEqual([s['state'] for s in states], ['Kerala', 'Goa'])
+        self.assertIsNone(states[0]['child_attention_gap'])
+        
+        status, _, body = self._get('/states/kerala/districts')
+        self.assertEqual(len(json.loads(body)), 40)
+        self.assertEqual(self._get('/states/Atlantis/districts')[0], 404)
+        self.assertEqual(self._get('/forecast')[0], 503)
+        self.assertEqual(json.loads(self._get('/kpis')[2])['total_enrolments'], 35)
+        print("  ✓ /kpis, /states, /states/{state}/districts served; errors mapped to 404/503")
+    
+    def test_gzip_etag_and_cache(self):
+        """Large bodies are gzipped, repeats hit the LRU and If-None-Match gives 304."""
+        import gzip
+        import json
+        path = '/states/Kerala/districts'
+        status, headers, body = self._get(path, **{'Accept-Encoding': 'gzip'})
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(body))), 40)
+        self.assertEqual(headers['X-Cache'], 'MISS')
+        
+        status, again, _ = self._get(path)
+        self.assertEqual(again['X-Cache'], 'HIT')
+        self.assertIsNone(again['Content-Encoding'])
+        self.assertEqual(again['ETag'], headers['ETag'])
+        
+        status, _, body = self._get(path, **{'If-None-Match': headers['ETag']})
+        self.assertEqual((status, body), (304, b''))
+        print(f"  ✓ gzip + ETag {headers['ETag']} revalidated with 304")
+
+
+    @unittest.skipUnless(HAS_TYPER, "typer not installed")
+    def test_anomalies_route_serves_cli_output(self):
+        """/anomalies (default outputs dir) returns what `uidai anomalies` just wrote."""
+        import json
+        import shutil
+        import threading
+        from typer.testing import CliRunner
+        import uidai
+        from api_server import OUTPUTS_DIR, SOURCES
+        if not os.path.exists(os.path.join(OUTPUTS_DIR, 'integrated_analysis', 'integrated_data.csv')):
+            self.skipTest("integrated outputs not built")
+        path = os.path.join(OUTPUTS_DIR, SOURCES['anomalies'][0])
+        backup = os.path.join(self.tmp.name, 'anomalies_backup.csv')
+        if os.path.exists(path):
+            shutil.copy2(path, backup)
+        try:
+            result = CliRunner().invoke(uidai.app, ['anomalies', '--method', 'zscore', '--top', '7'])
+            self.assertEqual(result.exit_code, 0, result.output)
+            written = pd.read_csv(path)
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = make_server(port=0, quiet=True)
+            self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+            status, _, body = self._get(f'/anomalies?top={len(written)}')
+            self.assertEqual(status, 200)
+            served = json.loads(body)
+            self.assertEqual(sorted(r['district'] for r in served), sorted(written['district']))
+        finally:
+            if os.path.exists(backup):
+                shutil.copy(backup, path)
+            elif os.path.exists(path):
+                os.remove(path)
+        print(f"  ✓ /anomalies serves the {len(written)} rows `uidai anomalies` wrote")
+    
+    def test_sources_match_sql_tables(self):
+        """The API and `uidai query` read the same file for every shared dataset."""
+        from api_server import SOURCES
+        from sql_engine import TABLES
+        shared = set(SOURCES) & set(TABLES)
+        self.assertIn('anomalies', shared)
+        for name in shared:
+            self.assertEqual(SOURCES[name][0], TABLES[name], name)
+        print(f"  ✓ {len(shared)} datasets resolve to the same output files")
+
+
+@unittest.skipUnless(HAS_DUCKDB, "duckdb not installed")
+class TestSqlEngine(unittest.TestCase):
+    """Test SQL over Parquet mirrors of the outputs."""
+    
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        integrated = os.path.join(self.tmp.name, 'integrated_analysis')
+        os.makedirs(integrated)
+        self.csv = os.path.join(integrated, 'integrated_data.csv')
+        pd.DataFrame({
+            'state': ['Kerala', 'Kerala', 'Goa'], 'district': ['Idukki', 'Wayanad', 'North Goa'],
+            'total_enrol': [10, 20, 5], 'total_updates': [100, 50, 60],
+        }).to_csv(self.csv, index=False)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_query_and_export(self):
+        """Aggregates match pandas; results export to Parquet; only existing outputs are tables."""
+        con, available = connect(self.tmp.name, threads=2)
+        self.assertEqual(list(available), ['integrated'])
+        self.assertTrue(available['integrated'].endswith('.parquet'))
+        
+        columns, rows, truncated, _ = run_query(
+            con, "SELECT state, SUM(total_enrol) AS enrol FROM integrated GROUP BY 1 ORDER BY 1;", limit=1)
+        self.assertEqual(columns, ['state', 'enrol'])
+        self.assertEqual(rows, [('Goa', 5)])
+        self.assertTrue(truncated)
+        
+        out = os.path.join(self.tmp.name, 'kerala.parquet')
+        self.assertEqual(export_query(con, "SELECT * FROM integrated WHERE state = 'Kerala'", out), 2)
+        with self.assertRaises(QueryError):
+            run_query(con, "SELECT missing_column FROM integrated")
+        print("  ✓ SQL over Parquet mirror matches; 2 rows exported")
+    
+    @unittest.skipUnless(HAS_TYPER, "typer not installed")
+    def test_cli_uses_repo_outputs(self):
+        """`uidai query` reads the repo-root outputs/ (no patched paths)."""
+        from typer.testing import CliRunner
+        import uidai
+        from sql_engine import OUTPUTS_DIR
+        if not os.path.exists(os.path.join(OUTPUTS_DIR, 'integrated_analysis', 'integrated_data.csv')):
+            self.skipTest("integrated_data.csv not built")
+        result = CliRunner().invoke(uidai.app, ['query', 'SELECT COUNT(*) AS n FROM integrated'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertNotIn('No pipeline outputs', result.output)
+        print("  ✓ uidai query runs against the repo-root outputs/")
+    
+    @unittest.skipUnless(HAS_TYPER, "typer not installed")
+    def test_cli_queries_fresh_anomalies(self):
+        """`uidai query` on anomalies sees the rows `uidai anomalies` just wrote."""
+        import shutil
+        from typer.testing import CliRunner
+        import uidai
+        from sql_engine import OUTPUTS_DIR, TABLES
+        if not os.path.exists(os.path.join(OUTPUTS_DIR, 'integrated_analysis', 'integrated_data.csv')):
+            self.skipTest("integrated_data.csv not built")
+        path = os.path.join(OUTPUTS_DIR, TABLES['anomalies'])
+        backup = os.path.join(self.tmp.name, 'anomalies_backup.csv')
+        if os.path.exists(path):
+            shutil.copy2(path, backup)
+        runner = CliRunner()
+        try:
+            result = runner.invoke(uidai.app, ['anomalies', '--method', 'zscore', '--top', '7'])
+            self.assertEqual(result.exit_code, 0, result.output)
+            written = len(pd.read_csv(path))
+            out = os.path.join(self.tmp.name, 'anomalies.csv')
+            result = runner.invoke(uidai.app, ['query', 'SELECT * FROM anomalies', '--output', out])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertEqual(len(pd.read_csv(out)), written)
+        finally:
+            if os.path.exists(backup):
+                shutil.copy(backup, path)
+            elif os.path.exists(path):
+                os.remove(path)
+        print(f"  ✓ uidai query sees the {written} fresh anomaly rows")
+
+
+class TestPartitionedStore(unittest.TestCase):
+    """Test the state/year/month partitioned store and its pruning."""
+    
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, 'partitions')
+        self.df = coerce_to_schema(pd.DataFrame({
+            'year': [2025] * 6, 'month': [3, 3, 4, 3, 4, 4],
+            'state': ['Goa', 'Goa', 'Goa', 'Jammu and Kashmir', 'Jammu and Kashmir', 'Kerala'],
+            'district': ['North Goa', 'South Goa', 'North Goa', 'Jammu', 'Srinagar', 'Idukki'],
+            'total_enrol': [5, 6, 7, 8, 9, 10],
+            'child_attention_gap': [0.1, -0.2, 0.3, -0.4, 0.5, -0.6],
+        }), 'integrated')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_layout_and_round_trip(self):
+        """Hive paths per state/year/month; reading every partition restores the frame."""
+        manifest = write_partitions(self.df, self.root)
+        self.assertEqual(len(manifest['partitions']), 5)
+        self.assertTrue(os.path.exists(os.path.join(
+            self.root, 'state=Jammu%20And%20Kashmir', 'year=2025', 'month=3', 'part-0.csv')))
+        
+        back = read_partitions(self.root).sort_values('total_enrol').reset_index(drop=True)
+        self.assertEqual(list(back.columns), list(self.df.columns))
+        self.assertEqual(back['state'].astype(str).tolist(), self.df['state'].astype(str).tolist())
+        self.assertEqual(back['month'].dtype, self.df['month'].dtype)
+        np.testing.assert_allclose(back['child_attention_gap'], self.df['child_attention_gap'])
+        print(f"  ✓ {len(manifest['partitions'])} partitions round-trip")
+    
+    def test_state_filter_reads_only_matching_partitions(self):
+        """A state query resolves against the partition list; other states are never opened."""
+        write_partitions(self.df, self.root)
+        states = match_states(list_partitions(self.root), 'kashmir')
+        self.assertEqual(states, ['Jammu And Kashmir'])
+        
+        import shutil
+        shutil.rmtree(os.path.join(self.root, 'state=Goa'))   # would fail if read
+        subset = read_partitions(self.root, states=states, columns=['district', 'total_enrol'])
+        self.assertEqual(list(subset.columns), ['year', 'month', 'state', 'district', 'total_enrol'])
+        self.assertEqual(sorted(subset['district'].astype(str)), ['Jammu', 'Srinagar'])
+        self.assertEqual(len(read_partitions(self.root, states=match_states(list_partitions(self.root), 'atlantis'))), 0)
+        print(f"  ✓ 'kashmir' → {states[0]}: {len(subset)} rows from its partitions only")
+    
+    @unittest.skipUnless(HAS_TYPER, "typer not installed")
+    def test_cli_reads_default_store(self):
+        """uidai's state loader prunes the store integrated_analysis writes (no patched paths)."""
+        import uidai
+        from partitioned_store import STORE_DIR
+        self.assertEqual(uidai.PARTITIONS_DIR, STORE_DIR)
+        partitions = list_partitions(STORE_DIR)
+        if not partitions:
+            self.skipTest("partitioned store not built")
+        state = partitions[0]['state']
+        subset = uidai.load_state_data(state)
+        self.assertEqual(set(subset['state']), set(match_states(partitions, state)))
+        print(f"  ✓ uidai reads {state} from the default partitioned store")
+
+
+class TestDistinctSketch(unittest.TestCase):
+    """Test the mergeable distinct-count sketches behind active_pincodes."""
+    
+    def test_exact_below_threshold_matches_nunique(self):
+        """Small cells are counted exactly, identical to groupby nunique."""
+        df = generate_rows('enrolment', 20_000, build_geography(n_districts=40, n_pincodes=400),
+                           np.random.default_rng(3), dirty_rate=0.0)
+        keys = ['state', 'district']
+        counts = count_distinct(df, keys, 'pincode')
+        expected = df.groupby(keys, observed=True)['pincode'].nunique()
+        pd.testing.assert_series_equal(counts, expected.astype('int64'), check_names=False)
+        print(f"  ✓ {len(counts)} cells counted exactly")
+    
+    def test_estimate_error_above_threshold(self):
+        """Past the threshold the HyperLogLog estimate stays within 3%."""
+        values = np.random.default_rng(5).integers(0, 10**12, 50_000)
+        sketch = DistinctSketch().add(values)
+        truth = len(np.unique(values))
+        self.assertFalse(sketch.is_exact)
+        self.assertLess(abs(sketch.count() - truth) / truth, 0.03)
+        print(f"  ✓ Estimate {sketch.count():,} vs {truth:,} distinct")
+    
+    def test_merge_equals_union(self):
+        """Merging per-shard sketches gives the same counts as one pass over all rows."""
+        rng = np.random.default_rng(7)
+        df = pd.DataFrame({'state': rng.integers(0, 5, 30_000),
+                           'pincode': rng.integers(0, 6_000, 30_000)})
+        whole = count_distinct(df, ['state'], 'pincode')
+        shards = [grouped_sketches(df.iloc[i::3], ['state'], 'pincode') for i in range(3)]
+        merged = sketch_counts(merge_sketches(*shards))
+        pd.testing.assert_series_equal(merged, whole, check_names=False)
+        
+        restored = DistinctSketch.from_bytes(merge_sketches(*shards).iloc[0].to_bytes())
+        self.assertEqual(restored.count(), whole.iloc[0])
+        print(f"  ✓ 3 shards merged → {merged.tolist()}")
+
+
+class TestQuantileSketch(unittest.TestCase):
+    """Test the mergeable quantile sketches behind medians, caps and percentiles."""
+    
+    def test_exact_mode_matches_pandas(self):
+        """Below exact_limit, quantiles and percentile ranks equal pandas."""
+        rng = np.random.default_rng(11)
+        values = pd.Series(np.round(rng.lognormal(2, 1, 20_000), 1))
+        values[::37] = np.nan
+        states = rng.choice(['Bihar', 'Goa', 'Kerala'], len(values))
+        sketch = sketch_values(values, chunk_rows=3_000)
+        
+        self.assertTrue(sketch.is_exact)
+        np.testing.assert_allclose(sketch.quantile([0.25, 0.5, 0.99]), values.quantile([0.25, 0.5, 0.99]))
+        np.testing.assert_allclose(sketch.rank(values), values.rank(pct=True), equal_nan=True)
+        np.testing.assert_allclose(group_ranks(values, states, group_sketches(values, states, chunk_rows=3_000)),
+                                   values.groupby(states).rank(pct=True), equal_nan=True)
+        print(f"  ✓ Median {sketch.median():.1f} and ranks identical to pandas")
+    
+    def test_kll_rank_error_is_bounded(self):
+        """Past exact_limit, every quantile lands within 1% of its true rank."""
+        values = np.random.default_rng(13).exponential(10, 500_000)
+        sketch = sketch_values(values, chunk_rows=50_000)
+        qs = np.array([0.01, 0.25, 0.5, 0.75, 0.99])
+        true_ranks = np.searchsorted(np.sort(values), sketch.quantile(qs)) / len(values)
+        
+        self.assertFalse(sketch.is_exact)
+        self.assertLess(np.abs(true_ranks - qs).max(), 0.01)
+        self.assertLess(len(sketch.to_bytes()), 100_000)
+        print(f"  ✓ Max rank error {np.abs(true_ranks - qs).max():.4f} from {len(sketch.to_bytes()):,} bytes")
+    
+    def test_merge_and_round_trip(self):
+        """Merged shard sketches track the whole input and survive serialization."""
+        values = np.random.default_rng(17).normal(100, 15, 200_000)
+        shards = [QuantileSketch().update(values[i::4]) for i in range(4)]
+        merged = shards[0] | shards[1] | shards[2] | shards[3]
+        
+        self.assertEqual(merged.count, len(values))
+        self.assertLess(abs(merged.median() - np.median(values)), 0.5)
+        restored = QuantileSketch.from_bytes(merged.to_bytes())
+        self.assertEqual(restored.count, merged.count)
+        self.assertEqual(restored.median(), merged.median())
+        print(f"  ✓ 4 shards → median {merged.median():.2f} (exact {np.median(values):.2f})")
+
+
+class TestShardProfiler(unittest.TestCase):
+    """Test the parallel, cached shard profiler behind the data audits."""
+    
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        write_datasets(self.tmp.name, 12000, shard_rows=2000, seed=5, n_districts=60, n_pincodes=500)
+        self.dirs = {name: os.path.join(self.tmp.name, f'api_data_aadhar_{name}')
+                     for name in ('biometric', 'demographic', 'enrolment')}
+        self.cache = os.path.join(self.tmp.name, 'profiles.json')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_merged_profile_matches_full_read(self):
+        """Merged shard profiles equal counts from reading every row at once."""
+        merged, profiled = profile_datasets(self.dirs, cache_path=self.cache, jobs=2)
+        raw = pd.concat([pd.read_csv(f) for f in sorted(
+            glob.glob(os.path.join(self.dirs['demographic'], '*.csv')))], ignore_index=True)
+        demo = merged['demographic']
+        
+        self.assertEqual(demo['rows'], len(raw))
+        self.assertEqual(demo['totals']['demo_age_17_'], raw['demo_age_17_'].sum())
+        self.assertEqual(demo['states'], {k: int(v) for k, v in raw['state'].value_counts().items()})
+        self.assertEqual(distinct_pincodes(demo), raw['pincode'].nunique())
+        self.assertEqual(sum(demo['histograms']['demo_age_5_17']), len(raw))
+        dates = pd.to_datetime(raw['date'], format='%d-%m-%Y')
+        self.assertEqual(demo['dates']['min'], dates.min().date().isoformat())
+        self.assertEqual(len(profiled), sum(p['shards'] for p in merged.values()))
+        print(f"  ✓ {demo['shards']} demographic shards → {demo['rows']:,} rows, "
+              f"{len(demo['states'])} raw state spellings")
+    
+    def test_unchanged_shards_come_from_cache(self):
+        """A second run re-reads only the shard that changed."""
+        first, _ = profile_datasets(self.dirs, cache_path=self.cache, jobs=1)
+        _, profiled = profile_datasets(self.dirs, cache_path=self.cache, jobs=1)
+        self.assertEqual(profiled, [])
+        
+        shard = sorted(glob.glob(os.path.join(self.dirs['enrolment'], '*.csv')))[0]
+        with open(shard, 'a') as fp:
+            fp.write("01-04-2025,Goa,North Goa,403001,1000,0,0\n")
+        again, profiled = profile_datasets(self.dirs, cache_path=self.cache, jobs=1)
+        self.assertEqual(profiled, [shard])
+        self.assertEqual(again['enrolment']['rows'], first['enrolment']['rows'] + 1)
+        self.assertEqual(again['enrolment']['round_values']['age_0_5'],
+                         first['enrolment']['round_values']['age_0_5'] + 1)
+        print(f"  ✓ Cache reused; 1 changed shard re-profiled")
+    
+    def test_outliers_use_shard_moments(self):
+        """Outlier flags use the whole shard's mean/std, whatever the chunk size."""
+        shard = sorted(glob.glob(os.path.join(self.dirs['demographic'], '*.csv')))[0]
+        raw = pd.read_csv(shard)
+        cols = ['demo_age_5_17', 'demo_age_17_']
+        flags = suspicious_value_flags(raw[cols].fillna(0).to_numpy(dtype=float))['outlier']
+        expected = dict(zip(cols, flags.sum(axis=0).tolist()))
+        for chunk_rows in (len(raw), 97):
+            self.assertEqual(profile_shard(shard, 'demographic', chunk_rows=chunk_rows)['outliers'], expected)
+        print(f"  ✓ Outliers per shard ({sum(expected.values())}) independent of chunk size")
+
+
+    def test_quantiles_match_full_read(self):
+        """Chunk-fed quantile sketches, merged across shards, track pandas quantiles in a small cache."""
+        import json
+        merged, _ = profile_datasets(self.dirs, cache_path=self.cache, jobs=1)
+        raw = pd.concat([pd.read_csv(f) for f in sorted(
+            glob.glob(os.path.join(self.dirs['enrolment'], '*.csv')))], ignore_index=True)
+        quantiles = column_quantiles(merged['enrolment'])
+        for col in ('age_0_5', 'age_18_greater'):
+            for q, value in ((0.5, quantiles[col]['p50']), (0.99, quantiles[col]['p99'])):
+                self.assertLessEqual((raw[col] < value).mean(), q + 0.02)
+                self.assertGreaterEqual((raw[col] <= value).mean(), q - 0.02)
+        
+        # Stored sketches stay a few KB per column, whatever the shard size
+        with open(self.cache) as fp:
+            shards = json.load(fp)['shards'].values()
+        largest = max(len(s) for entry in shards for s in entry['profile']['quantiles'].values())
+        self.assertLess(largest, 8192)
+        print(f"  ✓ Merged shard quantiles within 2% rank (age_0_5 p99={quantiles['age_0_5']['p99']:,.1f}), "
+              f"≤{largest:,} B per cached sketch")
+
+
+class TestShardScanner(unittest.TestCase):
+    """Test the pandas-free raw shard scanner behind validate_data.py."""
+    
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        write_datasets(self.tmp.name, 9000, shard_rows=1500, seed=9, n_districts=40, n_pincodes=300)
+        self.dirs = {name: os.path.join(self.tmp.name, f'api_data_aadhar_{name}')
+                     for name in ('biometric', 'demographic', 'enrolment')}
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_scan_matches_pandas(self):
+        """Rows, totals and date range equal a full pandas read, across small blocks too."""
+        merged = scan_datasets(self.dirs, jobs=2)
+        files = sorted(glob.glob(os.path.join(self.dirs['biometric'], '*.csv')))
+        raw = pd.concat([pd.read_csv(f) for f in files], ignore_index=True)
+        bio = merged['biometric']
+        
+        self.assertEqual(bio['rows'], len(raw))
+        self.assertEqual(sum(count_rows(f) for f in files), len(raw))
+        self.assertEqual(bio['totals'], {c: int(raw[c].sum()) for c in bio['totals']})
+        dates = pd.to_datetime(raw['date'], format='%d-%m-%Y')
+        self.assertEqual(bio['dates']['min'], dates.min().date().isoformat())
+        self.assertEqual(bio['dates']['max'], dates.max().date().isoformat())
+        self.assertEqual(bio['header_issues'], [])
+        
+        whole, blocks = scan_shard(files[0], 'biometric'), scan_shard(files[0], 'biometric', block_bytes=512)
+        self.assertEqual(whole['totals'], blocks['totals'])
+        self.assertEqual(whole['dates'], blocks['dates'])
+        print(f"  ✓ {len(bio['files'])} biometric shards → {bio['rows']:,} rows, "
+              f"{bio['dates']['min']} to {bio['dates']['max']}")
+    
+    def test_dirty_lines_and_headers(self):
+        """Bad dates and values are counted, quoted fields parse, header drift is reported."""
+        path = os.path.join(self.tmp.name, 'dirty.csv')
+        with open(path, 'w', newline='') as fp:
+            fp.write("date,state,district,pincode,age_0_5,age_5_17,age_18_greater\r\n")
+            fp.write("01-03-2025,Goa,North Goa,403001,5,-2,x1\r\n")
+            fp.write("2025-03-02,Goa,South Goa,403601,,4,7\r\n")
+            fp.write('31-03-2025,"Jammu, Kashmir",Jammu,180001,1,1,1')
+        scan = scan_shard(path, 'enrolment')
+        
+        self.assertEqual(scan['rows'], 3)
+        self.assertEqual(scan['totals'], {'age_0_5': 6, 'age_5_17': 3, 'age_18_greater': 8})
+        self.assertEqual(scan['nulls']['age_0_5'], 1)
+        self.assertEqual(scan['negatives']['age_5_17'], 1)
+        self.assertEqual(scan['invalid_values']['age_18_greater'], 1)
+        self.assertEqual(scan['dates'], {'min': '2025-03-01', 'max': '2025-03-31', 'invalid': 1})
+        
+        drift = validate_header(['date', 'state', 'pincode', 'district', 'age_0_5', 'notes'], 'enrolment')
+        self.assertEqual(drift['missing'], ['age_5_17', 'age_18_greater'])
+        self.assertEqual(drift['extra'], ['notes'])
+        self.assertFalse(drift['ordered'])
+        print(f"  ✓ Dirty shard scanned: 1 bad date, 1 bad value, header drift reported")
+    
+    def test_blank_lines_are_skipped(self):
+        """Blank and whitespace-only lines are not rows, nulls or bad dates (as in pd.read_csv)."""
+        path = os.path.join(self.tmp.name, 'blank.csv')
+        with open(path, 'w', newline='') as fp:
+            fp.write("date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n")
+            fp.write("01-03-2025,Goa,North Goa,403001,5,2,1\n\n")
+            fp.write("  \r\n02-03-2025,Goa,South Goa,403601,,4,7\n\n\n")
+        quoted = os.path.join(self.tmp.name, 'blank_quoted.csv')
+        with open(quoted, 'w', newline='') as fp:
+            fp.write("date,state,district,pincode,age_0_5,age_5_17,age_18_greater\n\n")
+            fp.write('01-03-2025,"Goa",North Goa,403001,5,2,1\n\n')
+        for csv_path in (path, quoted):
+            expected = pd.read_csv(csv_path)
+            for block_bytes in (1 << 24, 8):
+                scan = scan_shard(csv_path, 'enrolment', block_bytes=block_bytes)
+                self.assertEqual(scan['rows'], len(expected))
+                self.assertEqual(scan['dates']['invalid'], 0)
+                self.assertEqual(scan['nulls']['age_0_5'], int(expected['age_0_5'].isna().sum()))
+                self.assertEqual(count_rows(csv_path, block_bytes=block_bytes), len(expected))
+        print(f"  ✓ Blank lines skipped: rows match pd.read_csv")
+
+
+class TestDedupIndex(unittest.TestCase):
+    """Test cross-chunk / cross-run deduplication with the persistent key index."""
+    
+    def setUp(self):
+        import tempfile
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(12)
+        rows = generate_rows('demographic', 20000, build_geography(80, 800), rng)
+        rows['date'] = parse_dates(rows['date'])
+        self.df = pd.concat([rows, rows.sample(4000, random_state=3)], ignore_index=True)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_chunked_matches_drop_duplicates(self):
+        """Filtering chunk by chunk keeps exactly the rows one drop_duplicates keeps."""
+        expected, removed = deduplicate_data(self.df)
+        for bloom in (True, False):
+            index = KeyIndex(capacity=1 << 16, bloom=bloom)
+            chunks = [self.df.iloc[i:i + 5000] for i in range(0, len(self.df), 5000)]
+            parts = [chunk[index.filter(chunk, shard=f'chunk{i}')] for i, chunk in enumerate(chunks)]
+            kept = pd.concat(parts)
+            self.assertTrue(kept.index.equals(expected.index))
+            report = index.report
+            self.assertEqual(sum(r['within'] + r['across'] for r in report.values()), removed)
+            self.assertEqual(sum(r['kept'] for r in report.values()), len(expected))
+        # Probes only for keys the Bloom filter could not rule out
+        self.assertEqual(report['chunk0']['probed'], report['chunk0']['rows'] - report['chunk0']['within'])
+        
+        relabelled = self.df.head(500).assign(pincode=lambda d: d['pincode'].astype(float),
+                                              state=lambda d: d['state'].astype(object))
+        np.testing.assert_array_equal(key_hashes(relabelled), key_hashes(self.df.head(500)))
+        print(f"  ✓ {len(self.df):,} rows in 5 chunks → {len(expected):,} kept ({removed:,} duplicates)")
+    
+    def test_index_persists_across_runs(self):
+        """A reopened index drops keys from an earlier run; ingested shards are skipped."""
+        path = os.path.join(self.tmp.name, 'keys.sqlite')
+        with KeyIndex(path, capacity=1 << 16) as index:
+            first = index.filter(self.df.iloc[:10000], shard='run1')
+        with KeyIndex(path, capacity=1 << 16) as index:
+            again = index.filter(self.df.iloc[5000:15000], shard='run2')
+            self.assertEqual(len(index), int(first.sum() + again.sum()))
+            self.assertEqual(index.report['run2']['across'] + index.report['run2']['within'],
+                             10000 - int(again.sum()))
+        self.assertGreaterEqual(index.report['run2']['across'], len(self.df.iloc[5000:10000].drop_duplicates(
+            ['date', 'state', 'district', 'pincode'])))
+        
+        bloom = BloomFilter(5000, 0.01)
+        hashes = np.random.default_rng(4).integers(0, 2**63, 10000, dtype=np.int64).view(np.uint64)
+        bloom.add(hashes[:5000])
+        self.assertTrue(bloom.might_contain(hashes[:5000]).all())
+        self.assertLess(bloom.might_contain(hashes[5000:]).mean(), 0.03)
+        
+        write_datasets(self.tmp.name, 3000, shard_rows=1000, seed=2, n_districts=30, n_pincodes=200)
+        dirs = {'enrolment': os.path.join(self.tmp.name, 'api_data_aadhar_enrolment')}
+        index_dir = os.path.join(self.tmp.name, 'dedup')
+        first_run = dedup_shards(dirs, index_dir=index_dir)['enrolment']
+        second_run = dedup_shards(dirs, index_dir=index_dir)['enrolment']
+        self.assertFalse(any(s['cached'] for s in first_run.values()))
+        self.assertTrue(all(s['cached'] for s in second_run.values()))
+        self.assertEqual(sum(s['rows'] for s in first_run.values()), scan_datasets(dirs, jobs=1)['enrolment']['rows'])
+        print(f"  ✓ Keys persisted across runs; {len(second_run)} ingested shards skipped")
+    
+    def test_interrupted_shard_is_rolled_back(self):
+        """A run that stops inside a shard saves none of its keys; the rerun keeps every row."""
+        from unittest import mock
+        write_datasets(self.tmp.name, 2000, shard_rows=1000, seed=7, n_districts=30, n_pincodes=200)
+        dirs = {'enrolment': os.path.join(self.tmp.name, 'api_data_aadhar_enrolment')}
+        index_dir = os.path.join(self.tmp.name, 'dedup')
+        out_dir = os.path.join(self.tmp.name, 'clean')
+        expected = dedup_shards(dirs, index_dir=os.path.join(self.tmp.name, 'reference'))['enrolment']
+        
+        with mock.patch.object(KeyIndex, 'mark_ingested', side_effect=RuntimeError("interrupted")):
+            with self.assertRaises(RuntimeError):
+                dedup_shards(dirs, index_dir=index_dir, out_dir=out_dir, chunk_rows=300)
+        rerun = dedup_shards(dirs, index_dir=index_dir, out_dir=out_dir, chunk_rows=300)['enrolment']
+        for name, counts in expected.items():
+            self.assertEqual(rerun[name]['kept'], counts['kept'])
+            written = pd.read_csv(os.path.join(out_dir, 'enrolment', name))
+            self.assertEqual(len(written), counts['kept'])
+        print(f"  ✓ Interrupted shard rolled back; rerun kept {sum(s['kept'] for s in rerun.values()):,} rows")
+
+
+class TestUnionAlign(unittest.TestCase):
+    """Test N-way key alignment against chained outer merges."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(21)
+        keys = ['year', 'month', 'state', 'district']
+        
+        def aggregate(n, cols):
+            df = pd.DataFrame({'year': 2025, 'month': rng.integers(1, 13, n),
+                               'state': rng.choice(['Goa', 'Bihar', 'Kerala', 'Assam'], n),
+                               'district': rng.choice([f'D{i}' for i in range(30)], n)})
+            for col in cols:
+                df[col] = rng.integers(0, 50, n)
+            return df.groupby(keys, as_index=False).sum()
+        
+        self.keys = keys
+        self.frames = [aggregate(900, ['total_enrol', 'x']), aggregate(700, ['total_demo']),
+                       aggregate(800, ['total_bio', 'x'])]
+    
+    def test_matches_chained_outer_merges(self):
+        """Same rows, order, columns and dtypes as two outer merges; provenance per source."""
+        enrol, demo, bio = self.frames
+        expected = enrol.merge(demo, on=self.keys, how='outer').merge(
+            bio, on=self.keys, how='outer', suffixes=('', '_src3'))
+        aligned = union_align(self.frames, self.keys, names=['enrol', 'demo', 'bio'])
+        
+        pd.testing.assert_frame_equal(aligned.drop(columns=['has_enrol', 'has_demo', 'has_bio']), expected)
+        np.testing.assert_array_equal(aligned['has_demo'], expected['total_demo'].notna())
+        np.testing.assert_array_equal(aligned['has_bio'], expected['total_bio'].notna())
+        print(f"  ✓ 3 aggregates aligned into {len(aligned):,} rows, identical to chained merges")
+    
+    def test_missing_keys_and_repeats(self):
+        """NaN keys align with each other; repeated keys within a frame are summed."""
+        left = pd.DataFrame({'k': [1.0, np.nan, 3.0, 3.0], 'x': [1, 2, 3, 4]})
+        right = pd.DataFrame({'k': [np.nan, 4.0], 'y': [5, 6]})
+        aligned = union_align([left, right], ['k'], names=['left', 'right'])
+        
+        self.assertEqual(aligned['x'].tolist()[:2], [1.0, 7.0])
+        self.assertTrue(np.isnan(aligned['k'].iloc[-1]))
+        self.assertEqual(aligned['y'].iloc[-1], 5)
+        self.assertEqual(aligned['has_right'].tolist(), [False, False, True, True])
+        merged = safe_merge_datasets(self.frames, self.keys, fill_strategy='drop')
+        self.assertEqual(int(merged['_source_count'].max()), 3)
+        print(f"  ✓ NaN keys and repeated keys handled")
+
+
+class TestGroupedWindows(unittest.TestCase):
+    """Test grouped rolling / lag / EWMA kernels against pandas groupby."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        n = 3000
+        self.df = pd.DataFrame({
+            'state': rng.choice(['Goa', 'Bihar', 'Kerala', None], n, p=[0.33, 0.33, 0.33, 0.01]),
+            'district': rng.integers(0, 40, n), 'date': rng.permutation(n),
+            'a': rng.gamma(2, 10, n), 'b': rng.integers(0, 4, n).astype(float),
+        }, index=rng.permutation(n) + 7)
+        self.df.loc[rng.random(n) < 0.05, 'a'] = np.nan
+        self.windows = GroupedWindows(self.df, ['state', 'district'], order_by='date')
+        self.grouped = self.df.sort_values('date').groupby(['state', 'district'])[['a', 'b']]
+    
+    def assertFramesClose(self, actual, expected):
+        expected = expected.reindex(self.df.index)
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True)
+    
+    def test_rolling_matches_pandas(self):
+        """Trailing, lagged and centred windows equal transform(lambda x: x.rolling(...))."""
+        for stat in ('mean', 'sum', 'std', 'max'):
+            self.assertFramesClose(self.windows.rolling(['a', 'b'], 3, stat, min_periods=1),
+                                   self.grouped.transform(lambda x: getattr(x.rolling(3, min_periods=1), stat)()))
+        self.assertFramesClose(self.windows.rolling(['a', 'b'], 3, min_periods=1, lag=1),
+                               self.grouped.transform(lambda x: x.rolling(3, min_periods=1).mean().shift(1)))
+        self.assertFramesClose(self.windows.rolling(['a', 'b'], 4, 'std', min_periods=2, center=True),
+                               self.grouped.transform(lambda x: x.rolling(4, min_periods=2, center=True).std()))
+        # Empty windows: sum is 0 with min_periods=0, NaN where the lag leaves the group
+        sparse = self.df.assign(a=self.df['a'].where(self.df['b'] == 0))
+        windows = GroupedWindows(sparse, ['state', 'district'], order_by='date')
+        grouped = sparse.sort_values('date').groupby(['state', 'district'])
+        for lag in (0, 2):
+            self.assertFramesClose(windows.rolling(['a', 'b'], 3, 'sum', min_periods=0, lag=lag),
+                                   grouped[['a', 'b']].transform(lambda x: x.rolling(3, min_periods=0).sum().shift(lag)))
+        self.assertFramesClose(windows.rolling(['a'], 3, 'mean', min_periods=0),
+                               grouped[['a']].transform(lambda x: x.rolling(3, min_periods=0).mean()))
+        print(f"  ✓ Rolling mean/sum/std/max, lagged and centred windows match pandas")
+    
+    def test_lags_and_ewma_match_pandas(self):
+        """pct_change, diff and EWMA equal the groupby versions (NaN keys stay NaN)."""
+        self.assertFramesClose(self.windows.pct_change(['a', 'b']), self.grouped.pct_change())
+        self.assertFramesClose(self.windows.diff(['a', 'b'], 2), self.grouped.diff(2))
+        self.assertFramesClose(self.windows.ewma(['a', 'b'], span=4),
+                               self.grouped.transform(lambda x: x.ewm(span=4).mean()))
+        self.assertTrue(self.windows.shift(['a'])['a'][self.df['state'].isna()].isna().all())
+        with self.assertRaises(ValueError):
+            self.windows.ewma(['a'])
+        print(f"  ✓ pct_change, diff and EWMA match pandas for {len(self.windows.starts)} groups")
+
+
+class TestBatchForecast(unittest.TestCase):
+    """Test batched forecasting engines against per-series references."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        self.months = pd.period_range('2023-01', periods=30, freq='M')
+        t = np.arange(30)
+        self.Y = 200 + rng.normal(0, 4, (60, 1)) * t + 15 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 5, (60, 30))
+        self.Y[rng.random(self.Y.shape) < 0.1] = np.nan
+    
+    def test_series_matrix_layout(self):
+        """Duplicate key/months are summed, gaps and all-NaN series stay NaN."""
+        df = pd.DataFrame({
+            'state': ['Goa', 'Goa', 'Goa', 'Bihar', None],
+            'date': pd.to_datetime(['2025-01-03', '2025-01-20', '2025-03-01', '2025-02-01', '2025-02-01']),
+            'total_enrol': [1.0, 2.0, 4.0, np.nan, 9.0],
+        })
+        labels, months, Y = series_matrix(df, ['state'], 'total_enrol')
+        self.assertEqual(labels['state'].tolist(), ['Bihar', 'Goa'])
+        self.assertEqual([str(m) for m in months], ['2025-01', '2025-02', '2025-03'])
+        np.testing.assert_array_equal(Y, [[np.nan, np.nan, np.nan], [3.0, np.nan, 4.0]])
+        forecast = forecast_frame(labels, months, Y, 2)
+        self.assertEqual(forecast['yhat'].isna().tolist(), [True, True, False, False])
+        print(f"  ✓ Series matrix sums duplicates and keeps gaps as NaN")
+    
+    def test_exact_fits_have_no_interval(self):
+        """A 2-observation series gets a point forecast but NaN bounds, not a zero-width band."""
+        Y = np.full((2, 10), np.nan)
+        Y[0, [2, 6]] = [10.0, 20.0]
+        Y[1] = np.arange(10) * 3.0 + np.random.default_rng(11).normal(0, 1, 10)
+        months = pd.period_range('2025-01', periods=10, freq='M')
+        for engine in (linear_forecast, holt_forecast):
+            yhat, lower, upper = engine(Y, months, 3)
+            self.assertTrue(np.isfinite(yhat).all())
+            self.assertTrue(np.isnan(lower[0]).all() and np.isnan(upper[0]).all())
+            self.assertTrue((upper[1] > lower[1]).all())
+        np.testing.assert_allclose(linear_forecast(Y, months, 1)[0][0], [20.0 + 2.5 * 4])
+        print(f"  ✓ Exact fits report NaN interval bounds")
+    
+    def test_linear_matches_polyfit(self):
+        """Trend-only fit equals np.polyfit on each series' observed months."""
+        yhat, lower, upper = linear_forecast(self.Y, self.months, 4, seasonal=False)
+        t = np.arange(30)
+        for i in range(len(self.Y)):
+            seen = ~np.isnan(self.Y[i])
+            expected = np.polyval(np.polyfit(t[seen], self.Y[i, seen], 1), np.arange(30, 34))
+            np.testing.assert_allclose(yhat[i], expected, rtol=1e-8)
+        self.assertTrue((lower < yhat).all() and (upper > yhat).all())
+        print(f"  ✓ Batched trend fit matches np.polyfit for {len(self.Y)} series")
+    
+    def test_holdout_coverage(self):
+        """Both engines beat a flat forecast and 80% intervals cover roughly 80%."""
+        train, test = self.Y[:, :24], self.Y[:, 24:]
+        seen = ~np.isnan(test)
+        for engine in (linear_forecast, holt_forecast):
+            yhat, lower, upper = engine(train, self.months[:24], 6, interval_width=0.80, seasonal=True)
+            coverage = ((test >= lower) & (test <= upper))[seen].mean()
+            error = np.abs(test - yhat)[seen].mean()
+            flat = np.abs(test - np.nanmean(train, axis=1, keepdims=True))[seen].mean()
+            self.assertGreater(coverage, 0.6)
+            self.assertLess(error, flat)
+        yhat, lower, upper = holt_forecast(np.full((2, 12), 50.0), self.months[:12], 3)
+        np.testing.assert_allclose(yhat, 50.0)
+        np.testing.assert_allclose(upper - lower, 0.0, atol=1e-9)
+        print(f"  ✓ Linear and Holt-Winters hold-out coverage within tolerance")
+
+
+class TestForecastBacktest(unittest.TestCase):
+    """Test rolling-origin backtesting, scoring, caching and engine selection."""
+    
+    def setUp(self):
+        rng = np.random.default_rng(10)
+        self.months = pd.period_range('2024-01', periods=14, freq='M')
+        self.Y = 100 + np.arange(14) * rng.normal(3, 1, (20, 1)) + rng.normal(0, 2, (20, 14))
+    
+    def test_folds_and_scores(self):
+        """Origins leave a full horizon; MAPE/sMAPE/coverage match hand values."""
+        self.assertEqual(rolling_origins(10, horizon=3, min_train=6), [6, 7])
+        self.assertEqual(rolling_origins(8, horizon=3, min_train=6), [])
+        folds = pd.DataFrame({'actual': [100.0, 0.0, 50.0, np.nan], 'yhat': [110.0, 0.0, 25.0, 1.0],
+                              'yhat_lower': [90.0, -1.0, 30.0, 0.0], 'yhat_upper': [120.0, 1.0, 40.0, 2.0]})
+        scores = score_folds(folds)
+        self.assertEqual(scores['points'], 3)
+        self.assertAlmostEqual(scores['mape'], (10 + 50) / 2)
+        self.assertAlmostEqual(scores['smape'], (2 * 10 / 210 + 2 * 25 / 75) / 2 * 100)
+        self.assertAlmostEqual(scores['coverage'], 2 / 3 * 100)
+        print(f"  ✓ Rolling origins and MAPE/sMAPE/coverage verified")
+    
+    def test_every_engine_honours_interval_width(self):
+        """Trend bands follow interval_width like the other engines; NaN bands are not scored."""
+        from forecast_analysis import forecast_with_simple_trend
+        monthly = pd.DataFrame({'date': self.months.to_timestamp(), 'value': self.Y[0]})
+        narrow = forecast_with_simple_trend(monthly, 'value', 2, interval_width=0.80)
+        wide = forecast_with_simple_trend(monthly, 'value', 2, interval_width=0.95)
+        std = np.std(self.Y[0])
+        np.testing.assert_allclose(wide['yhat_upper'] - wide['yhat'], 1.959964 * std, rtol=1e-6)
+        np.testing.assert_allclose(narrow['yhat_upper'] - narrow['yhat'], 1.281552 * std, rtol=1e-6)
+        folds = pd.DataFrame({'actual': [1.0, 5.0], 'yhat': [1.0, 5.0],
+                              'yhat_lower': [0.0, np.nan], 'yhat_upper': [2.0, np.nan]})
+        self.assertEqual(score_folds(folds)['coverage'], 100.0)
+        print(f"  ✓ Trend bands use interval_width; unbanded points skip coverage")
+    
+    def test_cache_refits_only_changed_series(self):
+        """A cached rerun gives the same folds; editing one series refits only it."""
+        cache = {}
+        first, _ = backtest_level(self.Y, self.months, 'linear', horizon=2, min_train=8, cache=cache)
+        n_folds = len(rolling_origins(14, 2, 8))
+        self.assertEqual(len(cache), 20 * n_folds)
+        self.assertEqual(len(first), 20 * n_folds * 2)
+        again, _ = backtest_level(self.Y, self.months, 'linear', horizon=2, min_train=8, cache=cache)
+        pd.testing.assert_frame_equal(first, again)
+        
+        changed = self.Y.copy()
+        changed[3, 0] += 1
+        backtest_level(changed, self.months, 'linear', horizon=2, min_train=8, cache=cache)
+        self.assertEqual(len(cache), 21 * n_folds)
+        trend, _ = backtest_level(self.Y, self.months, 'trend', horizon=2, min_train=8, cache=cache)
+        self.assertEqual(len(trend), len(first))
+        print(f"  ✓ Fold cache reused; one edited series refits {n_folds} folds")
+    
+    def test_run_backtest_and_selection(self):
+        """Every engine/level/metric is scored; selection prefers the faster of equals."""
+        dates = self.months.to_timestamp()
+        df = pd.DataFrame({
+            'state': np.repeat(['Goa', 'Goa', 'Bihar', 'Bihar'], 14 * 5),
+            'district': np.repeat([f'd{i}' for i in range(20)], 14),
+            'date': np.tile(dates, 20),
+            'total_enrol': self.Y.ravel(), 'total_updates': self.Y.ravel() * 2,
+        })
+        summary = run_backtest(df, ['trend', 'linear'], horizon=2, min_train=8, jobs=1, cache_path=None)
+        self.assertEqual(len(summary), 3 * 2 * 2)
+        self.assertEqual(summary.loc[summary['level'] == 'district', 'series'].tolist(), [20] * 4)
+        linear = summary[summary['engine'] == 'linear'].reset_index(drop=True)
+        trend = summary[summary['engine'] == 'trend'].reset_index(drop=True)
+        np.testing.assert_allclose(linear['smape'], trend['smape'])  # same least-squares line
+        
+        table = pd.DataFrame({'level': ['state'] * 3, 'engine': ['slow', 'fast', 'bad'],
+                              'smape': [10.0, 10.5, 30.0], 'seconds': [5.0, 0.1, 0.01]})
+        self.assertEqual(select_engines(table, 0.1), {'state': 'fast'})
+        self.assertEqual(select_engines(table, 0.01), {'state': 'slow'})
+        print(f"  ✓ Backtest summary covers 3 levels x 2 metrics x 2 engines")
+
+
 def run_metrics_tests():
     """Run all metrics validation tests."""
     print("="*70)
@@ -203,6 +1602,30 @@ def run_metrics_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestAnomalyDetection))
     suite.addTests(loader.loadTestsFromTestCase(TestVolatilityMetrics))
     suite.addTests(loader.loadTestsFromTestCase(TestKPIValidity))
+    suite.addTests(loader.loadTestsFromTestCase(TestMetricKernel))
+    suite.addTests(loader.loadTestsFromTestCase(TestMemoryOwnership))
+    suite.addTests(loader.loadTestsFromTestCase(TestSchemaRegistry))
+    suite.addTests(loader.loadTestsFromTestCase(TestCalendarUtils))
+    suite.addTests(loader.loadTestsFromTestCase(TestGeoDimension))
+    suite.addTests(loader.loadTestsFromTestCase(TestPipelineRunner))
+    suite.addTests(loader.loadTestsFromTestCase(TestPlotRegistry))
+    suite.addTests(loader.loadTestsFromTestCase(TestPhaseProfiler))
+    suite.addTests(loader.loadTestsFromTestCase(TestSyntheticData))
+    suite.addTests(loader.loadTestsFromTestCase(TestEquivalenceHarness))
+    suite.addTests(loader.loadTestsFromTestCase(TestDashboardBundle))
+    suite.addTests(loader.loadTestsFromTestCase(TestImageAssets))
+    suite.addTests(loader.loadTestsFromTestCase(TestApiServer))
+    suite.addTests(loader.loadTestsFromTestCase(TestSqlEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestPartitionedStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestDistinctSketch))
+    suite.addTests(loader.loadTestsFromTestCase(TestQuantileSketch))
+    suite.addTests(loader.loadTestsFromTestCase(TestShardProfiler))
+    suite.addTests(loader.loadTestsFromTestCase(TestShardScanner))
+    suite.addTests(loader.loadTestsFromTestCase(TestDedupIndex))
+    suite.addTests(loader.loadTestsFromTestCase(TestUnionAlign))
+    suite.addTests(loader.loadTestsFromTestCase(TestGroupedWindows))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchForecast))
+    suite.addTests(loader.loadTestsFromTestCase(TestForecastBacktest))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)